@@ -1,36 +1,45 @@
 #!/usr/bin/env python3
 import sys
 import os
+from utils import tracing
+# --trace / NEOARCH_TRACE has to be picked up before the imports below
+tracing.configure_from_argv(sys.argv)
 import subprocess
 import time
 import json
 import re
 import shutil
 import tempfile
-import importlib.util
 import traceback
 from threading import Thread, Event
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QLineEdit, QTableWidget, QTableWidgetItem, QTextEdit,
+                             QPushButton, QLineEdit, QTableWidget, QTableWidgetItem, QPlainTextEdit,
                              QLabel, QFileDialog, QMessageBox, QHeaderView, QFrame, QSplitter,
                              QScrollArea, QCheckBox, QListWidget, QListWidgetItem, QSizePolicy,
                              QDialog, QTabWidget, QGroupBox, QGridLayout, QRadioButton, QSpinBox)
-from PyQt6.QtCore import Qt, pyqtSignal, QObject, QThread, QSize, QTimer, QRectF, QItemSelectionModel, qInstallMessageHandler, QtMsgType
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QThread, QSize, QTimer, QRectF, QItemSelectionModel, QEvent, qInstallMessageHandler, QtMsgType
 from PyQt6.QtGui import QColor, QFont, QIcon, QPixmap, QPainter, QImage
 from PyQt6.QtSvg import QSvgRenderer
 from collections import Counter
 
-from managers.git_manager import GitManager
-
 from utils.styles import Styles
-from components import (SourceCard, FilterCard, LargeSearchBox, LoadingSpinner, PluginsView, PluginsSidebar,
-                       GeneralSettingsWidget, AutoUpdateSettingsWidget, PluginsSettingsWidget)
+# Plugins, Settings and the Git/Docker managers are imported when first shown
+# (or by the warm-up after first paint), see _warm_up_views
+from components import SourceCard, FilterCard, LargeSearchBox, LoadingSpinner
 from managers.plugin_manager import PluginsManager
 from utils.workers import CommandWorker, PackageLoaderWorker
-from utils import config_utils, sys_utils
-from services import (snapshot_service, update_service, uninstall_service, ignore_service,
+from utils.log_sink import LogSink
+from utils.process_runner import run_command
+from utils.scheduler import DOMAIN_LABELS
+from utils import config_utils, sys_utils, pacman_lock, plugin_runtime, plugin_manifest
+from services import (snapshot_service, update_service, ignore_service,
                       bundle_service, askpass_service, settings_service, filters_service,
-                      install_service, packages_service, help_service)
+                      packages_service, help_service, prefetch_service,
+                      privileged_helper, queue_service)
+
+# Item data roles on the package name cell
+PKG_SOURCE_ROLE = Qt.ItemDataRole.UserRole
+PKG_INSTALLED_ROLE = Qt.ItemDataRole.UserRole + 1
 
 def _qt_msg_handler(mode, context, message):
     s = str(message)
@@ -162,12 +171,32 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self._installed_index_building = False
         self._installed_index_last_built = 0
         self._installed_index_sources = set()
+        self._mark_installed_pending = False
+        self._table_view = None
+        self.install_runners = set()
+        self.install_scheduler = None
+        self.domain_cancel_buttons = {}
+        # Cached datasets and per-view UI state kept across view switches
+        self.updates_all = []
+        self.installed_all = []
+        self._view_state = {}
+        self._stale_views = {"updates", "installed"}
+        self._view_db_stamp = {}
+        self._loading_views = set()
+        # Background prefetch of pending updates: {(source, id): {'status', 'bytes', 'total'}}
+        self.prefetch_state = {}
+        self._prefetch_running = False
+        # Durable install/update/uninstall queue (services.queue_service)
+        self.operation_queue = queue_service.OperationQueue()
+        self._queue_worker = None
         # Working bundle state (list of {name,id,source,version?})
         self.bundle_items = []
         # Settings state
         self.settings = self.load_settings()
-        # Plugins runtime
+        privileged_helper.configure(self.settings.get('use_privileged_helper', False))
+        # Plugins runtime; hooks run on the host's workers (see utils.plugin_runtime)
         self.plugins = []
+        self.plugin_host = plugin_runtime.PluginHost(self, log=self.log)
         self.plugin_timer = QTimer()
         self.plugin_timer.setInterval(60000)
         self.plugin_timer.timeout.connect(self.run_plugin_tick)
@@ -178,13 +207,14 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.packages_ready.connect(self.on_packages_loaded)
         self.discover_results_ready.connect(self.display_discover_results)
         self.show_message.connect(self._show_message)
-        self.log_signal.connect(self.log)
+        # Console lines are buffered by the sink; append in the emitting thread
+        self.log_sink = LogSink(parent=self)
+        self.log_signal.connect(self.log, Qt.ConnectionType.DirectConnection)
         self.load_error.connect(self.on_load_error)
         self.installation_progress.connect(self.on_installation_progress)
         self.ui_call.connect(self._on_ui_call)
         # Background loading coordination
         self.loading_context = None
-        self.cancel_update_load = False
         self.cancel_discover_search = False
         # Nav badges (e.g., updates count)
         self.nav_badges = {}
@@ -194,6 +224,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.settings_nav_buttons = {}
         self.source_card = None
         self.filters_panel = None
+        self._first_paint_done = False
         self.setup_ui()
         # Set initial nav button state
         for btn_id, btn in self.nav_buttons.items():
@@ -219,6 +250,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         except Exception:
             pass
         QTimer.singleShot(1500, self.run_first_run_checks)
+        QTimer.singleShot(2000, self.offer_queue_resume)
 
     def on_large_search_requested(self, query):
         """Handle search request from large search box"""
@@ -353,6 +385,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         y = (screen_geometry.height() - self.height()) // 2
         self.move(x, y)
     
+    @tracing.traced('setup_ui')
     def setup_ui(self):
         central_widget = QWidget()
         central_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -362,11 +395,13 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         main_layout.setSpacing(0)
         
         # Left Sidebar
-        sidebar = self.create_sidebar()
+        with tracing.span('setup_ui.sidebar'):
+            sidebar = self.create_sidebar()
         main_layout.addWidget(sidebar)
         
         # Main Content Area
-        content = self.create_content_area()
+        with tracing.span('setup_ui.content'):
+            content = self.create_content_area()
         main_layout.addWidget(content, 1)
         
         # Ensure proper sizing
@@ -823,16 +858,9 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 return
             env, cleanup = self.prepare_askpass_env()
             cmd = f"cd '{tmpdir}' && makepkg -si --noconfirm"
-            process = subprocess.Popen(["bash", "-lc", cmd], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
-            while True:
-                line = process.stdout.readline() if process.stdout else ""
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    self.log(line.strip())
-            _, stderr = process.communicate()
-            if process.returncode != 0 and stderr:
-                self.log(f"Error: {stderr}")
+            result = run_command(["bash", "-lc", cmd], on_stdout=self.log, env=env)
+            if result.returncode != 0 and result.stderr:
+                self.log(f"Error: {result.stderr}")
         finally:
             try:
                 shutil.rmtree(tmpdir, ignore_errors=True)
@@ -1003,7 +1031,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         layout.setSpacing(0)
         
         # Header
-        header = self.create_header()
+        with tracing.span('setup_ui.header'):
+            header = self.create_header()
         layout.addWidget(header)
         
         # Main Content (Splitter)
@@ -1011,11 +1040,13 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         splitter.setOrientation(Qt.Orientation.Horizontal)
         
         # Left panel: Filters/Sources
-        left_panel = self.create_filters_panel()
+        with tracing.span('setup_ui.filters_panel'):
+            left_panel = self.create_filters_panel()
         splitter.addWidget(left_panel)
         
         # Right panel: Packages table + Console
-        right_panel = self.create_packages_panel()
+        with tracing.span('setup_ui.packages_panel'):
+            right_panel = self.create_packages_panel()
         splitter.addWidget(right_panel)
         
         splitter.setCollapsible(0, True)
@@ -1108,6 +1139,10 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 self.plugins_manager.install_by_id(self.plugins_view, plugin_id)
         except Exception as e:
             self._show_message("Plugins", f"Install error: {e}")
+            try:
+                self.plugins_view.set_installing(plugin_id, False)
+            except Exception:
+                pass
     
     def on_plugin_launch_requested(self, plugin_id):
         try:
@@ -1122,6 +1157,10 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 self.plugins_manager.uninstall_by_id(self.plugins_view, plugin_id)
         except Exception as e:
             self._show_message("Plugins", f"Uninstall error: {e}")
+            try:
+                self.plugins_view.set_installing(plugin_id, False)
+            except Exception:
+                pass
     
     def open_plugins_folder(self):
         try:
@@ -1177,12 +1216,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 pkg_name = name_item.text().strip() if name_item else ''
                 pkg_id = id_item.text().strip() if id_item else pkg_name
                 if self.current_view == "discover":
-                    source = ""
-                    chip = self.package_table.cellWidget(row, 4)
-                    if chip is not None:
-                        labels = chip.findChildren(QLabel)
-                        if labels:
-                            source = labels[-1].text()
+                    source = self.get_source_text(row, "discover")
                 else:
                     source_item = self.package_table.item(row, 5)
                     source = source_item.text() if source_item else "pacman"
@@ -1227,7 +1261,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         except Exception:
             pass
         self.log_signal.emit(f"Installing with sudo: {', '.join([f'{pkg} ({source})' for source, pkgs in to_install.items() for pkg in pkgs])}")
-        install_service.install_packages(self, to_install)
+        queue_service.submit(self, 'install', to_install, force_sudo=True)
     
     def create_filters_panel(self):
         self.filters_panel = QFrame()
@@ -1305,6 +1339,13 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.cancel_install_btn.setMinimumHeight(36)
         self.cancel_install_btn.setVisible(False)  # Hidden by default
         self.cancel_install_btn.clicked.connect(self.cancel_installation)
+
+        # One cancel button per lock domain while several run in parallel
+        self.domain_cancel_row = QWidget()
+        self.domain_cancel_layout = QHBoxLayout(self.domain_cancel_row)
+        self.domain_cancel_layout.setContentsMargins(0, 0, 0, 0)
+        self.domain_cancel_layout.setSpacing(8)
+        self.domain_cancel_row.setVisible(False)
         
         # Container for loading widget and cancel button (centered both axes)
         self.loading_container = QWidget()
@@ -1315,6 +1356,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         loading_layout.addStretch()  # Top stretch for vertical centering
         loading_layout.addWidget(self.loading_widget, alignment=Qt.AlignmentFlag.AlignHCenter)
         loading_layout.addWidget(self.cancel_install_btn, alignment=Qt.AlignmentFlag.AlignHCenter)
+        loading_layout.addWidget(self.domain_cancel_row, alignment=Qt.AlignmentFlag.AlignHCenter)
         loading_layout.addStretch()  # Bottom stretch for vertical centering
         self.loading_container.setVisible(False)
         
@@ -1345,19 +1387,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.settings_container.setWidget(self.settings_root)
         self.packages_panel_layout.addWidget(self.settings_container)
         
-        # Plugins view (hidden by default)
-        self.plugins_view = PluginsView(self, self.get_svg_icon)
-        self.plugins_view.install_requested.connect(self.on_plugin_install_requested)
-        self.plugins_view.launch_requested.connect(self.on_plugin_launch_requested)
-        try:
-            self.plugins_view.uninstall_requested.connect(self.on_plugin_uninstall_requested)
-        except Exception:
-            pass
-        self.plugins_view.setVisible(False)
-        
-        # Add plugins view directly (no tabs needed)
-        self.plugins_view.setVisible(False)
-        self.packages_panel_layout.addWidget(self.plugins_view)
+        # Plugins view is built on first show, see ensure_plugins_view
+        self.plugins_view = None
         
         # Packages Table
         self.package_table = QTableWidget()
@@ -1376,6 +1407,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.package_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.package_table.setSelectionMode(QTableWidget.SelectionMode.MultiSelection)
         self.package_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.package_table.verticalScrollBar().valueChanged.connect(self._schedule_mark_installed)
+        self.package_table.viewport().installEventFilter(self)
         self.packages_panel_layout.addWidget(self.package_table, 1)
         self.load_more_btn = QPushButton("Load More Packages")
         self.load_more_btn.setMinimumHeight(36)
@@ -1396,9 +1429,23 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.console_toggle_btn.setVisible(False)
         self.packages_panel_layout.addWidget(self.console_toggle_btn, alignment=Qt.AlignmentFlag.AlignRight)
         
-        # Console Output
-        self.console_label = QLabel("Console Output")
-        self.console_label.setObjectName("sectionLabel")
+        # Console Output (header row: title, search, export)
+        self.console_label = QWidget()
+        console_header = QHBoxLayout(self.console_label)
+        console_header.setContentsMargins(0, 0, 0, 0)
+        console_header.setSpacing(8)
+        console_title = QLabel("Console Output")
+        console_title.setObjectName("sectionLabel")
+        console_header.addWidget(console_title)
+        console_header.addStretch()
+        self.console_search = QLineEdit()
+        self.console_search.setPlaceholderText("Search log")
+        self.console_search.setFixedWidth(200)
+        self.console_search.textChanged.connect(self.log_sink.set_filter)
+        console_header.addWidget(self.console_search)
+        export_log_btn = QPushButton("Export Log")
+        export_log_btn.clicked.connect(self.export_console_log)
+        console_header.addWidget(export_log_btn)
         self.packages_panel_layout.addWidget(self.console_label)
         # Hidden by default; shown via the bottom-right toggle
         try:
@@ -1406,13 +1453,10 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         except Exception:
             pass
         
-        self.console = QTextEdit()
+        self.console = QPlainTextEdit()
         self.console.setReadOnly(True)
         self.console.setMaximumHeight(150)
-        try:
-            self.console.document().setMaximumBlockCount(500)
-        except Exception:
-            pass
+        self.log_sink.attach(self.console)
         self.packages_panel_layout.addWidget(self.console)
         try:
             self.console.setVisible(False)
@@ -1793,20 +1837,78 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 QTimer.singleShot(800, animate_next_message)  # 800ms delay between messages
             else:
                 # Clear the console after the animation completes
-                QTimer.singleShot(2000, lambda: self.console.clear())  # Wait 2 seconds then clear
+                QTimer.singleShot(2000, self.log_sink.clear)  # Wait 2 seconds then clear
         
         # Start the animation
         animate_next_message()
     
-    def switch_view(self, view_id):
-        self.current_view = view_id
+    def ensure_plugins_view(self):
+        """Build the Plugins view (and import the plugin catalogue) on first use."""
+        if self.plugins_view is not None:
+            return self.plugins_view
+        with tracing.span('build plugins view'):
+            from components import PluginsView
+            view = PluginsView(self, self.get_svg_icon)
+        view.install_requested.connect(self.on_plugin_install_requested)
+        view.launch_requested.connect(self.on_plugin_launch_requested)
         try:
-            _installing = getattr(self, "_installing", False) or hasattr(self, 'install_cancel_event')
+            view.uninstall_requested.connect(self.on_plugin_uninstall_requested)
         except Exception:
-            _installing = False
-        if not _installing:
-            self.console.clear()
-        # Stop any spinners and cancel background loads when switching views
+            pass
+        view.setVisible(False)
+        # Same place in the panel as before: right above the packages table
+        index = self.packages_panel_layout.indexOf(self.package_table)
+        self.packages_panel_layout.insertWidget(index, view)
+        self.plugins_view = view
+        return view
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            tracing.since_start('first paint')
+            QTimer.singleShot(0, self._warm_up_views)
+
+    def _warm_up_views(self):
+        """After first paint, import the deferred views off the UI thread, then build Plugins and Settings."""
+        modules = ('components.plugins_view', 'components.plugins_sidebar', 'components.settings_general',
+                   'components.settings_auto_update', 'components.settings_plugins',
+                   'managers.git_manager', 'managers.docker_manager')
+
+        def import_modules():
+            import importlib
+            for name in modules:
+                try:
+                    importlib.import_module(name)
+                except Exception:
+                    pass
+            self.ui_call.emit(self._warm_up_ui)
+
+        Thread(target=tracing.bind(import_modules, 'warm-up imports'), daemon=True).start()
+
+    def _warm_up_ui(self, steps=None):
+        """Build one deferred view per idle slice so input is never blocked for long."""
+        # Widgets can only be created on the UI thread; modules are imported by now
+        if steps is None:
+            steps = [self.ensure_plugins_view, self.ensure_settings_ui]
+        if not steps:
+            return
+        step = steps.pop(0)
+        with tracing.span('warm-up views', view=step.__name__):
+            try:
+                step()
+            except Exception:
+                pass
+        if steps:
+            QTimer.singleShot(0, lambda: self._warm_up_ui(steps))
+
+    @tracing.traced('switch_view', args=lambda self, view_id: {'view': view_id})
+    def switch_view(self, view_id):
+        if view_id != self.current_view:
+            self._save_view_state(self.current_view)
+            self._table_view = None
+        self.current_view = view_id
+        # Stop any spinners when switching views; background loads keep running and fill the view cache
         try:
             self.loading_widget.stop_animation()
             self.loading_widget.setVisible(False)
@@ -1823,8 +1925,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 self.console_toggle_btn.setVisible(False)
         except Exception:
             pass
-        # Cancel ongoing non-install tasks
-        self.cancel_update_load = True
+        # Cancel ongoing discover searches
         self.cancel_discover_search = True
         # Tag the current view as the active loading context
         self.loading_context = view_id
@@ -1864,7 +1965,10 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.update_table_columns(view_id)
         self.update_filters_panel(view_id)
         self.update_toolbar()
+        self.search_timer.stop()
+        self.search_input.blockSignals(True)
         self.search_input.clear()
+        self.search_input.blockSignals(False)
         if view_id != "discover":
             self.large_search_box.setVisible(False)
         
@@ -1887,16 +1991,20 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                     self.console_toggle_btn.setToolTip("Show Console")
             except Exception:
                 pass
-            try:
-                self.loading_widget.set_message("Checking for updates...")
-                self.loading_widget.setVisible(True)
-                self.loading_widget.start_animation()
-                if hasattr(self, 'loading_container'):
-                    self.loading_container.setVisible(True)
-            except Exception:
-                pass
-            self.package_table.setVisible(False)
-            self.load_updates()
+            if self._view_needs_reload("updates"):
+                try:
+                    self.loading_widget.set_message("Checking for updates...")
+                    self.loading_widget.setVisible(True)
+                    self.loading_widget.start_animation()
+                    if hasattr(self, 'loading_container'):
+                        self.loading_container.setVisible(True)
+                except Exception:
+                    pass
+                self.package_table.setVisible(False)
+                if "updates" not in self._loading_views:
+                    self.load_updates()
+            else:
+                self._restore_package_view("updates")
         elif view_id == "installed":
             try:
                 self.console_label.setVisible(False)
@@ -1906,19 +2014,23 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                     self.console_toggle_btn.setToolTip("Show Console")
             except Exception:
                 pass
-            try:
-                self.loading_widget.set_message("Loading installed packages...")
-                self.loading_widget.setVisible(True)
-                self.loading_widget.start_animation()
-                if hasattr(self, 'loading_container'):
-                    self.loading_container.setVisible(True)
-            except Exception:
-                pass
-            try:
-                self.package_table.setVisible(False)
-            except Exception:
-                pass
-            self.load_installed_packages()
+            if self._view_needs_reload("installed"):
+                try:
+                    self.loading_widget.set_message("Loading installed packages...")
+                    self.loading_widget.setVisible(True)
+                    self.loading_widget.start_animation()
+                    if hasattr(self, 'loading_container'):
+                        self.loading_container.setVisible(True)
+                except Exception:
+                    pass
+                try:
+                    self.package_table.setVisible(False)
+                except Exception:
+                    pass
+                if "installed" not in self._loading_views:
+                    self.load_installed_packages()
+            else:
+                self._restore_package_view("installed")
         elif view_id == "discover":
             self.large_search_box.setVisible(True)
             self.package_table.setVisible(False)
@@ -1943,6 +2055,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 _installing = getattr(self, "_installing", False) or hasattr(self, 'install_cancel_event')
             except Exception:
                 _installing = False
+            if not _installing:
+                self._restore_discover_view()
             if _installing:
                 try:
                     self.loading_widget.set_message("Installing packages...")
@@ -2030,6 +2144,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             self.update_plugins_sources()
             
             # Show plugins view directly (no tab widget)
+            self.ensure_plugins_view()
             try:
                 self.plugins_view.setVisible(True)
             except Exception:
@@ -2076,7 +2191,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             except Exception:
                 pass
             self.header_info.setText("Configure NeoArch settings and plugins")
-            QTimer.singleShot(0, self.build_settings_ui)
+            QTimer.singleShot(0, self.ensure_settings_ui)
         # Notify plugins about view change
         try:
             self.run_plugin_hook('on_view_changed', view_id)
@@ -2091,6 +2206,10 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 pass
     
     def update_filters_panel(self, view_id):
+        self._build_filters_panel(view_id)
+        self._restore_filter_state(view_id)
+
+    def _build_filters_panel(self, view_id):
         # Clear existing filters section
         while self.filters_layout.count():
             item = self.filters_layout.takeAt(0)
@@ -2149,6 +2268,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 if item.widget():
                     item.widget().deleteLater()
             try:
+                from components import PluginsSidebar
                 self.plugins_sidebar = PluginsSidebar(self)
                 self.plugins_sidebar.filter_changed.connect(self.on_plugins_filter_changed)
                 # Populate sidebar with the same list as cards
@@ -2461,29 +2581,24 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         # Ignore results if user has navigated away from the originating view
         if self.loading_context != self.current_view or self.current_view not in ("updates", "installed"):
             return
-        self.all_packages = packages
         if self.current_view == "updates":
             self.updates_all = packages
-        elif self.current_view == "installed":
+            visible = filters_service.filter_update_packages(self, packages)
+        else:
             self.installed_all = packages
-        self.current_page = 0
-        self.packages_per_page = 10
-        self.package_table.setRowCount(0)
-        self.display_page()
-        if self.current_view == "updates" and hasattr(self, 'source_card') and self.source_card:
-            try:
-                states = self.source_card.get_selected_sources()
-                self.on_updates_source_changed(states)
-            except Exception:
-                pass
-        elif self.current_view == "installed" and hasattr(self, 'source_card') and self.source_card:
-            try:
-                states = self.source_card.get_selected_sources()
-                self.on_installed_source_changed(states)
-            except Exception:
-                pass
-        
-        
+            visible = filters_service.filter_installed_packages(self, packages)
+        in_place = (getattr(self, '_table_view', None) == self.current_view
+                    and self.package_table.rowCount() > 0
+                    and not self.search_input.text().strip())
+        if in_place:
+            self._apply_package_diff(visible)
+        else:
+            self.all_packages = visible
+            self.current_page = 0
+            self.packages_per_page = 10
+            self.package_table.setRowCount(0)
+            self.display_page()
+
         # Hide loading spinner, stop animation, and show packages table
         self.loading_widget.setVisible(False)
         self.loading_widget.stop_animation()
@@ -2510,6 +2625,145 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         elif self.current_view == "installed":
             self.update_installed_header_counts()
     
+    def on_view_packages_loaded(self, view_id, packages, db_stamp=None):
+        """Store a finished background load in the view cache and show it if the view is current."""
+        self._loading_views.discard(view_id)
+        self._view_db_stamp[view_id] = db_stamp
+        if view_id == "updates":
+            self.updates_all = packages
+            try:
+                prefetch_service.maybe_start_prefetch(self, packages)
+            except Exception:
+                pass
+        else:
+            self.installed_all = packages
+        if self.current_view == view_id:
+            self.loading_context = view_id
+            self.on_packages_loaded(packages)
+        elif view_id == "updates":
+            try:
+                self.set_updates_count(len(packages))
+            except Exception:
+                pass
+
+    def on_view_load_failed(self, view_id):
+        self._loading_views.discard(view_id)
+        self._stale_views.add(view_id)
+        if self.current_view == view_id:
+            self.on_load_error()
+
+    def invalidate_package_views(self, views=("updates", "installed")):
+        """Mark cached package data as outdated after a transaction.
+
+        The current view reloads right away (diffed in place); other views
+        reload the next time they are shown.
+        """
+        for v in views:
+            self._stale_views.add(v)
+        if self.current_view in views and not getattr(self, '_installing', False):
+            self.refresh_packages()
+
+    def _view_needs_reload(self, view_id):
+        if view_id in self._stale_views:
+            return True
+        return self._view_db_stamp.get(view_id) != packages_service.pacman_db_stamp()
+
+    def _save_view_state(self, view_id):
+        if view_id not in ("updates", "installed", "discover"):
+            return
+        state = {
+            'search': self.search_input.text(),
+            'rows': self.package_table.rowCount(),
+            'scroll': self.package_table.verticalScrollBar().value(),
+        }
+        try:
+            state['sources'] = self.source_card.get_selected_sources()
+        except Exception:
+            pass
+        if view_id == "installed":
+            try:
+                state['filters'] = self.filter_card.get_selected_filters()
+            except Exception:
+                pass
+        self._view_state[view_id] = state
+
+    def _restore_filter_state(self, view_id):
+        state = self._view_state.get(view_id) or {}
+        card = getattr(self, 'source_card', None)
+        if card is not None and state.get('sources'):
+            try:
+                for name, checked in state['sources'].items():
+                    item = card.sources.get(name)
+                    if item is None:
+                        continue
+                    item.checkbox.blockSignals(True)
+                    item.set_checked(checked)
+                    item.checkbox.blockSignals(False)
+                card.update_select_all_button()
+            except Exception:
+                pass
+        fcard = getattr(self, 'filter_card', None)
+        if view_id == "installed" and fcard is not None and state.get('filters'):
+            try:
+                fcard.blockSignals(True)
+                fcard.set_selected_filters(state['filters'])
+            except Exception:
+                pass
+            finally:
+                fcard.blockSignals(False)
+
+    def _restore_rows(self, state, add_row, dataset):
+        rows = min(state.get('rows', 0), len(dataset))
+        self.package_table.setUpdatesEnabled(False)
+        for pkg in dataset[self.package_table.rowCount():rows]:
+            add_row(pkg)
+        self.package_table.setUpdatesEnabled(True)
+        self.current_page = max(0, (self.package_table.rowCount() - 1) // self.packages_per_page)
+        scroll = state.get('scroll', 0)
+        QTimer.singleShot(0, lambda: self.package_table.verticalScrollBar().setValue(scroll))
+
+    def _restore_package_view(self, view_id):
+        """Redisplay Updates/Installed from the cache with the filters, search and scroll the user left."""
+        state = self._view_state.get(view_id) or {}
+        if view_id == "updates":
+            self.all_packages = filters_service.filter_update_packages(self, self.updates_all)
+        else:
+            self.all_packages = filters_service.filter_installed_packages(self, self.installed_all)
+        self.search_results = []
+        self.current_page = 0
+        self.package_table.setRowCount(0)
+        self.display_page()
+        query = state.get('search') or ''
+        if query:
+            self.search_input.blockSignals(True)
+            self.search_input.setText(query)
+            self.search_input.blockSignals(False)
+            self.perform_search()
+        else:
+            self._restore_rows(state, self._add_row_for_view, self.all_packages)
+            remaining = len(self.all_packages) - self.package_table.rowCount()
+            self.load_more_btn.setVisible(remaining > 0)
+            if remaining > 0:
+                self.load_more_btn.setText(f"Load More ({remaining} remaining)")
+        self.package_table.setVisible(True)
+        if view_id == "updates":
+            self.update_updates_header_counts()
+        else:
+            self.update_installed_header_counts()
+
+    def _restore_discover_view(self):
+        state = self._view_state.get("discover") or {}
+        query = state.get('search') or ''
+        if not query or not self.search_results:
+            return
+        self.search_input.blockSignals(True)
+        self.search_input.setText(query)
+        self.search_input.blockSignals(False)
+        self.large_search_box.setVisible(False)
+        self.display_discover_results()
+        self._restore_rows(state, self.add_discover_row, self.filtered_results)
+        self.update_load_more_visibility()
+
     def on_load_error(self):
         # Hide loading spinner, stop animation, and show packages table (empty)
         self.loading_widget.setVisible(False)
@@ -2532,7 +2786,39 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         """Cancel the ongoing installation process"""
         if hasattr(self, 'install_cancel_event'):
             self.install_cancel_event.set()
+            for runner in list(getattr(self, 'install_runners', ()) or ()):
+                runner.cancel()
             self.log("Installation cancellation requested...")
+
+    def show_domain_cancel_buttons(self, domains):
+        """Offer a cancel button for each lock domain of the running install."""
+        self.hide_domain_cancel_buttons()
+        for domain in domains:
+            btn = QPushButton(f"Cancel {DOMAIN_LABELS.get(domain, domain)}")
+            btn.setMinimumHeight(30)
+            btn.clicked.connect(lambda _=False, d=domain: self.cancel_installation_domain(d))
+            self.domain_cancel_layout.addWidget(btn)
+            self.domain_cancel_buttons[domain] = btn
+        self.domain_cancel_row.setVisible(bool(self.domain_cancel_buttons))
+
+    def hide_domain_cancel_buttons(self):
+        for btn in self.domain_cancel_buttons.values():
+            self.domain_cancel_layout.removeWidget(btn)
+            btn.deleteLater()
+        self.domain_cancel_buttons = {}
+        self.domain_cancel_row.setVisible(False)
+
+    def cancel_installation_domain(self, domain):
+        """Cancel only one lock domain ('alpm', 'flatpak', 'npm') of the running install."""
+        scheduler = self.install_scheduler
+        if scheduler is None:
+            return
+        scheduler.cancel(domain)
+        btn = self.domain_cancel_buttons.get(domain)
+        if btn is not None:
+            btn.setEnabled(False)
+            btn.setText(f"Cancelling {DOMAIN_LABELS.get(domain, domain)}…")
+        self.log(f"Cancelling {DOMAIN_LABELS.get(domain, domain)} installs...")
     
     def on_installation_progress(self, status, can_cancel):
         if status == "start":
@@ -2580,6 +2866,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 pass
             self.loading_widget.set_message("Success")
             self.cancel_install_btn.setVisible(False)
+            self.hide_domain_cancel_buttons()
+            self.invalidate_package_views()
             # Keep spinner visible briefly to show success, then hide
             QTimer.singleShot(1500, lambda: self.finish_installation_progress())
         elif status == "failed":
@@ -2589,6 +2877,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 pass
             self.loading_widget.set_message("Install failed")
             self.cancel_install_btn.setVisible(False)
+            self.hide_domain_cancel_buttons()
+            self.invalidate_package_views()
             # Keep spinner visible briefly to show failure, then hide
             QTimer.singleShot(2000, lambda: self.finish_installation_progress())
         elif status == "cancelled":
@@ -2598,6 +2888,9 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 pass
             self.loading_widget.set_message("Installation cancelled")
             self.cancel_install_btn.setVisible(False)
+            self.hide_domain_cancel_buttons()
+            # Domains that were not cancelled may have installed packages
+            self.invalidate_package_views()
             # Keep spinner visible briefly to show cancellation, then hide
             QTimer.singleShot(1500, lambda: self.finish_installation_progress())
     
@@ -2646,6 +2939,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 self.load_more_btn.setVisible(False)
     
     def display_page(self):
+        self._table_view = self.current_view
         self.package_table.setUpdatesEnabled(False)
         start = self.current_page * self.packages_per_page
         end = start + self.packages_per_page
@@ -2690,6 +2984,9 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 self._ensure_installed_index_async(ss)
         else:
             dataset = self.search_results if self.search_results else self.all_packages
+            # Rows may have been added or removed by an in-place refresh
+            start = self.package_table.rowCount()
+            end = start + self.packages_per_page
         
         page_packages = dataset[start:end]
         total = len(dataset)
@@ -2735,7 +3032,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         cb_layout.addWidget(checkbox)
         cb_layout.addStretch()
         self.package_table.setCellWidget(row, 0, cb_container)
-        checkbox.stateChanged.connect(lambda state, r=row: self.on_checkbox_changed(r, state))
+        checkbox.stateChanged.connect(lambda state, c=cb_container: self.on_checkbox_changed(self._cell_widget_row(c), state))
         
         name_item = QTableWidgetItem(pkg['name'])
         name_item.setToolTip(pkg['name'])
@@ -2762,31 +3059,50 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             chip_icon.setPixmap(source_icon.pixmap(16, 16))
         chip_layout.addWidget(chip_icon)
         chip_text = QLabel(pkg.get('source', ''))
+        chip_text.setObjectName("sourceChipText")
         chip_layout.addWidget(chip_text)
         self.package_table.setCellWidget(row, 4, source_chip)
-        try:
-            installed = self.is_package_installed(pkg)
-        except Exception:
-            installed = False
+        # Keep the source on the item so lookups don't have to walk the chip widget
+        name_item.setData(PKG_SOURCE_ROLE, pkg.get('source', ''))
+        installed = pkg.get('installed')
+        if installed is None:
+            try:
+                installed = self.is_package_installed(pkg)
+            except Exception:
+                installed = False
         if installed:
-            green = QColor(16, 185, 129)
-            name_item.setForeground(green)
-            id_item.setForeground(green)
-            ver_item.setForeground(green)
-            tip = "Already installed"
-            name_item.setToolTip(tip)
-            id_item.setToolTip(tip)
-            ver_item.setToolTip(tip)
+            self._style_installed_row(row)
+
+    def _style_installed_row(self, row):
+        name_item = self.package_table.item(row, 1)
+        id_item = self.package_table.item(row, 2)
+        ver_item = self.package_table.item(row, 3)
+        if not name_item or not id_item or not ver_item:
+            return
+        if name_item.data(PKG_INSTALLED_ROLE):
+            return
+        name_item.setData(PKG_INSTALLED_ROLE, True)
+        green = QColor(16, 185, 129)
+        tip = "Already installed"
+        for itm in (name_item, id_item, ver_item):
+            itm.setForeground(green)
+            itm.setToolTip(tip)
+        chip = self.package_table.cellWidget(row, 4)
+        if chip is not None:
             try:
-                chip_text.setStyleSheet("color: rgb(16,185,129);")
-                source_chip.setToolTip(tip)
+                chip_text = chip.findChild(QLabel, "sourceChipText")
+                if chip_text is not None:
+                    chip_text.setStyleSheet("color: rgb(16,185,129);")
+                chip.setToolTip(tip)
             except Exception:
                 pass
-            try:
+        try:
+            checkbox = self.get_row_checkbox(row)
+            if checkbox is not None:
                 checkbox.setEnabled(False)
                 checkbox.setToolTip(tip)
-            except Exception:
-                pass
+        except Exception:
+            pass
     
     def add_package_row(self, name, pkg_id, version, new_version, source, pkg_data=None):
         row = self.package_table.rowCount()
@@ -2805,7 +3121,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         cb_layout.addWidget(checkbox)
         cb_layout.addStretch()
         self.package_table.setCellWidget(row, 0, cb_container)
-        checkbox.stateChanged.connect(lambda state, r=row: self.on_checkbox_changed(r, state))
+        checkbox.stateChanged.connect(lambda state, c=cb_container: self.on_checkbox_changed(self._cell_widget_row(c), state))
         
         name_item = QTableWidgetItem(name)
         font = QFont()
@@ -2821,6 +3137,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         ver_item.setIcon(self.get_svg_icon(os.path.join(icon_dir, "version.svg"), 18))
         self.package_table.setItem(row, 3, ver_item)
         
+        name_item.setData(PKG_SOURCE_ROLE, source or "")
         if self.current_view == "installed" and pkg_data:
             self.package_table.setItem(row, 4, QTableWidgetItem(pkg_data.get('source', 'pacman')))
             status = "⬆️ Update available" if pkg_data.get('has_update') else "✓ Up to date"
@@ -2835,9 +3152,115 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             if self.current_view == "updates":
                 # Make new version green to indicate available update
                 new_version_item.setForeground(QColor(16, 185, 129))  # Green color
+                self._apply_prefetch_label(new_version_item, new_version, {'source': source, 'id': pkg_id})
             self.package_table.setItem(row, 4, new_version_item)
             self.package_table.setItem(row, 5, QTableWidgetItem(source))
     
+    def _cell_widget_row(self, widget):
+        """Current row of a column-0 cell widget; rows shift when the table is diffed in place."""
+        try:
+            idx = self.package_table.indexAt(widget.pos())
+            if idx.isValid() and self.package_table.cellWidget(idx.row(), 0) is widget:
+                return idx.row()
+        except Exception:
+            pass
+        for r in range(self.package_table.rowCount()):
+            if self.package_table.cellWidget(r, 0) is widget:
+                return r
+        return -1
+
+    def _row_key(self, row):
+        name_item = self.package_table.item(row, 1)
+        id_item = self.package_table.item(row, 2)
+        if not name_item or not id_item:
+            return None
+        return (name_item.data(PKG_SOURCE_ROLE) or "", id_item.text())
+
+    def _update_package_row(self, row, pkg):
+        ver_item = self.package_table.item(row, 3)
+        if ver_item is not None and ver_item.text() != pkg.get('version', ''):
+            ver_item.setText(pkg.get('version', ''))
+        if self.current_view == "installed":
+            status = "⬆️ Update available" if pkg.get('has_update') else "✓ Up to date"
+            status_item = self.package_table.item(row, 5)
+            if status_item is not None and status_item.text() != status:
+                status_item.setText(status)
+                status_item.setForeground(QColor(255, 165, 0) if pkg.get('has_update') else QColor(16, 185, 129))
+        elif self.package_table.columnCount() > 4:
+            nv_item = self.package_table.item(row, 4)
+            new_version = pkg.get('new_version', pkg.get('version', ''))
+            if nv_item is not None and self.current_view == "updates":
+                self._apply_prefetch_label(nv_item, new_version, pkg)
+            elif nv_item is not None and nv_item.text() != new_version:
+                nv_item.setText(new_version)
+
+    def _apply_prefetch_label(self, item, new_version, pkg):
+        info = prefetch_service.prefetch_info(self, pkg)
+        label = prefetch_service.prefetch_label(info)
+        text = f"{new_version}   {label}" if label else new_version
+        if item.text() != text:
+            item.setText(text)
+            item.setToolTip(label)
+
+    def refresh_prefetch_labels(self):
+        """Repaint prefetch progress in the Updates table without reloading it."""
+        if self.current_view != "updates" or self.package_table.columnCount() <= 4:
+            return
+        by_key = {packages_service.package_key(p): p for p in self.all_packages}
+        for row in range(self.package_table.rowCount()):
+            pkg = by_key.get(self._row_key(row))
+            item = self.package_table.item(row, 4)
+            if pkg is not None and item is not None:
+                self._apply_prefetch_label(item, pkg.get('new_version', pkg.get('version', '')), pkg)
+
+    def _add_row_for_view(self, pkg):
+        if self.current_view == "installed":
+            self.add_package_row(pkg['name'], pkg['id'], pkg['version'], pkg.get('new_version', pkg['version']), pkg.get('source', 'pacman'), pkg)
+        else:
+            self.add_package_row(pkg['name'], pkg['id'], pkg['version'], pkg.get('new_version', pkg['version']), pkg.get('source', 'pacman'))
+
+    def _apply_package_diff(self, packages):
+        """Bring the table in line with ``packages`` without rebuilding it.
+
+        Rows are matched by (source, id) through ``packages_service.diff_packages``:
+        vanished rows are removed, changed rows are updated in place and new
+        rows are appended, so scroll position, selection and checkbox state
+        of untouched rows survive.
+        """
+        table = self.package_table
+        old_count = table.rowCount()
+        shown_all = old_count >= len(self.all_packages)
+        diff = packages_service.diff_packages(self.all_packages, packages)
+        changed = {packages_service.package_key(p) for p in diff['changed']}
+        by_key = {packages_service.package_key(p): p for p in packages}
+        bar = table.verticalScrollBar()
+        scroll = bar.value()
+        table.setUpdatesEnabled(False)
+        try:
+            for row in range(old_count - 1, -1, -1):
+                if self._row_key(row) not in by_key:
+                    table.removeRow(row)
+            displayed = []
+            for row in range(table.rowCount()):
+                key = self._row_key(row)
+                if key in changed:
+                    self._update_package_row(row, by_key[key])
+                displayed.append(key)
+            seen = set(displayed)
+            # Keep the model in display order so load-more continues after the visible rows
+            self.all_packages = [by_key[k] for k in displayed] + [p for p in packages if packages_service.package_key(p) not in seen]
+            target = len(self.all_packages) if shown_all else max(old_count, self.packages_per_page)
+            for pkg in self.all_packages[table.rowCount():target]:
+                self._add_row_for_view(pkg)
+        finally:
+            table.setUpdatesEnabled(True)
+        bar.setValue(min(scroll, bar.maximum()))
+        self.current_page = max(0, (table.rowCount() - 1) // self.packages_per_page)
+        remaining = len(self.all_packages) - table.rowCount()
+        self.load_more_btn.setVisible(remaining > 0)
+        if remaining > 0:
+            self.load_more_btn.setText(f"Load More ({remaining} remaining)")
+
     def filter_packages(self):
         query = self.search_input.text().lower()
         
@@ -3070,7 +3493,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             except Exception as e:
                 self.log(f"Search error: {str(e)}")
         
-        Thread(target=search_in_thread, daemon=True).start()
+        Thread(target=tracing.bind(search_in_thread, 'discover search'), daemon=True).start()
 
     def get_filtered_discover_results(self, selected_sources=None):
         if selected_sources is None:
@@ -3229,7 +3652,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             self.log("No packages selected for update")
             return
         self.log(f"Selected packages for update: {', '.join([f'{pkg} ({source})' for source, pkgs in packages_by_source.items() for pkg in pkgs])}")
-        update_service.update_packages(self, packages_by_source)
+        queue_service.submit(self, 'update', packages_by_source)
     
     def ignore_selected(self):
         return ignore_service.ignore_selected(self)
@@ -3241,6 +3664,10 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         vid = view_id or self.current_view
         try:
             if vid in ("discover", "bundles"):
+                name_item = self.package_table.item(row, 1)
+                src = name_item.data(PKG_SOURCE_ROLE) if name_item else None
+                if src is not None:
+                    return src
                 cell = self.package_table.cellWidget(row, 4)
                 if cell:
                     labels = cell.findChildren(QLabel)
@@ -3356,12 +3783,17 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         if built_any:
             self._installed_index_last_built = now
 
+    @staticmethod
+    def _installed_key(pkg):
+        """Key a result is listed under in the installed index (Flatpak by app id)."""
+        field = 'id' if pkg.get('source', '') == 'Flatpak' else 'name'
+        return (pkg.get(field) or '').strip()
+
     def is_package_installed(self, pkg):
         try:
-            src = pkg.get('source', '')
-            name = (pkg.get('id') or '').strip() if src == 'Flatpak' else (pkg.get('name') or '').strip()
+            key = self._installed_key(pkg)
             index = self.installed_index or {}
-            return bool(name) and (name in (index.get(src) or set()))
+            return bool(key) and (key in (index.get(pkg.get('source', '')) or set()))
         except Exception:
             return False
     
@@ -3399,12 +3831,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                 pkg_name = name_item.text().strip() if name_item else ''
                 pkg_id = id_item.text().strip() if id_item else pkg_name
                 if self.current_view == "discover":
-                    source = ""
-                    chip = self.package_table.cellWidget(row, 4)
-                    if chip is not None:
-                        labels = chip.findChildren(QLabel)
-                        if labels:
-                            source = labels[-1].text()
+                    source = self.get_source_text(row, "discover")
                 else:
                     source_item = self.package_table.item(row, 5)
                     source = source_item.text() if source_item else "pacman"
@@ -3437,7 +3864,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             return
         self.log_signal.emit(f"Selected packages: {', '.join([f'{pkg} ({source})' for source, pkgs in to_install.items() for pkg in pkgs])}")
         self.log_signal.emit(f"Proceeding with installation...")
-        install_service.install_packages(self, to_install)
+        queue_service.submit(self, 'install', to_install)
 
     def _prewarm_installed_index_async(self):
         try:
@@ -3447,7 +3874,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
                     self.build_installed_index(sel)
                 except Exception:
                     pass
-            Thread(target=_run, daemon=True).start()
+            Thread(target=tracing.bind(_run, 'prewarm installed index'), daemon=True).start()
         except Exception:
             pass
     
@@ -3459,50 +3886,60 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             def _run():
                 try:
                     self.build_installed_index(selected_sources)
+                    self._annotate_installed(self.search_results)
                 finally:
                     self._installed_index_building = False
-                    QTimer.singleShot(0, self._mark_installed_in_visible_rows)
-            Thread(target=_run, daemon=True).start()
+                    self.ui_call.emit(self._mark_installed_in_visible_rows)
+            Thread(target=tracing.bind(_run, 'build installed index'), daemon=True).start()
         except Exception:
             self._installed_index_building = False
-    
+
+    def _annotate_installed(self, packages):
+        """Store the installed state on each result in one pass over the index."""
+        index = self.installed_index or {}
+        for pkg in list(packages or []):
+            try:
+                key = self._installed_key(pkg)
+                pkg['installed'] = bool(key) and key in (index.get(pkg.get('source', '')) or set())
+            except Exception:
+                continue
+
+    def _visible_row_range(self):
+        count = self.package_table.rowCount()
+        if count == 0:
+            return range(0)
+        first = self.package_table.rowAt(0)
+        last = self.package_table.rowAt(max(0, self.package_table.viewport().height() - 1))
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = count - 1
+        return range(first, last + 1)
+
+    def eventFilter(self, obj, event):
+        # A taller viewport exposes rows that no scroll event announced
+        if event.type() == QEvent.Type.Resize and obj is self.package_table.viewport():
+            self._schedule_mark_installed()
+        return super().eventFilter(obj, event)
+
+    def _schedule_mark_installed(self, *_):
+        if self.current_view != "discover" or self._mark_installed_pending:
+            return
+        self._mark_installed_pending = True
+        QTimer.singleShot(0, self._mark_installed_in_visible_rows)
+
     def _mark_installed_in_visible_rows(self):
+        self._mark_installed_pending = False
         try:
             if self.current_view != "discover" or not self.installed_index:
                 return
-            green = QColor(16, 185, 129)
-            for row in range(self.package_table.rowCount()):
-                name_item = self.package_table.item(row, 1)
-                id_item = self.package_table.item(row, 2)
-                ver_item = self.package_table.item(row, 3)
-                if not name_item or not id_item or not ver_item:
-                    continue
-                chip = self.package_table.cellWidget(row, 4)
-                src = self.get_source_text(row, "discover")
-                pkg = {"name": name_item.text().strip(), "id": id_item.text().strip(), "source": src}
-                if self.is_package_installed(pkg):
-                    name_item.setForeground(green)
-                    id_item.setForeground(green)
-                    ver_item.setForeground(green)
-                    tip = "Already installed"
-                    name_item.setToolTip(tip)
-                    id_item.setToolTip(tip)
-                    ver_item.setToolTip(tip)
-                    if chip is not None:
-                        try:
-                            labels = chip.findChildren(QLabel)
-                            if labels:
-                                labels[-1].setStyleSheet("color: rgb(16,185,129);")
-                            chip.setToolTip(tip)
-                        except Exception:
-                            pass
-                    try:
-                        checkbox = self.get_row_checkbox(row)
-                        if checkbox is not None:
-                            checkbox.setEnabled(False)
-                            checkbox.setToolTip(tip)
-                    except Exception:
-                        pass
+            # Rows map 1:1 onto the filtered results; only rows in the viewport are restyled
+            results = self.filtered_results or []
+            for row in self._visible_row_range():
+                if row >= len(results):
+                    break
+                if results[row].get('installed'):
+                    self._style_installed_row(row)
         except Exception:
             pass
     
@@ -3531,7 +3968,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         
         flat_summary = ', '.join([f"{pkg} ({src})" for src, pkgs in packages_by_source.items() for pkg in pkgs])
         self.log(f"Selected for uninstallation: {flat_summary}")
-        uninstall_service.uninstall_packages(self, packages_by_source)
+        queue_service.submit(self, 'uninstall', packages_by_source)
     
     def apply_filters(self):
         return filters_service.apply_filters(self)
@@ -3586,6 +4023,11 @@ class ArchPkgManagerUniGetUI(QMainWindow):
             pass
         return plugs
     
+    def ensure_settings_ui(self):
+        """Build the Settings panel once; switching back to Settings reuses it."""
+        if not self.settings_widgets:
+            self.build_settings_ui()
+
     def build_settings_ui(self):
         # Clear existing layout
         while self.settings_layout.count():
@@ -3698,6 +4140,7 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         self.settings_content_layout.setSpacing(16)
         
         # Create and store settings widgets
+        from components import GeneralSettingsWidget, AutoUpdateSettingsWidget, PluginsSettingsWidget
         self.settings_widgets = {
             "general": GeneralSettingsWidget(self),
             "auto_update": AutoUpdateSettingsWidget(self),
@@ -3827,6 +4270,8 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         """Public method for updating a setting value."""
         self.settings[key] = value
         self.save_settings()
+        if key == 'use_privileged_helper':
+            privileged_helper.configure(value)
     
     def export_settings(self):
         return settings_service.export_settings(self)
@@ -3835,9 +4280,11 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         return settings_service.import_settings(self)
     
     # -------------------- Plugin runtime --------------------
+    @tracing.traced('initialize_plugins', cat='plugin')
     def initialize_plugins(self):
         try:
-            self.ensure_default_plugins(force_enable=True)
+            with tracing.span('ensure_default_plugins', cat='plugin'):
+                self.ensure_default_plugins(force_enable=True)
             self.reload_plugins()
             self.run_plugin_hook('on_startup')
             try:
@@ -3852,11 +4299,12 @@ class ArchPkgManagerUniGetUI(QMainWindow):
         defaults = {
             'auto_check_updates.py': (
                 """
+# neoarch-plugin: hooks=on_startup
 def on_startup(app):
     try:
         if app.settings.get('auto_check_updates', True):
             from PyQt6.QtCore import QTimer
-            QTimer.singleShot(800, lambda: app.switch_view("updates"))
+            app.run_on_ui(lambda: QTimer.singleShot(800, lambda: app.switch_view("updates")))
     except Exception as e:
         try:
             app.log(f"auto_check_updates plugin: {e}")
@@ -3866,6 +4314,10 @@ def on_startup(app):
             ),
             'flathub_remote.py': (
                 """
+# neoarch-plugin: hooks=on_startup
+# flatpak remotes + remote-add can take up to 40s on a slow network
+HOOK_BUDGETS = {'on_startup': 45}
+
 def on_startup(app):
     try:
         app.ensure_flathub_user_remote()
@@ -3878,7 +4330,7 @@ def on_startup(app):
             ),
             'bundle_autoload.py': (
                 """
-from PyQt6.QtCore import QTimer
+# neoarch-plugin: hooks=on_view_changed views=bundles
 import os, json
 
 def on_view_changed(app, view_id):
@@ -3894,6 +4346,16 @@ def on_view_changed(app, view_id):
         items = data.get('items') if isinstance(data, dict) else None
         if not isinstance(items, list):
             return
+        # The bundle table belongs to the UI thread
+        app.run_on_ui(_merge, app, items)
+    except Exception as e:
+        try:
+            app.log(f"bundle_autoload plugin: {e}")
+        except Exception:
+            pass
+
+def _merge(app, items):
+    try:
         existing = {(i.get('source'), (i.get('id') or i.get('name'))) for i in app.bundle_items}
         added = 0
         for it in items:
@@ -3927,15 +4389,20 @@ def on_view_changed(app, view_id):
             ),
             'notify_install.py': (
                 """
+# neoarch-plugin: hooks=on_startup
 from PyQt6.QtWidgets import QMessageBox
 
 def on_startup(app):
     try:
-        app.installation_progress.connect(lambda status, can_cancel: _on_status(app, status))
+        app.run_on_ui(lambda: app.installation_progress.connect(lambda status, can_cancel: _on_status(app, status)))
     except Exception:
         pass
 
 def _on_status(app, status):
+    # installation_progress is emitted from install workers; dialogs need the UI thread
+    app.run_on_ui(_show_status, app, status)
+
+def _show_status(app, status):
     try:
         if status == "success":
             QMessageBox.information(app, "Install", "Installation complete.")
@@ -3952,6 +4419,7 @@ def _on_status(app, status):
             ),
             'bundle_autosave.py': (
                 """
+# neoarch-plugin: hooks=on_view_changed,on_tick views=bundles
 import os, json, hashlib
 
 _last_hash = None
@@ -3971,7 +4439,7 @@ def _save(app):
         if not path:
             return
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        items = list(app.bundle_items)
+        items = app.run_on_ui(lambda: [dict(i) for i in app.bundle_items], wait=True, timeout=5)
         global _last_hash
         h = _hash_items(items)
         if h and h == _last_hash:
@@ -3999,6 +4467,7 @@ def on_tick(app):
             ),
             'auto_refresh_updates.py': (
                 """
+# neoarch-plugin: hooks=on_tick
 import time
 
 _last = 0
@@ -4015,6 +4484,9 @@ def on_tick(app):
     if _last and now - _last < minutes * 60:
         return
     _last = now
+    app.run_on_ui(_refresh, app)
+
+def _refresh(app):
     try:
         if app.current_view == 'updates':
             app.load_updates()
@@ -4027,10 +4499,16 @@ def on_tick(app):
             ),
             'auto_update.py': (
                 """
+# neoarch-plugin: hooks=on_tick
 import time
+import shutil
 import subprocess
 import os
 import json
+from utils import sys_utils
+
+# Runs timeshift and pacman -Syu (up to 30 min each) and waits for the user's answer
+HOOK_BUDGETS = {'on_tick': 4 * 3600}
 
 _last_update = 0
 _last_check = 0
@@ -4071,64 +4549,56 @@ def on_tick(app):
         _save_state(_state)
         if _last_update and now - _last_update < interval_seconds:
             return
-        from PyQt6.QtWidgets import QMessageBox
-        reply = QMessageBox.question(app, "Scheduled Update",
-            f"It's been {days} days since the last update.\n\n"
-            "Would you like to update your system now?\n\n"
-            "This will update packages and create snapshots if enabled.",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.Yes)
-        if reply != QMessageBox.StandardButton.Yes:
+        if not app.ask_user("Scheduled Update",
+                f"It's been {days} days since the last update.\\n\\n"
+                "Would you like to update your system now?\\n\\n"
+                "This will update packages and create snapshots if enabled."):
             return
         _last_update = now
         _state['last_update'] = _last_update
         _save_state(_state)
-        if app.settings.get('snapshot_before_update', False):
-            try:
-                if app.cmd_exists("timeshift"):
-                    try:
-                        result = subprocess.run(["timeshift", "--list"], capture_output=True, text=True, timeout=30)
-                        if result.returncode == 0:
-                            lines = result.stdout.strip().split('\n')
-                            snapshot_count = sum(1 for line in lines if line.strip() and not line.startswith('Num') and not line.startswith('---'))
-                            if snapshot_count > 2:
-                                delete_result = subprocess.run(["pkexec", "timeshift", "--delete-all", "--skip", "2"], capture_output=True, text=True, timeout=300)
-                                if delete_result.returncode == 0:
-                                    app.log("Auto-update: Cleaned up old snapshots (kept latest 2)")
-                                else:
-                                    app.log(f"Auto-update: Failed to clean up snapshots: {delete_result.stderr}")
-                    except Exception as e:
-                        app.log(f"Auto-update: Error checking snapshots: {e}")
-                    timestamp = subprocess.run(["date", "+%Y-%m-%d_%H-%M-%S"], capture_output=True, text=True).stdout.strip()
-                    comment = f"NeoArch pre-update snapshot {timestamp}"
-                    result = subprocess.run(["pkexec", "timeshift", "--create", "--comments", comment], capture_output=True, text=True, timeout=300)
-                    if result.returncode == 0:
-                        app.log(f"Auto-update: Pre-update snapshot created: {comment}")
-                        app.show_message.emit("Snapshot", f"Pre-update snapshot created: {comment}")
-                    else:
-                        app.log(f"Auto-update: Failed to create pre-update snapshot: {result.stderr}")
-            except Exception as e:
-                app.log(f"Auto-update: Pre-update snapshot creation failed: {e}")
+        from utils.update_pipeline import PhaseTimings, snapshot_then_install, create_pre_update_snapshot
+        from services import prefetch_service
+        timings = PhaseTimings()
+        snapshot = None
+        if app.settings.get('snapshot_before_update', False) and app.cmd_exists("timeshift"):
+            def snapshot():
+                ok = create_pre_update_snapshot(log=lambda m: app.log(f"Auto-update: {m}"))
+                if ok:
+                    app.show_message.emit("Snapshot", "Pre-update snapshot created")
+                return ok
+        def download():
+            if not app.cmd_exists("pacman"):
+                return False
+            return prefetch_service.download_system_upgrade(log=lambda m: app.log(f"Auto-update: {m}"))
+        def install(results):
+            if not app.cmd_exists("pacman"):
+                return False
+            from utils.workers import get_auth_command
+            env, _ = app.prepare_askpass_env()
+            auth_cmd = get_auth_command(env)
+            cmd = auth_cmd + ["pacman", "-Syu", "--noconfirm"] + prefetch_service.cachedir_args()
+            app.log(f"Auto-update: Using {auth_cmd[0]} for pacman")
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800, env=env)
+            if result.returncode == 0:
+                app.log("Auto-update: Pacman updates completed successfully")
+                app.show_message.emit("Auto Update", "System packages updated successfully")
+                shutil.rmtree(prefetch_service.PACMAN_CACHE_DIR, ignore_errors=True)
+                return True
+            app.log(f"Auto-update: Pacman update failed: {result.stderr}")
+            app.show_message.emit("Auto Update", f"Pacman update failed: {result.stderr}")
+            return False
         update_success = False
         try:
             app.log("Auto-update: Starting scheduled system updates...")
-            if app.cmd_exists("pacman"):
-                from utils.workers import get_auth_command
-                env, _ = app.prepare_askpass_env()
-                auth_cmd = get_auth_command(env)
-                cmd = auth_cmd + ["pacman", "-Syu", "--noconfirm"]
-                app.log(f"Auto-update: Using {auth_cmd[0]} for pacman")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800, env=env)
-                if result.returncode == 0:
-                    app.log("Auto-update: Pacman updates completed successfully")
-                    update_success = True
-                    app.show_message.emit("Auto Update", "System packages updated successfully")
-                else:
-                    app.log(f"Auto-update: Pacman update failed: {result.stderr}")
-                    app.show_message.emit("Auto Update", f"Pacman update failed: {result.stderr}")
+            # Snapshot and downloads overlap; the install waits for both
+            results = snapshot_then_install(download, install, snapshot=snapshot, timings=timings)
+            if results.get('install') is True:
+                update_success = True
             # Update AUR packages using any available AUR helper
             aur_helper = sys_utils.get_aur_helper(app.settings.get('aur_helper', 'auto') if app.settings.get('aur_helper', 'auto') != 'auto' else None)
             if aur_helper:
+                aur_t0 = time.monotonic()
                 try:
                     env, _ = app.prepare_askpass_env()
                     result = subprocess.run([aur_helper, "-Syu", "--noconfirm", "--sudoflags", "-A"], capture_output=True, text=True, timeout=1800, env=env)
@@ -4139,11 +4609,13 @@ def on_tick(app):
                         app.log(f"Auto-update: AUR update failed: {result.stderr}")
                 except Exception as e:
                     app.log(f"Auto-update: AUR update error: {e}")
+                timings.record('aur', time.monotonic() - aur_t0)
             if app.cmd_exists("flatpak"):
                 scopes = [["--user"], ["--system"]] if app.cmd_exists("sudo") else [["--user"]]
                 for scope in scopes:
                     try:
-                        result = subprocess.run(["flatpak"] + scope + ["update", "-y"], capture_output=True, text=True, timeout=900)
+                        with timings.phase('flatpak'):
+                            result = subprocess.run(["flatpak"] + scope + ["update", "-y"], capture_output=True, text=True, timeout=900)
                         if result.returncode == 0:
                             app.log(f"Auto-update: Flatpak {scope[0]} updates completed")
                             update_success = True
@@ -4159,7 +4631,8 @@ def on_tick(app):
                     env['npm_config_prefix'] = npm_prefix
                     env['NPM_CONFIG_PREFIX'] = npm_prefix
                     env['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env.get('PATH', '')
-                    result = subprocess.run(["npm", "update", "-g"], capture_output=True, text=True, timeout=600, env=env)
+                    with timings.phase('npm'):
+                        result = subprocess.run(["npm", "update", "-g"], capture_output=True, text=True, timeout=600, env=env)
                     if result.returncode == 0:
                         app.log("Auto-update: NPM global packages updated")
                         update_success = True
@@ -4169,6 +4642,8 @@ def on_tick(app):
                     app.log(f"Auto-update: NPM update error: {e}")
         except Exception as e:
             app.log(f"Auto-update: General error: {e}")
+        app.log(f"Auto-update: timings: {timings.summary()}")
+        timings.save()
         if update_success:
             app.show_message.emit("Auto Update", f"System update completed successfully! Next check in {days} days.")
         else:
@@ -4178,53 +4653,26 @@ def on_tick(app):
                 """.strip()
             ),
         }
-        for fname, code in defaults.items():
-            fpath = os.path.join(user_dir, fname)
-            write_needed = True
-            if os.path.exists(fpath):
-                try:
-                    with open(fpath, 'r', encoding='utf-8') as f:
-                        existing = f.read()
-                    write_needed = existing.strip() != (code + "\n").strip()
-                except Exception:
-                    write_needed = True
-            if write_needed:
-                try:
-                    with open(fpath, 'w', encoding='utf-8') as f:
-                        f.write(code + "\n")
-                except Exception as e:
-                    self.log(f"Default plugin write failed {fname}: {e}")
-            if force_enable:
-                name = os.path.splitext(fname)[0]
-                enabled = set(self.settings.get('enabled_plugins') or [])
-                if name not in enabled:
-                    enabled.add(name)
-                    self.settings['enabled_plugins'] = sorted(enabled)
+        written = plugin_manifest.install_defaults(user_dir, defaults, log=self.log)
+        if written:
+            self.log(f"Installed default plugins: {', '.join(written)}")
         if force_enable:
-            self.save_settings()
+            enabled = set(self.settings.get('enabled_plugins') or [])
+            names = {os.path.splitext(fname)[0] for fname in defaults}
+            if not names <= enabled:
+                self.settings['enabled_plugins'] = sorted(enabled | names)
+                self.save_settings()
     
     def load_enabled_plugins(self):
-        loaded = []
+        """Enabled plugins as LazyPlugins; modules are imported when a declared hook first fires."""
         plugs = {p['name']: p for p in self.scan_plugins()}
         enabled = self.settings.get('enabled_plugins') or []
-        for name in enabled:
-            p = plugs.get(name)
-            if not p:
-                continue
-            path = p.get('path')
-            try:
-                spec = importlib.util.spec_from_file_location(name, path)
-                if not spec or not spec.loader:
-                    continue
-                mod = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(mod)
-                loaded.append(mod)
-            except Exception as e:
-                self.log(f"Failed to load plugin {name}: {e}\n{traceback.format_exc()}")
-        return loaded
+        with tracing.span('scan plugin manifests', cat='plugin'):
+            return plugin_manifest.scan([plugs[name] for name in enabled if name in plugs])
     
     def reload_plugins(self):
         self.plugins = self.load_enabled_plugins()
+        self.plugin_host.set_plugins(self.plugins)
     
     def reload_plugins_and_notify(self):
         self.reload_plugins()
@@ -4237,13 +4685,18 @@ def on_tick(app):
         self._show_message("Plugins", "Default plugins installed and enabled")
     
     def run_plugin_hook(self, hook_name, *args, **kwargs):
-        for mod in self.plugins:
-            try:
-                func = getattr(mod, hook_name, None)
-                if callable(func):
-                    func(self, *args, **kwargs)
-            except Exception as e:
-                self.log(f"Plugin hook {hook_name} error: {e}\n{traceback.format_exc()}")
+        try:
+            self.plugin_host.dispatch(hook_name, *args, **kwargs)
+        except Exception as e:
+            self.log(f"Plugin hook {hook_name} error: {e}\n{traceback.format_exc()}")
+    
+    def run_on_ui(self, fn, *args, wait=False, timeout=None):
+        """Thread-safe: run fn(*args) on the GUI thread (plugin API)."""
+        return plugin_runtime.run_on_ui(self.ui_call.emit, fn, *args, wait=wait, timeout=timeout)
+    
+    def ask_user(self, title, text, default=True, timeout=None):
+        """Thread-safe Yes/No question for plugins; returns True for Yes."""
+        return plugin_runtime.ask_user(self.ui_call.emit, self, title, text, default=default, timeout=timeout)
     
     def run_plugin_tick(self):
         try:
@@ -4258,6 +4711,41 @@ def on_tick(app):
         """Public method to show a message in the console"""
         self.log(f"{title}: {text}")
     
+    def wait_for_pacman_lock(self, what="continuing", cancel_event=None):
+        """Block the calling worker thread while another program holds the pacman lock.
+
+        Shows a countdown in the loading widget and returns one of the
+        pacman_lock results (FREE, STALE, TIMEOUT, CANCELLED).
+        """
+        if not pacman_lock.is_locked():
+            return pacman_lock.FREE
+        timeout = int(self.settings.get('pacman_lock_timeout', 300) or 300)
+        self.log(f"Package database is locked; waiting up to {timeout}s before {what}...")
+        shown = {'by_us': False}
+
+        def show(remaining, holders):
+            who = ", ".join(sorted({name for _, name in holders})) or "another package manager"
+            if not self.loading_widget.isVisible():
+                shown['by_us'] = True
+                self.loading_widget.setVisible(True)
+                self.loading_widget.start_animation()
+            self.loading_widget.set_countdown(f"Waiting for {who} to finish before {what}...", remaining)
+
+        result = pacman_lock.wait_for_unlock(
+            timeout=timeout, cancel_event=cancel_event,
+            on_tick=lambda remaining, holders: self.ui_call.emit(lambda: show(remaining, holders)))
+
+        def restore():
+            if shown['by_us']:
+                self.loading_widget.stop_animation()
+                self.loading_widget.setVisible(False)
+        self.ui_call.emit(restore)
+        if result == pacman_lock.STALE:
+            self.log(f"{pacman_lock.DB_LOCK} exists but no package manager is running; it is a stale lock. Remove it as root if no pacman transaction is in progress.")
+        elif result == pacman_lock.TIMEOUT:
+            self.log("Gave up waiting for the package database lock.")
+        return result
+
     def show_busy_pm_warning(self, details: str = "", retry_action=None):
         try:
             dlg = QMessageBox(self)
@@ -4285,14 +4773,25 @@ def on_tick(app):
     
     def log(self, message):
         try:
-            self.ui_call.emit(lambda: self.console.append(message))
+            self.log_sink.write(message)
         except Exception:
             pass
+
+    def export_console_log(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Log", os.path.join(os.path.expanduser('~'), "neoarch.log"), "Log files (*.log *.txt)")
+        if not path:
+            return
+        try:
+            count = self.log_sink.export(path)
+            self._show_message("Export Log", f"Saved {count} lines to {path}")
+        except Exception as e:
+            self._show_message("Export Log", f"Failed: {e}")
     
     def _on_ui_call(self, fn):
         try:
             if callable(fn):
-                fn()
+                with tracing.span(f"ui_call {getattr(fn, '__qualname__', None) or getattr(fn, '__name__', 'callable')}", cat='ui'):
+                    fn()
         except Exception:
             pass
     
@@ -4379,12 +4878,48 @@ def on_tick(app):
         # The component will call this if needed
         pass
 
+    def offer_queue_resume(self):
+        """Ask whether to resume operations left in the queue by a previous session."""
+        pending = self.operation_queue.pending()
+        if not pending or queue_service.is_active(self):
+            return
+        lines = "\n".join(f"• {op['kind']}: {', '.join(p for pkgs in op['packages'].values() for p in pkgs)}" for op in pending)
+        reply = QMessageBox.question(
+            self, "Resume Queued Operations",
+            f"These operations were still queued when NeoArch closed:\n\n{lines}\n\nRun them now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            queue_service.resume_pending(self)
+        else:
+            self.operation_queue.clear()
+
+    def closeEvent(self, event):
+        running = self.operation_queue.running()
+        pending = self.operation_queue.pending()
+        if running or pending:
+            text = "Package operations are still queued and will be offered again on next start."
+            if running:
+                text = "A package operation is still running. Quitting now interrupts it, which can leave the package database in an inconsistent state.\n\n" + text
+            reply = QMessageBox.question(
+                self, "Operations In Progress", text + "\n\nQuit anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+        super().closeEvent(event)
+
 def main():
     if len(sys.argv) > 1:
         if sys.argv[1] in ["--help", "-h"]:
             print("NeoArch - Elevate Your Arch Experience")
-            print("Usage: python aurora_home.py")
+            print("Usage: python aurora_home.py [--trace[=FILE]]")
             print("A graphical package manager for Arch Linux with AUR support.")
+            print("  --trace[=FILE]  record a Chrome trace of startup and view switches")
+            print(f"                  (or set {tracing.ENV_VAR}=1 or {tracing.ENV_VAR}=FILE)")
             sys.exit(0)
         else:
             print(f"Unknown option: {sys.argv[1]}")
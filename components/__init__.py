@@ -1,18 +1,39 @@
 """
 Aurora Components Package
+
+Components are imported on first attribute access, so importing one of them
+(e.g. ``from components import SourceCard``) does not pull in the plugin
+catalogue or the settings pages.
 """
 
-from .source_item import SourceItem
-from .source_card import SourceCard
-from .filter_card import FilterCard
-from .large_search_box import LargeSearchBox
-from .loading_spinner import LoadingSpinner
-from .plugins_view import PluginsView
-from .plugins_sidebar import PluginsSidebar
-from .settings_general import GeneralSettingsWidget
-from .settings_auto_update import AutoUpdateSettingsWidget
-from .settings_plugins import PluginsSettingsWidget
-from .about_dialog import AboutDialog
+import importlib
+
+_LAZY = {
+    'SourceItem': '.source_item',
+    'SourceCard': '.source_card',
+    'FilterCard': '.filter_card',
+    'LargeSearchBox': '.large_search_box',
+    'LoadingSpinner': '.loading_spinner',
+    'PluginsView': '.plugins_view',
+    'PluginsSidebar': '.plugins_sidebar',
+    'GeneralSettingsWidget': '.settings_general',
+    'AutoUpdateSettingsWidget': '.settings_auto_update',
+    'PluginsSettingsWidget': '.settings_plugins',
+    'AboutDialog': '.about_dialog',
+}
 
 __all__ = ['SourceItem', 'SourceCard', 'FilterCard', 'LargeSearchBox', 'LoadingSpinner', 'PluginsView', 'PluginsSidebar',
            'GeneralSettingsWidget', 'AutoUpdateSettingsWidget', 'PluginsSettingsWidget', 'AboutDialog']
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
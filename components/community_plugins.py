@@ -8,7 +8,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
                              QMessageBox, QProgressBar, QGroupBox, QListWidget, QFileDialog)
 from PyQt6.QtCore import pyqtSignal, Qt, QThread, QTimer
 from PyQt6.QtGui import QGuiApplication
+from threading import Thread, Event
 import os
+import json
 
 from stores.plugin_store import PluginStore
  
@@ -21,6 +23,60 @@ try:
 except Exception:
     MongoPluginStore = None  # type: ignore
 
+CATALOGUE_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'neoarch', 'community_plugins.json')
+
+
+def load_cached_catalogue(path=None):
+    """Plugins from the last successful discovery ([] when there is none)."""
+    try:
+        with open(path or CATALOGUE_CACHE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [p for p in data if isinstance(p, dict)] if isinstance(data, list) else []
+    except Exception:
+        return []
+
+
+def save_cached_catalogue(plugins, path=None):
+    """Keep the listing fields only; install fetches the code from the store again."""
+    path = path or CATALOGUE_CACHE
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump([{k: v for k, v in p.items() if k != 'code'} for p in plugins], f)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def select_store(cancelled=None):
+    """(store, kind) for the first configured backend: 'mongo', 'supabase' or 'http'.
+
+    Blocking (the Mongo constructor pings the server for up to 4 s); call it
+    on a worker. Returns (None, None) when ``cancelled`` is set in between.
+    """
+    cancelled = cancelled or Event()
+    try:
+        if MongoPluginStore is not None:
+            m = MongoPluginStore()
+            if m.is_configured():
+                return m, 'mongo'
+    except Exception:
+        pass
+    if cancelled.is_set():
+        return None, None
+    try:
+        if SupabasePluginStore is not None:
+            s = SupabasePluginStore()
+            if s.is_configured():
+                return s, 'supabase'
+    except Exception:
+        pass
+    if cancelled.is_set():
+        return None, None
+    return PluginStore(), 'http'
+
+
 class CommunityPluginCard(QFrame):
     """Card displaying a community plugin"""
 
@@ -387,38 +443,30 @@ class CommunityPluginsTab(QWidget):
     """Community plugins discovery and sharing tab"""
 
     plugin_installed = pyqtSignal(str)  # plugin_id
+    store_ready = pyqtSignal(object, str)  # store, kind
+    plugins_loaded = pyqtSignal(int, object, str)  # load generation, plugins, error
+    install_finished = pyqtSignal(object, bool, str)  # plugin_info, ok, error
 
     def __init__(self, main_app, parent=None):
         super().__init__(parent)
         self.main_app = main_app
+        # Chosen on the discovery worker; see select_store
         self.plugin_store = None
         self._is_supabase = False
         self._is_mongo = False
-        try:
-            if MongoPluginStore is not None:
-                m = MongoPluginStore()
-                if m.is_configured():
-                    self.plugin_store = m
-                    self._is_mongo = True
-        except Exception:
-            self.plugin_store = None
-        if self.plugin_store is None:
-            try:
-                if SupabasePluginStore is not None:
-                    s = SupabasePluginStore()
-                    if s.is_configured():
-                        self.plugin_store = s
-                        self._is_supabase = True
-            except Exception:
-                self.plugin_store = None
-        if self.plugin_store is None:
-            self.plugin_store = PluginStore()
-        self.community_plugins = []
+        self.community_plugins = load_cached_catalogue()
         self.details_dialog = None
         self.creator_dialog = None
         self.my_plugins = []
         self._selected_my_id = None
         self._setup_status = None
+        self._load_generation = 0
+        self._load_cancel = None
+        self._load_pending = False
+
+        self.store_ready.connect(self._on_store_ready)
+        self.plugins_loaded.connect(self._on_plugins_loaded)
+        self.install_finished.connect(self._on_install_finished)
 
         self._init_ui()
         self.refresh_plugins()
@@ -452,43 +500,6 @@ class CommunityPluginsTab(QWidget):
 
         layout.addLayout(header)
 
-        if self._is_supabase:
-            self.onboarding_group = QGroupBox("Supabase Setup Required")
-            ob_layout = QVBoxLayout(self.onboarding_group)
-            self.ob_text = QLabel("Your Supabase project is missing required objects. Use the buttons below to copy SQL and run it in the Supabase SQL editor, and create two storage buckets: plugin-icons and plugin-files.")
-            self.ob_text.setWordWrap(True)
-            ob_layout.addWidget(self.ob_text)
-            btns = QHBoxLayout()
-            self.btn_copy_sql = QPushButton("Copy Table + RLS SQL")
-            self.btn_copy_sql.clicked.connect(self._copy_sql_setup)
-            self.btn_copy_storage = QPushButton("Copy Storage Policies SQL")
-            self.btn_copy_storage.clicked.connect(self._copy_storage_policies)
-            btns.addWidget(self.btn_copy_sql)
-            btns.addWidget(self.btn_copy_storage)
-            btns.addStretch()
-            ob_layout.addLayout(btns)
-            layout.addWidget(self.onboarding_group)
-            self.onboarding_group.setVisible(False)
-            auth_row = QHBoxLayout()
-            self.email_input = QLineEdit()
-            self.email_input.setPlaceholderText("Email")
-            self.password_input = QLineEdit()
-            self.password_input.setPlaceholderText("Password")
-            self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-            self.btn_login = QPushButton("Login")
-            self.btn_signup = QPushButton("Sign up")
-            self.btn_logout = QPushButton("Logout")
-            self.btn_login.clicked.connect(self.sign_in)
-            self.btn_signup.clicked.connect(self.sign_up)
-            self.btn_logout.clicked.connect(self.sign_out)
-            auth_row.addWidget(self.email_input)
-            auth_row.addWidget(self.password_input)
-            auth_row.addWidget(self.btn_login)
-            auth_row.addWidget(self.btn_signup)
-            auth_row.addWidget(self.btn_logout)
-            auth_row.addStretch()
-            layout.addLayout(auth_row)
-
         # Progress bar for loading
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -507,106 +518,215 @@ class CommunityPluginsTab(QWidget):
         scroll_area.setWidget(self.content_widget)
         layout.addWidget(scroll_area)
 
-        if self._is_supabase:
-            self.my_group = QGroupBox("My Plugins")
-            my_layout = QHBoxLayout(self.my_group)
-            self.my_list = QListWidget()
-            self.my_list.currentTextChanged.connect(self._on_my_select)
-            my_layout.addWidget(self.my_list, 1)
-
-            form_col = QVBoxLayout()
-            form_grid = QGridLayout()
-            form_grid.setSpacing(6)
-            self.input_id = QLineEdit()
-            self.input_name = QLineEdit()
-            self.input_version = QLineEdit()
-            self.input_author = QLineEdit()
-            self.input_desc = QTextEdit()
-            self.input_desc.setMaximumHeight(80)
-            self.input_cats = QLineEdit()
-            self.icon_path = QLineEdit()
-            self.file_path = QLineEdit()
-            btn_browse_icon = QPushButton("Browse Icon")
-            btn_browse_icon.clicked.connect(self._browse_icon)
-            btn_browse_file = QPushButton("Browse File")
-            btn_browse_file.clicked.connect(self._browse_file)
-            form_grid.addWidget(QLabel("ID"), 0, 0)
-            form_grid.addWidget(self.input_id, 0, 1)
-            form_grid.addWidget(QLabel("Name"), 1, 0)
-            form_grid.addWidget(self.input_name, 1, 1)
-            form_grid.addWidget(QLabel("Version"), 2, 0)
-            form_grid.addWidget(self.input_version, 2, 1)
-            form_grid.addWidget(QLabel("Author"), 3, 0)
-            form_grid.addWidget(self.input_author, 3, 1)
-            form_grid.addWidget(QLabel("Categories (comma)"), 4, 0)
-            form_grid.addWidget(self.input_cats, 4, 1)
-            form_grid.addWidget(QLabel("Description"), 5, 0)
-            form_grid.addWidget(self.input_desc, 5, 1)
-            form_grid.addWidget(QLabel("Icon"), 6, 0)
-            row6 = QHBoxLayout()
-            row6.addWidget(self.icon_path, 1)
-            row6.addWidget(btn_browse_icon)
-            form_col.addLayout(form_grid)
-            form_col.addLayout(row6)
-            form_grid2 = QGridLayout()
-            form_grid2.addWidget(QLabel("Plugin File (.py)"), 0, 0)
-            rowf = QHBoxLayout()
-            rowf.addWidget(self.file_path, 1)
-            rowf.addWidget(btn_browse_file)
-            form_col.addLayout(form_grid2)
-            form_col.addLayout(rowf)
-            btn_row = QHBoxLayout()
-            self.btn_new = QPushButton("New")
-            self.btn_save = QPushButton("Save")
-            self.btn_delete = QPushButton("Delete")
-            self.btn_reload_my = QPushButton("Reload")
-            self.btn_new.clicked.connect(self._reset_my_form)
-            self.btn_save.clicked.connect(self._save_my_plugin)
-            self.btn_delete.clicked.connect(self._delete_my_plugin)
-            self.btn_reload_my.clicked.connect(self._load_my_plugins)
-            btn_row.addWidget(self.btn_new)
-            btn_row.addWidget(self.btn_save)
-            btn_row.addWidget(self.btn_delete)
-            btn_row.addWidget(self.btn_reload_my)
-            btn_row.addStretch()
-            form_col.addLayout(btn_row)
-            my_layout.addLayout(form_col, 2)
-            layout.addWidget(self.my_group)
-            self._update_auth_ui()
-            self._update_onboarding_panel()
+    def _build_supabase_ui(self):
+        """Onboarding, login and "My Plugins" widgets; added once a Supabase store is selected."""
+        layout = self.layout()
+        self.onboarding_group = QGroupBox("Supabase Setup Required")
+        ob_layout = QVBoxLayout(self.onboarding_group)
+        self.ob_text = QLabel("Your Supabase project is missing required objects. Use the buttons below to copy SQL and run it in the Supabase SQL editor, and create two storage buckets: plugin-icons and plugin-files.")
+        self.ob_text.setWordWrap(True)
+        ob_layout.addWidget(self.ob_text)
+        btns = QHBoxLayout()
+        self.btn_copy_sql = QPushButton("Copy Table + RLS SQL")
+        self.btn_copy_sql.clicked.connect(self._copy_sql_setup)
+        self.btn_copy_storage = QPushButton("Copy Storage Policies SQL")
+        self.btn_copy_storage.clicked.connect(self._copy_storage_policies)
+        btns.addWidget(self.btn_copy_sql)
+        btns.addWidget(self.btn_copy_storage)
+        btns.addStretch()
+        ob_layout.addLayout(btns)
+        layout.insertWidget(1, self.onboarding_group)
+        self.onboarding_group.setVisible(False)
+        auth_row = QHBoxLayout()
+        self.email_input = QLineEdit()
+        self.email_input.setPlaceholderText("Email")
+        self.password_input = QLineEdit()
+        self.password_input.setPlaceholderText("Password")
+        self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.btn_login = QPushButton("Login")
+        self.btn_signup = QPushButton("Sign up")
+        self.btn_logout = QPushButton("Logout")
+        self.btn_login.clicked.connect(self.sign_in)
+        self.btn_signup.clicked.connect(self.sign_up)
+        self.btn_logout.clicked.connect(self.sign_out)
+        auth_row.addWidget(self.email_input)
+        auth_row.addWidget(self.password_input)
+        auth_row.addWidget(self.btn_login)
+        auth_row.addWidget(self.btn_signup)
+        auth_row.addWidget(self.btn_logout)
+        auth_row.addStretch()
+        layout.insertLayout(2, auth_row)
+
+        self.my_group = QGroupBox("My Plugins")
+        my_layout = QHBoxLayout(self.my_group)
+        self.my_list = QListWidget()
+        self.my_list.currentTextChanged.connect(self._on_my_select)
+        my_layout.addWidget(self.my_list, 1)
+
+        form_col = QVBoxLayout()
+        form_grid = QGridLayout()
+        form_grid.setSpacing(6)
+        self.input_id = QLineEdit()
+        self.input_name = QLineEdit()
+        self.input_version = QLineEdit()
+        self.input_author = QLineEdit()
+        self.input_desc = QTextEdit()
+        self.input_desc.setMaximumHeight(80)
+        self.input_cats = QLineEdit()
+        self.icon_path = QLineEdit()
+        self.file_path = QLineEdit()
+        btn_browse_icon = QPushButton("Browse Icon")
+        btn_browse_icon.clicked.connect(self._browse_icon)
+        btn_browse_file = QPushButton("Browse File")
+        btn_browse_file.clicked.connect(self._browse_file)
+        form_grid.addWidget(QLabel("ID"), 0, 0)
+        form_grid.addWidget(self.input_id, 0, 1)
+        form_grid.addWidget(QLabel("Name"), 1, 0)
+        form_grid.addWidget(self.input_name, 1, 1)
+        form_grid.addWidget(QLabel("Version"), 2, 0)
+        form_grid.addWidget(self.input_version, 2, 1)
+        form_grid.addWidget(QLabel("Author"), 3, 0)
+        form_grid.addWidget(self.input_author, 3, 1)
+        form_grid.addWidget(QLabel("Categories (comma)"), 4, 0)
+        form_grid.addWidget(self.input_cats, 4, 1)
+        form_grid.addWidget(QLabel("Description"), 5, 0)
+        form_grid.addWidget(self.input_desc, 5, 1)
+        form_grid.addWidget(QLabel("Icon"), 6, 0)
+        row6 = QHBoxLayout()
+        row6.addWidget(self.icon_path, 1)
+        row6.addWidget(btn_browse_icon)
+        form_col.addLayout(form_grid)
+        form_col.addLayout(row6)
+        form_grid2 = QGridLayout()
+        form_grid2.addWidget(QLabel("Plugin File (.py)"), 0, 0)
+        rowf = QHBoxLayout()
+        rowf.addWidget(self.file_path, 1)
+        rowf.addWidget(btn_browse_file)
+        form_col.addLayout(form_grid2)
+        form_col.addLayout(rowf)
+        btn_row = QHBoxLayout()
+        self.btn_new = QPushButton("New")
+        self.btn_save = QPushButton("Save")
+        self.btn_delete = QPushButton("Delete")
+        self.btn_reload_my = QPushButton("Reload")
+        self.btn_new.clicked.connect(self._reset_my_form)
+        self.btn_save.clicked.connect(self._save_my_plugin)
+        self.btn_delete.clicked.connect(self._delete_my_plugin)
+        self.btn_reload_my.clicked.connect(self._load_my_plugins)
+        btn_row.addWidget(self.btn_new)
+        btn_row.addWidget(self.btn_save)
+        btn_row.addWidget(self.btn_delete)
+        btn_row.addWidget(self.btn_reload_my)
+        btn_row.addStretch()
+        form_col.addLayout(btn_row)
+        my_layout.addLayout(form_col, 2)
+        layout.addWidget(self.my_group)
 
     def refresh_plugins(self):
-        """Refresh the list of community plugins"""
+        """Show the cached catalogue now and rediscover the community plugins on a worker"""
+        self.cancel_loading()
+        self._load_generation += 1
+        generation = self._load_generation
+        cancelled = Event()
+        self._load_cancel = cancelled
+        self._load_pending = True
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
 
-        # Clear existing plugins
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Add loading message
-        loading_label = QLabel("Loading community plugins...")
-        loading_label.setStyleSheet("color: #AAA; font-style: italic;")
-        self.grid_layout.addWidget(loading_label, 0, 0, 1, 5, Qt.AlignmentFlag.AlignCenter)
+        if self.community_plugins:
+            self._display_plugins()
+        else:
+            self._clear_grid()
+            loading_label = QLabel("Loading community plugins...")
+            loading_label.setStyleSheet("color: #AAA; font-style: italic;")
+            self.grid_layout.addWidget(loading_label, 0, 0, 1, 5, Qt.AlignmentFlag.AlignCenter)
 
-        # Load plugins in background
-        QTimer.singleShot(100, self._load_plugins_async)
+        store = self.plugin_store
+        Thread(target=self._discover, args=(generation, store, cancelled), daemon=True).start()
 
         if self._is_supabase:
             QTimer.singleShot(150, self._load_my_plugins)
             QTimer.singleShot(50, self._update_onboarding_panel)
 
-    def _load_plugins_async(self):
-        """Load plugins asynchronously"""
+    def _discover(self, generation, store, cancelled):
+        """Worker: select and connect the store if needed, then run discovery."""
+        plugins, error = None, ""
         try:
-            self.community_plugins = self.plugin_store.discover_plugins()
-            self._display_plugins()
+            if store is None:
+                store, kind = select_store(cancelled)
+                if store is not None:
+                    self.store_ready.emit(store, kind)
+            if store is not None and not cancelled.is_set():
+                plugins = store.discover_plugins()
         except Exception as e:
-            self._show_error(f"Failed to load community plugins: {e}")
+            error = str(e)
+        if cancelled.is_set():
+            return
+        if plugins is not None:
+            # An empty catalogue is a valid answer and replaces the cache too
+            save_cached_catalogue(plugins)
+        try:
+            self.plugins_loaded.emit(generation, plugins, error)
+        except RuntimeError:
+            # The tab was deleted while discovery ran
+            pass
+
+    def _on_store_ready(self, store, kind):
+        if self.plugin_store is not None:
+            return
+        self.plugin_store = store
+        self._is_mongo = kind == 'mongo'
+        self._is_supabase = kind == 'supabase'
+        if self._is_supabase:
+            self._build_supabase_ui()
+            self._update_auth_ui()
+            self._update_onboarding_panel()
+            QTimer.singleShot(0, self._load_my_plugins)
+
+    def _on_plugins_loaded(self, generation, plugins, error):
+        if generation != self._load_generation:
+            return
+        self._load_pending = False
+        self._load_cancel = None
+        self.progress_bar.setVisible(False)
+        if plugins is None and error:
+            if not self.community_plugins:
+                self._clear_grid()
+                self._show_error(f"Failed to load community plugins: {error}")
+            return
+        if plugins is None:
+            # No store answered: keep showing the cached catalogue, if any
+            if not self.community_plugins:
+                self._display_plugins()
+            return
+        self.community_plugins = plugins
+        self._display_plugins()
+
+    def cancel_loading(self):
+        """Drop an in-flight discovery; a blocking call finishes on its worker and is ignored."""
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+            self._load_cancel = None
+            self._load_generation += 1
             self.progress_bar.setVisible(False)
 
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self._load_cancel is not None:
+            self.cancel_loading()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Discovery was cancelled when the user left the view; resume it
+        if self._load_pending and self._load_cancel is None:
+            self.refresh_plugins()
+
+    def _clear_grid(self):
+        while self.grid_layout.count():
+            item = self.grid_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
     def _update_auth_ui(self):
         if not self._is_supabase:
             return
@@ -710,11 +830,7 @@ class CommunityPluginsTab(QWidget):
 
     def _display_plugins(self):
         """Display the loaded plugins"""
-        # Clear loading message
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self._clear_grid()
 
         if not self.community_plugins:
             no_plugins_label = QLabel("No community plugins found.\n\nBe the first to share a plugin!")
@@ -742,26 +858,43 @@ class CommunityPluginsTab(QWidget):
         if not plugin_id:
             QMessageBox.warning(self, "Error", "Invalid plugin information.")
             return
+        store = self.plugin_store
+        if store is None:
+            QMessageBox.information(self, "Community Plugins",
+                                    "Still connecting to the plugin store, try again in a moment.")
+            return
 
         # Show progress
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
 
-        try:
-            if self.plugin_store.install_community_plugin(plugin_id):
-                QMessageBox.information(self, "Success",
-                                      f"Plugin '{plugin_info.get('name')}' installed successfully!\n\n"
-                                      "Go to Settings → Plugins to enable it.")
-                self.plugin_installed.emit(plugin_id)
-                self.main_app.reload_plugins_and_notify()
-            else:
-                QMessageBox.warning(self, "Installation Failed",
-                                  f"Failed to install plugin '{plugin_info.get('name')}'.\n\n"
-                                  "Please check your internet connection and try again.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Installation error: {e}")
-        finally:
-            self.progress_bar.setVisible(False)
+        def run():
+            # Store queries and downloads can block for up to 30 s
+            try:
+                ok, error = bool(store.install_community_plugin(plugin_id)), ""
+            except Exception as e:
+                ok, error = False, str(e)
+            try:
+                self.install_finished.emit(plugin_info, ok, error)
+            except RuntimeError:
+                pass
+
+        Thread(target=run, daemon=True).start()
+
+    def _on_install_finished(self, plugin_info, ok, error):
+        self.progress_bar.setVisible(self._load_cancel is not None)
+        if error:
+            QMessageBox.critical(self, "Error", f"Installation error: {error}")
+        elif ok:
+            QMessageBox.information(self, "Success",
+                                  f"Plugin '{plugin_info.get('name')}' installed successfully!\n\n"
+                                  "Go to Settings → Plugins to enable it.")
+            self.plugin_installed.emit(plugin_info.get('id'))
+            self.main_app.reload_plugins_and_notify()
+        else:
+            QMessageBox.warning(self, "Installation Failed",
+                              f"Failed to install plugin '{plugin_info.get('name')}'.\n\n"
+                              "Please check your internet connection and try again.")
 
     def sign_in(self):
         if not self._is_supabase:
@@ -910,7 +1043,7 @@ class CommunityPluginsTab(QWidget):
             self.creator_dialog.close()
 
         self.creator_dialog = PluginCreatorDialog(
-            self.plugin_store,
+            self.plugin_store or PluginStore(),
             self.on_plugin_created,
             self
         )
@@ -118,6 +118,14 @@ class LoadingSpinner(QWidget):
         """Set the loading message"""
         self.loading_label.setText(message)
 
+    def set_countdown(self, message, remaining):
+        """Show a message with the time left, e.g. while waiting for a lock"""
+        if remaining is None:
+            self.loading_label.setText(message)
+            return
+        minutes, seconds = divmod(max(0, int(remaining)), 60)
+        self.loading_label.setText(f"{message}\n{minutes}:{seconds:02d} left")
+
     def is_animating(self):
         """Check if the spinner is currently animating"""
         return self.spinner_timer.isActive()
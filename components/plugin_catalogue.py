@@ -0,0 +1,301 @@
+"""Precomputed plugin catalogue.
+
+``plugins_data.py`` stays the editable source of the built-in catalogue;
+``plugins_catalogue.json`` is generated from it with icon paths and
+categories already resolved, so opening the Plugins page only reads one
+JSON file (once, on first use) and never scans the icon directories.
+
+Regenerate or verify the manifest with::
+
+    python -m components.plugin_catalogue          # rewrite
+    python -m components.plugin_catalogue --check  # exit 1 if stale
+"""
+import os
+import re
+import sys
+import json
+import random
+import threading
+
+
+MANIFEST_VERSION = 1
+BASE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "plugins_catalogue.json")
+ICONS_DIR = os.path.join(BASE_DIR, "assets", "icons", "plugins")
+FALLBACK_ICON = os.path.join(BASE_DIR, "assets", "icons", "plugins.svg")
+ICON_EXTS = ('.svg', '.png', '.jpeg', '.jpg')
+
+CATEGORY_SYNONYMS = {
+    'system': 'System Tools',
+    'system tool': 'System Tools',
+    'system tools': 'System Tools',
+    'utility': 'Utility',
+    'utilities': 'Utility',
+    'dev': 'Development',
+    'development': 'Development',
+    'internet': 'Internet',
+    'network': 'Internet',
+    'graphics': 'Graphics',
+    'multimedia': 'Multimedia',
+    'audio': 'Multimedia',
+    'video': 'Multimedia',
+    'office': 'Office',
+    'productivity': 'Office',
+    'education': 'Education',
+    'game': 'Games',
+    'games': 'Games',
+    'security': 'Security',
+    'communication': 'Communication',
+    'chat': 'Communication',
+}
+
+CATEGORY_PATTERNS = [
+    (('vscode', 'visual studio', 'code', 'editor', 'ide', 'developer', 'dev', 'git', 'node', 'npm', 'python', 'qt', 'gcc', 'make', 'electron', 'android studio'), 'Development'),
+    (('browser', 'firefox', 'chrome', 'web', 'network', 'mail', 'torrent', 'internet', 'ftp'), 'Internet'),
+    (('image', 'photo', 'graphic', 'draw', 'paint', 'gimp', 'krita', 'inkscape', 'blender'), 'Graphics'),
+    (('video', 'music', 'audio', 'player', 'vlc', 'mpv', 'spotify', 'media', 'ffmpeg'), 'Multimedia'),
+    (('chat', 'telegram', 'discord', 'slack', 'message', 'voip', 'call', 'communication'), 'Communication'),
+    (('system', 'monitor', 'btop', 'htop', 'terminal', 'shell', 'backup', 'timeshift', 'disk', 'partition', 'gparted', 'bleachbit'), 'System Tools'),
+    (('game', 'steam', 'lutris', 'retroarch', 'games'), 'Games'),
+    (('office', 'libreoffice', 'document', 'spreadsheet', 'writer', 'calc', 'pdf'), 'Office'),
+    (('learn', 'education', 'anki', 'study'), 'Education'),
+    (('password', 'privacy', 'guard', 'vpn', 'security', 'encrypt'), 'Security'),
+]
+
+# Explicit aliases for known mismatches between plugin ids and icon file names
+ICON_ALIASES = {
+    'bleachbit': ['BleachBit', 'bleachbit'],
+    'timeshift': ['timeshift'],
+    'baobab': ['diskusageanalyzer', 'baobab'],
+    'deja-dup': ['dejadup', 'DejaDup'],
+    'gparted': ['gparted'],
+    'gnome-disk-utility': ['gnome-disks', 'gnomedisks', 'gnomeDis'],
+    'pavucontrol': ['pavucontrol', 'pulseaudio'],
+    'system-config-printer': ['printer', 'printers'],
+    'btop': ['btop'],
+    'htop': ['htop'],
+    'gnome-system-monitor': ['system-monitor', 'gnomesystemmonitor', 'gnomeSystemMonitor'],
+    'simple-scan': ['simple-scan', 'documentscanner'],
+    'file-roller': ['file-roller', 'archive', 'achive', 'archivemanager', 'archiver'],
+    'nvidia-settings': ['nvidia-settings', 'nvidia', 'nvideasettings', 'nvidiasettings'],
+    'nvtop': ['nvtop'],
+}
+
+_lock = threading.Lock()
+_catalogue = None
+_icon_index = None
+
+
+def normalize_name(s):
+    return re.sub(r'[^a-z0-9]', '', (s or '').lower())
+
+
+def candidate_aliases(spec):
+    pid = spec.get('id') or ''
+    name = spec.get('name') or ''
+    aliases = []
+
+    def add(x):
+        if x and x not in aliases:
+            aliases.append(x)
+
+    add(pid)
+    add(name)
+    add(pid.replace('-', ''))
+    add(pid.replace('-', '_'))
+    add(pid.replace('_', ''))
+    add(name.replace(' ', ''))
+    add(name.replace(' ', '-').lower())
+    add(name.replace(' ', '').lower())
+    for a in ICON_ALIASES.get(pid, []):
+        add(a)
+    return aliases
+
+
+def icon_index(icons_dir=ICONS_DIR):
+    """{ext: {normalized stem: path}} for ``icons_dir``; the default directory is scanned once."""
+    global _icon_index
+    if icons_dir == ICONS_DIR and _icon_index is not None:
+        return _icon_index
+    index = {e: {} for e in ICON_EXTS}
+    try:
+        files = sorted(os.listdir(icons_dir))
+    except OSError:
+        files = []
+    for fname in files:
+        path = os.path.join(icons_dir, fname)
+        stem, ext = os.path.splitext(fname)
+        if ext.lower() in index and os.path.isfile(path):
+            index[ext.lower()].setdefault(normalize_name(stem), path)
+    if icons_dir == ICONS_DIR:
+        _icon_index = index
+    return index
+
+
+def find_icon_file(spec, icons_dir=ICONS_DIR):
+    """Best icon in ``icons_dir`` for ``spec`` by exact, then partial, alias match."""
+    index = icon_index(icons_dir)
+    candidates = [normalize_name(a) for a in candidate_aliases(spec)]
+    for ext in ICON_EXTS:
+        for key in candidates:
+            if key in index[ext]:
+                return index[ext][key]
+    for ext in ICON_EXTS:
+        for key in candidates:
+            for k2, p2 in index[ext].items():
+                if key and (k2.startswith(key) or key in k2):
+                    return p2
+    return None
+
+
+def resolve_icon(spec, icons_dir=ICONS_DIR):
+    """Icon path for a spec: its own file if present, else an alias match, else None."""
+    path = spec.get('icon')
+    if path and os.path.exists(path):
+        return os.path.normpath(path)
+    return find_icon_file(spec, icons_dir)
+
+
+def category_for(plugin):
+    cat = (plugin.get('category') or '').strip()
+    if cat:
+        return CATEGORY_SYNONYMS.get(cat.lower(), cat)
+    tags = plugin.get('tags') or []
+    tags_text = ' '.join(tags) if isinstance(tags, (list, tuple, set)) else str(tags)
+    text = ' '.join([
+        plugin.get('name', ''),
+        plugin.get('desc', ''),
+        plugin.get('id', ''),
+        plugin.get('pkg', ''),
+        tags_text,
+    ]).lower()
+    for kws, label in CATEGORY_PATTERNS:
+        for kw in kws:
+            if kw in text:
+                return label
+    return 'Utility'
+
+
+def _relative(path):
+    if not path:
+        return None
+    return os.path.relpath(path, BASE_DIR).replace(os.sep, '/')
+
+
+def build_manifest(icons_dir=ICONS_DIR):
+    """Manifest dict built from plugins_data.py (the slow path, for build time only)."""
+    from . import plugins_data
+
+    def entry(spec):
+        out = {k: v for k, v in spec.items() if k != 'icon'}
+        out['icon'] = _relative(resolve_icon(spec, icons_dir))
+        out['category_label'] = category_for(spec)
+        return out
+
+    initial = [entry(s) for s in plugins_data.get_plugins_data()]
+    plugins = [entry(s) for s in plugins_data.get_all_plugins_specs()]
+    categories = {}
+    for p in plugins:
+        categories.setdefault(p['category_label'], []).append(p['id'])
+    return {
+        'version': MANIFEST_VERSION,
+        'generated_from': 'components/plugins_data.py',
+        'initial': initial,
+        'plugins': plugins,
+        'categories': {k: categories[k] for k in sorted(categories)},
+    }
+
+
+def write_manifest(path=MANIFEST_PATH):
+    data = build_manifest()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    return data
+
+
+def check_manifest(path=MANIFEST_PATH):
+    """List of problems with the manifest at ``path``; empty when it is current."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return [f"cannot read {path}: {e}"]
+    problems = []
+    if data != build_manifest():
+        problems.append(f"{os.path.basename(path)} is out of date with plugins_data.py")
+    for spec in data.get('initial', []) + data.get('plugins', []):
+        icon = spec.get('icon')
+        if icon and not os.path.isfile(os.path.join(BASE_DIR, icon)):
+            problems.append(f"{spec.get('id')}: icon {icon} does not exist")
+    ids = [p.get('id') for p in data.get('plugins', [])]
+    if len(ids) != len(set(ids)):
+        problems.append("duplicate plugin ids")
+    return problems
+
+
+def _materialize(spec):
+    spec = dict(spec)
+    icon = spec.get('icon')
+    spec['icon'] = os.path.join(BASE_DIR, icon) if icon else FALLBACK_ICON
+    spec['icon_resolved'] = True
+    return spec
+
+
+def load_catalogue(path=MANIFEST_PATH):
+    """The manifest, read once; falls back to building it when the file is missing."""
+    global _catalogue
+    with _lock:
+        if _catalogue is not None and path == MANIFEST_PATH:
+            return _catalogue
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != MANIFEST_VERSION:
+                raise ValueError("unsupported manifest version")
+        except (OSError, ValueError):
+            data = build_manifest()
+        if path == MANIFEST_PATH:
+            _catalogue = data
+        return data
+
+
+def _shuffle_plugins(plugins):
+    """Shuffle plugins while keeping initial popular items at the top"""
+    if len(plugins) <= 8:
+        return plugins
+    popular = plugins[:8]
+    rest = plugins[8:]
+    random.shuffle(rest)
+    return popular + rest
+
+
+def get_plugins_data():
+    """Initial plugin specifications (popular items)."""
+    return [_materialize(s) for s in load_catalogue()['initial']]
+
+
+def get_all_plugins_data():
+    """All plugin specifications, popular first and the rest shuffled."""
+    return _shuffle_plugins([_materialize(s) for s in load_catalogue()['plugins']])
+
+
+def categories():
+    """{category label: [plugin ids]}"""
+    return load_catalogue()['categories']
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if '--check' in argv:
+        problems = check_manifest()
+        for p in problems:
+            print(p, file=sys.stderr)
+        return 1 if problems else 0
+    data = write_manifest()
+    print(f"Wrote {MANIFEST_PATH} ({len(data['plugins'])} plugins, {len(data['categories'])} categories)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+"""Virtualized plugin grid.
+
+The Plugins page used to build a ``QFrame`` with labels, buttons and
+stylesheets for every card. Here the catalogue lives in a list model and
+a delegate paints each card (icon, source chip, description, buttons and
+their hover/installing states), so only the rows inside the viewport cost
+anything and the whole catalogue scrolls smoothly in one view.
+"""
+import os
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QIcon, QPainter, QPainterPath, QPen, QPixmap
+from PyQt6.QtWidgets import QAbstractItemView, QFrame, QListView, QStyle, QStyledItemDelegate
+
+
+CARD_WIDTH = 340
+CARD_HEIGHT = 140
+SPACING = 20
+MAX_COLUMNS = 5
+BUTTON_WIDTH = 85
+ICON_SIZE = QSize(48, 48)
+
+SpecRole = Qt.ItemDataRole.UserRole + 1
+IdRole = Qt.ItemDataRole.UserRole + 2
+InstalledRole = Qt.ItemDataRole.UserRole + 3
+InstallingRole = Qt.ItemDataRole.UserRole + 4
+SourceRole = Qt.ItemDataRole.UserRole + 5
+
+ASSETS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets"))
+CARD_BACKGROUND = os.path.join(ASSETS_DIR, "plugins", "cardbackground.jpg")
+
+
+def package_source(spec):
+    """Package source shown on a card, guessed from the package name."""
+    pkg = (spec.get('pkg') or '').lower()
+    if pkg.startswith('npm-') or 'npm' in pkg:
+        return 'npm'
+    elif pkg.startswith('aur/') or 'aur' in pkg:
+        return 'aur'
+    elif pkg.endswith('.flatpak') or 'flatpak' in pkg:
+        return 'flatpak'
+    elif pkg.startswith('brew-') or 'brew' in pkg:
+        return 'brew'
+    else:
+        return 'pacman'
+
+
+def source_icon_path(source):
+    base_path = os.path.join(ASSETS_DIR, "icons", "discover")
+    icons = {
+        'pacman': 'pacman.svg',
+        'aur': 'aur.svg',
+        'flatpak': 'flatpack.svg',
+        'npm': 'node.svg',
+    }
+    return os.path.join(base_path, icons.get(source, 'pacman.svg'))
+
+
+def columns_for(width):
+    """Columns of fixed-size cards that fit ``width`` (1 to MAX_COLUMNS)."""
+    return max(1, min(MAX_COLUMNS, (max(0, width) + SPACING) // (CARD_WIDTH + SPACING)))
+
+
+class PluginListModel(QAbstractListModel):
+    """Plugin specs plus their installed/installing state; icons are loaded on first paint.
+
+    With an ``image_loader`` (see utils.thumbnails) raster icons are decoded
+    off the UI thread; DecorationRole is None until the row's icon arrives.
+    """
+
+    def __init__(self, icon_provider=None, parent=None, image_loader=None):
+        super().__init__(parent)
+        self._icon_provider = icon_provider
+        self._image_loader = image_loader
+        self._specs = []
+        self._rows = {}
+        self._installed = {}
+        self._installing = set()
+        self._icons = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._specs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._specs):
+            return None
+        spec = self._specs[index.row()]
+        pid = spec.get('id')
+        if role == Qt.ItemDataRole.DisplayRole:
+            return spec.get('name') or pid
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return spec.get('desc') or None
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon(spec)
+        if role == SpecRole:
+            return spec
+        if role == IdRole:
+            return pid
+        if role == InstalledRole:
+            return bool(self._installed.get(pid))
+        if role == InstallingRole:
+            return pid in self._installing
+        if role == SourceRole:
+            return package_source(spec)
+        return None
+
+    def _icon(self, spec):
+        pid = spec.get('id')
+        if pid in self._icons:
+            return self._icons[pid]
+        path = spec.get('icon') if spec.get('icon_resolved') else None
+        if self._image_loader is not None and path and not path.lower().endswith('.svg'):
+            self._image_loader.load(path, ICON_SIZE, lambda image, spec=spec: self._icon_loaded(spec, image))
+            return self._icons.get(pid)
+        icon = None
+        if self._icon_provider is not None:
+            try:
+                icon = self._icon_provider(spec)
+            except Exception:
+                icon = None
+        self._icons[pid] = icon
+        return icon
+
+    def _icon_loaded(self, spec, image):
+        pid = spec.get('id')
+        # A null icon (unreadable artwork) is painted as the generic plugin glyph
+        self._icons[pid] = QIcon() if image.isNull() else QIcon(QPixmap.fromImage(image))
+        row = self._rows.get(pid)
+        if row is not None:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+    def plugins(self):
+        return list(self._specs)
+
+    def set_plugins(self, specs):
+        self.beginResetModel()
+        self._specs = list(specs)
+        self._rows = {s.get('id'): row for row, s in enumerate(self._specs)}
+        self.endResetModel()
+
+    def row_of(self, plugin_id):
+        return self._rows.get(plugin_id, -1)
+
+    def _row_changed(self, plugin_id):
+        row = self._rows.get(plugin_id)
+        if row is not None:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [InstalledRole, InstallingRole])
+
+    def set_installed(self, states):
+        """Merge {plugin id: installed}; only rows whose state changed are repainted."""
+        changed = [pid for pid, installed in states.items() if bool(self._installed.get(pid)) != bool(installed)]
+        self._installed.update(states)
+        for pid in changed:
+            self._row_changed(pid)
+        return changed
+
+    def set_installing(self, plugin_id, installing):
+        if installing == (plugin_id in self._installing):
+            return
+        if installing:
+            self._installing.add(plugin_id)
+        else:
+            self._installing.discard(plugin_id)
+        self._row_changed(plugin_id)
+
+
+def _font(base, px, weight):
+    f = QFont(base)
+    f.setPixelSize(px)
+    f.setWeight(weight)
+    return f
+
+
+def _elide_lines(fm, text, width, max_lines):
+    """Word-wrap ``text`` to at most ``max_lines`` lines, eliding the last one."""
+    words = (text or '').split()
+    lines = []
+    current = ''
+    while words:
+        trial = (current + ' ' + words[0]).strip()
+        if fm.horizontalAdvance(trial) <= width or not current:
+            current = trial
+            words.pop(0)
+            continue
+        lines.append(current)
+        current = ''
+        if len(lines) == max_lines - 1:
+            break
+    rest = ' '.join(([current] if current else []) + words)
+    if rest:
+        lines.append(fm.elidedText(rest, Qt.TextElideMode.ElideRight, width))
+    return lines[:max_lines]
+
+
+class PluginCardDelegate(QStyledItemDelegate):
+    """Paints an app card; the view asks it where the buttons are for hover and clicks."""
+
+    def __init__(self, parent=None, image_loader=None):
+        super().__init__(parent)
+        self.hover = (-1, None)  # (row, button name) under the mouse
+        self._image_loader = image_loader
+        self._background = None
+        self._source_pixmaps = {}
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+    @staticmethod
+    def card_rect(cell):
+        """The fixed-size card centred horizontally in its grid cell."""
+        x = cell.x() + max(0, (cell.width() - CARD_WIDTH) // 2)
+        return QRect(x, cell.y(), CARD_WIDTH, CARD_HEIGHT)
+
+    @staticmethod
+    def button_rects(card, installed):
+        """{'open'|'uninstall'|'install': rect} for a card at ``card``."""
+        x = card.right() - 16 - BUTTON_WIDTH + 1
+        cy = card.center().y()
+        if installed:
+            top = cy - (34 + 8 + 32) // 2
+            return {
+                'open': QRect(x, top, BUTTON_WIDTH, 34),
+                'uninstall': QRect(x, top + 34 + 8, BUTTON_WIDTH, 32),
+            }
+        return {'install': QRect(x, cy - 17, BUTTON_WIDTH, 34)}
+
+    def button_at(self, cell, installed, pos):
+        for name, rect in self.button_rects(self.card_rect(cell), installed).items():
+            if rect.contains(pos):
+                return name
+        return None
+
+    def _card_background(self):
+        """Centre crop of the card artwork; a null pixmap until the loader delivers it."""
+        if self._background is None:
+            self._background = QPixmap()
+            if self._image_loader is not None:
+                self._image_loader.load(CARD_BACKGROUND, QSize(CARD_WIDTH, CARD_HEIGHT), self._background_loaded, mode='center')
+            else:
+                self._background = QPixmap(CARD_BACKGROUND)
+        return self._background
+
+    def _background_loaded(self, image):
+        self._background = QPixmap.fromImage(image)
+        view = self.parent()
+        if view is not None:
+            view.viewport().update()
+
+    def _source_pixmap(self, source):
+        if source not in self._source_pixmaps:
+            pm = QPixmap(source_icon_path(source))
+            if not pm.isNull():
+                pm = pm.scaled(12, 12, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            self._source_pixmaps[source] = pm
+        return self._source_pixmaps[source]
+
+    def paint(self, painter, option, index):
+        spec = index.data(SpecRole) or {}
+        installed = bool(index.data(InstalledRole))
+        installing = bool(index.data(InstallingRole))
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        card = self.card_rect(option.rect)
+        base_font = option.font
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+
+        # Card background and border
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 14, 14)
+        painter.save()
+        painter.setClipPath(path)
+        painter.fillRect(card, QColor(20, 25, 35) if hovered else QColor(15, 20, 30))
+        bg = self._card_background()
+        if not bg.isNull():
+            # Centred and unscaled, like the former background-position: center
+            painter.drawPixmap(card.center().x() - bg.width() // 2, card.center().y() - bg.height() // 2, bg)
+        painter.restore()
+        painter.setPen(QPen(QColor(0, 191, 174, 102 if hovered else 38), 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(path)
+
+        left = card.x() + 16
+        top = card.y() + 12
+        text_right = card.right() - 16 - BUTTON_WIDTH - 12
+
+        # Icon tile
+        icon_rect = QRect(left, top, 52, 52)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(255, 255, 255, 13))
+        painter.drawRoundedRect(QRectF(icon_rect), 10, 10)
+        icon = index.data(Qt.ItemDataRole.DecorationRole)
+        if icon is None:
+            pass  # still decoding: the empty tile is the placeholder
+        elif not icon.isNull():
+            icon.paint(painter, icon_rect.adjusted(2, 2, -2, -2))
+        else:
+            painter.setPen(QColor(224, 224, 224))
+            painter.setFont(_font(base_font, 28, QFont.Weight.Normal))
+            painter.drawText(icon_rect, Qt.AlignmentFlag.AlignCenter, "🧩")
+
+        # Name
+        name_x = icon_rect.right() + 11
+        name_font = _font(base_font, 13, QFont.Weight.Bold)
+        painter.setFont(name_font)
+        painter.setPen(QColor(255, 255, 255))
+        name = spec.get('name', spec.get('id', ''))
+        name_rect = QRect(name_x, top + 4, text_right - name_x, 20)
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         QFontMetrics(name_font).elidedText(name, Qt.TextElideMode.ElideRight, name_rect.width()))
+
+        # Source chip
+        source = index.data(SourceRole) or 'pacman'
+        chip_rect = QRect(name_x, top + 28, text_right - name_x, 22)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 191, 174, 26))
+        painter.drawRoundedRect(QRectF(chip_rect), 6, 6)
+        pm = self._source_pixmap(source)
+        chip_x = chip_rect.x() + 6
+        if not pm.isNull():
+            painter.drawPixmap(chip_x, chip_rect.center().y() - pm.height() // 2, pm)
+        painter.setFont(_font(base_font, 9, QFont.Weight.DemiBold))
+        painter.setPen(QColor(0, 191, 174))
+        painter.drawText(QRect(chip_x + 16, chip_rect.y(), chip_rect.width() - 22, chip_rect.height()),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, source)
+
+        # Description, at most two lines
+        desc_font = _font(base_font, 10, QFont.Weight.Normal)
+        fm = QFontMetrics(desc_font)
+        painter.setFont(desc_font)
+        painter.setPen(QColor(176, 176, 176))
+        y = icon_rect.bottom() + 7
+        for line in _elide_lines(fm, spec.get('desc', ''), text_right - left, 2):
+            painter.drawText(QRect(left, y, text_right - left, fm.height()), Qt.AlignmentFlag.AlignLeft, line)
+            y += fm.height()
+
+        # Buttons
+        hover_button = self.hover[1] if self.hover[0] == index.row() else None
+        for name, rect in self.button_rects(card, installed).items():
+            self._paint_button(painter, base_font, name, rect, installing, name == hover_button)
+
+        painter.restore()
+
+    @staticmethod
+    def _paint_button(painter, base_font, name, rect, installing, hovered):
+        if name == 'open':
+            text = "Installing…" if installing else "Open"
+            fill = QColor(245, 245, 245) if hovered else QColor(255, 255, 255)
+            fg, border, px, weight = QColor(26, 26, 26), None, 12, QFont.Weight.Bold
+        elif name == 'uninstall':
+            text = "Uninstalling…" if installing else "Uninstall"
+            fill = QColor(0, 191, 174, 26) if hovered else QColor(0, 0, 0, 0)
+            fg = QColor(0, 191, 174) if hovered else QColor(224, 224, 224)
+            border = QColor(0, 191, 174, 204) if hovered else QColor(255, 255, 255, 77)
+            px, weight = 11, QFont.Weight.DemiBold
+        else:
+            text = "Installing…" if installing else "Install"
+            fill = QColor(0, 212, 196) if hovered else QColor(0, 191, 174)
+            fg, border, px, weight = QColor(255, 255, 255), None, 12, QFont.Weight.Bold
+        painter.save()
+        if installing:
+            painter.setOpacity(0.55)
+        painter.setPen(QPen(border, 1) if border is not None else Qt.PenStyle.NoPen)
+        painter.setBrush(fill)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 10, 10)
+        painter.setPen(fg)
+        painter.setFont(_font(base_font, px, weight))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+
+class PluginGridView(QListView):
+    """Icon-mode list view laying cards out in as many columns as fit."""
+
+    install_clicked = pyqtSignal(str)
+    open_clicked = pyqtSignal(str)
+    uninstall_clicked = pyqtSignal(str)
+
+    def __init__(self, parent=None, image_loader=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(0)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setDragEnabled(False)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.verticalScrollBar().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+        self._delegate = PluginCardDelegate(self, image_loader)
+        self.setItemDelegate(self._delegate)
+        self._update_grid_size()
+
+    def columns(self):
+        return columns_for(self.viewport().width())
+
+    def _update_grid_size(self):
+        width = self.viewport().width()
+        cols = columns_for(width)
+        # QListView wraps when a row fills the viewport exactly, so leave it a pixel
+        size = QSize(max(CARD_WIDTH, (width - 1) // cols), CARD_HEIGHT + SPACING)
+        if size != self.gridSize():
+            self.setGridSize(size)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_grid_size()
+
+    def _button_at(self, pos):
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return index, None
+        return index, self._delegate.button_at(self.visualRect(index), bool(index.data(InstalledRole)), pos)
+
+    def _set_hover(self, row, button):
+        old_row = self._delegate.hover[0]
+        if (row, button) == self._delegate.hover:
+            return
+        self._delegate.hover = (row, button)
+        model = self.model()
+        for r in {old_row, row}:
+            if model is not None and 0 <= r < model.rowCount():
+                self.viewport().update(self.visualRect(model.index(r, 0)))
+        if button:
+            self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            self.viewport().unsetCursor()
+
+    def mouseMoveEvent(self, event):
+        index, button = self._button_at(event.position().toPoint())
+        self._set_hover(index.row() if index.isValid() else -1, button)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._set_hover(-1, None)
+        super().leaveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            index, button = self._button_at(event.position().toPoint())
+            if button and not index.data(InstallingRole):
+                pid = index.data(IdRole)
+                {'install': self.install_clicked,
+                 'open': self.open_clicked,
+                 'uninstall': self.uninstall_clicked}[button].emit(pid)
+                event.accept()
+                return
+        super().mouseReleaseEvent(event)
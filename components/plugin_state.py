@@ -0,0 +1,97 @@
+"""Installed state for the whole plugin catalogue in one pass.
+
+Instead of ``shutil.which`` plus one ``pacman -Qi`` per card, one read of
+pacman's local database gives the installed package names together with
+everything they provide, and one scan of ``$PATH`` gives the executable
+index; each spec is then checked against both.
+"""
+import os
+import subprocess
+
+
+LOCAL_DB = "/var/lib/pacman/local"
+
+
+def _read_local_db(dbpath):
+    """Names and provides of every package in a pacman local database."""
+    names = set()
+    with os.scandir(dbpath) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            try:
+                with open(os.path.join(entry.path, "desc"), encoding="utf-8", errors="replace") as f:
+                    section = None
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            section = None
+                        elif line.startswith("%") and line.endswith("%"):
+                            section = line
+                        elif section in ("%NAME%", "%PROVIDES%"):
+                            # Provides may carry a version: "java-runtime=17"
+                            names.add(line.split("=", 1)[0])
+            except OSError:
+                continue
+    return names
+
+
+def installed_packages(timeout=30, dbpath=None):
+    """Names of all installed packages plus what they provide; empty set on failure.
+
+    Reads the local database directly; without one, falls back to
+    ``pacman -Qq`` (names only).
+    """
+    try:
+        return _read_local_db(dbpath or LOCAL_DB)
+    except OSError:
+        pass
+    try:
+        r = subprocess.run(["pacman", "-Qq"], capture_output=True, text=True, timeout=timeout)
+        if r.returncode == 0:
+            return {line.strip() for line in r.stdout.splitlines() if line.strip()}
+    except Exception:
+        pass
+    return set()
+
+
+def path_executables(path=None):
+    """{name: full path} of the files on ``path`` (default $PATH), first entry wins."""
+    index = {}
+    for directory in (os.environ.get('PATH', '') if path is None else path).split(os.pathsep):
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name not in index:
+                        index[entry.name] = entry.path
+        except OSError:
+            continue
+    return index
+
+
+def _runnable(executables, cmd):
+    path = executables.get(cmd)
+    # The executable bit is only checked for the few names that match
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def is_installed(spec, packages, executables):
+    cmd = spec.get('cmd')
+    pkg = spec.get('pkg')
+    return bool((cmd and _runnable(executables, cmd)) or (pkg and pkg in packages))
+
+
+def installed_states(specs, packages=None, executables=None):
+    """{plugin id: installed} for every spec, from one package query and one PATH scan."""
+    if packages is None:
+        packages = installed_packages()
+    if executables is None:
+        executables = path_executables()
+    states = {}
+    for spec in specs:
+        pid = spec.get('id')
+        if pid:
+            states[pid] = is_installed(spec, packages, executables)
+    return states
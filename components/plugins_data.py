@@ -83,6 +83,11 @@ def get_plugins_data():
 
 def get_all_plugins_data():
     """Return all plugin specifications (lazy loading)"""
+    return _shuffle_plugins(get_all_plugins_specs())
+
+
+def get_all_plugins_specs():
+    """All plugin specifications in source order (popular items first)"""
     plugins_items_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets", "plugins", "plugins-items"))
 
     plugins = [
@@ -1314,7 +1319,7 @@ def get_all_plugins_data():
             'category': 'Development',
         },
     ]
-    return _shuffle_plugins(plugins)
+    return plugins
 
 
 def _shuffle_plugins(plugins):
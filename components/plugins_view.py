@@ -1,11 +1,13 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QFrame, QGridLayout, QSizePolicy, QMenu
-from PyQt6.QtCore import pyqtSignal, Qt, QTimer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QFrame, QSizePolicy, QMenu
+from PyQt6.QtCore import pyqtSignal, Qt, QSize
 from PyQt6.QtGui import QIcon, QPixmap, QAction
-from .plugins_data import get_plugins_data, get_all_plugins_data
+from . import plugin_catalogue, plugin_grid, plugin_state
+from .plugin_catalogue import get_plugins_data, get_all_plugins_data
+from utils import thumbnails
 import os
 import shutil
-import re
 import random
+from threading import Thread
 
 
 class CardState:
@@ -269,6 +271,7 @@ class PluginsView(QWidget):
     install_requested = pyqtSignal(str)   # plugin id
     launch_requested = pyqtSignal(str)    # plugin id
     uninstall_requested = pyqtSignal(str) # plugin id
+    installed_states_ready = pyqtSignal(dict)  # {plugin id: installed} from the bulk pass
 
     def __init__(self, main_app, get_icon_callback, parent=None):
         super().__init__(parent)
@@ -278,35 +281,23 @@ class PluginsView(QWidget):
         self._installed_only = False
         self._categories = set()
         self._selected_category = None  # Track selected category
-        self._current_cols = 2  # Track current column count
-        self._all_cards = []  # Store all created cards for performance
         self._current_filter_states = {}  # Track current filter states
         self._current_source_states = {"pacman": True, "AUR": True, "Flatpak": True, "npm": True}  # Track source states
-        
-        # Pagination variables for infinite scrolling
-        self._all_plugins = []  # All available plugins
-        self._loaded_count = 0  # Number of plugins currently loaded
-        self._batch_size = 4  # Load 4 plugins at a time for better performance
-        self._is_loading = False  # Prevent multiple simultaneous loads
-        self._loading_indicator = None  # Loading indicator widget
-        self._load_timer = None  # Timer for deferred loading
-        self._card_cache = {}
-        self._category_filtered_plugins = []
-        self._category_loaded_count = 0
-        self._is_layouting = False  # Guard to avoid loading during relayout
-        
-        # Debounce timer for resize events
-        self._resize_timer = QTimer()
-        self._resize_timer.setSingleShot(True)
-        self._resize_timer.timeout.connect(self._handle_resize)
+        self._all_plugins = []  # Full catalogue, popular first
+        # Installed state from the last bulk pass (see refresh_installed_states)
+        self._installed_states = {}
+        self._state_scan_running = False
+        self._state_scan_again = False
+        self.installed_states_ready.connect(self._apply_installed_states)
         
         # UI components initialized in _init_ui
         self.slider_layout = None
-        self.grid_layout = None
-        self._loading_container = None
-        self._scroll_area = None
+        self._grid_model = None
+        self._grid_view = None
+        self._pending_actions = {}  # plugin id -> installed state the clicked action is waiting for
         
         self._init_specs()
+        self.refresh_installed_states()
         self._init_ui()
 
     def _init_specs(self):
@@ -326,7 +317,7 @@ class PluginsView(QWidget):
         
         # Apps Grid
         self.create_apps_grid(layout)
-        QTimer.singleShot(100, self.populate_app_cards)
+        self.populate_app_cards()
 
     def create_popular_slider(self, parent_layout):
         """Create the popular apps slider at the top"""
@@ -477,31 +468,20 @@ class PluginsView(QWidget):
         # Check if app is installed
         is_installed = False
         if matching_plugin:
-            is_installed = self.is_installed(matching_plugin)
+            is_installed = self._cached_installed(matching_plugin)
         
         # Get background image path
         image_filename = app_data.get("image", "")
         background_image_path = os.path.join(os.path.dirname(__file__), "..", "assets", "plugins", "slidebar", image_filename)
         
-        # Create background image label
+        # Create background image label; the artwork arrives from the thumbnail loader
         background_label = QLabel(card)
         background_label.setGeometry(0, 0, 240, 180)
+        background_label.setStyleSheet("background-color: rgb(20, 25, 35); border-radius: 12px;")
         
-        # Load and scale the background image
         if os.path.exists(background_image_path):
-            pixmap = QPixmap(background_image_path)
-            if not pixmap.isNull():
-                # Scale the pixmap to cover the entire card while maintaining aspect ratio
-                scaled_pixmap = pixmap.scaled(240, 180, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-                
-                # If the scaled image is larger than the card, crop it to center
-                if scaled_pixmap.width() > 240 or scaled_pixmap.height() > 180:
-                    x_offset = max(0, (scaled_pixmap.width() - 240) // 2)
-                    y_offset = max(0, (scaled_pixmap.height() - 180) // 2)
-                    cropped_pixmap = scaled_pixmap.copy(x_offset, y_offset, 240, 180)
-                    background_label.setPixmap(cropped_pixmap)
-                else:
-                    background_label.setPixmap(scaled_pixmap)
+            thumbnails.loader().load(background_image_path, QSize(240, 180),
+                                     lambda image: self._set_label_image(background_label, image), mode='cover')
         
         # Style the card frame
         card.setStyleSheet("""
@@ -597,12 +577,9 @@ class PluginsView(QWidget):
             }
         """)
         
-        # Connect button to appropriate action
+        # One handler decides at click time: the installed state arrives after the bulk scan
         if matching_plugin:
-            if is_installed:
-                action_btn.clicked.connect(lambda: self.launch_requested.emit(matching_plugin['id']))
-            else:
-                action_btn.clicked.connect(lambda: (card.set_installing(True), self.install_requested.emit(matching_plugin['id'])))
+            action_btn.clicked.connect(lambda: self._on_slider_action(card, matching_plugin['id']))
         
         bottom_layout.addWidget(action_btn)
         
@@ -628,28 +605,17 @@ class PluginsView(QWidget):
         
         return card
 
-    def _get_or_create_card(self, plugin_spec):
-        """Return cached card data for a plugin or create it."""
-        try:
-            pid = plugin_spec.get('id')
-        except Exception:
-            pid = None
-        if pid and pid in getattr(self, '_card_cache', {}):
-            return self._card_cache[pid]
-        installed = self.is_installed(plugin_spec)
-        icon = self._icon_for(plugin_spec)
-        card = self.create_app_card(plugin_spec, icon, installed)
-        data = {
-            'plugin': plugin_spec,
-            'widget': card,
-            'installed': installed
-        }
-        try:
-            if pid:
-                self._card_cache[pid] = data
-        except Exception:
-            pass
-        return data
+    def _on_slider_action(self, card, plugin_id):
+        if card.card_state.get_installed_state():
+            self.launch_requested.emit(plugin_id)
+        else:
+            card.set_installing(True)
+            self.install_requested.emit(plugin_id)
+
+    @staticmethod
+    def _set_label_image(label, image):
+        if not image.isNull():
+            label.setPixmap(QPixmap.fromImage(image))
 
     def create_filter_buttons(self, parent_layout):
         """Create the main filter buttons row"""
@@ -829,651 +795,103 @@ class PluginsView(QWidget):
         """
 
     def create_apps_grid(self, parent_layout):
-        """Create the apps grid section"""
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        # Enable scroll bar interaction
-        scroll.verticalScrollBar().setCursor(Qt.CursorShape.PointingHandCursor)
-        scroll.horizontalScrollBar().setCursor(Qt.CursorShape.PointingHandCursor)
-        scroll.setStyleSheet(self._get_scrollbar_stylesheet())
-        
-        # Connect scroll event to detect when user reaches bottom
-        scroll.verticalScrollBar().valueChanged.connect(self._on_scroll)
-        
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout(scroll_widget)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-        scroll_layout.setSpacing(16)
-        
-        # Create grid container
-        grid_container = QWidget()
-        # Use Minimum vertical policy so content grows naturally and scrollbars appear when needed
-        grid_container.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-        self.grid_layout = QGridLayout(grid_container)
-        self.grid_layout.setSpacing(20)
-        self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        # Dynamic column stretching will be set in populate_app_cards
-        
-        # Add loading indicator container at the bottom
-        self._loading_container = QWidget()
-        self._loading_container.setVisible(False)
-        loading_layout = QVBoxLayout(self._loading_container)
-        loading_layout.setContentsMargins(20, 10, 20, 10)
-        loading_layout.setSpacing(8)
-        
-        loading_text = QLabel("Loading more plugins...")
-        loading_text.setStyleSheet("""
-            QLabel {
-                color: #00BFAE;
-                font-size: 12px;
-                font-weight: 600;
-                text-align: center;
-            }
-        """)
-        loading_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        loading_layout.addWidget(loading_text)
-        
-        # Add grid and loading indicator to scroll layout
-        scroll_layout.addWidget(grid_container)
-        scroll_layout.addWidget(self._loading_container)
-        
-        scroll.setWidget(scroll_widget)
-        self._scroll_area = scroll  # Store reference for scroll handling
-        parent_layout.addWidget(scroll)
+        """Create the apps grid: a list view in icon mode that only paints visible cards"""
+        self._grid_model = plugin_grid.PluginListModel(self._icon_for, self, image_loader=thumbnails.loader())
+        self._grid_model.set_installed(self._installed_states)
+        view = plugin_grid.PluginGridView(image_loader=thumbnails.loader())
+        view.setModel(self._grid_model)
+        view.setStyleSheet("QListView { background: transparent; border: none; }" + self._get_scrollbar_stylesheet())
+        view.install_clicked.connect(self._on_install_clicked)
+        view.uninstall_clicked.connect(self._on_uninstall_clicked)
+        view.open_clicked.connect(self.launch_requested.emit)
+        self._grid_view = view
+        parent_layout.addWidget(view, 1)
+
+    def _on_install_clicked(self, plugin_id):
+        self.set_installing(plugin_id, True)
+        self._pending_actions[plugin_id] = True
+        self.install_requested.emit(plugin_id)
+
+    def _on_uninstall_clicked(self, plugin_id):
+        self.set_installing(plugin_id, True)
+        self._pending_actions[plugin_id] = False
+        self.uninstall_requested.emit(plugin_id)
 
     def populate_app_cards(self):
-        """Populate the grid with real plugin cards filtered by category"""
-        # For category filtering, show all cards that match the category
-        if self._selected_category:
-            if not self._all_cards:
-                self._create_all_cards()
-            while self.grid_layout.count():
-                _ = self.grid_layout.takeAt(0)
-            self._reset_row_stretches()
-            for card_data in self._all_cards:
-                card_data['widget'].hide()
-            try:
-                viewport_w = self._scroll_area.viewport().width()
-                viewport_h = self._scroll_area.viewport().height()
-            except Exception:
-                viewport_w = self.width()
-                viewport_h = self.height()
-            cols = self._calc_cols(viewport_w)
-            visible_rows = self._calc_visible_rows(viewport_h)
-            initial_rows = visible_rows + 2
-            self._current_cols = cols
-            # Ensure full dataset is available for categories
-            if not self._all_plugins:
-                self._all_plugins = get_all_plugins_data()
-            # Build filtered plugin list from the full dataset
-            self._category_filtered_plugins = [p for p in self._all_plugins if self._category_for(p) == self._selected_category]
-            for i in range(cols):
-                self.grid_layout.setColumnStretch(i, 1)
-                try:
-                    self.grid_layout.setColumnMinimumWidth(i, 340)
-                except Exception:
-                    pass
-            initial_batch = min(len(self._category_filtered_plugins), cols * initial_rows)
-            self._category_loaded_count = 0
-            self._load_initial_category_batch(initial_batch)
-            QTimer.singleShot(10, self._ensure_category_scrollbar_visible)
-        else:
-            # For "All" tab, use pagination system
-            if not self._all_plugins:
-                # Initialize pagination if not already done
-                self.show_all_apps()
-            else:
-                # Just refresh the current view
-                self._update_grid_layout()
-    
-    def _create_all_cards(self):
-        """Create all plugin cards once for better performance"""
-        self._all_cards = []
-        for plugin in self.plugins:
-            installed = self.is_installed(plugin)
-            icon = self._icon_for(plugin)
-            card = self.create_app_card(plugin, icon, installed)
-            self._all_cards.append({
-                'plugin': plugin,
-                'widget': card,
-                'installed': installed
-            })
+        """Show the plugins matching the selected category and filters in the grid"""
+        if not self._all_plugins:
+            self._all_plugins = get_all_plugins_data()
+        self._grid_model.set_plugins(self._visible_plugins())
+
+    def _visible_plugins(self):
+        show_available = self._current_filter_states.get('Available', True)
+        show_installed = self._current_filter_states.get('Installed', True)
+        source_keys = {'pacman': 'pacman', 'aur': 'AUR', 'flatpak': 'Flatpak', 'npm': 'npm'}
+        visible = []
+        for plugin in self._all_plugins:
+            if self._selected_category and self._category_for(plugin) != self._selected_category:
+                continue
+            installed = self._cached_installed(plugin)
+            if self._installed_only and not installed:
+                continue
+            if not ((installed and show_installed) or (not installed and show_available)):
+                continue
+            source = self._get_package_source(plugin)
+            if source in source_keys and not self._current_source_states.get(source_keys[source], True):
+                continue
+            if self._categories and plugin.get('category', '') not in self._categories:
+                continue
+            if self._filter_text:
+                name = (plugin.get('name', '') or '').lower()
+                desc = (plugin.get('desc', '') or '').lower()
+                plugin_id = (plugin.get('id', '') or '').lower()
+                # Match if search text is in name, description, or id
+                if not (self._filter_text in name or self._filter_text in desc or self._filter_text in plugin_id):
+                    continue
+            visible.append(plugin)
+        return visible
+
+    def _filters_use_installed_state(self):
+        return (self._installed_only
+                or not self._current_filter_states.get('Available', True)
+                or not self._current_filter_states.get('Installed', True))
 
     @staticmethod
     def _get_package_source(plugin_spec):
         """Determine package source from plugin spec"""
-        pkg = plugin_spec.get('pkg', '').lower()
-        if pkg.startswith('npm-') or 'npm' in pkg:
-            return 'npm'
-        elif pkg.startswith('aur/') or 'aur' in pkg:
-            return 'aur'
-        elif pkg.endswith('.flatpak') or 'flatpak' in pkg:
-            return 'flatpak'
-        elif pkg.startswith('brew-') or 'brew' in pkg:
-            return 'brew'
-        else:
-            return 'pacman'
+        return plugin_grid.package_source(plugin_spec)
     
     @staticmethod
     def _category_for(plugin):
-        cat = (plugin.get('category') or '').strip()
-        if cat:
-            c = cat.lower()
-            synonyms = {
-                'system': 'System Tools',
-                'system tool': 'System Tools',
-                'system tools': 'System Tools',
-                'utility': 'Utility',
-                'utilities': 'Utility',
-                'dev': 'Development',
-                'development': 'Development',
-                'internet': 'Internet',
-                'network': 'Internet',
-                'graphics': 'Graphics',
-                'multimedia': 'Multimedia',
-                'audio': 'Multimedia',
-                'video': 'Multimedia',
-                'office': 'Office',
-                'productivity': 'Office',
-                'education': 'Education',
-                'game': 'Games',
-                'games': 'Games',
-                'security': 'Security',
-                'communication': 'Communication',
-                'chat': 'Communication',
-            }
-            return synonyms.get(c, cat)
-        tags = plugin.get('tags') or []
-        tags_text = ' '.join(tags) if isinstance(tags, (list, tuple, set)) else str(tags)
-        text = ' '.join([
-            plugin.get('name', ''),
-            plugin.get('desc', ''),
-            plugin.get('id', ''),
-            plugin.get('pkg', ''),
-            tags_text,
-        ]).lower()
-        patterns = [
-            (('vscode','visual studio','code','editor','ide','developer','dev','git','node','npm','python','qt','gcc','make','electron','android studio'), 'Development'),
-            (('browser','firefox','chrome','web','network','mail','torrent','internet','ftp'), 'Internet'),
-            (('image','photo','graphic','draw','paint','gimp','krita','inkscape','blender'), 'Graphics'),
-            (('video','music','audio','player','vlc','mpv','spotify','media','ffmpeg'), 'Multimedia'),
-            (('chat','telegram','discord','slack','message','voip','call','communication'), 'Communication'),
-            (('system','monitor','btop','htop','terminal','shell','backup','timeshift','disk','partition','gparted','bleachbit'), 'System Tools'),
-            (('game','steam','lutris','retroarch','games'), 'Games'),
-            (('office','libreoffice','document','spreadsheet','writer','calc','pdf'), 'Office'),
-            (('learn','education','anki','study'), 'Education'),
-            (('password','privacy','guard','vpn','security','encrypt'), 'Security'),
-        ]
-        for kws, label in patterns:
-            for kw in kws:
-                if kw in text:
-                    return label
-        return 'Utility'
+        # Catalogue specs carry the label resolved at build time
+        return plugin.get('category_label') or plugin_catalogue.category_for(plugin)
     
     @staticmethod
     def _get_source_icon(source):
         """Get icon path for package source"""
-        base_path = os.path.join(os.path.dirname(__file__), "..", "assets", "icons", "discover")
-        icons = {
-            'pacman': os.path.join(base_path, 'pacman.svg'),
-            'aur': os.path.join(base_path, 'aur.svg'),
-            'flatpak': os.path.join(base_path, 'flatpack.svg'),
-            'npm': os.path.join(base_path, 'node.svg'),
-            'brew': os.path.join(base_path, 'pacman.svg'),
-            'pip': os.path.join(base_path, 'pacman.svg')
-        }
-        return icons.get(source, os.path.join(base_path, 'pacman.svg'))
-
-    # --- Layout helpers to keep calculations consistent ---
-    def _layout_spacing(self):
-        try:
-            return self.grid_layout.spacing() if self.grid_layout else 20
-        except Exception:
-            return 20
-
-    def _calc_cols(self, viewport_width):
-        spacing = self._layout_spacing()
-        unit_w = 340 + spacing
-        # Cap columns to 5 to avoid tight packing on very wide screens
-        return max(1, min(5, (max(0, viewport_width) + spacing) // unit_w))
-
-    def _calc_visible_rows(self, viewport_height):
-        spacing = self._layout_spacing()
-        row_h = 140 + spacing
-        return max(1, (max(0, viewport_height) + spacing) // row_h)
-
-    def _enforce_row_min_heights(self, upto_row):
-        if not hasattr(self, 'grid_layout'):
-            return
-        try:
-            for r in range(0, max(0, int(upto_row)) + 1):
-                self.grid_layout.setRowMinimumHeight(r, 140)
-        except Exception:
-            pass
-    
-    def _stop_deferred_loads(self):
-        try:
-            if self._load_timer is not None:
-                self._load_timer.stop()
-                self._load_timer = None
-        except Exception:
-            self._load_timer = None
-
-    def _begin_layout_update(self):
-        if self._is_layouting:
-            return False
-        self._is_layouting = True
-        self._stop_deferred_loads()
-        try:
-            self.setUpdatesEnabled(False)
-        except Exception:
-            pass
-        try:
-            if hasattr(self, '_scroll_area') and self._scroll_area:
-                self._scroll_area.setUpdatesEnabled(False)
-                self._scroll_area.viewport().setUpdatesEnabled(False)
-        except Exception:
-            pass
-        return True
-
-    def _finish_layout_update(self):
-        try:
-            if hasattr(self, '_scroll_area') and self._scroll_area:
-                self._scroll_area.viewport().setUpdatesEnabled(True)
-                self._scroll_area.setUpdatesEnabled(True)
-                self._scroll_area.viewport().update()
-        except Exception:
-            pass
-        try:
-            self.setUpdatesEnabled(True)
-        except Exception:
-            pass
-        self._is_layouting = False
-
-    def create_app_card(self, plugin_spec, icon, installed):
-        """Create a medium-sized app card with enhanced styling"""
-        card = QFrame()
-        card.setFixedSize(340, 140)
-        # Ensure the widget paints its own background to avoid transparency/bleed issues
-        try:
-            card.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-            card.setAutoFillBackground(True)
-            card.setObjectName("appCard")
-        except Exception:
-            pass
-        
-        # Store state using CardState class for proper encapsulation
-        card_state = CardState()
-        card_state.set_installed_state(installed)
-        card.card_state = card_state
-        
-        def set_card_installing(installing):
-            card_state.set_installing(installing)
-            if installing:
-                for widget in card.findChildren(QPushButton):
-                    widget.setEnabled(False)
-                    if widget.text() in ("Install", "Open"):
-                        widget.setText("Installing…")
-                    elif widget.text() == "Uninstall":
-                        widget.setText("Uninstalling…")
-            else:
-                for widget in card.findChildren(QPushButton):
-                    widget.setEnabled(True)
-                    if "Installing" in widget.text() or "Uninstalling" in widget.text():
-                        if "Uninstalling" in widget.text():
-                            widget.setText("Uninstall")
-                        else:
-                            widget.setText("Install" if not card_state.get_installed_state() else "Open")
-        card.set_installing = set_card_installing
-        bg_image_path = os.path.join(os.path.dirname(__file__), "..", "assets", "plugins", "cardbackground.jpg")
-        bg_image_url = bg_image_path.replace("\\", "/")
-        card.setStyleSheet(f"""
-            QFrame#appCard {{
-                background-image: url('{bg_image_url}');
-                background-position: center;
-                background-repeat: no-repeat;
-                background-color: rgb(15, 20, 30);
-                border-radius: 14px;
-                border: 1px solid rgba(0, 191, 174, 0.15);
-            }}
-            QFrame#appCard:hover {{
-                border: 1px solid rgba(0, 191, 174, 0.4);
-                background-color: rgb(20, 25, 35);
-            }}
-        """)
-        
-        layout = QHBoxLayout(card)
-        layout.setContentsMargins(16, 12, 16, 12)
-        layout.setSpacing(12)
-        
-        # Left side: Icon and text
-        left_layout = QVBoxLayout()
-        left_layout.setContentsMargins(0, 0, 0, 0)
-        left_layout.setSpacing(6)
-        
-        # Icon and name row
-        icon_name_layout = QHBoxLayout()
-        icon_name_layout.setContentsMargins(0, 0, 0, 0)
-        icon_name_layout.setSpacing(10)
-        
-        # Icon with shadow effect
-        icon_label = QLabel()
-        icon_label.setFixedSize(52, 52)
-        icon_label.setStyleSheet("""
-            QLabel {
-                border: none;
-                background: rgba(255, 255, 255, 0.05);
-                border-radius: 10px;
-                padding: 2px;
-            }
-        """)
-        if icon and not icon.isNull():
-            icon_label.setPixmap(icon.pixmap(48, 48))
-        else:
-            icon_label.setText("🧩")
-            icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            icon_label.setStyleSheet("""
-                QLabel {
-                    font-size: 28px;
-                    border: none;
-                    background: rgba(255, 255, 255, 0.05);
-                    border-radius: 10px;
-                }
-            """)
-        icon_name_layout.addWidget(icon_label)
-        
-        # Name and source column
-        name_source_layout = QVBoxLayout()
-        name_source_layout.setContentsMargins(0, 0, 0, 0)
-        name_source_layout.setSpacing(2)
-        
-        # Name
-        name_label = QLabel(plugin_spec.get('name', plugin_spec.get('id')))
-        name_label.setStyleSheet("""
-            QLabel {
-                color: #FFFFFF;
-                font-weight: 700;
-                font-size: 13px;
-                border: none;
-                background: transparent;
-            }
-        """)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignVCenter)
-        name_source_layout.addWidget(name_label)
-        
-        # Source (package manager) with icon
-        source = self._get_package_source(plugin_spec)
-        source_icon_path = self._get_source_icon(source)
-        
-        # Create source layout with icon and text
-        source_layout = QHBoxLayout()
-        source_layout.setContentsMargins(6, 2, 6, 2)
-        source_layout.setSpacing(4)
-        
-        # Source icon
-        source_icon_label = QLabel()
-        source_icon_label.setFixedSize(12, 12)
-        try:
-            source_pixmap = QPixmap(source_icon_path)
-            if not source_pixmap.isNull():
-                source_icon_label.setPixmap(source_pixmap.scaled(12, 12, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-            else:
-                source_icon_label.setText("📦")
-                source_icon_label.setStyleSheet("font-size: 10px;")
-        except Exception:
-            source_icon_label.setText("📦")
-            source_icon_label.setStyleSheet("font-size: 10px;")
-        
-        # Source text
-        source_text_label = QLabel(source)
-        source_text_label.setStyleSheet("""
-            QLabel {
-                color: #00BFAE;
-                font-size: 9px;
-                font-weight: 600;
-                border: none;
-                background: transparent;
-            }
-        """)
-        
-        source_layout.addWidget(source_icon_label)
-        source_layout.addWidget(source_text_label)
-        source_layout.addStretch()
-        
-        # Source container with background
-        source_container = QWidget()
-        source_container.setLayout(source_layout)
-        source_container.setStyleSheet("""
-            QWidget {
-                background: rgba(0, 191, 174, 0.1);
-                border-radius: 6px;
-            }
-        """)
-        name_source_layout.addWidget(source_container)
-        
-        icon_name_layout.addLayout(name_source_layout, 1)
-        left_layout.addLayout(icon_name_layout)
-        
-        # Description
-        desc_label = QLabel(plugin_spec.get('desc', ''))
-        desc_label.setStyleSheet("""
-            QLabel {
-                color: #B0B0B0;
-                font-size: 10px;
-                border: none;
-                background: transparent;
-                line-height: 1.3;
-            }
-        """)
-        desc_label.setWordWrap(True)
-        desc_label.setMaximumHeight(28)
-        left_layout.addWidget(desc_label)
-        
-        left_layout.addStretch()
-        layout.addLayout(left_layout, 1)
-        
-        # Right side: Buttons
-        btn_layout = QVBoxLayout()
-        btn_layout.setContentsMargins(0, 0, 0, 0)
-        btn_layout.setSpacing(8)
-        btn_layout.addStretch()
-        
-        if installed:
-            # Open button (filled white)
-            open_btn = QPushButton("Open")
-            open_btn.setFixedHeight(34)
-            open_btn.setMinimumWidth(85)
-            open_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #FFFFFF;
-                    color: #1a1a1a;
-                    border: none;
-                    border-radius: 10px;
-                    font-weight: 700;
-                    font-size: 12px;
-                    padding: 0px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #F5F5F5;
-                    color: #000000;
-                }
-                QPushButton:pressed {
-                    background-color: #E8E8E8;
-                }
-            """)
-            open_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            open_btn.clicked.connect(lambda: self.launch_requested.emit(plugin_spec['id']))
-            btn_layout.addWidget(open_btn)
-            
-            # Uninstall button (outlined)
-            uninstall_btn = QPushButton("Uninstall")
-            uninstall_btn.setFixedHeight(32)
-            uninstall_btn.setMinimumWidth(85)
-            uninstall_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    color: #E0E0E0;
-                    border: 1px solid rgba(255, 255, 255, 0.3);
-                    border-radius: 10px;
-                    font-weight: 600;
-                    font-size: 11px;
-                    padding: 0px 12px;
-                }
-                QPushButton:hover {
-                    border: 1px solid rgba(0, 191, 174, 0.8);
-                    color: #00BFAE;
-                    background-color: rgba(0, 191, 174, 0.1);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(0, 191, 174, 0.2);
-                    border: 1px solid rgba(0, 191, 174, 1.0);
-                }
-            """)
-            uninstall_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            uninstall_btn.clicked.connect(lambda: (card.set_installing(True), self.uninstall_requested.emit(plugin_spec['id'])))
-            btn_layout.addWidget(uninstall_btn)
-        else:
-            # Install button (filled teal)
-            install_btn = QPushButton("Install")
-            install_btn.setFixedHeight(34)
-            install_btn.setMinimumWidth(85)
-            install_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #00BFAE;
-                    color: white;
-                    border: none;
-                    border-radius: 10px;
-                    font-weight: 700;
-                    font-size: 12px;
-                    padding: 0px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #00D4C4;
-                    color: white;
-                }
-                QPushButton:pressed {
-                    background-color: #009080;
-                }
-            """)
-            install_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            install_btn.clicked.connect(lambda: (card.set_installing(True), self.install_requested.emit(plugin_spec['id'])))
-            btn_layout.addWidget(install_btn)
-        
-        btn_layout.addStretch()
-        layout.addLayout(btn_layout)
-        
-        return card
+        return plugin_grid.source_icon_path(source)
 
     def _icon_for(self, spec):
         try:
-            path = spec.get('icon')
-            if path and os.path.exists(path):
-                return self.get_icon_callback(os.path.normpath(path), 36)
-
-            # Try to resolve using available files (supports svg/png/jpg/jpeg) with aliases
-            resolved = self._find_plugin_icon_file(spec)
-            if resolved and os.path.exists(resolved):
+            if spec.get('icon_resolved'):
+                return self.get_icon_callback(spec['icon'], 36)
+            resolved = plugin_catalogue.resolve_icon(spec)
+            if resolved:
                 return self.get_icon_callback(os.path.normpath(resolved), 36)
-
             # Fallback to default plugin icon
-            fallback = os.path.join(os.path.dirname(__file__), "..", "assets", "icons", "plugins.svg")
-            return self.get_icon_callback(os.path.normpath(fallback), 36)
+            return self.get_icon_callback(plugin_catalogue.FALLBACK_ICON, 36)
         except Exception:
             return QIcon()
 
     def _normalize_name(self, s: str) -> str:
-        try:
-            return re.sub(r'[^a-z0-9]', '', (s or '').lower())
-        except Exception:
-            s = (s or '').lower()
-            return s.replace('-', '').replace('_', '').replace(' ', '')
+        return plugin_catalogue.normalize_name(s)
 
     def _candidate_aliases(self, spec) -> list:
-        pid = (spec.get('id') or '')
-        name = (spec.get('name') or '')
-        aliases = []
-
-        def add(x):
-            if x and x not in aliases:
-                aliases.append(x)
-
-        # Base identifiers
-        add(pid)
-        add(name)
-        add(pid.replace('-', ''))
-        add(pid.replace('-', '_'))
-        add(pid.replace('_', ''))
-        add((name or '').replace(' ', ''))
-        add((name or '').replace(' ', '-').lower())
-        add((name or '').replace(' ', '').lower())
-
-        # Explicit aliases for known mismatches and alt names
-        alias_map = {
-            'bleachbit': ['BleachBit', 'bleachbit'],
-            'timeshift': ['timeshift'],
-            'baobab': ['diskusageanalyzer', 'baobab'],
-            'deja-dup': ['dejadup', 'DejaDup'],
-            'gparted': ['gparted'],
-            'gnome-disk-utility': ['gnome-disks', 'gnomedisks', 'gnomeDis'],
-            'pavucontrol': ['pavucontrol', 'pulseaudio'],
-            'system-config-printer': ['printer', 'printers'],
-            'btop': ['btop'],
-            'htop': ['htop'],
-            'gnome-system-monitor': ['system-monitor', 'gnomesystemmonitor', 'gnomeSystemMonitor'],
-            'simple-scan': ['simple-scan', 'documentscanner'],
-            'file-roller': ['file-roller', 'archive', 'achive', 'archivemanager', 'archiver'],
-            'nvidia-settings': ['nvidia-settings', 'nvidia', 'nvideasettings', 'nvidiasettings'],
-            'nvtop': ['nvtop'],
-        }
-        for a in alias_map.get(pid, []):
-            add(a)
-
-        return aliases
+        return plugin_catalogue.candidate_aliases(spec)
 
     def _find_plugin_icon_file(self, spec):
-        icons_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets", "icons", "plugins"))
         try:
-            files = []
-            try:
-                files = os.listdir(icons_dir)
-            except Exception:
-                files = []
-            if not files:
-                return None
-
-            # Build index by normalized stem per extension, prefer svg, then png, jpeg, jpg
-            exts = ['.svg', '.png', '.jpeg', '.jpg']
-            index = {e: {} for e in exts}
-            for fname in files:
-                path = os.path.join(icons_dir, fname)
-                if not os.path.isfile(path):
-                    continue
-                ext = os.path.splitext(fname)[1].lower()
-                if ext not in index:
-                    continue
-                stem = os.path.splitext(fname)[0]
-                key = self._normalize_name(stem)
-                # Do not overwrite existing mapping for same key/ext to keep first-found
-                index[ext].setdefault(key, path)
-
-            candidates = [self._normalize_name(a) for a in self._candidate_aliases(spec) if a]
-
-            # Exact match by preference order
-            for ext in exts:
-                for key in candidates:
-                    if key in index[ext]:
-                        return index[ext][key]
-
-            # Fallback: partial contains match (still following ext preference)
-            for ext in exts:
-                for key in candidates:
-                    for k2, p2 in index[ext].items():
-                        if key and (k2.startswith(key) or key in k2):
-                            return p2
-            return None
+            return plugin_catalogue.find_icon_file(spec)
         except Exception:
             return None
 
@@ -1493,63 +911,71 @@ class PluginsView(QWidget):
         except Exception:
             return False
 
-    def refresh_all(self):
-        """Refresh all plugin cards to reflect current installation state"""
+    def _cached_installed(self, spec):
+        """Installed state from the last bulk pass; cards are corrected when it finishes."""
+        return bool(self._installed_states.get(spec.get('id')))
+
+    def refresh_installed_states(self):
+        """Recompute installed state for the whole catalogue off the UI thread."""
+        if self._state_scan_running:
+            self._state_scan_again = True
+            return
+        self._state_scan_running = True
+        specs = list(self.plugins)
         try:
-            # Refresh slider cards to update Open/Install buttons
+            specs += plugin_catalogue.load_catalogue()['plugins']
+        except Exception:
+            pass
+        specs += [p for p in self._all_plugins if p.get('id') not in {s.get('id') for s in specs}]
+
+        def scan():
             try:
-                if hasattr(self, 'slider_layout'):
-                    for i in range(self.slider_layout.count()):
-                        card = self.slider_layout.itemAt(i).widget()
-                        if card and hasattr(card, 'card_state'):
-                            plugin = card.card_state.get_matching_plugin()
-                            if plugin:
-                                # Re-check if app is installed
-                                is_now_installed = self.is_installed(plugin)
-                                # Update button text
-                                buttons = card.findChildren(QPushButton)
-                                if buttons:
-                                    btn = buttons[0]
-                                    btn.setText("Open" if is_now_installed else "Install")
-                                    # Update the stored state for animation
-                                    card.card_state.set_installed_state(is_now_installed)
+                states = plugin_state.installed_states(specs)
             except Exception:
-                pass
-            
-            # Clear grid layout
-            while self.grid_layout.count():
-                item = self.grid_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-            
-            # Clear and rebuild all cards with updated installation status
-            self._all_cards = []
-            for plugin in self.plugins:
-                installed = self.is_installed(plugin)
-                icon = self._icon_for(plugin)
-                card = self.create_app_card(plugin, icon, installed)
-                self._all_cards.append({
-                    'plugin': plugin,
-                    'widget': card,
-                    'installed': installed
-                })
-            
-            # Rebuild grid with updated cards
-            cols = self._current_cols
-            for i in range(cols):
-                self.grid_layout.setColumnStretch(i, 1)
-            
-            for i, card_data in enumerate(self._all_cards):
-                row = i // cols
-                col = i % cols
-                self.grid_layout.addWidget(card_data['widget'], row, col)
+                states = {}
+            self.installed_states_ready.emit(states)
+
+        Thread(target=scan, daemon=True).start()
+
+    def _apply_installed_states(self, states):
+        self._state_scan_running = False
+        self._installed_states.update(states)
+        # An install/uninstall is over once the scan sees the state it was heading for
+        for plugin_id, target in list(self._pending_actions.items()):
+            if plugin_id in states and bool(states[plugin_id]) == target:
+                self.set_installing(plugin_id, False)
+        try:
+            for i in range(self.slider_layout.count()):
+                card = self.slider_layout.itemAt(i).widget()
+                plugin = card.card_state.get_matching_plugin() if card and hasattr(card, 'card_state') else None
+                if plugin and card.card_state.get_installed_state() != self._cached_installed(plugin):
+                    installed = self._cached_installed(plugin)
+                    buttons = card.findChildren(QPushButton)
+                    if buttons:
+                        buttons[0].setText("Open" if installed else "Install")
+                    card.card_state.set_installed_state(installed)
         except Exception:
             pass
+        if self._grid_model is not None:
+            # Only rows whose state changed are repainted; the scroll position is kept
+            changed = self._grid_model.set_installed(states)
+            if changed and self._filters_use_installed_state():
+                self.populate_app_cards()
+        if self._state_scan_again:
+            self._state_scan_again = False
+            self.refresh_installed_states()
+
+    def refresh_all(self):
+        """Re-check installed state; only cards whose state changed are repainted."""
+        self.refresh_installed_states()
 
     def get_plugin(self, plugin_id):
         for spec in self.plugins:
             if spec['id'] == plugin_id:
                 return spec
+        for spec in self._all_plugins:
+            if spec.get('id') == plugin_id:
+                return spec
         return None
 
     def set_filter(self, text: str, installed_only: bool, categories=None):
@@ -1560,596 +986,36 @@ class PluginsView(QWidget):
 
     def apply_filter(self):
         """Apply text, installed, and category filters to the plugins view"""
-        # Create cards if not already created
-        if not self._all_cards:
-            self._create_all_cards()
-        
-        # Clear the grid layout
-        while self.grid_layout.count():
-            _ = self.grid_layout.takeAt(0)
-        
-        # Reset row stretches before re-adding cards
-        self._reset_row_stretches()
-        
-        # Hide all cards first
-        for card_data in self._all_cards:
-            card_data['widget'].hide()
-        
-        # Filter and display cards based on search text, installed status, and categories
-        filtered_cards = []
-        for card_data in self._all_cards:
-            plugin = card_data['plugin']
-            is_installed = card_data['installed']
-            
-            # Check installed filter
-            if self._installed_only and not is_installed:
-                continue
-            
-            # Check category filter
-            if self._categories:
-                plugin_category = plugin.get('category', '')
-                if plugin_category not in self._categories:
-                    continue
-            
-            # Check search text filter
-            if self._filter_text:
-                name = (plugin.get('name', '') or '').lower()
-                desc = (plugin.get('desc', '') or '').lower()
-                plugin_id = (plugin.get('id', '') or '').lower()
-                
-                # Match if search text is in name, description, or id
-                if not (self._filter_text in name or self._filter_text in desc or self._filter_text in plugin_id):
-                    continue
-            
-            filtered_cards.append(card_data)
-        
-        # Use tracked column count
-        cols = self._current_cols
-        
-        # Set column stretching dynamically
-        for i in range(cols):
-            self.grid_layout.setColumnStretch(i, 1)
-        
-        # Add filtered cards to layout and show them
-        for i, card_data in enumerate(filtered_cards):
-            row = i // cols
-            col = i % cols
-            card_data['widget'].show()
-            self.grid_layout.addWidget(card_data['widget'], row, col)
-        # Ensure the layout can scroll and does not keep a big empty bottom gap
-        max_row = ((len(filtered_cards) - 1) // cols) if filtered_cards else 0
-        self.grid_layout.setRowStretch(max_row + 1, 1)
-        if not self._selected_category:
-            QTimer.singleShot(50, self._ensure_scrollbar_visible)
-        QTimer.singleShot(10, self._adjust_bottom_stretch)
+        self.populate_app_cards()
 
     def set_installing(self, plugin_id: str, installing: bool):
         """Update installing state for a plugin card"""
+        if not installing:
+            self._pending_actions.pop(plugin_id, None)
         try:
-            # Find the card with this plugin_id
-            for card_data in self._all_cards:
-                if card_data['plugin'].get('id') == plugin_id:
-                    card = card_data['widget']
-                    if hasattr(card, 'set_installing'):
-                        card.set_installing(installing)
-                    break
+            if self._grid_model is not None:
+                self._grid_model.set_installing(plugin_id, installing)
         except Exception:
             pass
     
     def filter_by_category(self, category):
         """Handle category selection from dropdown menu"""
         self._selected_category = category
-        self._category_filtered_plugins = []
-        self._category_loaded_count = 0
         self.populate_app_cards()
     
     def show_all_apps(self):
-        """Show all apps by clearing category filter and initializing pagination"""
+        """Show all apps by clearing category filter"""
         self._selected_category = None
-        
-        # Initialize pagination for "All" tab
-        if not self._all_plugins:
-            self._all_plugins = get_all_plugins_data()
-            self._loaded_count = 0
-            self._all_cards = []
-            
-            # Clear existing grid
-            while self.grid_layout.count():
-                _ = self.grid_layout.takeAt(0)
-            
-            # Load first batch sized to fill visible rows on current viewport
-            try:
-                viewport_w = self._scroll_area.viewport().width()
-                viewport_h = self._scroll_area.viewport().height()
-            except Exception:
-                viewport_w = self.width()
-                viewport_h = self.height()
-            cols = self._calc_cols(viewport_w)
-            visible_rows = self._calc_visible_rows(viewport_h)
-            initial_rows = visible_rows + 2  # fill screen + buffer
-            initial_batch = min(len(self._all_plugins), cols * initial_rows)
-            self._load_initial_batch(initial_batch)
-        else:
-            # Just refresh the current view
-            self._update_grid_layout()
-    
-    def _load_initial_batch(self, batch_size):
-        """Load the initial batch of plugins for the All tab"""
-        self._is_loading = True
-        self._begin_layout_update()
-        self._loading_container.setVisible(True)
-        
-        # Get initial batch
-        new_plugins = self._all_plugins[:batch_size]
-        
-        # Create cards for initial plugins
-        new_cards = []
-        for plugin in new_plugins:
-            installed = self.is_installed(plugin)
-            icon = self._icon_for(plugin)
-            card = self.create_app_card(plugin, icon, installed)
-            card_data = {
-                'plugin': plugin,
-                'widget': card,
-                'installed': installed
-            }
-            new_cards.append(card_data)
-        
-        # Reset any previous row stretch factors
-        try:
-            rc = max(0, self.grid_layout.rowCount())
-            for r in range(rc + 4):
-                self.grid_layout.setRowStretch(r, 0)
-        except Exception:
-            pass
-
-        # Add cards to grid using optimized positioning
-        cols = self._current_cols
-        for i in range(cols):
-            self.grid_layout.setColumnStretch(i, 1)
-            try:
-                self.grid_layout.setColumnMinimumWidth(i, 340)
-            except Exception:
-                pass
-        
-        # Pre-calculate maximum row needed for initial batch
-        max_position = len(new_cards) - 1
-        max_row_needed = max_position // cols
-        
-        # Add cards to positions
-        for i, card_data in enumerate(new_cards):
-            row = i // cols
-            col = i % cols
-            self.grid_layout.addWidget(card_data['widget'], row, col)
-        self.grid_layout.setRowStretch(max_row_needed + 1, 1)
-        self._enforce_row_min_heights(max_row_needed)
-        
-        self._all_cards.extend(new_cards)
-        self._loaded_count = batch_size
-        
-        # Hide loading indicator
-        QTimer.singleShot(300, self._hide_loading_indicator)
-        QTimer.singleShot(20, self._ensure_scrollbar_visible)
-        self._is_loading = False
-        self._finish_layout_update()
-    
-    def _load_initial_category_batch(self, batch_size):
-        if self._is_loading:
-            return
-        self._is_loading = True
-        self._begin_layout_update()
-        self._loading_container.setVisible(True)
-        cols = self._current_cols
-        for i in range(cols):
-            self.grid_layout.setColumnStretch(i, 1)
-        max_position = batch_size - 1
-        max_row_needed = max(0, max_position // max(1, cols))
-        for i in range(batch_size):
-            plugin = self._category_filtered_plugins[i]
-            card_data = self._get_or_create_card(plugin)
-            row = i // cols
-            col = i % cols
-            card_data['widget'].show()
-            self.grid_layout.addWidget(card_data['widget'], row, col)
-        self.grid_layout.setRowStretch(max_row_needed + 1, 1)
-        QTimer.singleShot(10, self._adjust_bottom_stretch)
-        self._category_loaded_count = batch_size
-        self._enforce_row_min_heights(max_row_needed)
-        QTimer.singleShot(300, self._hide_loading_indicator)
-        self._is_loading = False
-        self._finish_layout_update()
-    
-    def _hide_loading_indicator(self):
-        """Hide the loading indicator widget"""
-        if hasattr(self, '_loading_container'):
-            self._loading_container.setVisible(False)
-    
-    def _reset_row_stretches(self):
-        if not hasattr(self, 'grid_layout'):
-            return
-        try:
-            rc = max(0, self.grid_layout.rowCount())
-            for r in range(rc + 4):
-                self.grid_layout.setRowStretch(r, 0)
-        except Exception:
-            pass
-    
-    def _adjust_bottom_stretch(self):
-        """Keep a stretch row only when no scrollbar; remove it when scrolling is available."""
-        if not hasattr(self, 'grid_layout'):
-            return
-        try:
-            last_row = max(0, self.grid_layout.rowCount() - 1)
-            sb = None
-            try:
-                sb = self._scroll_area.verticalScrollBar() if hasattr(self, '_scroll_area') else None
-            except Exception:
-                sb = None
-            if sb and sb.maximum() > 0:
-                # Scrolling available, remove artificial stretch row
-                self.grid_layout.setRowStretch(last_row, 0)
-            else:
-                # No scrolling; keep stretch so content fills viewport cleanly
-                self.grid_layout.setRowStretch(last_row, 1)
-        except Exception:
-            pass
-    
-    def _ensure_scrollbar_visible(self):
-        """Auto-load more batches until the scrollbar appears (or we run out of items)."""
-        # Only applies for the infinite-scroll 'All' view
-        if getattr(self, '_selected_category', None):
-            return
-        if not hasattr(self, '_scroll_area'):
-            return
-        
-        state = {'attempts': 0}
-        
-        def _step():
-            if state['attempts'] >= 10:
-                self._adjust_bottom_stretch()
-                return
-            sb = self._scroll_area.verticalScrollBar()
-            if (sb.maximum() > 0) or (self._loaded_count >= len(self._all_plugins)):
-                # If last row is not full, top it off to avoid a one-time gap
-                try:
-                    viewport_w = self._scroll_area.viewport().width()
-                    cols = self._calc_cols(viewport_w)
-                except Exception:
-                    cols = max(1, int(self._current_cols) if hasattr(self, '_current_cols') else 1)
-                remaining = len(self._all_plugins) - self._loaded_count
-                need = (cols - (self._loaded_count % cols)) % cols
-                if need > 0 and remaining > 0:
-                    if self._is_loading:
-                        QTimer.singleShot(120, _step)
-                        return
-                    state['attempts'] += 1
-                    self._load_more_plugins()
-                    QTimer.singleShot(120, _step)
-                    return
-                self._adjust_bottom_stretch()
-                return
-            if self._is_loading:
-                QTimer.singleShot(120, _step)
-                return
-            state['attempts'] += 1
-            self._load_more_plugins()
-            QTimer.singleShot(120, _step)
-        
-        QTimer.singleShot(50, _step)
-    
-    def _ensure_category_scrollbar_visible(self):
-        if not hasattr(self, '_scroll_area'):
-            return
-        if not getattr(self, '_selected_category', None):
-            return
-        state = {'attempts': 0}
-        def _step():
-            if state['attempts'] >= 10:
-                self._adjust_bottom_stretch()
-                return
-            sb = self._scroll_area.verticalScrollBar()
-            if (sb.maximum() > 0) or (self._category_loaded_count >= len(self._category_filtered_plugins)):
-                try:
-                    viewport_w = self._scroll_area.viewport().width()
-                    cols = self._calc_cols(viewport_w)
-                except Exception:
-                    cols = max(1, int(self._current_cols) if hasattr(self, '_current_cols') else 1)
-                remaining = len(self._category_filtered_plugins) - self._category_loaded_count
-                need = (cols - (self._category_loaded_count % cols)) % cols
-                if need > 0 and remaining > 0:
-                    if self._is_loading:
-                        QTimer.singleShot(120, _step)
-                        return
-                    state['attempts'] += 1
-                    self._load_more_category()
-                    QTimer.singleShot(120, _step)
-                    return
-                self._adjust_bottom_stretch()
-                return
-            if self._is_loading:
-                QTimer.singleShot(120, _step)
-                return
-            state['attempts'] += 1
-            self._load_more_category()
-            QTimer.singleShot(120, _step)
-        QTimer.singleShot(50, _step)
-    
-    def resizeEvent(self, event):
-        """Handle window resize to update grid layout"""
-        super().resizeEvent(event)
-        # Debounce resize events to prevent performance issues
-        if hasattr(self, '_resize_timer'):
-            self._resize_timer.stop()
-            self._resize_timer.start(150)  # Wait 150ms after resize stops
-    
-    def _handle_resize(self):
-        """Handle debounced resize event"""
-        if not hasattr(self, 'grid_layout') or not self.plugins:
-            return
-            
-        # Determine new column count using actual viewport width
-        try:
-            viewport_width = self._scroll_area.viewport().width() if self._scroll_area else self.width()
-        except Exception:
-            viewport_width = self.width()
-        new_cols = self._calc_cols(viewport_width)
-        
-        # Only rebuild if column count changed
-        if new_cols != self._current_cols:
-            self._current_cols = new_cols
-            self._stop_deferred_loads()
-            # Use optimized layout update instead of full rebuild
-            self._update_grid_layout()
-    
-    def _update_grid_layout(self):
-        """Update grid layout without recreating cards"""
-        if not self._all_cards:
-            self.populate_app_cards()
-            return
-        if self._is_layouting:
-            return
-        self._begin_layout_update()
-        
-        try:
-            # Clear layout items
-            while self.grid_layout.count():
-                _ = self.grid_layout.takeAt(0)
-            
-            # Reset row stretches before re-layout
-            self._reset_row_stretches()
-            
-            # Get filtered cards
-            filtered_cards = self._all_cards
-            if self._selected_category:
-                if hasattr(self, '_category_filtered_plugins') and self._category_loaded_count:
-                    filtered_cards = [self._get_or_create_card(p) for p in self._category_filtered_plugins[:self._category_loaded_count]]
-                else:
-                    # Fallback build from full dataset
-                    if not self._all_plugins:
-                        self._all_plugins = get_all_plugins_data()
-                    filtered_cards = [self._get_or_create_card(p) for p in self._all_plugins if self._category_for(p) == self._selected_category]
-            
-            # Re-layout with new column count
-            cols = self._current_cols
-            for i in range(cols):
-                self.grid_layout.setColumnStretch(i, 1)
-                try:
-                    self.grid_layout.setColumnMinimumWidth(i, 340)
-                except Exception:
-                    pass
-            
-            for i, card_data in enumerate(filtered_cards):
-                row = i // cols
-                col = i % cols
-                self.grid_layout.addWidget(card_data['widget'], row, col)
-            max_row = ((len(filtered_cards) - 1) // cols) if filtered_cards else 0
-            self.grid_layout.setRowStretch(max_row + 1, 1)
-            self._enforce_row_min_heights(max_row)
-            # Adjust the bottom stretch so we don't keep a big empty row once scrolling is available
-            QTimer.singleShot(10, self._adjust_bottom_stretch)
-            if self._selected_category:
-                QTimer.singleShot(50, self._ensure_category_scrollbar_visible)
-            else:
-                QTimer.singleShot(50, self._ensure_scrollbar_visible)
-        finally:
-            self._finish_layout_update()
-    
-    def _on_scroll(self, value):
-        """Handle scroll events to detect when user reaches bottom"""
-        if self._is_loading or self._is_layouting or not hasattr(self, '_scroll_area'):
-            return
-            
-        scrollbar = self._scroll_area.verticalScrollBar()
-        max_value = scrollbar.maximum()
-        
-        if self._selected_category:
-            if max_value - value <= 150 and self._category_loaded_count < len(self._category_filtered_plugins):
-                if self._load_timer is not None:
-                    self._load_timer.stop()
-                self._load_timer = QTimer()
-                self._load_timer.setSingleShot(True)
-                self._load_timer.timeout.connect(self._load_more_category)
-                self._load_timer.start(100)
-        else:
-            if max_value - value <= 150 and self._loaded_count < len(self._all_plugins):
-                if self._load_timer is not None:
-                    self._load_timer.stop()
-                self._load_timer = QTimer()
-                self._load_timer.setSingleShot(True)
-                self._load_timer.timeout.connect(self._load_more_plugins)
-                self._load_timer.start(100)
-    
-    def _load_more_plugins(self):
-        """Load next batch of plugins with optimized performance"""
-        if self._is_loading or self._loaded_count >= len(self._all_plugins):
-            return
-            
-        self._is_loading = True
-        self._begin_layout_update()
-        self._loading_container.setVisible(True)
-        
-        # Calculate how many more plugins to load; align with row boundaries
-        remaining = len(self._all_plugins) - self._loaded_count
-        try:
-            viewport_w = self._scroll_area.viewport().width()
-        except Exception:
-            viewport_w = self.width()
-        cols = self._calc_cols(viewport_w)
-        target_total = ((self._loaded_count + self._batch_size + cols - 1) // cols) * cols
-        min_needed = max(cols, target_total - self._loaded_count)
-        batch_size = min(remaining, min_needed)
-        
-        # Get next batch of plugins
-        start_idx = self._loaded_count
-        end_idx = start_idx + batch_size
-        new_plugins = self._all_plugins[start_idx:end_idx]
-        
-        # Create cards for new plugins
-        new_cards = []
-        for plugin in new_plugins:
-            installed = self.is_installed(plugin)
-            icon = self._icon_for(plugin)
-            card = self.create_app_card(plugin, icon, installed)
-            card_data = {
-                'plugin': plugin,
-                'widget': card,
-                'installed': installed
-            }
-            new_cards.append(card_data)
-        
-        # Add new cards to the grid - optimized positioning
-        cols = self._current_cols
-        
-        # Pre-calculate maximum row needed
-        max_position = self._loaded_count + len(new_cards) - 1
-        max_row_needed = max_position // cols
-        
-        # Reset previous stretches so we don't leave a stretched empty row in the middle
-        self._reset_row_stretches()
-        
-        # Add cards to grid positions
-        for i, card_data in enumerate(new_cards):
-            total_position = self._loaded_count + i
-            row = total_position // cols
-            col = total_position % cols
-            self.grid_layout.addWidget(card_data['widget'], row, col)
-        
-        # Add a final stretch row to enable scrolling
-        self.grid_layout.setRowStretch(max_row_needed + 1, 1)
-        QTimer.singleShot(10, self._adjust_bottom_stretch)
-        self._enforce_row_min_heights(max_row_needed)
-        
-        # Add to all_cards list
-        self._all_cards.extend(new_cards)
-        self._loaded_count += batch_size
-        
-        # Hide loading indicator after a short delay
-        QTimer.singleShot(100, self._hide_loading_indicator)
-        self._is_loading = False
-        self._finish_layout_update()
-    
-    def _load_more_category(self):
-        if self._is_loading or self._category_loaded_count >= len(self._category_filtered_plugins):
-            return
-        self._is_loading = True
-        self._begin_layout_update()
-        self._loading_container.setVisible(True)
-        remaining = len(self._category_filtered_plugins) - self._category_loaded_count
-        try:
-            viewport_w = self._scroll_area.viewport().width()
-        except Exception:
-            viewport_w = self.width()
-        cols = self._calc_cols(viewport_w)
-        target_total = ((self._category_loaded_count + self._batch_size + cols - 1) // cols) * cols
-        min_needed = max(cols, target_total - self._category_loaded_count)
-        batch_size = min(remaining, min_needed)
-        max_position = self._category_loaded_count + batch_size - 1
-        max_row_needed = max_position // cols
-        self._reset_row_stretches()
-        for i in range(batch_size):
-            total_position = self._category_loaded_count + i
-            plugin = self._category_filtered_plugins[total_position]
-            card_data = self._get_or_create_card(plugin)
-            row = total_position // cols
-            col = total_position % cols
-            card_data['widget'].show()
-            self.grid_layout.addWidget(card_data['widget'], row, col)
-        self.grid_layout.setRowStretch(max_row_needed + 1, 1)
-        QTimer.singleShot(10, self._adjust_bottom_stretch)
-        self._category_loaded_count += batch_size
-        self._enforce_row_min_heights(max_row_needed)
-        QTimer.singleShot(100, self._hide_loading_indicator)
-        self._is_loading = False
+        self.populate_app_cards()
     
     def apply_filters(self, filter_states):
         """Apply Available/Installed filters to the plugins view"""
         # Store current filter states
         self._current_filter_states = filter_states
-        # Re-apply all filters (both status and source)
-        self._apply_combined_filters()
+        self.populate_app_cards()
     
     def apply_source_filters(self, source_states):
         """Apply source filters (pacman, AUR, Flatpak, npm) to the plugins view"""
         # Store current source states
         self._current_source_states = source_states
-        # Re-apply all filters (both status and source)
-        self._apply_combined_filters()
-    
-    def _apply_combined_filters(self):
-        """Apply both status and source filters together"""
-        # Create cards if not already created
-        if not self._all_cards:
-            self._create_all_cards()
-        
-        # Clear the grid layout
-        while self.grid_layout.count():
-            _ = self.grid_layout.takeAt(0)
-        
-        # Get filter states
-        show_available = self._current_filter_states.get('Available', True)
-        show_installed = self._current_filter_states.get('Installed', True)
-        
-        # Get source states
-        show_pacman = self._current_source_states.get('pacman', True)
-        show_aur = self._current_source_states.get('AUR', True)
-        show_flatpak = self._current_source_states.get('Flatpak', True)
-        show_npm = self._current_source_states.get('npm', True)
-        
-        # Filter cards based on both status and source
-        filtered_cards = []
-        for card_data in self._all_cards:
-            plugin = card_data['plugin']
-            is_installed = card_data['installed']
-            
-            # Check status filter
-            status_match = (is_installed and show_installed) or (not is_installed and show_available)
-            
-            # Check source filter
-            source = self._get_package_source(plugin).lower()
-            source_match = False
-            if source == 'pacman' and show_pacman:
-                source_match = True
-            elif source == 'aur' and show_aur:
-                source_match = True
-            elif source == 'flatpak' and show_flatpak:
-                source_match = True
-            elif source == 'npm' and show_npm:
-                source_match = True
-            
-            # Include card only if both filters match
-            if status_match and source_match:
-                filtered_cards.append(card_data)
-        
-        # Use tracked column count
-        cols = self._current_cols
-        
-        # Set column stretching dynamically
-        for i in range(cols):
-            self.grid_layout.setColumnStretch(i, 1)
-        
-        # Add filtered cards to layout and show them
-        for i, card_data in enumerate(filtered_cards):
-            row = i // cols
-            col = i % cols
-            card_data['widget'].show()
-            self.grid_layout.addWidget(card_data['widget'], row, col)
+        self.populate_app_cards()
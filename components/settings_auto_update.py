@@ -103,6 +103,12 @@ class AutoUpdateSettingsWidget(QWidget):
         self.interval_spin.valueChanged.connect(lambda v: self.app.update_setting('auto_update_interval_days', v))
         auto_grid.addWidget(self.interval_spin, 1, 1)
 
+        self.cb_prefetch = QCheckBox("Pre-download pending updates in the background")
+        self.cb_prefetch.setToolTip("When the system is idle, download pacman, Flatpak and npm updates ahead of time so installing them is quick")
+        self.cb_prefetch.setChecked(bool(self.app.settings.get('prefetch_updates', False)))
+        self.cb_prefetch.toggled.connect(lambda v: self.app.update_setting('prefetch_updates', v))
+        auto_grid.addWidget(self.cb_prefetch, 2, 0, 1, 2)
+
         self.layout.addWidget(update_box)
 
         # Snapshot Settings
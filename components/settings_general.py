@@ -1,6 +1,7 @@
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QGridLayout,
-                             QLabel, QCheckBox, QLineEdit, QPushButton, QFileDialog, QComboBox)
+                             QLabel, QCheckBox, QLineEdit, QPushButton, QFileDialog, QComboBox,
+                             QSpinBox)
 from PyQt6.QtCore import Qt
 from utils import sys_utils
 
@@ -115,8 +116,29 @@ class GeneralSettingsWidget(QWidget):
         self.cb_npm.toggled.connect(lambda v: self.app.update_setting('npm_user_mode', v))
         grid.addWidget(self.cb_npm, 2, 0, 1, 2)
 
+        # Persistent privileged helper
+        self.cb_priv_helper = QCheckBox("Authorize once per session for package operations")
+        self.cb_priv_helper.setToolTip("Start a root helper through polkit on first use; it runs allow-listed pacman operations and exits after 10 minutes without requests")
+        self.cb_priv_helper.setChecked(bool(self.app.settings.get('use_privileged_helper', False)))
+        self.cb_priv_helper.toggled.connect(lambda v: self.app.update_setting('use_privileged_helper', v))
+        grid.addWidget(self.cb_priv_helper, 3, 0, 1, 2)
+
+        # sudo keep-alive
+        self.cb_sudo_keepalive = QCheckBox("Keep sudo authorization alive during multi-step updates")
+        self.cb_sudo_keepalive.setChecked(bool(self.app.settings.get('sudo_keepalive', False)))
+        self.cb_sudo_keepalive.toggled.connect(lambda v: self.app.update_setting('sudo_keepalive', v))
+        grid.addWidget(self.cb_sudo_keepalive, 4, 0, 1, 2)
+
+        # How long to wait for another program's pacman lock
+        grid.addWidget(QLabel("Wait for pacman lock (seconds):"), 5, 0)
+        self.lock_timeout_spin = QSpinBox()
+        self.lock_timeout_spin.setRange(10, 3600)
+        self.lock_timeout_spin.setValue(int(self.app.settings.get('pacman_lock_timeout', 300)))
+        self.lock_timeout_spin.valueChanged.connect(lambda v: self.app.update_setting('pacman_lock_timeout', v))
+        grid.addWidget(self.lock_timeout_spin, 5, 1)
+
         # AUR Helper selection
-        grid.addWidget(QLabel("AUR Helper:"), 3, 0)
+        grid.addWidget(QLabel("AUR Helper:"), 6, 0)
         self.aur_helper_combo = QComboBox()
         
         # Get available AUR helpers
@@ -139,18 +161,18 @@ class GeneralSettingsWidget(QWidget):
             self.aur_helper_combo.setCurrentIndex(index)
         
         self.aur_helper_combo.currentIndexChanged.connect(self.on_aur_helper_changed)
-        grid.addWidget(self.aur_helper_combo, 3, 1)
+        grid.addWidget(self.aur_helper_combo, 6, 1)
         
         # Show currently detected helper
         detected_helper = sys_utils.get_aur_helper()
         if detected_helper:
             helper_status = QLabel(f"Currently using: {detected_helper}")
             helper_status.setStyleSheet("color: #888; font-size: 11px;")
-            grid.addWidget(helper_status, 4, 1)
+            grid.addWidget(helper_status, 7, 1)
         else:
             helper_status = QLabel("No AUR helper detected")
             helper_status.setStyleSheet("color: #d9534f; font-size: 11px;")
-            grid.addWidget(helper_status, 4, 1)
+            grid.addWidget(helper_status, 7, 1)
 
         self.layout.addWidget(basic_box)
 
@@ -3,7 +3,16 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QT
                              QHeaderView, QPushButton, QLabel, QTabWidget,
                              QMessageBox, QCheckBox, QDialog, QLineEdit, QTextEdit,
                              QComboBox, QFileDialog, QFormLayout)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+
+STAT_COLUMNS = ["Calls", "Total", "Mean", "p95", "Max", "Errors"]
+STATS_REFRESH_MS = 2000
+
+
+def _format_ms(value):
+    if value >= 1000:
+        return f"{value / 1000:.2f} s"
+    return f"{value:.1f} ms"
 
 class PluginsSettingsWidget(QWidget):
     def __init__(self, parent=None):
@@ -92,16 +101,22 @@ class PluginsSettingsWidget(QWidget):
         """)
         btn_reload.clicked.connect(self.app.reload_plugins_and_notify)
         core_actions.addWidget(btn_reload)
+        btn_export_profile = QPushButton("Export Hook Profile")
+        btn_export_profile.setStyleSheet(btn_reload.styleSheet())
+        btn_export_profile.setToolTip("Save per-plugin hook timings and errors as JSON")
+        btn_export_profile.clicked.connect(self.export_hook_profile)
+        core_actions.addWidget(btn_export_profile)
         core_actions.addStretch()
         core_layout.addLayout(core_actions)
         
         # Core Plugins Table
         self.core_plugins_table = QTableWidget()
-        self.core_plugins_table.setColumnCount(3)
-        self.core_plugins_table.setHorizontalHeaderLabels(["Enabled", "Plugin", "Location"])
+        self.core_plugins_table.setColumnCount(3 + len(STAT_COLUMNS))
+        self.core_plugins_table.setHorizontalHeaderLabels(["Enabled", "Plugin", "Location"] + STAT_COLUMNS)
         self.core_plugins_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.core_plugins_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.core_plugins_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        for col in range(2, 3 + len(STAT_COLUMNS)):
+            self.core_plugins_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
         self.core_plugins_table.setStyleSheet("""
             QTableWidget {
                 background-color: rgba(255, 255, 255, 0.03);
@@ -251,6 +266,11 @@ class PluginsSettingsWidget(QWidget):
         # Initialize tables
         self.refresh_plugins_table()
         self.core_plugins_table.itemChanged.connect(self.on_plugin_item_changed)
+
+        # Hook timings keep changing while the app runs; refresh them while visible
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(STATS_REFRESH_MS)
+        self._stats_timer.timeout.connect(self.refresh_plugin_stats)
         
         # Initialize community bundles
         self.refresh_community_bundles()
@@ -276,6 +296,90 @@ class PluginsSettingsWidget(QWidget):
             self.core_plugins_table.setItem(row, 2, loc_item)
 
         self._plugins_populating = False
+        self.refresh_plugin_stats()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # The Settings panel is built once and reused, so plugins installed, removed
+        # or reset elsewhere (and newly shared bundles) are picked up here
+        self.refresh_plugins_table()
+        self.refresh_community_bundles()
+        self._stats_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._stats_timer.stop()
+
+    def refresh_plugin_stats(self):
+        """Fill the timing columns from the plugin host's hook profiler."""
+        host = getattr(self.app, 'plugin_host', None)
+        if host is None:
+            return
+        profiler = host.profiler
+        snapshot = profiler.snapshot()
+        status = host.status()
+        self._plugins_populating = True
+        try:
+            for row in range(self.core_plugins_table.rowCount()):
+                name_item = self.core_plugins_table.item(row, 1)
+                if not name_item:
+                    continue
+                name = name_item.text().strip()
+                summary = profiler.plugin_summary(name)
+                if summary is None:
+                    values = [""] * len(STAT_COLUMNS)
+                else:
+                    values = [str(summary['calls']), _format_ms(summary['total_ms']), _format_ms(summary['mean_ms']),
+                              _format_ms(summary['p95_ms']), _format_ms(summary['max_ms']), str(summary['errors'])]
+                tooltip = self._stats_tooltip(snapshot.get(name, {}), status.get(name))
+                for offset, value in enumerate(values):
+                    col = 3 + offset
+                    item = self.core_plugins_table.item(row, col)
+                    if item is None:
+                        item = QTableWidgetItem()
+                        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                        self.core_plugins_table.setItem(row, col, item)
+                    if item.text() != value:
+                        item.setText(value)
+                    item.setToolTip(tooltip)
+                errors_item = self.core_plugins_table.item(row, 3 + STAT_COLUMNS.index("Errors"))
+                if errors_item is not None:
+                    errors_item.setForeground(Qt.GlobalColor.red if summary and summary['errors'] else Qt.GlobalColor.gray)
+        finally:
+            self._plugins_populating = False
+
+    @staticmethod
+    def _stats_tooltip(hooks, status):
+        lines = []
+        for hook in sorted(hooks):
+            h = hooks[hook]
+            lines.append(f"{hook}: {h['calls']} calls, mean {_format_ms(h['mean_ms'])}, "
+                         f"p95 {_format_ms(h['p95_ms'])}, max {_format_ms(h['max_ms'])}, {h['errors']} errors")
+            for err in h['last_errors']:
+                lines.append(f"    {err}")
+        if status and not status.get('loaded'):
+            lines.append("Not imported yet: none of its declared hooks has fired")
+        if status and status.get('disabled'):
+            lines.append("Disabled for this session: hooks kept overrunning their time budget")
+        elif status and status.get('flagged'):
+            lines.append(f"Overran its time budget ({status.get('overruns', 0)} in a row)")
+        return "\n".join(lines) or "No hooks called yet"
+
+    def export_hook_profile(self):
+        """Save the hook profiler snapshot as JSON."""
+        host = getattr(self.app, 'plugin_host', None)
+        if host is None:
+            return
+        default = os.path.join(os.path.expanduser('~'), "neoarch-plugin-profile.json")
+        path, _ = QFileDialog.getSaveFileName(self, "Export Hook Profile", default, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            count = host.profiler.export(path, host.status())
+            self.app._show_message("Export Hook Profile", f"Saved timings of {count} plugin(s) to {path}")
+        except Exception as e:
+            self.app._show_message("Export Hook Profile", f"Failed: {e}")
 
     def on_plugin_item_changed(self, item):
         if getattr(self, '_plugins_populating', False):
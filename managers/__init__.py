@@ -1,11 +1,19 @@
-"""Manager modules for NeoArch package manager."""
+"""Manager modules for NeoArch package manager.
 
-from . import git_manager
-from . import docker_manager
-from . import plugin_manager
+Submodules are imported on first access so that loading the plugin manager
+at startup does not also import the Git and Docker panels.
+"""
+
+import importlib
 
 __all__ = [
     'git_manager',
     'docker_manager',
     'plugin_manager',
 ]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
@@ -10,6 +10,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer, QPoint
 from PyQt6.QtGui import QPixmap, QPainter, QIcon, QColor, QCursor
 from PyQt6.QtSvg import QSvgRenderer
+from utils.process_runner import run_command
 
 
 class DockerManager(QObject):
@@ -357,17 +358,10 @@ class DockerManager(QObject):
             pass
         self.log_signal.emit(f"Pulling image: {image}")
         try:
-            p = subprocess.Popen(["docker", "pull", image], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            while True:
-                line = p.stdout.readline() if p.stdout else ""
-                if not line and p.poll() is not None:
-                    break
-                if line:
-                    self.log_signal.emit(line.strip())
-            _, err = p.communicate()
-            if p.returncode != 0:
-                if err:
-                    self.log_signal.emit(err.strip())
+            result = run_command(["docker", "pull", image], on_stdout=self.log_signal.emit)
+            if result.returncode != 0:
+                if result.stderr:
+                    self.log_signal.emit(result.stderr)
                 self.show_message.emit("Docker Pull Failed", f"Failed to pull {image}")
                 return False
             self.show_message.emit("Docker", f"Pulled {image}")
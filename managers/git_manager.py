@@ -8,6 +8,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer
 from PyQt6.QtGui import QPixmap, QPainter, QIcon, QColor
 from PyQt6.QtSvg import QSvgRenderer
+from utils.process_runner import run_command
 
 
 class GitManager(QObject):
@@ -333,7 +334,7 @@ class GitManager(QObject):
                 if os.path.exists(clone_path):
                     self.log_signal.emit(f"Directory {clone_path} already exists. Pulling latest changes...")
                     pull_cmd = ["git", "-C", clone_path, "pull"]
-                    pull_result = subprocess.run(pull_cmd, capture_output=True, text=True, timeout=60)
+                    pull_result = run_command(pull_cmd, on_stdout=self.log_signal.emit, timeout=60)
                     if pull_result.returncode != 0:
                         self.log_signal.emit(f"Failed to pull latest changes: {pull_result.stderr}")
                         self.show_message.emit("Git Update Failed", f"Failed to update repository: {pull_result.stderr}")
@@ -343,7 +344,7 @@ class GitManager(QObject):
                     # Clone the repository
                     self.log_signal.emit("Cloning repository...")
                     clone_cmd = ["git", "clone", git_url, clone_path]
-                    clone_result = subprocess.run(clone_cmd, capture_output=True, text=True, timeout=300)
+                    clone_result = run_command(clone_cmd, on_stdout=self.log_signal.emit, timeout=300)
 
                     if clone_result.returncode != 0:
                         self.log_signal.emit(f"Failed to clone repository: {clone_result.stderr}")
@@ -359,7 +360,7 @@ class GitManager(QObject):
                 if os.path.exists(os.path.join(clone_path, "Cargo.toml")):
                     self.log_signal.emit("Detected Rust project, installing with cargo...")
                     install_cmd = ["cargo", "install", "--path", clone_path]
-                    install_result = subprocess.run(install_cmd, capture_output=True, text=True, timeout=600)
+                    install_result = run_command(install_cmd, on_stdout=self.log_signal.emit, timeout=600)
 
                     if install_result.returncode == 0:
                         self.log_signal.emit("Rust package installed successfully")
@@ -392,7 +393,7 @@ class GitManager(QObject):
 
                     success = True
                     for cmd in configure_cmds:
-                        result = subprocess.run(cmd, cwd=clone_path, capture_output=True, text=True, timeout=600)
+                        result = run_command(cmd, on_stdout=self.log_signal.emit, cwd=clone_path, timeout=600)
                         if result.returncode != 0:
                             self.log_signal.emit(f"Command failed: {' '.join(cmd)}")
                             self.log_signal.emit(f"Error: {result.stderr}")
@@ -419,7 +420,7 @@ class GitManager(QObject):
                     success = True
                     for cmd in build_cmds:
                         self.log_signal.emit(f"Running: {' '.join(cmd)}")
-                        result = subprocess.run(cmd, cwd=clone_path, capture_output=True, text=True, timeout=600)
+                        result = run_command(cmd, on_stdout=self.log_signal.emit, cwd=clone_path, timeout=600)
                         if result.returncode != 0:
                             self.log_signal.emit(f"Command failed: {' '.join(cmd)}")
                             self.log_signal.emit(f"Error: {result.stderr}")
@@ -494,8 +495,7 @@ class GitManager(QObject):
                 repo_path = os.path.join(git_repos_dir, repo)
                 try:
                     self.log_signal.emit(f"Updating {repo}...")
-                    result = subprocess.run(["git", "-C", repo_path, "pull"],
-                                          capture_output=True, text=True, timeout=60)
+                    result = run_command(["git", "-C", repo_path, "pull"], on_stdout=self.log_signal.emit, timeout=60)
                     if result.returncode == 0:
                         updated += 1
                         self.log_signal.emit(f"✓ Updated {repo}")
@@ -551,8 +551,7 @@ class GitManager(QObject):
                 repo_path = os.path.join(git_repos_dir, repo)
                 try:
                     self.log_signal.emit(f"Cleaning {repo}...")
-                    result = subprocess.run(["git", "-C", repo_path, "clean", "-fdx"],
-                                          capture_output=True, text=True, timeout=30)
+                    result = run_command(["git", "-C", repo_path, "clean", "-fdx"], on_stdout=self.log_signal.emit, timeout=30)
                     if result.returncode == 0:
                         cleaned += 1
                         self.log_signal.emit(f"✓ Cleaned {repo}")
@@ -2,7 +2,6 @@ import os
 import shutil
 import subprocess
 from threading import Thread
-from PyQt6.QtCore import QTimer
 
 
 class PluginsManager:
@@ -13,15 +12,18 @@ class PluginsManager:
         try:
             spec = plugins_view.get_plugin(plugin_id)
             if not spec:
+                plugins_view.set_installing(plugin_id, False)
                 return
             # Already installed?
             if plugins_view.is_installed(spec):
                 self._message("Plugins", f"{spec.get('name')} is already installed")
-                QTimer.singleShot(0, plugins_view.refresh_all)
+                plugins_view.set_installing(plugin_id, False)
+                plugins_view.refresh_all()
                 return
             pkg = spec.get('pkg')
             if not pkg:
                 self._message("Plugins", "No package specified for installation")
+                plugins_view.set_installing(plugin_id, False)
                 return
             from utils.workers import get_auth_command
             auth_cmd = get_auth_command()
@@ -30,7 +32,7 @@ class PluginsManager:
 
             def _run():
                 try:
-                    QTimer.singleShot(0, lambda: plugins_view.set_installing(plugin_id, True))
+                    self._ui(lambda: plugins_view.set_installing(plugin_id, True))
                     proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
                     for line in proc.stdout:  # type: ignore
                         if line:
@@ -43,12 +45,14 @@ class PluginsManager:
                 except Exception as e:
                     self._message("Plugins", f"Install failed: {e}")
                 finally:
-                    QTimer.singleShot(0, lambda: plugins_view.set_installing(plugin_id, False))
-                    QTimer.singleShot(200, plugins_view.refresh_all)
+                    # Worker thread: Qt timers started here never fire, post to the UI thread
+                    self._ui(lambda: plugins_view.set_installing(plugin_id, False))
+                    self._ui(plugins_view.refresh_all)
 
             Thread(target=_run, daemon=True).start()
         except Exception as e:
             self._message("Plugins", f"Install error: {e}")
+            self._clear_installing(plugins_view, plugin_id)
 
     def launch_by_id(self, plugins_view, plugin_id):
         try:
@@ -83,14 +87,17 @@ class PluginsManager:
         try:
             spec = plugins_view.get_plugin(plugin_id)
             if not spec:
+                plugins_view.set_installing(plugin_id, False)
                 return
             pkg = spec.get('pkg')
             if not pkg:
                 self._message("Plugins", "No package specified for uninstall")
+                plugins_view.set_installing(plugin_id, False)
                 return
             # If not installed, just refresh UI
             if not plugins_view.is_installed(spec):
-                QTimer.singleShot(0, plugins_view.refresh_all)
+                plugins_view.set_installing(plugin_id, False)
+                plugins_view.refresh_all()
                 return
             from utils.workers import get_auth_command
             auth_cmd = get_auth_command()
@@ -99,7 +106,7 @@ class PluginsManager:
 
             def _run():
                 try:
-                    QTimer.singleShot(0, lambda: plugins_view.set_installing(plugin_id, True))
+                    self._ui(lambda: plugins_view.set_installing(plugin_id, True))
                     proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
                     for line in proc.stdout:  # type: ignore
                         if line:
@@ -112,12 +119,14 @@ class PluginsManager:
                 except Exception as e:
                     self._message("Plugins", f"Uninstall failed: {e}")
                 finally:
-                    QTimer.singleShot(0, lambda: plugins_view.set_installing(plugin_id, False))
-                    QTimer.singleShot(200, plugins_view.refresh_all)
+                    # Worker thread: Qt timers started here never fire, post to the UI thread
+                    self._ui(lambda: plugins_view.set_installing(plugin_id, False))
+                    self._ui(plugins_view.refresh_all)
 
             Thread(target=_run, daemon=True).start()
         except Exception as e:
             self._message("Plugins", f"Uninstall error: {e}")
+            self._clear_installing(plugins_view, plugin_id)
 
     def open_plugins_folder(self):
         try:
@@ -130,6 +139,20 @@ class PluginsManager:
         except Exception as e:
             self._message("Plugins", f"Cannot open folder: {e}")
 
+    def _ui(self, fn):
+        """Run ``fn`` on the UI thread (safe from worker threads)."""
+        try:
+            self.app.ui_call.emit(fn)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _clear_installing(plugins_view, plugin_id):
+        try:
+            plugins_view.set_installing(plugin_id, False)
+        except Exception:
+            pass
+
     def _log(self, msg):
         try:
             self.app.log_signal.emit(msg)
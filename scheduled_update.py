@@ -5,6 +5,7 @@ Runs independently to check for updates and prompt user when app is not running
 """
 
 import time
+import shutil
 import subprocess
 import os
 import json
@@ -138,83 +139,106 @@ class ScheduledUpdater:
     def perform_update(self):
         """Perform the actual system update"""
         print("Starting scheduled system updates...")
+        from utils.update_pipeline import PhaseTimings, snapshot_then_install
+        from services import prefetch_service
 
-        # Create snapshot before updates if enabled
-        if self.settings.get('snapshot_before_update', False):
-            self.create_snapshot()
-
+        timings = PhaseTimings()
         update_success = False
 
-        # Update pacman packages
-        if self.cmd_exists("pacman"):
+        # The snapshot and the package downloads run side by side; only the
+        # install waits for both
+        snapshot = self.create_snapshot if self.settings.get('snapshot_before_update', False) else None
+
+        def download():
+            if not self.cmd_exists("pacman"):
+                return False
+            print("Downloading pacman updates...")
+            return prefetch_service.download_system_upgrade(log=print)
+
+        def install(results):
+            if not self.cmd_exists("pacman"):
+                return False
+            if snapshot is not None and results.get('snapshot') is not True:
+                print("Continuing without a pre-update snapshot")
             print("Updating pacman packages...")
             # Import here to avoid circular imports
             from utils.workers import get_auth_command
             from services.askpass_service import prepare_askpass_env
-            
+
             env, _ = prepare_askpass_env()
             auth_cmd = get_auth_command(env)
-            cmd = auth_cmd + ["pacman", "-Syu", "--noconfirm"]
+            cmd = auth_cmd + ["pacman", "-Syu", "--noconfirm"] + prefetch_service.cachedir_args()
             print(f"Using {auth_cmd[0]} for pacman authentication")
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800, env=env)
             if result.returncode == 0:
                 print("Pacman updates completed successfully")
-                update_success = True
-            else:
-                print(f"Pacman update failed: {result.stderr}")
+                shutil.rmtree(prefetch_service.PACMAN_CACHE_DIR, ignore_errors=True)
+                return True
+            print(f"Pacman update failed: {result.stderr}")
+            return False
+
+        results = snapshot_then_install(download, install, snapshot=snapshot, timings=timings)
+        if results.get('install') is True:
+            update_success = True
 
         # Update AUR packages if an AUR helper is available
-        aur_helper = sys_utils.get_aur_helper()
-        if aur_helper:
-            print(f"Updating AUR packages using {aur_helper}...")
-            try:
-                env = os.environ.copy()
-                result = subprocess.run([aur_helper, "-Syu", "--noconfirm", "--sudoflags", "-A"],
-                                      capture_output=True, text=True, timeout=1800, env=env)
-                if result.returncode == 0:
-                    print("AUR updates completed successfully")
-                    update_success = True
-                else:
-                    print(f"AUR update failed: {result.stderr}")
-            except Exception as e:
-                print(f"AUR update error: {e}")
+        with timings.phase('aur'):
+            aur_helper = sys_utils.get_aur_helper()
+            if aur_helper:
+                print(f"Updating AUR packages using {aur_helper}...")
+                try:
+                    env = os.environ.copy()
+                    result = subprocess.run([aur_helper, "-Syu", "--noconfirm", "--sudoflags", "-A"],
+                                          capture_output=True, text=True, timeout=1800, env=env)
+                    if result.returncode == 0:
+                        print("AUR updates completed successfully")
+                        update_success = True
+                    else:
+                        print(f"AUR update failed: {result.stderr}")
+                except Exception as e:
+                    print(f"AUR update error: {e}")
 
         # Update Flatpak
-        if self.cmd_exists("flatpak"):
-            print("Updating Flatpak packages...")
-            scopes = [["--user"], ["--system"]] if self.cmd_exists("sudo") else [["--user"]]
-            for scope in scopes:
+        with timings.phase('flatpak'):
+            if self.cmd_exists("flatpak"):
+                print("Updating Flatpak packages...")
+                scopes = [["--user"], ["--system"]] if self.cmd_exists("sudo") else [["--user"]]
+                for scope in scopes:
+                    try:
+                        result = subprocess.run(["flatpak"] + scope + ["update", "-y"],
+                                              capture_output=True, text=True, timeout=900)
+                        if result.returncode == 0:
+                            print(f"Flatpak {scope[0]} updates completed")
+                            update_success = True
+                        else:
+                            print(f"Flatpak {scope[0]} update failed: {result.stderr}")
+                    except Exception as e:
+                        print(f"Flatpak {scope[0]} update error: {e}")
+
+        # Update npm global packages
+        with timings.phase('npm'):
+            if self.cmd_exists("npm"):
+                print("Updating npm global packages...")
                 try:
-                    result = subprocess.run(["flatpak"] + scope + ["update", "-y"],
-                                          capture_output=True, text=True, timeout=900)
+                    env = os.environ.copy()
+                    npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
+                    os.makedirs(npm_prefix, exist_ok=True)
+                    env['npm_config_prefix'] = npm_prefix
+                    env['NPM_CONFIG_PREFIX'] = npm_prefix
+                    env['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env.get('PATH', '')
+
+                    result = subprocess.run(["npm", "update", "-g"],
+                                          capture_output=True, text=True, timeout=600, env=env)
                     if result.returncode == 0:
-                        print(f"Flatpak {scope[0]} updates completed")
+                        print("NPM global packages updated")
                         update_success = True
                     else:
-                        print(f"Flatpak {scope[0]} update failed: {result.stderr}")
+                        print(f"NPM update failed: {result.stderr}")
                 except Exception as e:
-                    print(f"Flatpak {scope[0]} update error: {e}")
+                    print(f"NPM update error: {e}")
 
-        # Update npm global packages
-        if self.cmd_exists("npm"):
-            print("Updating npm global packages...")
-            try:
-                env = os.environ.copy()
-                npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
-                os.makedirs(npm_prefix, exist_ok=True)
-                env['npm_config_prefix'] = npm_prefix
-                env['NPM_CONFIG_PREFIX'] = npm_prefix
-                env['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env.get('PATH', '')
-
-                result = subprocess.run(["npm", "update", "-g"],
-                                      capture_output=True, text=True, timeout=600, env=env)
-                if result.returncode == 0:
-                    print("NPM global packages updated")
-                    update_success = True
-                else:
-                    print(f"NPM update failed: {result.stderr}")
-            except Exception as e:
-                print(f"NPM update error: {e}")
+        print(f"Update timings: {timings.summary()}")
+        timings.save()
 
         if update_success:
             print(f"System update completed successfully! Next check in {self.settings.get('auto_update_interval_days', 7)} days.")
@@ -236,37 +260,8 @@ class ScheduledUpdater:
             print("Timeshift not installed - skipping snapshot")
             return False
 
-        # Count existing snapshots and clean up if needed
-        try:
-            result = subprocess.run(["timeshift", "--list"], capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                snapshot_count = sum(1 for line in lines if line.strip() and not line.startswith('Num') and not line.startswith('---'))
-
-                # Keep at most 2 snapshots: delete all but the 2 most recent
-                if snapshot_count > 2:
-                    delete_result = subprocess.run(["pkexec", "timeshift", "--delete-all", "--skip", "2"],
-                                                 capture_output=True, text=True, timeout=300)
-                    if delete_result.returncode == 0:
-                        print("Cleaned up old snapshots (kept latest 2)")
-                    else:
-                        print(f"Failed to clean up snapshots: {delete_result.stderr}")
-        except Exception as e:
-            print(f"Error checking snapshots: {e}")
-
-        # Create new snapshot
-        timestamp = subprocess.run(["date", "+%Y-%m-%d_%H-%M-%S"], capture_output=True, text=True).stdout.strip()
-        comment = f"NeoArch pre-update snapshot {timestamp}"
-
-        result = subprocess.run(["pkexec", "timeshift", "--create", "--comments", comment],
-                              capture_output=True, text=True, timeout=300)
-
-        if result.returncode == 0:
-            print(f"Pre-update snapshot created: {comment}")
-            return True
-        else:
-            print(f"Failed to create pre-update snapshot: {result.stderr}")
-            return False
+        from utils.update_pipeline import create_pre_update_snapshot
+        return create_pre_update_snapshot(log=print)
 
 
 def main():
@@ -7,6 +7,9 @@ from . import help_service
 from . import ignore_service
 from . import install_service
 from . import packages_service
+from . import prefetch_service
+from . import privileged_helper
+from . import queue_service
 from . import settings_service
 from . import snapshot_service
 from . import uninstall_service
@@ -20,6 +23,9 @@ __all__ = [
     'ignore_service',
     'install_service',
     'packages_service',
+    'prefetch_service',
+    'privileged_helper',
+    'queue_service',
     'settings_service',
     'snapshot_service',
     'uninstall_service',
@@ -1,6 +1,9 @@
 import os
+import stat
 import shutil
 import tempfile
+import threading
+import subprocess
 
 
 def get_sudo_askpass():
@@ -17,27 +20,11 @@ def get_sudo_askpass():
     return None
 
 
-def prepare_askpass_env():
-    env = os.environ.copy()
-    cleanup_path = None
-    
-    # Check if any GUI dialog tools are available
-    available_tools = []
-    for tool in ["kdialog", "zenity", "yad"]:
-        if shutil.which(tool):
-            available_tools.append(tool)
-    
-    # If no GUI tools available, return None to indicate failure
-    if not available_tools:
-        print("Warning: No GUI authentication tools found (kdialog, zenity, yad)")
-        return env, None
-    
-    # Ensure DISPLAY is set for GUI dialogs
-    if "DISPLAY" not in env:
-        env["DISPLAY"] = ":0"
-    
-    try:
-        script = """#!/bin/sh
+ASKPASS_NAME = "neoarch-askpass.sh"
+_askpass_lock = threading.Lock()
+_askpass_path = None
+
+ASKPASS_SCRIPT = """#!/bin/sh
 # Single-attempt password dialog - no retries
 title=${NEOARCH_ASKPASS_TITLE:-"NeoArch - AUR Install"}
 text=${NEOARCH_ASKPASS_TEXT:-"AUR packages are community-maintained and may be unsafe.\nEnter your password to proceed."}
@@ -85,28 +72,156 @@ echo "Password prompt successful" >> /tmp/neoarch-askpass.log
 echo "$result"
 exit 0
 """
-        # Try to create temp file in user's temp directory first
-        temp_dir = os.path.expanduser("~/.cache")
-        if not os.path.exists(temp_dir):
+
+
+def _askpass_dir():
+    for d in (os.path.join(os.path.expanduser("~/.cache"), "neoarch"), tempfile.gettempdir()):
+        try:
+            os.makedirs(d, exist_ok=True)
+            if os.access(d, os.W_OK):
+                return d
+        except Exception:
+            continue
+    return None
+
+
+def _script_is_current(path):
+    try:
+        st = os.lstat(path)
+        if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+            return False
+        with open(path) as f:
+            return f.read() == ASKPASS_SCRIPT
+    except OSError:
+        return False
+
+
+def askpass_script_path():
+    """Path of the session's askpass script, written once and reused by every caller."""
+    global _askpass_path
+    with _askpass_lock:
+        if _askpass_path and _script_is_current(_askpass_path):
+            return _askpass_path
+        d = _askpass_dir()
+        if d is None:
+            return None
+        path = os.path.join(d, ASKPASS_NAME)
+        if not _script_is_current(path):
+            fd, tmp = tempfile.mkstemp(prefix="neoarch-askpass-", suffix=".sh", dir=d)
             try:
-                os.makedirs(temp_dir, exist_ok=True)
+                with os.fdopen(fd, "w") as f:
+                    f.write(ASKPASS_SCRIPT)
+                os.chmod(tmp, 0o700)
+                os.replace(tmp, path)
             except Exception:
-                temp_dir = None
-        
-        if temp_dir and os.access(temp_dir, os.W_OK):
-            fd, path = tempfile.mkstemp(prefix="neoarch-askpass-", suffix=".sh", dir=temp_dir)
-        else:
-            fd, path = tempfile.mkstemp(prefix="neoarch-askpass-", suffix=".sh")
-            
-        with os.fdopen(fd, "w") as f:
-            f.write(script)
-        os.chmod(path, 0o700)
-        cleanup_path = path
-        env["SUDO_ASKPASS"] = path
-        env["SSH_ASKPASS"] = path
-        env["SUDO_ASKPASS_REQUIRE"] = "force"
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+        _askpass_path = path
+        return path
+
+
+def prepare_askpass_env():
+    """Environment with SUDO_ASKPASS set to the shared askpass script.
+
+    The script is reused across calls, so the returned cleanup path is
+    always None and callers must not delete SUDO_ASKPASS themselves.
+    """
+    env = os.environ.copy()
+
+    # Check if any GUI dialog tools are available
+    available_tools = []
+    for tool in ["kdialog", "zenity", "yad"]:
+        if shutil.which(tool):
+            available_tools.append(tool)
+
+    # If no GUI tools available, return None to indicate failure
+    if not available_tools:
+        print("Warning: No GUI authentication tools found (kdialog, zenity, yad)")
+        return env, None
+
+    # Ensure DISPLAY is set for GUI dialogs
+    if "DISPLAY" not in env:
+        env["DISPLAY"] = ":0"
+
+    try:
+        path = askpass_script_path()
+        if path:
+            env["SUDO_ASKPASS"] = path
+            env["SSH_ASKPASS"] = path
+            env["SUDO_ASKPASS_REQUIRE"] = "force"
     except Exception as e:
         # If we can't create the askpass script, log the error but continue
         print(f"Warning: Could not create askpass script: {e}")
-    
-    return env, cleanup_path
+
+    return env, None
+
+
+class SudoKeepAlive:
+    """Keep sudo's credential cache warm during a multi-step transaction.
+
+    ``start()`` validates once with ``sudo -A -v`` (one askpass prompt) and
+    then refreshes the timestamp with ``sudo -n -v`` every ``interval``
+    seconds until ``stop()``. sudo keys the timestamp on the parent process
+    when there is no tty, so later ``sudo -A`` calls from this process reuse
+    it instead of prompting again.
+    """
+
+    def __init__(self, env=None, interval=60):
+        self.env = env
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        try:
+            ok = subprocess.run(["sudo", "-A", "-v"], env=self.env, capture_output=True, timeout=120).returncode == 0
+        except Exception:
+            ok = False
+        if ok:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        return ok
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if subprocess.run(["sudo", "-n", "-v"], env=self.env, capture_output=True, timeout=30).returncode != 0:
+                    return
+            except Exception:
+                return
+
+    def stop(self):
+        self._stop.set()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def transaction_keepalive(app, sources=()):
+    """Started SudoKeepAlive for a multi-step transaction, or None.
+
+    Only used when the 'sudo_keepalive' setting is on and this process will
+    itself run ``sudo -A`` more than once (pacman and npm, when the
+    session's auth command is sudo). AUR helpers call sudo from their own
+    process, where our timestamp does not apply, so they don't count.
+    """
+    if not app.settings.get('sudo_keepalive', False):
+        return None
+    if len([s for s in sources if s in ('pacman', 'npm')]) < 2:
+        return None
+    env, _ = prepare_askpass_env()
+    if 'SUDO_ASKPASS' not in env:
+        return None
+    from utils.workers import get_auth_command
+    if get_auth_command(env)[:1] != ["sudo"]:
+        return None
+    keepalive = SudoKeepAlive(env)
+    return keepalive if keepalive.start() else None
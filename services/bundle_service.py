@@ -4,7 +4,7 @@ import subprocess
 from threading import Thread
 from utils.workers import CommandWorker
 from PyQt6.QtWidgets import QFileDialog, QTableWidgetItem, QLabel, QInputDialog, QMessageBox
-from . import install_service
+from . import queue_service
 
 
 def add_selected_to_bundle(app):
@@ -152,7 +152,7 @@ def install_bundle(app):
     if not by_src:
         app.display_message("Install Bundle", "No valid items to install")
         return
-    install_service.install_packages(app, by_src)
+    queue_service.submit(app, 'install', by_src)
 
 
 def add_selected_to_community(app):
@@ -1,7 +1,5 @@
-def apply_filters(app):
-    if app.current_view != "installed":
-        return
-    base = getattr(app, 'installed_all', []) or []
+def filter_installed_packages(app, base):
+    """Return the Installed packages that pass the current source and status filters."""
     selected_sources = {"pacman": True, "AUR": True, "Flatpak": True, "npm": True, "Local": True}
     if hasattr(app, 'source_card') and app.source_card:
         try:
@@ -27,7 +25,25 @@ def apply_filters(app):
             final.append(pkg)
         elif not pkg.get('has_update') and show_installed:
             final.append(pkg)
-    app.all_packages = final
+    return final
+
+
+def filter_update_packages(app, base):
+    """Return the Updates packages whose source is selected in the source card."""
+    selected_sources = {}
+    if hasattr(app, 'source_card') and app.source_card:
+        try:
+            selected_sources = app.source_card.get_selected_sources()
+        except Exception:
+            selected_sources = {}
+    return [pkg for pkg in base if selected_sources.get(pkg.get('source'), True)]
+
+
+def apply_filters(app):
+    if app.current_view != "installed":
+        return
+    base = getattr(app, 'installed_all', []) or []
+    app.all_packages = filter_installed_packages(app, base)
     app.current_page = 0
     app.package_table.setRowCount(0)
     app.display_page()
@@ -1,309 +1,288 @@
 import os
-import re
-import subprocess
-import time
 from threading import Thread, Event
-from utils.workers import CommandWorker
+from utils.workers import get_auth_command
+from utils.process_runner import ProcessRunner
+from utils.progress import CacheDownloadWatcher, CombinedProgress, parser_for_source
+from utils.scheduler import DomainScheduler, DOMAIN_LABELS, lock_domain
 from utils import sys_utils
+from services import askpass_service, privileged_helper, prefetch_service
 
 
 def install_packages(app, packages_by_source: dict):
-    """Install packages from multiple sources.
-    
-    Note: This function has high cyclomatic complexity (76) due to handling
-    multiple package sources (pacman, AUR, Flatpak, npm, pip, cargo, snap).
-    TODO: Consider refactoring into separate handler functions per source.
+    """Install packages in a background thread; see install_packages_sync()."""
+    Thread(target=install_packages_sync, args=(app, packages_by_source), daemon=True).start()
+
+
+def install_packages_sync(app, packages_by_source: dict, force_sudo=None):
+    """Install packages from multiple sources and return True on success.
+
+    Sources are grouped by lock domain (see utils.scheduler): pacman and AUR
+    share the ALPM lock and run one after another, while Flatpak and npm run
+    in parallel with them. Each domain reports its own progress; a failure
+    in one domain does not stop the others. A per-domain cancel button
+    (``app.install_scheduler``) stops just that domain; the Cancel button or
+    a dismissed password prompt stops them all.
+    ``force_sudo`` overrides app.force_sudo_install.
     """
-    def install():
-        app.install_cancel_event = Event()
-        app.installation_progress.emit("start", True)
-        app.log_signal.emit("Installation thread started")
+    force_sudo_override = force_sudo
 
-        success = True
-        current_download_info = ""
+    def install_source(domain, source, packages, cancel, progress, push_progress, force_sudo):
+        """Install one source's packages. Returns "ok", "failed", "cancelled", "password-cancelled" or "skipped"."""
+        parser = parser_for_source(source)
+        progress.begin_segment(domain, len(packages))
+        push_progress(force=True, msg=f"Installing from {source}...")
 
-        total_packages = sum(len(pkgs) for pkgs in packages_by_source.values())
-        total_sources = len(packages_by_source)
-        completed_packages = 0
-        completed_sources = 0
-        force_sudo = bool(getattr(app, 'force_sudo_install', False))
+        def on_line(line):
+            app.log_signal.emit(line)
+            if parser is None:
+                return
+            events = parser.feed(line)
+            if not events:
+                return
+            for ev in events:
+                progress.feed(domain, ev)
+            # Only segment start/end force a push; poll() throttles the rest
+            push_progress()
+
+        def on_download(events):
+            for ev in events:
+                progress.feed(domain, ev)
+            push_progress()
+
+        def finish_segment():
+            if parser is not None:
+                for ev in parser.finish():
+                    progress.feed(domain, ev)
+            progress.end_segment(domain)
+
+        def run(exec_cmd, env, new_session=True):
+            runner = ProcessRunner(exec_cmd, env=env, new_session=new_session)
+            app.install_runners.add(runner)
+            try:
+                return runner.run(on_stdout=on_line, cancel_event=cancel)
+            finally:
+                app.install_runners.discard(runner)
+
+        # Prepare default environment (can be overridden per-source)
+        env = os.environ.copy()
 
-        def update_progress_message(msg: str = ""):
-            base_msg = f"Installing: {completed_packages}/{total_packages} packages"
+        if source == 'pacman':
+            cmd = ["pacman", "-S", "--noconfirm"] + packages
+        elif source == 'AUR':
+            # Get the configured AUR helper
+            preferred = app.settings.get('aur_helper', 'auto')
+            aur_helper = sys_utils.get_aur_helper(None if preferred == 'auto' else preferred)
+            if not aur_helper:
+                app.log_signal.emit("Error: No AUR helper available. Install yay, paru, trizen, or pikaur.")
+                return "failed"
+            
+            # Configure AUR helper - use pkexec for proper GUI authentication
+            cmd = [aur_helper, "-S", "--noconfirm"] + packages
+        elif source == 'Flatpak':
             try:
-                if current_download_info and msg:
-                    app.ui_call.emit(lambda: app.loading_widget.set_message(f"{base_msg}\n{current_download_info}"))
-                elif current_download_info:
-                    app.ui_call.emit(lambda: app.loading_widget.set_message(f"{base_msg}\n{current_download_info}"))
-                elif msg:
-                    app.ui_call.emit(lambda: app.loading_widget.set_message(f"{base_msg}\n{msg}"))
-                else:
-                    app.ui_call.emit(lambda: app.loading_widget.set_message(base_msg))
+                app.ensure_flathub_user_remote()
             except Exception:
                 pass
+            # In sudo mode install system-wide; otherwise user-scoped
+            if force_sudo:
+                cmd = ["flatpak", "install", "-y", "--noninteractive", "flathub"] + packages
+            else:
+                cmd = ["flatpak", "--user", "install", "-y", "--noninteractive", "flathub"] + packages
+        elif source == 'npm':
+            if not force_sudo:
+                try:
+                    npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
+                    os.makedirs(npm_prefix, exist_ok=True)
+                    env['npm_config_prefix'] = npm_prefix
+                    env['NPM_CONFIG_PREFIX'] = npm_prefix
+                    env['PREFIX'] = npm_prefix
+                    env['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env.get('PATH', '')
+                except Exception:
+                    pass
+            cmd = ["npm", "install", "-g"] + packages
+        else:
+            app.log_signal.emit(f"Unknown source {source} for packages {packages}")
+            return "skipped"
 
-        def parse_output_line(line: str):
-            nonlocal current_download_info
-            if "downloading" in line.lower() and ("mib" in line.lower() or "kib" in line.lower() or "gib" in line.lower()):
-                size_match = re.search(r'\(([-\d.]+)\s*(MiB|KiB|GiB|B)\)', line)
-                if size_match:
-                    size, unit = size_match.groups()
-                    current_download_info = f"Downloading {size} {unit}"
-                    update_progress_message("")
-            elif re.search(r'\[.*\]\s*\d+%', line):
-                progress_match = re.search(r'(\d+)%', line)
-                if progress_match:
-                    percentage = progress_match.group(1)
-                    if current_download_info:
-                        current_download_info = f"{current_download_info} - {percentage}%"
-                    else:
-                        current_download_info = f"Downloading... {percentage}%"
-                    update_progress_message("")
-            elif "installed" in line.lower() or "upgraded" in line.lower():
-                current_download_info = ""
-                update_progress_message("")
-
-        try:
-            for source, packages in packages_by_source.items():
-                if app.install_cancel_event.is_set():
-                    app.log_signal.emit("Installation cancelled by user")
-                    app.installation_progress.emit("cancelled", False)
-                    return
+        app.log_signal.emit(f"Running command for {source}: {' '.join(cmd)}")
 
-                update_progress_message(f"Installing from {source}...")
+        if cancel.is_set():
+            return "cancelled"
 
-                # Prepare default environment (can be overridden per-source)
-                env = os.environ.copy()
+        # For AUR, prepare askpass environment but DON'T use pkexec/sudo wrapper
+        # AUR helpers MUST run as normal user for security
+        # The helper will internally use sudo when needed (e.g., for pacman -U)
+        if source == 'AUR':
+            app.log_signal.emit(f"AUR install (as user): {' '.join(cmd)}")
+            # Setup askpass so the AUR helper can authenticate internally
+            if not env.get('SUDO_ASKPASS'):
+                env, _ = app.prepare_askpass_env()
+        
+        # For Flatpak with sudo, ensure proper authentication
+        if source == 'Flatpak' and force_sudo:
+            # Flatpak system-wide installation needs polkit authentication
+            if not env.get('SUDO_ASKPASS'):
+                env, _ = app.prepare_askpass_env()
 
+        # Piped pacman prints no download bars; read byte progress from the package cache
+        watcher = None
+        if source in ('pacman', 'AUR'):
+            watcher = CacheDownloadWatcher([prefetch_service.SYSTEM_CACHE_DIR], on_download).start()
+        try:
+            exec_cmd = cmd
+            result = None
+            if source == 'pacman' or (force_sudo and source == 'npm'):
+                # One authorization for the whole session when the privileged helper is enabled
+                result = privileged_helper.run_privileged(cmd, on_stdout=on_line, cancel_event=cancel, env=env)
+            if result is None:
+                # Use appropriate auth command based on environment
                 if source == 'pacman':
-                    cmd = ["pacman", "-S", "--noconfirm"] + packages
-                elif source == 'AUR':
-                    # Get the configured AUR helper
-                    preferred = app.settings.get('aur_helper', 'auto')
-                    aur_helper = sys_utils.get_aur_helper(None if preferred == 'auto' else preferred)
-                    if not aur_helper:
-                        app.log_signal.emit("Error: No AUR helper available. Install yay, paru, trizen, or pikaur.")
-                        success = False
-                        break
-                    
-                    # Configure AUR helper - use pkexec for proper GUI authentication
-                    cmd = [aur_helper, "-S", "--noconfirm"] + packages
-                elif source == 'Flatpak':
-                    try:
-                        app.ensure_flathub_user_remote()
-                    except Exception:
-                        pass
-                    # In sudo mode install system-wide; otherwise user-scoped
-                    if force_sudo:
-                        cmd = ["flatpak", "install", "-y", "--noninteractive", "flathub"] + packages
-                    else:
-                        cmd = ["flatpak", "--user", "install", "-y", "--noninteractive", "flathub"] + packages
-                elif source == 'npm':
-                    if not force_sudo:
-                        try:
-                            npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
-                            os.makedirs(npm_prefix, exist_ok=True)
-                            env['npm_config_prefix'] = npm_prefix
-                            env['NPM_CONFIG_PREFIX'] = npm_prefix
-                            env['PREFIX'] = npm_prefix
-                            env['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env.get('PATH', '')
-                        except Exception:
-                            pass
-                    cmd = ["npm", "install", "-g"] + packages
-                else:
-                    app.log_signal.emit(f"Unknown source {source} for packages {packages}")
-                    continue
+                    auth_cmd = get_auth_command(env)
+                    exec_cmd = auth_cmd + exec_cmd
+                    app.log_signal.emit(f"Pacman command with {auth_cmd[0]}: {' '.join(exec_cmd)}")
+                elif force_sudo and source in ('Flatpak', 'npm'):
+                    auth_cmd = get_auth_command(env)
+                    exec_cmd = auth_cmd + exec_cmd
 
-                app.log_signal.emit(f"Running command for {source}: {' '.join(cmd)}")
+                # Ensure DISPLAY and other GUI environment variables are set
+                # For pacman: pkexec needs these to show GUI password dialog
+                # For AUR: the helper needs these for its own GUI dialogs and sudo prompts
+                if source in ('pacman', 'AUR'):
+                    for var in ('DISPLAY', 'XAUTHORITY', 'WAYLAND_DISPLAY', 'DBUS_SESSION_BUS_ADDRESS'):
+                        if var not in env and var in os.environ:
+                            env[var] = os.environ[var]
 
-                if app.install_cancel_event.is_set():
-                    app.log_signal.emit("Installation cancelled by user")
-                    app.installation_progress.emit("cancelled", False)
-                    return
+                # Only pacman with pkexec needs to avoid setsid (breaks D-Bus connection)
+                # AUR runs as normal user so it can use setsid
+                result = run(exec_cmd, env, new_session=source not in ('pacman',))
+        finally:
+            if watcher is not None:
+                watcher.stop()
+        if result.cancelled:
+            return "cancelled"
 
-                # For AUR, prepare askpass environment but DON'T use pkexec/sudo wrapper
-                # AUR helpers MUST run as normal user for security
-                # The helper will internally use sudo when needed (e.g., for pacman -U)
-                if source == 'AUR':
-                    app.log_signal.emit(f"AUR install (as user): {' '.join(cmd)}")
-                    # Setup askpass so the AUR helper can authenticate internally
-                    if not env.get('SUDO_ASKPASS'):
-                        env, cleanup_path = app.prepare_askpass_env()
-                
-                # For Flatpak with sudo, ensure proper authentication
-                if source == 'Flatpak' and force_sudo:
-                    # Flatpak system-wide installation needs polkit authentication
-                    if not env.get('SUDO_ASKPASS'):
-                        env, cleanup_path = app.prepare_askpass_env()
-                
-                worker = CommandWorker(cmd, sudo=False, env=env)
-                worker.output.connect(lambda msg: app.log_signal.emit(msg))
-                worker.error.connect(lambda msg: app.log_signal.emit(msg))
-                worker.output.connect(parse_output_line)
+        if result.returncode == 0:
+            finish_segment()
+            push_progress(force=True, msg=f"Completed {source} packages")
+            app.log_signal.emit(f"Successfully installed {len(packages)} {source} package(s)")
+            return "ok"
 
-                try:
-                    exec_cmd = worker.command
-                    # Use appropriate auth command based on environment
-                    if source == 'pacman':
-                        from utils.workers import get_auth_command
-                        auth_cmd = get_auth_command(worker.env)
-                        exec_cmd = auth_cmd + exec_cmd
-                        app.log_signal.emit(f"Pacman command with {auth_cmd[0]}: {' '.join(exec_cmd)}")
-                    elif force_sudo and source in ('Flatpak', 'npm'):
-                        from utils.workers import get_auth_command
-                        auth_cmd = get_auth_command(worker.env)
-                        exec_cmd = auth_cmd + exec_cmd
-                    
-                    # Ensure DISPLAY and other GUI environment variables are set
-                    # For pacman: pkexec needs these to show GUI password dialog
-                    # For AUR: the helper needs these for its own GUI dialogs and sudo prompts
-                    if source in ('pacman', 'AUR'):
-                        if 'DISPLAY' not in worker.env and 'DISPLAY' in os.environ:
-                            worker.env['DISPLAY'] = os.environ['DISPLAY']
-                        if 'XAUTHORITY' not in worker.env and 'XAUTHORITY' in os.environ:
-                            worker.env['XAUTHORITY'] = os.environ['XAUTHORITY']
-                        if 'WAYLAND_DISPLAY' not in worker.env and 'WAYLAND_DISPLAY' in os.environ:
-                            worker.env['WAYLAND_DISPLAY'] = os.environ['WAYLAND_DISPLAY']
-                        if 'DBUS_SESSION_BUS_ADDRESS' not in worker.env and 'DBUS_SESSION_BUS_ADDRESS' in os.environ:
-                            worker.env['DBUS_SESSION_BUS_ADDRESS'] = os.environ['DBUS_SESSION_BUS_ADDRESS']
-                    
-                    # Only pacman with pkexec needs to avoid setsid (breaks D-Bus connection)
-                    # AUR runs as normal user so it can use setsid
-                    use_setsid = source not in ('pacman',)
-                    
-                    process = subprocess.Popen(
-                        exec_cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        stdin=subprocess.DEVNULL,
-                        text=True,
-                        bufsize=1,
-                        preexec_fn=os.setsid if use_setsid else None,
-                        env=worker.env
-                    )
+        error_output = result.stderr
+        if not error_output:
+            return "failed"
+        app.log_signal.emit(f"Process stderr: {error_output}")
+        # Missing GUI authentication tools are a failure, not a cancel
+        lowered = error_output.lower()
+        if source == 'AUR' and ("sudo: no askpass program specified" in lowered or "authentication agent" in lowered):
+            app.log_signal.emit("Error: Authentication failed - no GUI password dialog available")
+            app.log_signal.emit("This usually means you need to install a GUI authentication tool.")
+            app.log_signal.emit("Please install: sudo pacman -S kdialog (or zenity/yad)")
+            return "failed"
+        # The user dismissed the helper's password prompt; a plain rc=1 is a build failure
+        if source == 'AUR' and ("cancelled" in lowered or "authentication failed" in lowered):
+            app.log_signal.emit("AUR installation cancelled by user")
+            return "password-cancelled"
+        # Fallback: npm EACCES -> try with system privileges (polkit)
+        if source == 'npm' and ("EACCES" in error_output or "permission denied" in error_output.lower()):
+            try:
+                app.log_signal.emit("Permission denied installing npm package(s). Retrying with system privileges (polkit)...")
+                env2 = os.environ.copy()
+                # Not routed through the privileged helper: npm lifecycle scripts would run as root unprompted
+                exec_cmd2 = get_auth_command(env2) + ["npm", "install", "-g"] + packages
+                result2 = run(exec_cmd2, env2)
+                if result2.cancelled:
+                    return "cancelled"
+                if result2.returncode == 0:
+                    finish_segment()
+                    push_progress(force=True, msg=f"Completed {source} packages (elevated)")
+                    app.log_signal.emit(f"Successfully installed {len(packages)} {source} package(s) with system privileges")
+                    return "ok"
+                app.log_signal.emit(f"Error: {result2.stderr or error_output}")
+                return "failed"
+            except Exception as _e:
+                app.log_signal.emit(f"Error: {str(_e)}")
+        
+        error_text = f"Error: {error_output}"
+        if "Cannot change ownership" in error_output and "Value too large for defined data type" in error_output:
+            error_text += "\n\nThis error occurs when tar tries to set file ownership to UIDs/GIDs that don't exist in the current environment.\n"
+            error_text += "To fix this, you can modify the PKGBUILD to add '--no-same-owner' to the tar command.\n"
+            error_text += "For example, change 'tar -xzf file.tar.gz' to 'tar -xzf file.tar.gz --no-same-owner'"
+        app.log_signal.emit(error_text)
+        return "failed"
+
+    def install():
+        app.install_cancel_event = Event()
+        app.install_runners = set()
+        app.installation_progress.emit("start", True)
+        app.log_signal.emit("Installation thread started")
+        if force_sudo_override is not None:
+            app.force_sudo_install = force_sudo_override
 
-                    while True:
-                        if app.install_cancel_event.is_set():
-                            process.terminate()
-                            try:
-                                process.wait(timeout=5)
-                            except subprocess.TimeoutExpired:
-                                process.kill()
-                            app.log_signal.emit("Installation cancelled by user")
-                            app.installation_progress.emit("cancelled", False)
-                            return
+        total_packages = sum(len(pkgs) for pkgs in packages_by_source.values())
+        force_sudo = bool(getattr(app, 'force_sudo_install', False))
 
-                        if process.poll() is not None:
-                            break
+        domains = {}
+        for source, pkgs in packages_by_source.items():
+            domains[lock_domain(source)] = domains.get(lock_domain(source), 0) + len(pkgs)
+        progress = CombinedProgress(domains, labels=DOMAIN_LABELS)
+        scheduler = DomainScheduler(app.install_cancel_event)
+        # Lets the progress UI cancel one lock domain while the others keep going
+        app.install_scheduler = scheduler
+        if len(domains) > 1:
+            app.ui_call.emit(lambda: app.show_domain_cancel_buttons(list(domains)))
 
-                        if process.stdout:
-                            line = process.stdout.readline()
-                            if line:
-                                line = line.strip()
-                                parse_output_line(line)
-                                worker.output.emit(line)
+        def push_progress(force=False, msg=""):
+            text = progress.poll(force=force)
+            if text is None:
+                return
+            if msg:
+                text = f"{text}\n{msg}"
+            try:
+                app.ui_call.emit(lambda: app.loading_widget.set_message(text))
+            except Exception:
+                pass
 
-                        time.sleep(0.1)
+        def job(domain, source, packages, cancel):
+            outcome = install_source(domain, source, packages, cancel, progress, push_progress, force_sudo)
+            if outcome == "password-cancelled":
+                # A dismissed password prompt means the user wants out: stop every domain
+                scheduler.cancel()
+                return "cancelled"
+            return outcome
 
-                    if process.returncode == 0:
-                        completed_packages += len(packages)
-                        completed_sources += 1
-                        update_progress_message(f"Completed {source} packages")
-                        app.log_signal.emit(f"Successfully installed {len(packages)} {source} package(s)")
-                    else:
-                        success = False
-                        if process.stderr:
-                            error_output = process.stderr.read()
-                            if error_output:
-                                app.log_signal.emit(f"Process stderr: {error_output}")
-                                # Check if user cancelled password dialog or if authentication failed
-                                if source == 'AUR' and ("cancelled" in error_output.lower() or "authentication failed" in error_output.lower() or process.returncode == 1):
-                                    # Check if this might be due to missing authentication tools
-                                    if "sudo: no askpass program specified" in error_output.lower() or "authentication agent" in error_output.lower():
-                                        app.log_signal.emit("Error: Authentication failed - no GUI password dialog available")
-                                        app.log_signal.emit("This usually means you need to install a GUI authentication tool.")
-                                        app.log_signal.emit("Please install: sudo pacman -S kdialog (or zenity/yad)")
-                                    else:
-                                        app.log_signal.emit("AUR installation cancelled by user")
-                                    app.installation_progress.emit("cancelled", False)
-                                    return
-                                # Fallback: npm EACCES -> try with system privileges (polkit)
-                                if source == 'npm' and ("EACCES" in error_output or "permission denied" in error_output.lower()):
-                                    try:
-                                        app.log_signal.emit("Permission denied installing npm package(s). Retrying with system privileges (polkit)...")
-                                        env2 = os.environ.copy()
-                                        from utils.workers import get_auth_command
-                                        auth_cmd2 = get_auth_command(env2)
-                                        exec_cmd2 = auth_cmd2 + ["npm", "install", "-g"] + packages
-                                        process2 = subprocess.Popen(
-                                            exec_cmd2,
-                                            stdout=subprocess.PIPE,
-                                            stderr=subprocess.PIPE,
-                                            stdin=subprocess.DEVNULL,
-                                            text=True,
-                                            bufsize=1,
-                                            preexec_fn=os.setsid,
-                                            env=env2
-                                        )
-                                        while True:
-                                            if app.install_cancel_event.is_set():
-                                                process2.terminate()
-                                                try:
-                                                    process2.wait(timeout=5)
-                                                except subprocess.TimeoutExpired:
-                                                    process2.kill()
-                                                app.log_signal.emit("Installation cancelled by user")
-                                                app.installation_progress.emit("cancelled", False)
-                                                return
-                                            if process2.poll() is not None:
-                                                break
-                                            if process2.stdout:
-                                                line2 = process2.stdout.readline()
-                                                if line2:
-                                                    line2 = line2.strip()
-                                                    parse_output_line(line2)
-                                                    worker.output.emit(line2)
-                                            time.sleep(0.1)
-                                        if process2.returncode == 0:
-                                            success = True
-                                            completed_packages += len(packages)
-                                            completed_sources += 1
-                                            update_progress_message(f"Completed {source} packages (elevated)")
-                                            app.log_signal.emit(f"Successfully installed {len(packages)} {source} package(s) with system privileges")
-                                        else:
-                                            err2 = process2.stderr.read() if process2.stderr else ''
-                                            worker.error.emit(f"Error: {err2 or error_output}")
-                                        continue
-                                    except Exception as _e:
-                                        worker.error.emit(f"Error: {str(_e)}")
-                                
-                                error_text = f"Error: {error_output}"
-                                if "Cannot change ownership" in error_output and "Value too large for defined data type" in error_output:
-                                    error_text += "\n\nThis error occurs when tar tries to set file ownership to UIDs/GIDs that don't exist in the current environment.\n"
-                                    error_text += "To fix this, you can modify the PKGBUILD to add '--no-same-owner' to the tar command.\n"
-                                    error_text += "For example, change 'tar -xzf file.tar.gz' to 'tar -xzf file.tar.gz --no-same-owner'"
-                                worker.error.emit(error_text)
-                finally:
-                    # Cleanup askpass script if used for Flatpak
-                    if source == 'Flatpak' and 'cleanup_path' in locals() and cleanup_path and os.path.exists(cleanup_path):
-                        try:
-                            os.remove(cleanup_path)
-                        except Exception:
-                            pass
+        def on_error(source, e):
+            app.log_signal.emit(f"Error installing {source} packages: {str(e)}")
 
-            if success and not app.install_cancel_event.is_set():
-                update_progress_message("Installation complete!")
+        keepalive = None
+        try:
+            keepalive = askpass_service.transaction_keepalive(app, [s for s, p in packages_by_source.items() if p])
+            results = scheduler.run(packages_by_source, job, on_error=on_error)
+            # Sources skipped because their domain was cancelled count as cancelled
+            outcomes = ["cancelled" if o is None and scheduler.token(lock_domain(s)).is_set() else o
+                        for s, o in results.items()]
+            if app.install_cancel_event.is_set() or "cancelled" in outcomes:
+                app.log_signal.emit("Installation cancelled by user")
+                app.installation_progress.emit("cancelled", False)
+                return False
+            elif all(o in ("ok", "skipped") for o in outcomes):
+                push_progress(force=True, msg="Installation complete!")
                 app.log_signal.emit("Install completed")
                 app.show_message.emit("Installation Complete", f"Successfully installed {total_packages} package(s).")
                 app.installation_progress.emit("success", False)
-            elif not success and not app.install_cancel_event.is_set():
+                return True
+            else:
                 app.log_signal.emit("Install failed")
                 app.installation_progress.emit("failed", False)
+                return False
 
         except Exception as e:
             app.log_signal.emit(f"Error in installation thread: {str(e)}")
             app.installation_progress.emit("failed", False)
+            return False
         finally:
+            app.install_scheduler = None
+            if keepalive:
+                keepalive.stop()
             try:
                 # Reset sudo mode flag if set by caller
                 if hasattr(app, 'force_sudo_install'):
@@ -313,4 +292,4 @@ def install_packages(app, packages_by_source: dict):
             if hasattr(app, 'install_cancel_event'):
                 delattr(app, 'install_cancel_event')
 
-    Thread(target=install, daemon=True).start()
+    return install()
@@ -2,6 +2,66 @@ import os
 import json
 import subprocess
 from threading import Thread
+from utils import pacman_lock, tracing
+
+
+PACMAN_DB_DIRS = ("/var/lib/pacman/local", "/var/lib/pacman/sync")
+
+_DIFF_FIELDS = ('name', 'version', 'new_version', 'has_update')
+
+
+def package_key(pkg):
+    return (pkg.get('source') or '', pkg.get('id') or pkg.get('name') or '')
+
+
+def diff_packages(old, new):
+    """Compare two package lists by (source, id).
+
+    Returns a dict with 'added' and 'changed' (packages from ``new``) and
+    'removed' (keys only present in ``old``).
+    """
+    old_by_key = {package_key(p): p for p in old or []}
+    new_keys = set()
+    added, changed = [], []
+    for pkg in new or []:
+        key = package_key(pkg)
+        new_keys.add(key)
+        prev = old_by_key.get(key)
+        if prev is None:
+            added.append(pkg)
+        elif any(prev.get(f) != pkg.get(f) for f in _DIFF_FIELDS):
+            changed.append(pkg)
+    removed = [k for k in old_by_key if k not in new_keys]
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def pacman_db_stamp():
+    """mtimes of pacman's local and sync databases; they change whenever packages or repos do."""
+    stamp = []
+    for d in PACMAN_DB_DIRS:
+        try:
+            stamp.append(os.stat(d).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _begin_view_load(app, view_id):
+    try:
+        app._loading_views.add(view_id)
+        app._stale_views.discard(view_id)
+    except Exception:
+        pass
+
+
+def _finish_view_load(app, view_id, packages):
+    stamp = pacman_db_stamp()
+    app.ui_call.emit(lambda: app.on_view_packages_loaded(view_id, packages, stamp))
+
+
+def _refresh_in_place(app, view_id):
+    """True when the table already shows this view's rows and can be diffed instead of cleared."""
+    return getattr(app, '_table_view', None) == view_id and app.package_table.rowCount() > 0
 
 
 def load_updates(app):
@@ -9,11 +69,15 @@ def load_updates(app):
         app._updates_loading = True
     except Exception:
         pass
+    app.loading_context = "updates"
+    _begin_view_load(app, "updates")
+    if _refresh_in_place(app, "updates"):
+        # Keep the current rows, selection and scroll position; results are diffed in
+        Thread(target=tracing.bind(_load_updates_thread, 'load updates'), args=(app,), daemon=True).start()
+        return
     app.package_table.setRowCount(0)
     app.all_packages = []
     app.current_page = 0
-    app.cancel_update_load = False
-    app.loading_context = "updates"
 
     app.loading_widget.setVisible(True)
     try:
@@ -39,257 +103,272 @@ def load_updates(app):
     except Exception:
         pass
 
-    def load_in_thread():
-        try:
-            packages = []
-
-            # Sync package database first to get latest updates
-            try:
-                app.log("Syncing package database...")
-                env, _ = app.prepare_askpass_env()
-                sync_result = subprocess.run(["sudo", "-A", "pacman", "-Sy", "--noconfirm"], 
-                                            capture_output=True, text=True, timeout=120, env=env)
-                if sync_result.returncode == 0:
-                    app.log("Package database synced successfully")
-                else:
-                    err = sync_result.stderr or ""
-                    app.log(f"Warning: Database sync failed: {err}")
-                    low = err.lower()
-                    if ("could not lock database" in low) or ("unable to lock database" in low):
-                        try:
-                            app.ui_call.emit(lambda: app.show_busy_pm_warning(err))
-                        except Exception:
-                            pass
-            except Exception as e:
-                app.log(f"Warning: Could not sync database: {str(e)}")
+    Thread(target=tracing.bind(_load_updates_thread, 'load updates'), args=(app,), daemon=True).start()
 
-            result = subprocess.run(["pacman", "-Qu"], capture_output=True, text=True, timeout=60)
-            if result.returncode == 0 and result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        if ' -> ' in line:
-                            parts = line.split(' -> ')
-                            if len(parts) == 2:
-                                package_info = parts[0].strip().split()
-                                new_version = parts[1].strip()
-                                if len(package_info) >= 2:
-                                    package_name = package_info[0]
-                                    current_version = package_info[1]
-                                    packages.append({
-                                        'name': package_name,
-                                        'version': current_version,
-                                        'new_version': new_version,
-                                        'id': package_name,
-                                        'source': 'pacman'
-                                    })
 
-            try:
-                result_aur = subprocess.run(["yay", "-Qua"], capture_output=True, text=True, timeout=60)
-                if result_aur.returncode == 0 and result_aur.stdout:
-                    for line in result_aur.stdout.strip().split('\n'):
-                        if line.strip() and ' -> ' in line:
-                            parts = line.split(' -> ')
-                            if len(parts) == 2:
-                                package_info = parts[0].strip().split()
-                                new_version = parts[1].strip()
-                                if len(package_info) >= 2:
-                                    package_name = package_info[0]
-                                    current_version = package_info[1]
-                                    packages.append({
-                                        'name': package_name,
-                                        'version': current_version,
-                                        'new_version': new_version,
-                                        'id': package_name,
-                                        'source': 'AUR'
-                                    })
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                for aur_helper in ['paru', 'trizen', 'pikaur']:
-                    try:
-                        result_aur = subprocess.run([aur_helper, "-Qua"], capture_output=True, text=True, timeout=60)
-                        if result_aur.returncode == 0 and result_aur.stdout:
-                            for line in result_aur.stdout.strip().split('\n'):
-                                if line.strip() and ' -> ' in line:
-                                    parts = line.split(' -> ')
-                                    if len(parts) == 2:
-                                        package_info = parts[0].strip().split()
-                                        new_version = parts[1].strip()
-                                        if len(package_info) >= 2:
-                                            package_name = package_info[0]
-                                            current_version = package_info[1]
-                                            packages.append({
-                                                'name': package_name,
-                                                'version': current_version,
-                                                'new_version': new_version,
-                                                'id': package_name,
-                                                'source': 'AUR'
-                                            })
-                            break
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        continue
-
-            added_flatpak = False
-            try:
-                installed_map = {}
-                for scope in ([], ["--user"], ["--system"]):
-                    try:
-                        cmd = ["flatpak"] + scope + ["list", "--app", "--columns=application,version"]
-                        li = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-                        if li.returncode == 0 and li.stdout:
-                            for ln in [x for x in li.stdout.strip().split('\n') if x.strip()]:
-                                c = ln.split('\t')
-                                if c and c[0].strip():
-                                    installed_map[c[0].strip()] = (c[1].strip() if len(c) > 1 else '')
-                    except Exception:
-                        continue
+def _load_updates_thread(app):
+    try:
+        packages = []
 
-                seen_apps = set()
-                for scope in ([], ["--user"], ["--system"]):
+        # Sync package database first to get latest updates
+        try:
+            app.log("Syncing package database...")
+            env, _ = app.prepare_askpass_env()
+            # Wait for a running pacman instead of failing; retry once if another one slipped in first
+            for attempt in range(2):
+                lock_state = app.wait_for_pacman_lock("syncing the package database")
+                if lock_state != pacman_lock.FREE:
+                    err = f"{pacman_lock.DB_LOCK}: lock {lock_state}"
+                    app.log(f"Warning: Database sync skipped: {err}")
                     try:
-                        cmd = ["flatpak"] + scope + ["list", "--app", "--updates", "--columns=application,version"]
-                        fp = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-                        if fp.returncode == 0 and fp.stdout:
-                            for line in [l for l in fp.stdout.strip().split('\n') if l.strip()]:
-                                cols = line.split('\t')
-                                app_id = cols[0].strip() if len(cols) > 0 else ''
-                                inst = cols[1].strip() if len(cols) > 1 else ''
-                                if app_id and app_id not in seen_apps:
-                                    packages.append({
-                                        'name': app_id,
-                                        'version': inst or installed_map.get(app_id, ''),
-                                        'new_version': '',
-                                        'id': app_id,
-                                        'source': 'Flatpak'
-                                    })
-                                    seen_apps.add(app_id)
-                                    added_flatpak = True
+                        app.ui_call.emit(lambda: app.show_busy_pm_warning(err))
                     except Exception:
-                        continue
-
-                if not added_flatpak:
+                        pass
+                    break
+                sync_result = subprocess.run(["sudo", "-A", "pacman", "-Sy", "--noconfirm"], 
+                                            capture_output=True, text=True, timeout=120, env=env)
+                if sync_result.returncode == 0:
+                    app.log("Package database synced successfully")
+                    break
+                err = sync_result.stderr or ""
+                if pacman_lock.is_lock_error(err) and attempt == 0:
+                    continue
+                app.log(f"Warning: Database sync failed: {err}")
+                if pacman_lock.is_lock_error(err):
                     try:
-                        rl = subprocess.run(["flatpak", "remote-ls", "--updates", "--columns=application,version"], capture_output=True, text=True, timeout=60)
-                        if rl.returncode == 0 and rl.stdout:
-                            for ln in [x for x in rl.stdout.strip().split('\n') if x.strip()]:
-                                c = ln.split('\t')
-                                app_id = c[0].strip() if len(c) > 0 else ''
-                                latest = c[1].strip() if len(c) > 1 else ''
-                                if app_id and app_id in installed_map and app_id not in seen_apps:
-                                    packages.append({
-                                        'name': app_id,
-                                        'version': installed_map.get(app_id, ''),
-                                        'new_version': latest,
-                                        'id': app_id,
-                                        'source': 'Flatpak'
-                                    })
-                                    seen_apps.add(app_id)
-                                    added_flatpak = True
+                        app.ui_call.emit(lambda: app.show_busy_pm_warning(err))
                     except Exception:
                         pass
-            except Exception:
-                pass
+                break
+        except Exception as e:
+            app.log(f"Warning: Could not sync database: {str(e)}")
+
+        result = subprocess.run(["pacman", "-Qu"], capture_output=True, text=True, timeout=60)
+        if result.returncode == 0 and result.stdout:
+            for line in result.stdout.strip().split('\n'):
+                if line.strip():
+                    if ' -> ' in line:
+                        parts = line.split(' -> ')
+                        if len(parts) == 2:
+                            package_info = parts[0].strip().split()
+                            new_version = parts[1].strip()
+                            if len(package_info) >= 2:
+                                package_name = package_info[0]
+                                current_version = package_info[1]
+                                packages.append({
+                                    'name': package_name,
+                                    'version': current_version,
+                                    'new_version': new_version,
+                                    'id': package_name,
+                                    'source': 'pacman'
+                                })
 
-            try:
-                results = []
-                np_def = subprocess.run(["npm", "outdated", "-g", "--json"], capture_output=True, text=True, timeout=60)
-                results.append((np_def.returncode, np_def.stdout))
-                env_user = os.environ.copy()
+        try:
+            result_aur = subprocess.run(["yay", "-Qua"], capture_output=True, text=True, timeout=60)
+            if result_aur.returncode == 0 and result_aur.stdout:
+                for line in result_aur.stdout.strip().split('\n'):
+                    if line.strip() and ' -> ' in line:
+                        parts = line.split(' -> ')
+                        if len(parts) == 2:
+                            package_info = parts[0].strip().split()
+                            new_version = parts[1].strip()
+                            if len(package_info) >= 2:
+                                package_name = package_info[0]
+                                current_version = package_info[1]
+                                packages.append({
+                                    'name': package_name,
+                                    'version': current_version,
+                                    'new_version': new_version,
+                                    'id': package_name,
+                                    'source': 'AUR'
+                                })
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            for aur_helper in ['paru', 'trizen', 'pikaur']:
                 try:
-                    npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
-                    os.makedirs(npm_prefix, exist_ok=True)
-                    env_user['npm_config_prefix'] = npm_prefix
-                    env_user['NPM_CONFIG_PREFIX'] = npm_prefix
-                    env_user['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env_user.get('PATH', '')
-                except Exception:
-                    pass
-                np_user = subprocess.run(["npm", "outdated", "-g", "--json"], capture_output=True, text=True, env=env_user, timeout=60)
-                results.append((np_user.returncode, np_user.stdout))
-                seen = set()
-                for code, out in results:
-                    if code in (0, 1) and out and out.strip():
-                        try:
-                            data = json.loads(out)
-                            if isinstance(data, dict):
-                                for name, info in data.items():
-                                    cur = (info.get('current') or info.get('installed') or '').strip()
-                                    lat = (info.get('latest') or '').strip()
-                                    key = (name, cur, lat)
-                                    if name and cur and lat and cur != lat and key not in seen:
+                    result_aur = subprocess.run([aur_helper, "-Qua"], capture_output=True, text=True, timeout=60)
+                    if result_aur.returncode == 0 and result_aur.stdout:
+                        for line in result_aur.stdout.strip().split('\n'):
+                            if line.strip() and ' -> ' in line:
+                                parts = line.split(' -> ')
+                                if len(parts) == 2:
+                                    package_info = parts[0].strip().split()
+                                    new_version = parts[1].strip()
+                                    if len(package_info) >= 2:
+                                        package_name = package_info[0]
+                                        current_version = package_info[1]
                                         packages.append({
-                                            'name': name,
-                                            'version': cur,
-                                            'new_version': lat,
-                                            'id': name,
-                                            'source': 'npm'
+                                            'name': package_name,
+                                            'version': current_version,
+                                            'new_version': new_version,
+                                            'id': package_name,
+                                            'source': 'AUR'
                                         })
-                                        seen.add(key)
-                        except Exception:
-                            pass
-            except Exception:
-                pass
+                        break
+                except (subprocess.CalledProcessError, FileNotFoundError):
+                    continue
 
-            try:
-                entries = app.load_local_update_entries()
-                for e in entries:
-                    name = (e.get('name') or '').strip()
-                    if not name:
-                        continue
-                    installed = (e.get('installed_version') or '').strip()
-                    if not installed and e.get('installed_version_cmd'):
-                        try:
-                            r = subprocess.run(["bash", "-lc", e['installed_version_cmd']], capture_output=True, text=True, timeout=30)
-                            if r.returncode == 0:
-                                installed = (r.stdout or '').strip().splitlines()[0].strip()
-                        except Exception:
-                            installed = ''
-                    latest = (e.get('latest_version') or '').strip()
-                    if not latest and e.get('latest_version_cmd'):
-                        try:
-                            r = subprocess.run(["bash", "-lc", e['latest_version_cmd']], capture_output=True, text=True, timeout=30)
-                            if r.returncode == 0:
-                                latest = (r.stdout or '').strip().splitlines()[0].strip()
-                        except Exception:
-                            latest = ''
-                    if installed and latest and installed != latest:
-                        packages.append({
-                            'name': name,
-                            'version': installed,
-                            'new_version': latest,
-                            'id': (e.get('id') or name),
-                            'source': 'Local'
-                        })
-            except Exception:
-                pass
+        added_flatpak = False
+        try:
+            installed_map = {}
+            for scope in ([], ["--user"], ["--system"]):
+                try:
+                    cmd = ["flatpak"] + scope + ["list", "--app", "--columns=application,version"]
+                    li = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                    if li.returncode == 0 and li.stdout:
+                        for ln in [x for x in li.stdout.strip().split('\n') if x.strip()]:
+                            c = ln.split('\t')
+                            if c and c[0].strip():
+                                installed_map[c[0].strip()] = (c[1].strip() if len(c) > 1 else '')
+                except Exception:
+                    continue
 
-            try:
-                ignored = app.load_ignored_updates()
-                if ignored:
-                    packages = [p for p in packages if p.get('name') not in ignored]
-            except Exception:
-                pass
+            seen_apps = set()
+            for scope in ([], ["--user"], ["--system"]):
+                try:
+                    cmd = ["flatpak"] + scope + ["list", "--app", "--updates", "--columns=application,version"]
+                    fp = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                    if fp.returncode == 0 and fp.stdout:
+                        for line in [l for l in fp.stdout.strip().split('\n') if l.strip()]:
+                            cols = line.split('\t')
+                            app_id = cols[0].strip() if len(cols) > 0 else ''
+                            inst = cols[1].strip() if len(cols) > 1 else ''
+                            if app_id and app_id not in seen_apps:
+                                packages.append({
+                                    'name': app_id,
+                                    'version': inst or installed_map.get(app_id, ''),
+                                    'new_version': '',
+                                    'id': app_id,
+                                    'source': 'Flatpak'
+                                })
+                                seen_apps.add(app_id)
+                                added_flatpak = True
+                except Exception:
+                    continue
 
-            if not app.cancel_update_load and app.loading_context == 'updates' and app.current_view == 'updates':
+            if not added_flatpak:
                 try:
-                    app._updates_loading = False
+                    rl = subprocess.run(["flatpak", "remote-ls", "--updates", "--columns=application,version"], capture_output=True, text=True, timeout=60)
+                    if rl.returncode == 0 and rl.stdout:
+                        for ln in [x for x in rl.stdout.strip().split('\n') if x.strip()]:
+                            c = ln.split('\t')
+                            app_id = c[0].strip() if len(c) > 0 else ''
+                            latest = c[1].strip() if len(c) > 1 else ''
+                            if app_id and app_id in installed_map and app_id not in seen_apps:
+                                packages.append({
+                                    'name': app_id,
+                                    'version': installed_map.get(app_id, ''),
+                                    'new_version': latest,
+                                    'id': app_id,
+                                    'source': 'Flatpak'
+                                })
+                                seen_apps.add(app_id)
+                                added_flatpak = True
                 except Exception:
                     pass
-                app.packages_ready.emit(packages)
-        except Exception as e:
-            app.log(f"Error: {str(e)}")
+        except Exception:
+            pass
+
+        try:
+            results = []
+            np_def = subprocess.run(["npm", "outdated", "-g", "--json"], capture_output=True, text=True, timeout=60)
+            results.append((np_def.returncode, np_def.stdout))
+            env_user = os.environ.copy()
             try:
-                app._updates_loading = False
+                npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
+                os.makedirs(npm_prefix, exist_ok=True)
+                env_user['npm_config_prefix'] = npm_prefix
+                env_user['NPM_CONFIG_PREFIX'] = npm_prefix
+                env_user['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env_user.get('PATH', '')
             except Exception:
                 pass
-            app.load_error.emit()
+            np_user = subprocess.run(["npm", "outdated", "-g", "--json"], capture_output=True, text=True, env=env_user, timeout=60)
+            results.append((np_user.returncode, np_user.stdout))
+            seen = set()
+            for code, out in results:
+                if code in (0, 1) and out and out.strip():
+                    try:
+                        data = json.loads(out)
+                        if isinstance(data, dict):
+                            for name, info in data.items():
+                                cur = (info.get('current') or info.get('installed') or '').strip()
+                                lat = (info.get('latest') or '').strip()
+                                key = (name, cur, lat)
+                                if name and cur and lat and cur != lat and key not in seen:
+                                    packages.append({
+                                        'name': name,
+                                        'version': cur,
+                                        'new_version': lat,
+                                        'id': name,
+                                        'source': 'npm'
+                                    })
+                                    seen.add(key)
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+
+        try:
+            entries = app.load_local_update_entries()
+            for e in entries:
+                name = (e.get('name') or '').strip()
+                if not name:
+                    continue
+                installed = (e.get('installed_version') or '').strip()
+                if not installed and e.get('installed_version_cmd'):
+                    try:
+                        r = subprocess.run(["bash", "-lc", e['installed_version_cmd']], capture_output=True, text=True, timeout=30)
+                        if r.returncode == 0:
+                            installed = (r.stdout or '').strip().splitlines()[0].strip()
+                    except Exception:
+                        installed = ''
+                latest = (e.get('latest_version') or '').strip()
+                if not latest and e.get('latest_version_cmd'):
+                    try:
+                        r = subprocess.run(["bash", "-lc", e['latest_version_cmd']], capture_output=True, text=True, timeout=30)
+                        if r.returncode == 0:
+                            latest = (r.stdout or '').strip().splitlines()[0].strip()
+                    except Exception:
+                        latest = ''
+                if installed and latest and installed != latest:
+                    packages.append({
+                        'name': name,
+                        'version': installed,
+                        'new_version': latest,
+                        'id': (e.get('id') or name),
+                        'source': 'Local'
+                    })
+        except Exception:
+            pass
 
-    Thread(target=load_in_thread, daemon=True).start()
+        try:
+            ignored = app.load_ignored_updates()
+            if ignored:
+                packages = [p for p in packages if p.get('name') not in ignored]
+        except Exception:
+            pass
+
+        try:
+            app._updates_loading = False
+        except Exception:
+            pass
+        _finish_view_load(app, "updates", packages)
+    except Exception as e:
+        app.log(f"Error: {str(e)}")
+        try:
+            app._updates_loading = False
+        except Exception:
+            pass
+        app.ui_call.emit(lambda: app.on_view_load_failed("updates"))
 
 
 
 def load_installed_packages(app):
-    app.package_table.setRowCount(0)
-    app.all_packages = []
-    app.current_page = 0
     app.loading_context = "installed"
+    _begin_view_load(app, "installed")
+    if not _refresh_in_place(app, "installed"):
+        app.package_table.setRowCount(0)
+        app.all_packages = []
+        app.current_page = 0
 
     def load_in_thread():
         try:
@@ -548,9 +627,9 @@ def load_installed_packages(app):
             except Exception:
                 pass
 
-            app.packages_ready.emit(packages)
+            _finish_view_load(app, "installed", packages)
         except Exception as e:
             app.log(f"Error: {str(e)}")
-            app.load_error.emit()
+            app.ui_call.emit(lambda: app.on_view_load_failed("installed"))
 
-    Thread(target=load_in_thread, daemon=True).start()
+    Thread(target=tracing.bind(load_in_thread, 'load installed'), daemon=True).start()
@@ -0,0 +1,259 @@
+import os
+import glob
+import shutil
+import time
+from threading import Thread, Lock
+from utils.process_runner import run_command
+from utils.progress import CacheDownloadWatcher, format_bytes
+
+
+PREFETCH_ROOT = os.path.join(os.path.expanduser('~'), '.cache', 'neoarch', 'prefetch')
+PACMAN_CACHE_DIR = os.path.join(PREFETCH_ROOT, 'pkg')
+PACMAN_DB_DIR = os.path.join(PREFETCH_ROOT, 'db')
+SYSTEM_CACHE_DIR = '/var/cache/pacman/pkg'
+
+_state_lock = Lock()
+
+
+def _set_state(app, key, **fields):
+    with _state_lock:
+        entry = app.prefetch_state.setdefault(key, {'status': 'pending', 'bytes': 0, 'total': 0})
+        entry.update(fields)
+
+
+def prefetch_info(app, pkg):
+    """Prefetch state for an Updates row: {'status', 'bytes', 'total'} or None."""
+    state = getattr(app, 'prefetch_state', None)
+    if not state:
+        return None
+    with _state_lock:
+        entry = state.get((pkg.get('source'), pkg.get('id') or pkg.get('name')))
+        return dict(entry) if entry else None
+
+
+def prefetch_label(info):
+    if not info:
+        return ""
+    status = info.get('status')
+    if status == 'downloading':
+        if info.get('total'):
+            return f"⤓ {format_bytes(info.get('bytes'))} / {format_bytes(info.get('total'))}"
+        return "⤓ downloading"
+    if status == 'cached':
+        return f"✓ cached {format_bytes(info['bytes'])}" if info.get('bytes') else "✓ cached"
+    if status == 'failed':
+        return "prefetch failed"
+    return ""
+
+
+def is_idle(max_load_per_cpu=0.5):
+    """Cheap idleness check based on the 1-minute load average."""
+    try:
+        load1 = os.getloadavg()[0]
+    except (OSError, AttributeError):
+        return False
+    return load1 <= (os.cpu_count() or 1) * max_load_per_cpu
+
+
+def maybe_start_prefetch(app, packages):
+    """Start a background prefetch of ``packages`` when enabled, idle and nothing else is running."""
+    if not app.settings.get('prefetch_updates', False) or not packages:
+        return False
+    if getattr(app, '_prefetch_running', False) or getattr(app, '_installing', False):
+        return False
+    if not is_idle():
+        return False
+    app._prefetch_running = True
+    Thread(target=_prefetch_thread, args=(app, list(packages)), daemon=True).start()
+    return True
+
+
+def _prefetch_thread(app, packages):
+    try:
+        by_source = {}
+        for pkg in packages:
+            by_source.setdefault(pkg.get('source'), []).append(pkg)
+        for pkg in packages:
+            key = (pkg.get('source'), pkg.get('id') or pkg.get('name'))
+            if key not in app.prefetch_state:
+                _set_state(app, key, status='pending')
+        if by_source.get('pacman'):
+            _prefetch_pacman(app, by_source['pacman'])
+        if by_source.get('Flatpak'):
+            _prefetch_flatpak(app, by_source['Flatpak'])
+        if by_source.get('npm'):
+            _prefetch_npm(app, by_source['npm'])
+    except Exception as e:
+        app.log(f"Prefetch error: {str(e)}")
+    finally:
+        app._prefetch_running = False
+        _notify(app)
+
+
+def _notify(app):
+    try:
+        app.ui_call.emit(app.refresh_prefetch_labels)
+    except Exception:
+        pass
+
+
+def _prepare_private_db():
+    """Private dbpath whose 'local' points at the system DB, as checkupdates does."""
+    os.makedirs(PACMAN_DB_DIR, exist_ok=True)
+    os.makedirs(PACMAN_CACHE_DIR, exist_ok=True)
+    local = os.path.join(PACMAN_DB_DIR, 'local')
+    if not os.path.islink(local):
+        if os.path.exists(local):
+            shutil.rmtree(local, ignore_errors=True)
+        os.symlink('/var/lib/pacman/local', local)
+
+
+def _cached_files(name, version):
+    pattern = os.path.join(PACMAN_CACHE_DIR, f"{glob.escape(name)}-{glob.escape(version)}-*.pkg.tar.*")
+    files = [f for f in glob.glob(pattern) if not f.endswith('.sig') and not f.endswith('.part')]
+    # pkgname-pkgver-pkgrel-arch: make sure "foo" doesn't match "foo-bar".
+    # ``version`` usually carries the pkgrel already ("1.2-1"), leaving only the arch
+    dashes = 0 if '-' in version else 1
+    return [f for f in files if os.path.basename(f)[len(name) + len(version) + 2:].count('-') == dashes]
+
+
+def _download_sizes(base, names):
+    """{name: download size} of ``names`` from the private sync DB; {} when pacman can't tell."""
+    result = run_command(base + ["-Sp", "--print-format", "%n %s"] + names, timeout=60)
+    sizes = {}
+    if result.returncode != 0:
+        return sizes
+    for line in result.stdout.splitlines():
+        name, _, size = line.strip().partition(' ')
+        if size.isdigit():
+            sizes[name] = int(size)
+    return sizes
+
+
+def _synced_private_pacman(log, missing_fakeroot, sync_failed):
+    """pacman argv on the freshly synced private DB, or None (after logging why).
+
+    The prefetch and the scheduled update download both go through here, so
+    the unprivileged private-db invocation exists in one place only.
+    """
+    if not shutil.which('fakeroot'):
+        log(missing_fakeroot)
+        return None
+    _prepare_private_db()
+    base = ["fakeroot", "--", "pacman", "--dbpath", PACMAN_DB_DIR, "--logfile", "/dev/null"]
+    sync = run_command(base + ["-Sy"], timeout=300)
+    if sync.returncode != 0:
+        log(f"{sync_failed}: {sync.stderr}")
+        return None
+    return base
+
+
+def _prefetch_pacman(app, pkgs):
+    base = _synced_private_pacman(app.log, "Prefetch: fakeroot is not installed; skipping pacman downloads",
+                                  "Prefetch: could not sync private database")
+    if base is None:
+        return
+    by_name = {p.get('name'): p for p in pkgs}
+    sizes = _download_sizes(base, list(by_name))
+    for name, p in by_name.items():
+        _set_state(app, ('pacman', p.get('id') or name), status='downloading', bytes=0, total=sizes.get(name, 0))
+    _notify(app)
+
+    last = {'t': 0.0}
+
+    def on_download(events):
+        # pacman prints no download bars on a pipe; the watcher reads the .part files
+        for ev in events:
+            # Cache files are named name-pkgver-pkgrel-arch
+            name = ev.package.rsplit('-', 3)[0]
+            if name in by_name:
+                total = sizes.get(name) or ev.total or 0
+                _set_state(app, ('pacman', by_name[name].get('id') or name), status='downloading',
+                           bytes=ev.done or 0, total=total)
+        now = time.monotonic()
+        if now - last['t'] > 0.5:
+            last['t'] = now
+            _notify(app)
+
+    cmd = base + ["-Sw", "--noconfirm", "--cachedir", PACMAN_CACHE_DIR] + list(by_name)
+    with CacheDownloadWatcher([PACMAN_CACHE_DIR], on_download):
+        result = run_command(cmd)
+    for name, p in by_name.items():
+        files = _cached_files(name, p.get('new_version') or '')
+        size = sum(os.path.getsize(f) for f in files)
+        if files:
+            _set_state(app, ('pacman', p.get('id') or name), status='cached', bytes=size, total=size)
+        else:
+            _set_state(app, ('pacman', p.get('id') or name), status='failed' if result.returncode != 0 else 'pending')
+    if result.returncode != 0:
+        app.log(f"Prefetch: pacman download finished with errors: {result.stderr}")
+
+
+def _prefetch_flatpak(app, pkgs):
+    if not shutil.which('flatpak'):
+        return
+    ids = [p.get('id') or p.get('name') for p in pkgs]
+    for i in ids:
+        _set_state(app, ('Flatpak', i), status='downloading')
+    _notify(app)
+    result = run_command(["flatpak", "update", "--no-deploy", "-y", "--noninteractive"] + ids, timeout=3600)
+    for i in ids:
+        _set_state(app, ('Flatpak', i), status='cached' if result.returncode == 0 else 'failed')
+
+
+def _prefetch_npm(app, pkgs):
+    if not shutil.which('npm'):
+        return
+    for p in pkgs:
+        key = ('npm', p.get('id') or p.get('name'))
+        spec = f"{p.get('name')}@{p.get('new_version')}" if p.get('new_version') else p.get('name')
+        _set_state(app, key, status='downloading')
+        _notify(app)
+        r = run_command(["npm", "cache", "add", spec], timeout=600)
+        _set_state(app, key, status='cached' if r.returncode == 0 else 'failed')
+
+
+def download_system_upgrade(log=print):
+    """Download every pending pacman upgrade into the prefetch cache, unprivileged.
+
+    Used by the scheduled/automatic update to fetch packages while the
+    pre-update snapshot is being taken. Returns True when the download
+    completed.
+    """
+    base = _synced_private_pacman(log, "fakeroot is not installed; packages will be downloaded during the upgrade",
+                                  "Could not sync private package database")
+    if base is None:
+        return False
+    result = run_command(base + ["-Suw", "--noconfirm", "--cachedir", PACMAN_CACHE_DIR], timeout=3600)
+    if result.returncode != 0:
+        log(f"Package download finished with errors: {result.stderr}")
+        return False
+    return True
+
+
+def cachedir_args():
+    """``--cachedir`` options for the system and prefetch caches, if the latter has anything."""
+    try:
+        if not os.path.isdir(PACMAN_CACHE_DIR) or not os.listdir(PACMAN_CACHE_DIR):
+            return []
+    except OSError:
+        return []
+    # --cachedir replaces the configured list, so keep the system cache first
+    return ["--cachedir", SYSTEM_CACHE_DIR, "--cachedir", PACMAN_CACHE_DIR]
+
+
+def pacman_cachedir_args(app):
+    """Extra pacman options so an interactive update also reads the prefetch cache."""
+    if not app.settings.get('prefetch_updates', False):
+        return []
+    return cachedir_args()
+
+
+def clear_prefetch_cache(app):
+    try:
+        shutil.rmtree(PACMAN_CACHE_DIR, ignore_errors=True)
+    except Exception:
+        pass
+    with _state_lock:
+        app.prefetch_state.clear()
+    _notify(app)
@@ -0,0 +1,462 @@
+"""Persistent privileged helper.
+
+The helper is started once per session through polkit (or ``sudo -A``) and
+then accepts a small allow-list of package operations over a UNIX socket,
+so a batch of root operations needs a single authorization. The client
+sends one JSON request per connection::
+
+    {"op": "pacman_sync", "args": ["--needed", "firefox"]}
+
+and receives newline-delimited JSON messages: ``{"out": line}`` and
+``{"err": line}`` while the command runs, then ``{"rc": n}`` (plus
+``"error"`` when the request was rejected). Sending ``{"op": "cancel"}`` or
+closing the connection stops the running command.
+
+Only connections from the uid that started the helper are served
+(SO_PEERCRED), arguments are validated against the allow-list on the
+server side, and the helper exits after a period without requests. Each
+connection is served on its own thread, so a long install does not block
+pings or a parallel request. The allow-list is pacman only: npm runs
+package lifecycle scripts, so global npm operations keep going through a
+per-call ``get_auth_command`` prompt.
+
+The socket lives in ``$XDG_RUNTIME_DIR``; without it the helper is not used.
+
+Run ``python3 privileged_helper.py --serve --socket PATH --uid UID`` as
+root to start the server; the app does this through :func:`session`.
+"""
+import os
+import re
+import sys
+import json
+import stat
+import time
+import atexit
+import socket
+import struct
+import argparse
+import threading
+import subprocess
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.process_runner import ProcessRunner, ProcessResult
+
+
+IDLE_TIMEOUT = 600
+START_TIMEOUT = 120.0
+
+# op -> fixed argv, allowed bare flags, allowed options taking a value
+OPERATIONS = {
+    'pacman_sync': (['pacman', '-S', '--noconfirm'], {'--needed'}, {'--cachedir'}),
+    'pacman_upgrade': (['pacman', '-Syu', '--noconfirm'], {'--needed'}, {'--cachedir'}),
+    'pacman_remove': (['pacman', '-R', '--noconfirm'], set(), set()),
+}
+
+_PACMAN_TARGET = re.compile(r'^[A-Za-z0-9@_+][A-Za-z0-9@._+-]*(/[A-Za-z0-9@_+][A-Za-z0-9@._+-]*)?$')
+
+
+class HelperUnavailable(Exception):
+    pass
+
+
+def default_socket_path(uid=None):
+    """Socket path in the per-user runtime dir; raises HelperUnavailable without XDG_RUNTIME_DIR."""
+    uid = os.getuid() if uid is None else uid
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if not base or not os.path.isdir(base):
+        raise HelperUnavailable("XDG_RUNTIME_DIR is not set")
+    return os.path.join(base, f"neoarch-helper-{uid}.sock")
+
+
+def validate(op, args):
+    """Return the argv for ``op`` with ``args``; raise ValueError if anything is not allowed."""
+    if op not in OPERATIONS:
+        raise ValueError(f"operation not allowed: {op}")
+    base, flags, options = OPERATIONS[op]
+    argv = list(base)
+    targets = []
+    args = list(args or [])
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if not isinstance(a, str):
+            raise ValueError("arguments must be strings")
+        if a in flags:
+            argv.append(a)
+        elif a in options:
+            if i + 1 >= len(args):
+                raise ValueError(f"missing value for {a}")
+            value = args[i + 1]
+            if not isinstance(value, str) or not os.path.isabs(value) or not os.path.isdir(value):
+                raise ValueError(f"invalid value for {a}")
+            argv += [a, os.path.realpath(value)]
+            i += 1
+        elif _PACMAN_TARGET.match(a):
+            targets.append(a)
+        else:
+            raise ValueError(f"argument not allowed: {a}")
+        i += 1
+    if not targets and op != 'pacman_upgrade':
+        raise ValueError("no packages given")
+    return argv + targets
+
+
+def op_for_command(command):
+    """Map a plain argv (as passed to CommandWorker) onto (op, args), or None."""
+    if not command or len(command) < 2:
+        return None
+    for op, (base, flags, options) in OPERATIONS.items():
+        if command[:2] != base[:2]:
+            continue
+        rest = [a for a in command[2:] if a not in base[2:]]
+        try:
+            validate(op, rest)
+        except ValueError:
+            return None
+        return op, rest
+    return None
+
+
+# -------------------- server --------------------
+
+def _peer_uid(conn):
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _pid, uid, _gid = struct.unpack('3i', creds)
+    return uid
+
+
+def _server_env():
+    env = {'PATH': '/usr/local/sbin:/usr/local/bin:/usr/bin:/usr/sbin:/bin:/sbin', 'LC_ALL': 'C', 'HOME': '/root'}
+    return env
+
+
+def _handle(conn):
+    """Serve one request. Returns True when the server should shut down."""
+    reader = conn.makefile('r', encoding='utf-8', errors='replace')
+    send_lock = threading.Lock()
+    cancel = threading.Event()
+
+    def send(msg):
+        try:
+            with send_lock:
+                conn.sendall((json.dumps(msg) + "\n").encode('utf-8'))
+        except OSError:
+            cancel.set()
+
+    conn.settimeout(30)
+    try:
+        request = json.loads(reader.readline() or '{}')
+    except (ValueError, OSError):
+        send({'rc': 2, 'error': 'malformed request'})
+        return False
+    op = request.get('op')
+    if op == 'ping':
+        send({'rc': 0, 'pid': os.getpid()})
+        return False
+    if op == 'shutdown':
+        send({'rc': 0})
+        return True
+    try:
+        argv = validate(op, request.get('args'))
+    except ValueError as e:
+        send({'rc': 126, 'error': str(e)})
+        return False
+
+    def watch():
+        # EOF or an explicit cancel message stops the command
+        conn.settimeout(None)
+        try:
+            for line in reader:
+                if json.loads(line or '{}').get('op') == 'cancel':
+                    break
+        except (ValueError, OSError):
+            pass
+        cancel.set()
+
+    threading.Thread(target=watch, daemon=True).start()
+    result = ProcessRunner(argv, env=_server_env()).run(
+        on_stdout=lambda line: send({'out': line}),
+        on_stderr=lambda line: send({'err': line}),
+        cancel_event=cancel,
+    )
+    send({'rc': result.returncode, 'cancelled': result.cancelled})
+    return False
+
+
+def _hand_over_socket(socket_path, allowed_uid):
+    st = os.lstat(socket_path)
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.geteuid():
+        raise OSError(f"{socket_path} was replaced before it could be handed over")
+    os.chown(socket_path, allowed_uid, -1, follow_symlinks=False)
+    st = os.lstat(socket_path)
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != allowed_uid:
+        raise OSError(f"{socket_path} was replaced while it was handed over")
+
+
+def serve(socket_path, allowed_uid, idle_timeout=IDLE_TIMEOUT):
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    # umask makes the socket 0600 at bind time, so no chmod is needed
+    old_umask = os.umask(0o177)
+    try:
+        srv.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    # The runtime dir belongs to the user, who could swap the path for a
+    # symlink or another file: only hand over a socket we just created, and
+    # never follow links while doing it.
+    try:
+        _hand_over_socket(socket_path, allowed_uid)
+    except OSError:
+        srv.close()
+        raise
+    srv.listen(8)
+    srv.settimeout(0.5)
+    lock = threading.Lock()
+    state = {'active': 0, 'last': time.monotonic()}
+    stop = threading.Event()
+
+    def worker(conn):
+        with conn:
+            try:
+                if _peer_uid(conn) in (allowed_uid, 0) and _handle(conn):
+                    stop.set()
+            except Exception:
+                pass
+        with lock:
+            state['active'] -= 1
+            state['last'] = time.monotonic()
+
+    # One thread per connection; the idle timeout runs while nothing is being served
+    try:
+        while not stop.is_set():
+            try:
+                conn, _ = srv.accept()
+            except socket.timeout:
+                with lock:
+                    if state['active'] == 0 and time.monotonic() - state['last'] > idle_timeout:
+                        break
+                continue
+            with lock:
+                state['active'] += 1
+                state['last'] = time.monotonic()
+            threading.Thread(target=worker, args=(conn,), daemon=True).start()
+    finally:
+        srv.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+# -------------------- client --------------------
+
+class PrivilegedHelper:
+    def __init__(self, socket_path=None, idle_timeout=IDLE_TIMEOUT):
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self._proc = None
+
+    def _connect(self, timeout=5.0):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise HelperUnavailable(str(e))
+        return sock
+
+    def _request(self, msg, timeout=5.0):
+        sock = self._connect(timeout)
+        try:
+            sock.sendall((json.dumps(msg) + "\n").encode('utf-8'))
+            line = sock.makefile('r', encoding='utf-8').readline()
+            return json.loads(line) if line else None
+        except (OSError, ValueError):
+            return None
+        finally:
+            sock.close()
+
+    def ping(self):
+        try:
+            reply = self._request({'op': 'ping'}, timeout=2.0)
+        except HelperUnavailable:
+            return False
+        return bool(reply) and reply.get('rc') == 0
+
+    def alive(self):
+        """True while the helper this client started is running and its socket exists."""
+        return self._proc is not None and self._proc.poll() is None and os.path.exists(self.socket_path)
+
+    def start(self, env=None, timeout=START_TIMEOUT):
+        """Start the server through the session's auth command; True once it answers."""
+        # A busy helper may be slow to answer a ping; a live process is a live session
+        if self.alive() or self.ping():
+            return True
+        from utils.workers import get_auth_command
+        env = dict(env if env is not None else os.environ)
+        auth_cmd = get_auth_command(env)
+        if auth_cmd == ["sudo", "-A"] and 'SUDO_ASKPASS' not in env:
+            from services.askpass_service import prepare_askpass_env
+            env, _ = prepare_askpass_env()
+        cmd = auth_cmd + [sys.executable, os.path.abspath(__file__), '--serve',
+                          '--socket', self.socket_path, '--uid', str(os.getuid()),
+                          '--idle', str(int(self.idle_timeout))]
+        # Stay in our session so pkexec can reach the polkit agent
+        self._proc = subprocess.Popen(cmd, env=env, stdin=subprocess.DEVNULL,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.ping():
+                return True
+            if self._proc.poll() is not None:
+                return False
+            time.sleep(0.1)
+        return False
+
+    def run(self, op, args, on_stdout=None, on_stderr=None, cancel_event=None):
+        """Run an allow-listed operation and stream its output; returns a ProcessResult.
+
+        Raises HelperUnavailable if the helper cannot be reached before the
+        request is sent, so callers can fall back to a direct invocation.
+        """
+        sock = self._connect()
+        out, err = [], []
+        rc, cancelled, cancel_sent = None, False, False
+        try:
+            sock.sendall((json.dumps({'op': op, 'args': list(args)}) + "\n").encode('utf-8'))
+            sock.settimeout(0.2)
+            buf = b""
+            while rc is None:
+                if cancel_event is not None and cancel_event.is_set() and not cancel_sent:
+                    cancel_sent = True
+                    try:
+                        sock.sendall(b'{"op": "cancel"}\n')
+                    except OSError:
+                        break
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                buf += chunk
+                while b"\n" in buf:
+                    raw, buf = buf.split(b"\n", 1)
+                    try:
+                        msg = json.loads(raw.decode('utf-8', errors='replace'))
+                    except ValueError:
+                        continue
+                    if 'out' in msg:
+                        out.append(msg['out'])
+                        if on_stdout:
+                            on_stdout(msg['out'])
+                    elif 'err' in msg:
+                        err.append(msg['err'])
+                        if on_stderr:
+                            on_stderr(msg['err'])
+                    elif 'rc' in msg:
+                        rc = msg['rc']
+                        cancelled = bool(msg.get('cancelled'))
+                        if msg.get('error'):
+                            err.append(f"privileged helper: {msg['error']}")
+        except OSError as e:
+            err.append(f"privileged helper: {str(e)}")
+        finally:
+            sock.close()
+        if rc is None:
+            rc = -1
+        return ProcessResult(rc, "\n".join(out), "\n".join(err), cancelled=cancelled or cancel_sent)
+
+    def stop(self):
+        try:
+            self._request({'op': 'shutdown'}, timeout=2.0)
+        except HelperUnavailable:
+            pass
+
+
+# -------------------- per-session helper --------------------
+
+_session = None
+_enabled = False
+_start_failed = False
+_session_lock = threading.Lock()
+
+
+def configure(enabled):
+    """Turn helper use on or off (the 'use_privileged_helper' setting)."""
+    global _enabled, _start_failed
+    _enabled = bool(enabled)
+    _start_failed = False
+    if not _enabled:
+        shutdown()
+
+
+def session(env=None):
+    """The running helper for this session, starting it on first use; None when disabled or refused."""
+    global _session, _start_failed
+    if not _enabled or _start_failed:
+        return None
+    with _session_lock:
+        try:
+            if _session is None:
+                _session = PrivilegedHelper()
+                atexit.register(shutdown)
+            if _session.start(env):
+                return _session
+        except Exception:
+            pass
+        # Authorization refused or the helper could not start: don't prompt again this session
+        _start_failed = True
+        return None
+
+
+def run_privileged(command, on_stdout=None, on_stderr=None, cancel_event=None, env=None):
+    """Run ``command`` (without an auth prefix) through the helper.
+
+    Returns a ProcessResult, or None when the helper is disabled, could not
+    be started or does not allow the command; the caller then runs it with
+    get_auth_command as before.
+    """
+    mapped = op_for_command(command)
+    if mapped is None:
+        return None
+    helper = session(env)
+    if helper is None:
+        return None
+    try:
+        return helper.run(mapped[0], mapped[1], on_stdout=on_stdout, on_stderr=on_stderr, cancel_event=cancel_event)
+    except HelperUnavailable:
+        return None
+
+
+def shutdown():
+    global _session
+    with _session_lock:
+        helper, _session = _session, None
+    if helper is not None:
+        helper.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NeoArch privileged helper")
+    parser.add_argument('--serve', action='store_true', required=True)
+    parser.add_argument('--socket', required=True)
+    parser.add_argument('--uid', type=int, required=True)
+    parser.add_argument('--idle', type=int, default=IDLE_TIMEOUT)
+    opts = parser.parse_args(argv)
+    if os.geteuid() != 0:
+        print("privileged helper must run as root", file=sys.stderr)
+        return 1
+    serve(opts.socket, opts.uid, opts.idle)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
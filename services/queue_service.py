@@ -0,0 +1,263 @@
+"""Persistent operation queue for install, update and uninstall requests.
+
+Requests are stored in ``~/.local/state/neoarch/queue.json`` and run one at
+a time by a worker thread; each operation still fans out over lock domains
+internally (see utils.scheduler). Queuing a package that is already pending
+for the same kind of operation is a no-op, and the opposite operation
+(install vs. uninstall) replaces the earlier request. Operations that were
+pending or running when the app closed are offered again on next start.
+"""
+import os
+import json
+import time
+import uuid
+import tempfile
+import threading
+from threading import Thread
+from utils import pacman_lock
+
+
+KINDS = ('install', 'update', 'uninstall')
+# Lower runs first; among equal priorities, first come first served
+DEFAULT_PRIORITY = {'uninstall': 10, 'install': 10, 'update': 20}
+OPPOSITE = {'install': 'uninstall', 'uninstall': 'install'}
+ALPM_SOURCES = ('pacman', 'AUR')
+
+
+def state_dir():
+    base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'neoarch')
+
+
+def default_queue_path():
+    return os.path.join(state_dir(), 'queue.json')
+
+
+class OperationQueue:
+    """Thread-safe, file-backed list of operations.
+
+    Each operation is a dict with ``id``, ``kind``, ``packages``
+    ({source: [names]}), ``priority``, ``seq``, ``state`` ('pending' or
+    'running'), ``force_sudo`` and ``created``. Finished operations are
+    dropped from the file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_queue_path()
+        self._lock = threading.RLock()
+        self._ops = []
+        self._seq = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for op in data.get('operations', []) if isinstance(data, dict) else []:
+            if not isinstance(op, dict) or op.get('kind') not in KINDS or not op.get('packages'):
+                continue
+            # Whatever was running when the app stopped has to run again
+            op['state'] = 'pending'
+            self._ops.append(op)
+            self._seq = max(self._seq, int(op.get('seq', 0)))
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='.queue-', dir=os.path.dirname(self.path))
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': 1, 'operations': self._ops}, f, indent=1)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def operations(self):
+        with self._lock:
+            return [dict(op) for op in self._ops]
+
+    def pending(self):
+        with self._lock:
+            return [dict(op) for op in self._ops if op['state'] == 'pending']
+
+    def running(self):
+        with self._lock:
+            for op in self._ops:
+                if op['state'] == 'running':
+                    return dict(op)
+        return None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._ops)
+
+    def enqueue(self, kind, packages_by_source, priority=None, force_sudo=False):
+        """Add a request; returns the operation it ended up in, or None if nothing was new."""
+        if kind not in KINDS:
+            raise ValueError(f"unknown operation kind: {kind}")
+        priority = DEFAULT_PRIORITY[kind] if priority is None else int(priority)
+        with self._lock:
+            fresh = {}
+            for source, pkgs in packages_by_source.items():
+                for pkg in pkgs or []:
+                    if self._contains(kind, source, pkg) or pkg in fresh.get(source, []):
+                        continue
+                    self._withdraw(OPPOSITE.get(kind), source, pkg)
+                    fresh.setdefault(source, []).append(pkg)
+            if not fresh:
+                self._save()
+                return None
+            target = None
+            for op in self._ops:
+                if (op['state'] == 'pending' and op['kind'] == kind and op['priority'] == priority
+                        and bool(op.get('force_sudo')) == bool(force_sudo)):
+                    target = op
+                    break
+            if target is None:
+                self._seq += 1
+                target = {'id': uuid.uuid4().hex, 'kind': kind, 'packages': {}, 'priority': priority,
+                          'seq': self._seq, 'state': 'pending', 'force_sudo': bool(force_sudo),
+                          'created': time.time()}
+                self._ops.append(target)
+            for source, pkgs in fresh.items():
+                target['packages'].setdefault(source, []).extend(pkgs)
+            self._save()
+            return dict(target)
+
+    def _contains(self, kind, source, pkg):
+        return any(op['kind'] == kind and pkg in op['packages'].get(source, ()) for op in self._ops)
+
+    def _withdraw(self, kind, source, pkg):
+        if kind is None:
+            return
+        for op in list(self._ops):
+            if op['state'] != 'pending' or op['kind'] != kind:
+                continue
+            pkgs = op['packages'].get(source)
+            if pkgs and pkg in pkgs:
+                pkgs.remove(pkg)
+                if not pkgs:
+                    del op['packages'][source]
+                if not op['packages']:
+                    self._ops.remove(op)
+
+    def take_next(self, skip=None):
+        """Mark the highest-priority pending operation as running and return it.
+
+        ``skip(op)`` can veto an operation for now (e.g. its lock is busy);
+        the next eligible one is returned instead.
+        """
+        with self._lock:
+            if any(op['state'] == 'running' for op in self._ops):
+                return None
+            for op in sorted(self._ops, key=lambda o: (o['priority'], o['seq'])):
+                if op['state'] != 'pending':
+                    continue
+                if skip is not None and skip(op):
+                    continue
+                op['state'] = 'running'
+                op['started'] = time.time()
+                self._save()
+                return dict(op)
+        return None
+
+    def finish(self, op_id):
+        with self._lock:
+            self._ops = [op for op in self._ops if op['id'] != op_id]
+            self._save()
+
+    def clear(self):
+        """Drop every pending operation; a running one stays until it finishes."""
+        with self._lock:
+            self._ops = [op for op in self._ops if op['state'] == 'running']
+            self._save()
+
+
+def touches_alpm(op):
+    return any(op['packages'].get(s) for s in ALPM_SOURCES)
+
+
+def run_operation_sync(app, op):
+    """Run one queued operation with the synchronous service functions."""
+    from services import install_service, update_service, uninstall_service
+    packages = {s: list(p) for s, p in op['packages'].items() if p}
+    if op['kind'] == 'install':
+        return install_service.install_packages_sync(app, packages, force_sudo=op.get('force_sudo', False))
+    if op['kind'] == 'update':
+        return update_service.update_packages_sync(app, packages)
+    return uninstall_service.uninstall_packages_sync(app, packages)
+
+
+def _describe(op):
+    names = [f"{p} ({s})" for s, pkgs in op['packages'].items() for p in pkgs]
+    return f"{op['kind']} {', '.join(names)}"
+
+
+def get_queue(app):
+    queue = getattr(app, 'operation_queue', None)
+    if queue is None:
+        queue = app.operation_queue = OperationQueue()
+    return queue
+
+
+def submit(app, kind, packages_by_source, priority=None, force_sudo=False):
+    """Queue an operation and make sure the worker is running."""
+    queue = get_queue(app)
+    busy = is_active(app)
+    op = queue.enqueue(kind, packages_by_source, priority=priority, force_sudo=force_sudo)
+    if op is None:
+        app.log_signal.emit(f"Already queued: {kind} {', '.join(p for pkgs in packages_by_source.values() for p in pkgs)}")
+    elif busy:
+        app.log_signal.emit(f"Queued: {_describe(op)} ({len(queue.pending())} pending)")
+    start_worker(app)
+    return op
+
+
+def is_active(app):
+    worker = getattr(app, '_queue_worker', None)
+    return worker is not None and worker.is_alive()
+
+
+def start_worker(app):
+    if is_active(app):
+        return
+    app._queue_worker = Thread(target=_worker_loop, args=(app,), daemon=True)
+    app._queue_worker.start()
+
+
+def _worker_loop(app):
+    queue = get_queue(app)
+    waiting_logged = False
+    while True:
+        # Operations that need the ALPM lock wait while another pacman holds it
+        op = queue.take_next(skip=lambda o: touches_alpm(o) and pacman_lock.is_locked())
+        if op is None:
+            if not queue.pending():
+                return
+            if not waiting_logged:
+                app.log_signal.emit("Waiting for another package manager to release the pacman database lock...")
+            # Returns as soon as db.lck is removed
+            state = pacman_lock.wait_for_unlock(timeout=60)
+            if state == pacman_lock.STALE and not waiting_logged:
+                app.log_signal.emit(f"{pacman_lock.DB_LOCK} looks stale (no package manager is running); queued pacman operations stay pending until it is removed.")
+            if state == pacman_lock.STALE:
+                time.sleep(5)
+            waiting_logged = True
+            continue
+        waiting_logged = False
+        app.log_signal.emit(f"Running queued operation: {_describe(op)}")
+        try:
+            ok = run_operation_sync(app, op)
+        except Exception as e:
+            ok = False
+            app.log_signal.emit(f"Queued operation failed: {str(e)}")
+        if not ok:
+            app.log_signal.emit(f"Queued operation did not complete: {_describe(op)}")
+        queue.finish(op['id'])
+
+
+def resume_pending(app):
+    """Start working on operations left over from a previous session."""
+    if get_queue(app).pending():
+        start_worker(app)
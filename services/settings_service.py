@@ -22,6 +22,10 @@ def load_settings():
             'auto_refresh_updates_minutes': 0,
             'auto_update_enabled': False,
             'auto_update_interval_days': 7,
+            'prefetch_updates': False,
+            'use_privileged_helper': False,
+            'sudo_keepalive': False,
+            'pacman_lock_timeout': 300,
             'snapshot_before_update': False,
             'aur_helper': 'auto'  # auto, yay, paru, trizen, or pikaur
         }
@@ -38,6 +42,10 @@ def load_settings():
             'auto_refresh_updates_minutes': 0,
             'auto_update_enabled': False,
             'auto_update_interval_days': 7,
+            'prefetch_updates': False,
+            'use_privileged_helper': False,
+            'sudo_keepalive': False,
+            'pacman_lock_timeout': 300,
             'snapshot_before_update': False,
             'aur_helper': 'auto'  # auto, yay, paru, trizen, or pikaur
         }
@@ -1,33 +1,57 @@
 import os
-import json
 import subprocess
 from threading import Thread
 from PyQt6.QtCore import QTimer
 from utils.workers import CommandWorker
-from utils import sys_utils
+from utils.process_runner import run_command
+from utils.scheduler import DomainScheduler
+from utils import sys_utils, npm_utils, pacman_lock
+from services import askpass_service, prefetch_service, queue_service
 
 
 def update_packages(app, packages_by_source: dict):
+    """Update packages in a background thread; see update_packages_sync()."""
+    Thread(target=update_packages_sync, args=(app, packages_by_source), daemon=True).start()
+
+
+def update_packages_sync(app, packages_by_source: dict):
+    """Update the given packages per source and return True if every update succeeded."""
     def update():
         try:
             overall_success = True
             lock_detected = False
             lock_details = ""
-            for source, pkgs in packages_by_source.items():
+
+            def update_source(domain, source, pkgs, cancel):
+                nonlocal overall_success, lock_detected, lock_details
                 if source == 'pacman':
-                    cmd = ["pacman", "-S", "--noconfirm"] + pkgs
-                    worker = CommandWorker(cmd, sudo=True)
-                    worker.output.connect(app.log)
-                    def _on_err(msg):
-                        nonlocal overall_success, lock_detected, lock_details
+                    # Also read packages pre-downloaded by the background prefetch
+                    cmd = ["pacman", "-S", "--noconfirm"] + prefetch_service.pacman_cachedir_args(app) + pkgs
+                    for attempt in range(2):
+                        # Wait for another pacman to finish instead of failing on db.lck
+                        lock_state = app.wait_for_pacman_lock("updating packages", cancel_event=cancel)
+                        if lock_state != pacman_lock.FREE:
+                            lock_detected = True
+                            lock_details = f"{pacman_lock.DB_LOCK}: lock {lock_state}"
+                            overall_success = False
+                            return
+                        errors = []
+                        worker = CommandWorker(cmd, sudo=True)
+                        worker.output.connect(app.log)
+                        worker.error.connect(errors.append)
+                        worker.run()
+                        if not errors:
+                            return
+                        msg = "\n".join(errors)
+                        if pacman_lock.is_lock_error(msg) and attempt == 0:
+                            app.log("Package database was locked by another program; waiting and retrying...")
+                            continue
                         app.log(msg)
-                        m = (msg or '').lower()
-                        if 'could not lock database' in m or 'unable to lock database' in m:
+                        overall_success = False
+                        if pacman_lock.is_lock_error(msg):
                             lock_detected = True
                             lock_details = msg
-                        overall_success = False
-                    worker.error.connect(_on_err)
-                    worker.run()
+                        return
                 elif source == 'AUR':
                     # Get the configured AUR helper
                     preferred = app.settings.get('aur_helper', 'auto')
@@ -35,9 +59,15 @@ def update_packages(app, packages_by_source: dict):
                     if not aur_helper:
                         app.log("Error: No AUR helper available. Install yay, paru, trizen, or pikaur.")
                         overall_success = False
-                        continue
+                        return
                     
                     env, _ = app.prepare_askpass_env()
+                    lock_state = app.wait_for_pacman_lock("updating AUR packages", cancel_event=cancel)
+                    if lock_state != pacman_lock.FREE:
+                        lock_detected = True
+                        lock_details = f"{pacman_lock.DB_LOCK}: lock {lock_state}"
+                        overall_success = False
+                        return
                     cmd = [aur_helper, "-S", "--noconfirm"] + pkgs
                     worker = CommandWorker(cmd, sudo=False, env=env)
                     worker.output.connect(app.log)
@@ -58,74 +88,20 @@ def update_packages(app, packages_by_source: dict):
                     worker.error.connect(_on_err_fp)
                     worker.run()
                 elif source == 'npm':
-                    # Determine where each package is installed and update in that scope
-                    env_user = os.environ.copy()
-                    try:
-                        npm_prefix = os.path.join(os.path.expanduser('~'), '.npm-global')
-                        os.makedirs(npm_prefix, exist_ok=True)
-                        env_user['npm_config_prefix'] = npm_prefix
-                        env_user['NPM_CONFIG_PREFIX'] = npm_prefix
-                        env_user['PATH'] = os.path.join(npm_prefix, 'bin') + os.pathsep + env_user.get('PATH', '')
-                    except Exception:
-                        pass
-                    env_sys = os.environ.copy()
-
-                    user_pkgs, sys_pkgs, unknown_pkgs = [], [], []
-                    for name in pkgs:
-                        placed = False
-                        try:
-                            r_user = subprocess.run(["npm", "ls", "-g", name, "--depth=0", "--json"], capture_output=True, text=True, env=env_user, timeout=30)
-                            if r_user.returncode in (0, 1) and r_user.stdout:
-                                try:
-                                    data = json.loads(r_user.stdout)
-                                    deps = (data.get('dependencies') or {}) if isinstance(data, dict) else {}
-                                    if name in deps:
-                                        user_pkgs.append(name)
-                                        placed = True
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                        if placed:
-                            continue
-                        try:
-                            r_sys = subprocess.run(["npm", "ls", "-g", name, "--depth=0", "--json"], capture_output=True, text=True, timeout=30)
-                            if r_sys.returncode in (0, 1) and r_sys.stdout:
-                                try:
-                                    data = json.loads(r_sys.stdout)
-                                    deps = (data.get('dependencies') or {}) if isinstance(data, dict) else {}
-                                    if name in deps:
-                                        sys_pkgs.append(name)
-                                        placed = True
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                        if not placed:
-                            # Default to user scope if location unknown
-                            user_pkgs.append(name)
-
-                    if user_pkgs:
-                        cmd_u = ["npm", "update", "-g"] + user_pkgs
-                        w_u = CommandWorker(cmd_u, sudo=False, env=env_user)
-                        w_u.output.connect(app.log)
-                        def _on_err_np_u(msg):
+                    # One inventory of both prefixes, then one `npm update -g` per prefix
+                    uprefix = npm_utils.user_prefix()
+                    scopes = npm_utils.group_by_prefix(pkgs, npm_utils.classify_global(), default=uprefix)
+                    for prefix, names in scopes.items():
+                        # Use pkexec (sudo=True) for system-global updates the user can't write
+                        sudo = prefix != uprefix and not npm_utils.prefix_writable(prefix)
+                        w = CommandWorker(["npm", "update", "-g"] + names, sudo=sudo, env=npm_utils.env_for_prefix(prefix))
+                        w.output.connect(app.log)
+                        def _on_err_np(msg):
                             nonlocal overall_success
                             app.log(msg)
                             overall_success = False
-                        w_u.error.connect(_on_err_np_u)
-                        w_u.run()
-                    if sys_pkgs:
-                        cmd_s = ["npm", "update", "-g"] + sys_pkgs
-                        # Use pkexec (sudo=True) for system-global updates
-                        w_s = CommandWorker(cmd_s, sudo=True, env=env_sys)
-                        w_s.output.connect(app.log)
-                        def _on_err_np_s(msg):
-                            nonlocal overall_success
-                            app.log(msg)
-                            overall_success = False
-                        w_s.error.connect(_on_err_np_s)
-                        w_s.run()
+                        w.error.connect(_on_err_np)
+                        w.run()
                 elif source == 'Local':
                     entries = { (e.get('id') or e.get('name')): e for e in app.load_local_update_entries() }
                     for token in pkgs:
@@ -136,35 +112,44 @@ def update_packages(app, packages_by_source: dict):
                         if not upd:
                             continue
                         try:
-                            process = subprocess.Popen(["bash", "-lc", upd], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                            while True:
-                                line = process.stdout.readline() if process.stdout else ""
-                                if not line and process.poll() is not None:
-                                    break
-                                if line:
-                                    app.log(line.strip())
-                            _, stderr = process.communicate()
-                            if process.returncode != 0 and stderr:
-                                app.log(f"Error: {stderr}")
+                            result = run_command(["bash", "-lc", upd], on_stdout=app.log)
+                            if result.returncode != 0 and result.stderr:
+                                app.log(f"Error: {result.stderr}")
                                 overall_success = False
                         except Exception as ex:
                             app.log(str(ex))
+
+            def on_error(source, e):
+                nonlocal overall_success
+                app.log(f"Error updating {source} packages: {str(e)}")
+                overall_success = False
+
+            # pacman and AUR share the ALPM lock; Flatpak, npm and Local updates run alongside them
+            keepalive = askpass_service.transaction_keepalive(app, [s for s, p in packages_by_source.items() if p])
+            try:
+                DomainScheduler().run(packages_by_source, update_source, on_error=on_error)
+            finally:
+                if keepalive:
+                    keepalive.stop()
             if lock_detected:
                 try:
-                    app.ui_call.emit(lambda: app.show_busy_pm_warning(lock_details, retry_action=lambda: update_packages(app, packages_by_source)))
+                    app.ui_call.emit(lambda: app.show_busy_pm_warning(lock_details, retry_action=lambda: queue_service.submit(app, 'update', packages_by_source)))
                 except Exception:
                     pass
             if overall_success:
+                prefetch_service.clear_prefetch_cache(app)
                 app.show_message.emit("Update Complete", f"Successfully updated {sum(len(v) for v in packages_by_source.values())} package(s).")
             else:
                 app.show_message.emit("Update Failed", "Some updates failed. See console for details.")
             try:
-                app.ui_call.emit(app.refresh_packages)
+                app.ui_call.emit(app.invalidate_package_views)
             except Exception:
                 pass
+            return overall_success
         except Exception as e:
             app.log(f"Error in update thread: {str(e)}")
-    Thread(target=update, daemon=True).start()
+            return False
+    return update()
 
 
 def update_core_tools(app):
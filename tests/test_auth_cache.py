@@ -0,0 +1,48 @@
+import os
+from utils import workers
+from services import askpass_service
+
+
+def test_auth_probe_runs_once_per_session(monkeypatch):
+    calls = []
+    monkeypatch.setattr(workers, '_probe_auth_command', lambda env: calls.append(1) or ["pkexec"])
+    workers.invalidate_auth_cache()
+    env = {'XDG_CURRENT_DESKTOP': 'KDE', 'XDG_SESSION_TYPE': 'x11', 'DISPLAY': ':0'}
+    assert workers.get_auth_command(env) == ["pkexec"]
+    workers.get_auth_command(dict(env)).append("mutated")
+    assert workers.get_auth_command(env) == ["pkexec"]
+    assert len(calls) == 1
+    workers.get_auth_command(dict(env, WAYLAND_DISPLAY='wayland-0'))
+    assert len(calls) == 2
+    workers.invalidate_auth_cache()
+    workers.get_auth_command(env)
+    assert len(calls) == 3
+    workers.invalidate_auth_cache()
+
+
+def test_askpass_script_is_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(askpass_service, '_askpass_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(askpass_service, '_askpass_path', None)
+    first = askpass_service.askpass_script_path()
+    second = askpass_service.askpass_script_path()
+    assert first == second == str(tmp_path / askpass_service.ASKPASS_NAME)
+    assert os.listdir(tmp_path) == [askpass_service.ASKPASS_NAME]
+    # A tampered script is rewritten rather than trusted
+    with open(first, 'a') as f:
+        f.write("echo hijacked\n")
+    assert askpass_service.askpass_script_path() == first
+    with open(first) as f:
+        assert f.read() == askpass_service.ASKPASS_SCRIPT
+
+
+def test_keepalive_only_when_this_process_runs_sudo_twice(monkeypatch):
+    from types import SimpleNamespace
+    started = []
+    monkeypatch.setattr(askpass_service, 'prepare_askpass_env', lambda: ({'SUDO_ASKPASS': '/bin/true'}, None))
+    monkeypatch.setattr(workers, 'get_auth_command', lambda env: ["sudo", "-A"])
+    monkeypatch.setattr(askpass_service.SudoKeepAlive, 'start', lambda self: started.append(1) or True)
+    app = SimpleNamespace(settings={'sudo_keepalive': True})
+    assert askpass_service.transaction_keepalive(app, ['AUR']) is None
+    assert askpass_service.transaction_keepalive(app, ['AUR', 'pacman']) is None
+    assert askpass_service.transaction_keepalive(app, ['pacman', 'npm']) is not None
+    assert started == [1]
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication([])
+
+from components import community_plugins
+from components.community_plugins import CommunityPluginCard, CommunityPluginsTab
+
+
+class _SlowStore:
+    def __init__(self, release, plugins):
+        self.release = release
+        self.plugins = plugins
+        self.threads = []
+
+    def discover_plugins(self):
+        self.threads.append(threading.current_thread())
+        self.release.wait(5)
+        return self.plugins
+
+
+def _cards(tab):
+    items = (tab.grid_layout.itemAt(i).widget() for i in range(tab.grid_layout.count()))
+    return [w for w in items if isinstance(w, CommunityPluginCard)]
+
+
+def _pump_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def _tab(tmp_path, monkeypatch, store):
+    cache = str(tmp_path / "catalogue.json")
+    monkeypatch.setattr(community_plugins, 'CATALOGUE_CACHE', cache)
+    community_plugins.save_cached_catalogue([{'id': 'cached', 'name': 'Cached', 'code': 'print(1)'}], cache)
+    connected = threading.Event()
+
+    def select_store(cancelled=None):
+        connected.wait(5)  # e.g. a Mongo ping against an unreachable server
+        return store, 'mongo'
+
+    monkeypatch.setattr(community_plugins, 'select_store', select_store)
+    return CommunityPluginsTab(main_app=None), connected
+
+
+def test_cached_catalogue_renders_while_store_connects_on_a_worker(tmp_path, monkeypatch):
+    release = threading.Event()
+    store = _SlowStore(release, [{'id': 'a', 'name': 'A'}, {'id': 'b', 'name': 'B', 'code': 'x = 1'}])
+    t0 = time.monotonic()
+    tab, connected = _tab(tmp_path, monkeypatch, store)
+    assert time.monotonic() - t0 < 1
+    assert [c.plugin_info['id'] for c in _cards(tab)] == ['cached']
+    assert tab.plugin_store is None and tab.progress_bar.isVisibleTo(tab)
+
+    connected.set()
+    release.set()
+    assert _pump_until(lambda: [c.plugin_info['id'] for c in _cards(tab)] == ['a', 'b'])
+    assert tab.plugin_store is store and tab._is_mongo
+    assert store.threads and store.threads[0] is not threading.main_thread()
+    assert community_plugins.load_cached_catalogue() == [{'id': 'a', 'name': 'A'}, {'id': 'b', 'name': 'B'}]
+
+
+def test_leaving_the_view_cancels_discovery_and_coming_back_resumes(tmp_path, monkeypatch):
+    release = threading.Event()
+    store = _SlowStore(release, [{'id': 'fresh', 'name': 'Fresh'}])
+    tab, connected = _tab(tmp_path, monkeypatch, store)
+    tab.show()
+    tab.hide()
+    assert tab._load_cancel is None and not tab.progress_bar.isVisibleTo(tab)
+    connected.set()
+    assert _pump_until(lambda: tab.plugin_store is store)
+    release.set()
+    for _ in range(20):
+        app.processEvents()
+        time.sleep(0.01)
+    assert [c.plugin_info['id'] for c in _cards(tab)] == ['cached']
+
+    tab.show()
+    assert _pump_until(lambda: [c.plugin_info['id'] for c in _cards(tab)] == ['fresh'])
+    assert not tab._load_pending
+
+
+def test_empty_discovery_replaces_the_cached_catalogue(tmp_path, monkeypatch):
+    release = threading.Event()
+    release.set()
+    store = _SlowStore(release, [])
+    tab, connected = _tab(tmp_path, monkeypatch, store)
+    assert [c.plugin_info['id'] for c in _cards(tab)] == ['cached']
+    connected.set()
+    assert _pump_until(lambda: not tab._load_pending)
+    assert tab.community_plugins == [] and _cards(tab) == []
+    assert community_plugins.load_cached_catalogue() == []
@@ -0,0 +1,101 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from services import install_service
+from utils.process_runner import ProcessResult
+
+
+class _Signal:
+    def __init__(self):
+        self.calls = []
+
+    def emit(self, *args):
+        self.calls.append(args)
+
+
+def _app():
+    return SimpleNamespace(
+        log_signal=_Signal(), installation_progress=_Signal(), show_message=_Signal(), ui_call=_Signal(),
+        loading_widget=None, settings={'aur_helper': 'yay'}, install_runners=set(),
+        prepare_askpass_env=lambda: ({'SUDO_ASKPASS': '/bin/true'}, None),
+        ensure_flathub_user_remote=lambda: None,
+    )
+
+
+def _runners(monkeypatch, aur_result):
+    ran = []
+
+    class FakeRunner:
+        def __init__(self, cmd, env=None, new_session=True):
+            self.cmd = cmd
+
+        def run(self, on_stdout=None, cancel_event=None):
+            if self.cmd[0] == 'yay':
+                ran.append('yay')
+                return aur_result
+            # npm takes a while, so an AUR outcome lands while it runs
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                if cancel_event.is_set():
+                    ran.append('npm cancelled')
+                    return ProcessResult(-15, "", "", cancelled=True)
+                time.sleep(0.01)
+            ran.append('npm')
+            return ProcessResult(0, "", "")
+
+        def cancel(self):
+            pass
+
+    monkeypatch.setattr(install_service, 'ProcessRunner', FakeRunner)
+    monkeypatch.setattr(install_service.sys_utils, 'get_aur_helper', lambda preferred=None: 'yay')
+    monkeypatch.setattr(install_service.askpass_service, 'transaction_keepalive', lambda app, sources: None)
+    return ran
+
+
+def test_aur_build_failure_does_not_cancel_parallel_domains(monkeypatch):
+    ran = _runners(monkeypatch, ProcessResult(1, "", "==> ERROR: A failure occurred in build()."))
+    app = _app()
+    assert install_service.install_packages_sync(app, {'AUR': ['foo-git'], 'npm': ['eslint']}) is False
+    assert sorted(ran) == ['npm', 'yay']
+    assert app.installation_progress.calls[-1] == ("failed", False)
+
+
+def test_dismissed_aur_password_prompt_cancels_everything(monkeypatch):
+    ran = _runners(monkeypatch, ProcessResult(1, "", "sudo: Authentication failed"))
+    app = _app()
+    assert install_service.install_packages_sync(app, {'AUR': ['foo-git'], 'npm': ['eslint']}) is False
+    # npm is stopped either before its command starts or while it runs
+    assert ran[0] == 'yay' and 'npm' not in ran
+    assert app.installation_progress.calls[-1] == ("cancelled", False)
+
+
+def test_per_package_events_are_throttled(monkeypatch):
+    lines = [f"({i}/100) installing pkg{i}" for i in range(1, 101)]
+
+    class FakeRunner:
+        def __init__(self, cmd, env=None, new_session=True):
+            pass
+
+        def run(self, on_stdout=None, cancel_event=None):
+            for line in lines:
+                on_stdout(line)
+            return ProcessResult(0, "", "")
+
+    monkeypatch.setattr(install_service, 'ProcessRunner', FakeRunner)
+    monkeypatch.setattr(install_service.sys_utils, 'get_aur_helper', lambda preferred=None: 'yay')
+    monkeypatch.setattr(install_service.askpass_service, 'transaction_keepalive', lambda app, sources: None)
+    app = _app()
+    assert install_service.install_packages_sync(app, {'AUR': [f"pkg{i}" for i in range(1, 101)]}) is True
+    # Segment start, segment end and the final message, plus at most a few throttled updates
+    assert len(app.ui_call.calls) < 10
+
+
+def test_cancelling_one_domain_leaves_the_others_running(monkeypatch):
+    ran = _runners(monkeypatch, ProcessResult(0, "", ""))
+    app = _app()
+    threading.Timer(0.3, lambda: app.install_scheduler.cancel('npm')).start()
+    assert install_service.install_packages_sync(app, {'AUR': ['foo-git'], 'npm': ['eslint']}) is False
+    assert sorted(ran) == ['npm cancelled', 'yay']
+    assert app.installation_progress.calls[-1] == ("cancelled", False)
+    assert app.install_scheduler is None
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_component_import_does_not_load_plugin_catalogue():
+    out = _run(
+        "import sys\n"
+        "from components import SourceCard\n"
+        "import managers.plugin_manager\n"
+        "print('components.plugin_catalogue' in sys.modules, 'managers.git_manager' in sys.modules)\n"
+        "from components import PluginsView\n"
+        "print('components.plugin_catalogue' in sys.modules, PluginsView.__module__)\n"
+    )
+    assert out == ['False', 'False', 'True', 'components.plugins_view']
+
+
+def test_unknown_component_raises_attribute_error():
+    import components
+    try:
+        components.DoesNotExist
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("expected AttributeError")
+    assert 'PluginsView' in dir(components)
@@ -0,0 +1,56 @@
+import os
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+from utils.log_sink import LogSink
+
+_app = QApplication.instance() or QApplication([])
+
+
+def test_writes_from_threads_render_in_one_batch():
+    widget = QPlainTextEdit()
+    sink = LogSink(widget, max_blocks=50)
+    threads = [threading.Thread(target=lambda n=n: [sink.write(f"t{n} line {i}") for i in range(100)]) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert widget.blockCount() == 1
+    sink.flush()
+    assert widget.blockCount() <= 50
+    assert len(sink.lines()) == 400
+
+
+def test_search_filter_and_export(tmp_path):
+    widget = QPlainTextEdit()
+    sink = LogSink(widget)
+    sink.write("downloading foo\nerror: bar failed")
+    sink.write("installed baz")
+    sink.flush()
+    assert sink.search("ERROR") == [(1, "error: bar failed")]
+    sink.set_filter("baz")
+    assert widget.toPlainText() == "installed baz"
+    sink.set_filter("")
+    assert "downloading foo" in widget.toPlainText()
+    sink.clear()
+    assert widget.toPlainText() == ""
+    out = tmp_path / "log.txt"
+    assert sink.export(str(out)) == 3
+    assert out.read_text().splitlines()[-1] == "installed baz"
+
+
+def test_lines_written_while_filtered_are_kept_and_rendered():
+    widget = QPlainTextEdit()
+    sink = LogSink(widget)
+    sink.write("first")
+    sink.flush()
+    sink.set_filter("error")
+    sink.write("error: one\nprogress 50%")
+    sink.flush()
+    assert widget.toPlainText() == "error: one"
+    sink.write("progress 100%")
+    sink.flush()
+    sink.set_filter("")
+    assert widget.toPlainText().splitlines() == ["first", "error: one", "progress 50%", "progress 100%"]
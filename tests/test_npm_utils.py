@@ -0,0 +1,38 @@
+import os
+import stat
+from utils import npm_utils
+
+
+FAKE_NPM = """#!/bin/sh
+echo "$npm_config_prefix" >> "$NPM_CALLS"
+if [ -n "$npm_config_prefix" ]; then
+  echo '{"dependencies": {"eslint": {}, "typescript": {}}}'
+else
+  echo '{"dependencies": {"npm": {}, "typescript": {}, "corepack": {}}}'
+  exit 1
+fi
+"""
+
+
+def test_classify_global_lists_each_prefix_once(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    npm = bindir / "npm"
+    npm.write_text(FAKE_NPM)
+    npm.chmod(npm.stat().st_mode | stat.S_IXUSR)
+    calls = tmp_path / "calls"
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("PATH", str(bindir) + os.pathsep + os.environ.get("PATH", ""))
+    monkeypatch.setenv("NPM_CALLS", str(calls))
+    monkeypatch.delenv("npm_config_prefix", raising=False)
+    monkeypatch.delenv("NPM_CONFIG_PREFIX", raising=False)
+    monkeypatch.setattr(npm_utils, 'system_prefix', lambda env=None: "/usr")
+
+    scopes = npm_utils.classify_global()
+    user = npm_utils.user_prefix()
+    assert scopes == {"eslint": user, "typescript": user, "npm": "/usr", "corepack": "/usr"}
+    assert len(calls.read_text().splitlines()) == 2
+
+    groups = npm_utils.group_by_prefix(["typescript", "npm", "left-pad", "eslint"], scopes)
+    assert groups == {user: ["typescript", "eslint"], "/usr": ["npm"]}
+    assert npm_utils.group_by_prefix(["left-pad"], scopes, default=user) == {user: ["left-pad"]}
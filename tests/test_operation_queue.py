@@ -0,0 +1,45 @@
+from services.queue_service import OperationQueue
+
+
+def test_duplicates_merge_into_one_operation(tmp_path):
+    q = OperationQueue(str(tmp_path / "queue.json"))
+    first = q.enqueue('install', {'pacman': ['git', 'vim'], 'Flatpak': ['org.gimp.GIMP']})
+    assert q.enqueue('install', {'pacman': ['vim']}) is None
+    merged = q.enqueue('install', {'pacman': ['git', 'htop']})
+    assert merged['id'] == first['id']
+    assert merged['packages'] == {'pacman': ['git', 'vim', 'htop'], 'Flatpak': ['org.gimp.GIMP']}
+    assert len(q) == 1
+
+
+def test_opposite_request_replaces_pending_one(tmp_path):
+    q = OperationQueue(str(tmp_path / "queue.json"))
+    q.enqueue('install', {'pacman': ['git']})
+    q.enqueue('uninstall', {'pacman': ['git']})
+    ops = q.operations()
+    assert [(op['kind'], op['packages']) for op in ops] == [('uninstall', {'pacman': ['git']})]
+
+
+def test_priority_order_and_skip(tmp_path):
+    q = OperationQueue(str(tmp_path / "queue.json"))
+    q.enqueue('update', {'pacman': ['linux']})
+    q.enqueue('install', {'npm': ['eslint']})
+    q.enqueue('install', {'pacman': ['git']}, priority=0)
+    op = q.take_next(skip=lambda o: 'pacman' in o['packages'])
+    assert op['packages'] == {'npm': ['eslint']}
+    # One operation at a time
+    assert q.take_next() is None
+    q.finish(op['id'])
+    assert q.take_next()['packages'] == {'pacman': ['git']}
+
+
+def test_pending_and_running_operations_survive_restart(tmp_path):
+    path = str(tmp_path / "queue.json")
+    q = OperationQueue(path)
+    q.enqueue('install', {'pacman': ['git']})
+    q.enqueue('update', {'Flatpak': ['org.gimp.GIMP']})
+    running = q.take_next()
+    restored = OperationQueue(path)
+    assert [op['state'] for op in restored.operations()] == ['pending', 'pending']
+    assert restored.take_next()['id'] == running['id']
+    restored.clear()
+    assert len(restored) == 1 and len(OperationQueue(path)) == 1
@@ -0,0 +1,22 @@
+from services.packages_service import diff_packages, package_key
+
+
+def _pkg(name, version, source='pacman', **extra):
+    d = {'name': name, 'id': name, 'version': version, 'source': source}
+    d.update(extra)
+    return d
+
+
+def test_diff_packages_added_removed_changed():
+    old = [_pkg('a', '1'), _pkg('b', '1'), _pkg('c', '1', 'AUR')]
+    new = [_pkg('a', '1'), _pkg('b', '2'), _pkg('d', '1', 'Flatpak')]
+    d = diff_packages(old, new)
+    assert [p['name'] for p in d['added']] == ['d']
+    assert [p['name'] for p in d['changed']] == ['b']
+    assert d['removed'] == [('AUR', 'c')]
+
+
+def test_package_key_separates_sources():
+    assert package_key(_pkg('x', '1', 'pacman')) != package_key(_pkg('x', '1', 'AUR'))
+    d = diff_packages([_pkg('x', '1', 'pacman')], [_pkg('x', '1', 'AUR')])
+    assert len(d['added']) == 1 and d['removed'] == [('pacman', 'x')]
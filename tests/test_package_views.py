@@ -0,0 +1,169 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QApplication, QCheckBox, QLineEdit, QPushButton, QTableWidget
+
+app = QApplication.instance() or QApplication([])
+
+import aurora_home
+from aurora_home import ArchPkgManagerUniGetUI
+
+
+class _Window:
+    """The package-table slice of the main window, without building the whole UI."""
+
+    def __init__(self, view="installed"):
+        self.current_view = view
+        self.package_table = QTableWidget(0, 6)
+        self.load_more_btn = QPushButton()
+        self.search_input = QLineEdit()
+        self.all_packages = []
+        self.search_results = []
+        self.current_page = 0
+        self.packages_per_page = 10
+        self.updated_rows = []
+        self.searches = []
+        self._view_state = {}
+        self._stale_views = {"updates", "installed"}
+        self._view_db_stamp = {}
+        self.updates_all = []
+        self.installed_all = []
+        self.installed_index = None
+        self.filtered_results = []
+        self._mark_installed_pending = False
+
+    def get_svg_icon(self, path, size=16):
+        return QIcon()
+
+    def get_source_icon(self, source, size=16):
+        return QIcon()
+
+    def is_package_installed(self, pkg):
+        return False
+
+    def apply_checkbox_accent(self, checkbox, source):
+        pass
+
+    def on_checkbox_changed(self, row, state):
+        pass
+
+    def update_updates_header_counts(self):
+        pass
+
+    def update_installed_header_counts(self):
+        pass
+
+    def perform_search(self):
+        self.searches.append(self.search_input.text())
+
+    def _update_package_row(self, row, pkg):
+        self.updated_rows.append(pkg['name'])
+        ArchPkgManagerUniGetUI._update_package_row(self, row, pkg)
+
+
+for _name in ('add_package_row', '_cell_widget_row', '_row_key', '_add_row_for_view',
+              '_apply_package_diff', 'display_page', '_view_needs_reload', '_save_view_state',
+              '_restore_rows', '_restore_package_view', '_annotate_installed', '_visible_row_range',
+              '_mark_installed_in_visible_rows', '_style_installed_row', 'get_row_checkbox',
+              'add_discover_row'):
+    setattr(_Window, _name, getattr(ArchPkgManagerUniGetUI, _name))
+_Window._installed_key = staticmethod(ArchPkgManagerUniGetUI._installed_key)
+
+
+def _pkg(name, version, source='pacman'):
+    return {'name': name, 'id': name, 'version': version, 'source': source}
+
+
+def _names(window):
+    return [window.package_table.item(r, 1).text() for r in range(window.package_table.rowCount())]
+
+
+def _checkbox(window, row):
+    return window.package_table.cellWidget(row, 0).findChild(QCheckBox)
+
+
+def test_apply_package_diff_touches_only_changed_rows():
+    window = _Window()
+    window.all_packages = [_pkg('a', '1'), _pkg('b', '1'), _pkg('c', '1', 'AUR')]
+    window.display_page()
+    _checkbox(window, 0).setChecked(True)
+    kept = window.package_table.cellWidget(0, 0)
+
+    window._apply_package_diff([_pkg('a', '1'), _pkg('b', '2'), _pkg('d', '1', 'Flatpak')])
+
+    assert _names(window) == ['a', 'b', 'd']
+    assert window.package_table.cellWidget(0, 0) is kept and _checkbox(window, 0).isChecked()
+    assert window.package_table.item(1, 3).text() == '2'
+    assert window.updated_rows == ['b']
+    assert [p['name'] for p in window.all_packages] == ['a', 'b', 'd']
+    assert window.load_more_btn.isHidden()
+
+
+def test_view_needs_reload_only_when_stale_or_the_pacman_db_changed(monkeypatch):
+    stamp = [(1, 1)]
+    monkeypatch.setattr(aurora_home.packages_service, 'pacman_db_stamp', lambda: stamp[0])
+    window = _Window()
+    assert window._view_needs_reload("installed")
+    window._stale_views.clear()
+    window._view_db_stamp["installed"] = (1, 1)
+    assert not window._view_needs_reload("installed")
+    assert window._view_needs_reload("updates")
+    stamp[0] = (1, 2)
+    assert window._view_needs_reload("installed")
+
+
+def test_restore_package_view_brings_back_rows_and_search(monkeypatch):
+    monkeypatch.setattr(aurora_home.filters_service, 'filter_installed_packages', lambda app, pkgs: list(pkgs))
+    window = _Window()
+    window.installed_all = [_pkg(f"p{i}", '1') for i in range(25)]
+    window._view_state["installed"] = {'rows': 20, 'scroll': 0}
+    window.package_table.insertRow(0)  # leftovers from another view are dropped
+
+    window._restore_package_view("installed")
+    assert _names(window) == [f"p{i}" for i in range(20)]
+    assert window.current_page == 1
+    assert window.load_more_btn.text() == "Load More (5 remaining)"
+    assert window.searches == []
+
+    window.search_input.setText("p1")
+    window._save_view_state("installed")
+    window.search_input.clear()
+    window._restore_package_view("installed")
+    assert window.search_input.text() == "p1" and window.searches == ["p1"]
+
+
+def test_installed_state_is_annotated_once_and_styled_in_the_viewport_only():
+    window = _Window("discover")
+    results = [_pkg(f"p{i}", '1') for i in range(60)]
+    window.filtered_results = results
+    window.all_packages = results
+    window.packages_per_page = len(results)
+    window.display_page()
+    window.package_table.resize(400, 200)
+
+    # The installed index arrives after the results are shown
+    window.installed_index = {'pacman': {'p0', 'p59'}, 'Flatpak': {'org.example.App'}}
+    flatpak = {'name': 'App', 'id': 'org.example.App', 'version': '1', 'source': 'Flatpak'}
+    window._annotate_installed(results + [flatpak])
+    assert [p['name'] for p in results if p['installed']] == ['p0', 'p59'] and flatpak['installed']
+    window._mark_installed_in_visible_rows()
+    table = window.package_table
+    assert table.item(0, 1).data(aurora_home.PKG_INSTALLED_ROLE)
+    assert not window.get_row_checkbox(0).isEnabled()
+    assert table.item(59, 1).data(aurora_home.PKG_INSTALLED_ROLE) is None
+
+    table.scrollToBottom()
+    window._mark_installed_in_visible_rows()
+    assert table.item(59, 1).data(aurora_home.PKG_INSTALLED_ROLE)
+
+
+def test_installed_annotation_and_lookup_share_one_key():
+    window = _Window("discover")
+    window.installed_index = {'pacman': {'p0'}, 'Flatpak': {'org.example.App'}}
+    pkgs = [_pkg('p0', '1'), {'name': 'App', 'id': 'org.example.App', 'version': '1', 'source': 'Flatpak'},
+            {'name': 'org.example.App', 'id': 'App', 'version': '1', 'source': 'Flatpak'}, _pkg(' ', '1')]
+    window._annotate_installed(pkgs)
+    lookup = [ArchPkgManagerUniGetUI.is_package_installed(window, p) for p in pkgs]
+    assert [p['installed'] for p in pkgs] == lookup == [True, True, False, False]
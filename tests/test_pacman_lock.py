@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+from utils import pacman_lock
+
+
+def _fake_proc(tmp_path, names):
+    proc = tmp_path / "proc"
+    proc.mkdir()
+    for pid, name in enumerate(names, start=100):
+        (proc / str(pid)).mkdir()
+        (proc / str(pid) / "comm").write_text(name + "\n")
+    return str(proc)
+
+
+def test_wakes_up_when_lock_is_removed(tmp_path):
+    lock = tmp_path / "db.lck"
+    lock.write_text("")
+    proc = _fake_proc(tmp_path, ["bash", "pacman"])
+    threading.Timer(0.3, lambda: os.remove(lock)).start()
+    ticks = []
+    start = time.monotonic()
+    result = pacman_lock.wait_for_unlock(str(lock), timeout=5, proc=proc, on_tick=lambda r, h: ticks.append(h))
+    assert result == pacman_lock.FREE
+    assert time.monotonic() - start < 1.0
+    assert ticks and ticks[0] == [(101, "pacman")]
+
+
+def test_lock_without_package_manager_is_stale(tmp_path):
+    lock = tmp_path / "db.lck"
+    lock.write_text("")
+    proc = _fake_proc(tmp_path, ["bash"])
+    assert pacman_lock.is_stale(str(lock), proc=proc)
+    result = pacman_lock.wait_for_unlock(str(lock), timeout=10, stale_grace=0.5, proc=proc)
+    assert result == pacman_lock.STALE
+
+
+def test_timeout_and_cancel_while_held(tmp_path):
+    lock = tmp_path / "db.lck"
+    lock.write_text("")
+    proc = _fake_proc(tmp_path, ["yay"])
+    assert pacman_lock.wait_for_unlock(str(lock), timeout=0.3, proc=proc) == pacman_lock.TIMEOUT
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    assert pacman_lock.wait_for_unlock(str(lock), timeout=5, proc=proc, cancel_event=cancel) == pacman_lock.CANCELLED
+    assert pacman_lock.wait_for_unlock(str(tmp_path / "missing.lck")) == pacman_lock.FREE
+
+
+def test_long_lived_daemons_do_not_hold_a_stale_lock(tmp_path):
+    lock = tmp_path / "db.lck"
+    lock.write_text("")
+    proc = _fake_proc(tmp_path, ["packagekitd", "pamac-daemon", "pamac-manager"])
+    assert pacman_lock.lock_holders(proc=proc) == []
+    assert pacman_lock.is_stale(str(lock), proc=proc)
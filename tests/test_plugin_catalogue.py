@@ -0,0 +1,36 @@
+import json
+from components import plugin_catalogue
+
+
+def test_manifest_is_current_with_plugins_data():
+    # Regenerate with: python -m components.plugin_catalogue
+    assert plugin_catalogue.check_manifest() == []
+
+
+def test_loading_specs_does_not_scan_icon_directories(monkeypatch):
+    def no_listdir(path):
+        raise AssertionError(f"listdir({path}) while loading the catalogue")
+    monkeypatch.setattr(plugin_catalogue.os, 'listdir', no_listdir)
+    specs = plugin_catalogue.get_all_plugins_data()
+    assert specs and all(s['icon_resolved'] and s['icon'] for s in specs)
+    assert [s['id'] for s in specs[:8]] == [p['id'] for p in plugin_catalogue.load_catalogue()['plugins'][:8]]
+    by_id = {s['id']: s for s in specs}
+    for label, ids in plugin_catalogue.categories().items():
+        assert all(by_id[i]['category_label'] == label for i in ids)
+
+
+def test_category_and_icon_resolution(tmp_path):
+    (tmp_path / "nvideasettings.png").write_bytes(b"")
+    (tmp_path / "nvidia-settings.svg").write_bytes(b"")
+    (tmp_path / "archivemanager.png").write_bytes(b"")
+    spec = {'id': 'nvidia-settings', 'name': 'NVIDIA Settings', 'icon': str(tmp_path / "missing.png")}
+    # svg is preferred over png
+    assert plugin_catalogue.resolve_icon(spec, str(tmp_path)).endswith("nvidia-settings.svg")
+    assert plugin_catalogue.find_icon_file({'id': 'file-roller', 'name': 'File Roller'}, str(tmp_path)).endswith("archivemanager.png")
+    assert plugin_catalogue.category_for({'category': 'audio'}) == 'Multimedia'
+    assert plugin_catalogue.category_for({'name': 'Krita', 'desc': 'paint program'}) == 'Graphics'
+
+
+def test_missing_manifest_falls_back_to_source(tmp_path):
+    data = plugin_catalogue.load_catalogue(str(tmp_path / "absent.json"))
+    assert data == json.loads(json.dumps(plugin_catalogue.build_manifest()))
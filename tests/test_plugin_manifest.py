@@ -0,0 +1,99 @@
+import os
+import sys
+
+from utils import plugin_manifest, plugin_runtime
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_header_is_authoritative_and_hooks_are_inferred_without_one():
+    declared = plugin_manifest.read_manifest(
+        "# neoarch-plugin: hooks=on_view_changed views=bundles,updates\n"
+        "# neoarch-plugin: ui_thread=true\n"
+        '"""Doc"""\n'
+        "def on_view_changed(app, v): pass\n"
+        "def on_tick(app): pass\n")
+    assert declared['hooks'] == ['on_view_changed'] and declared['views'] == ['bundles', 'updates']
+    assert declared['ui_thread'] is True and 'inferred' not in declared
+
+    inferred = plugin_manifest.read_manifest(
+        "import os\nUI_THREAD = True\n"
+        "def on_startup(app):\n    pass\n"
+        "def _on_status(app):\n    pass\n"
+        "on_tick = lambda app: None\n"
+        "# neoarch-plugin: hooks=on_view_changed\n")
+    assert inferred['hooks'] == ['on_startup', 'on_tick'] and inferred['inferred']
+    assert inferred['ui_thread'] is True
+
+
+def test_plugin_is_imported_only_when_a_declared_hook_fires(tmp_path):
+    path = _write(tmp_path / "lazy_probe.py",
+                  "# neoarch-plugin: hooks=on_view_changed views=bundles\n"
+                  "import sys\n"
+                  "sys.modules.setdefault('lazy_probe_imports', []).append(1)\n"
+                  "seen = []\n"
+                  "def on_view_changed(app, view):\n"
+                  "    seen.append(view)\n")
+    index = plugin_manifest.ManifestIndex(str(tmp_path / "index.json"))
+    [plugin] = plugin_manifest.scan([{'name': 'lazy_probe', 'path': path}], index)
+    host = plugin_runtime.PluginHost(app=None)
+    host.set_plugins([plugin])
+
+    assert host.dispatch('on_startup') == 0
+    assert host.dispatch('on_view_changed', 'updates') == 0
+    assert not plugin.loaded and 'lazy_probe_imports' not in sys.modules
+
+    assert host.dispatch('on_view_changed', 'bundles') == 1
+    assert host.dispatch('on_view_changed', 'bundles') == 1
+    assert host.wait_idle(5)
+    assert plugin.module.seen == ['bundles', 'bundles']
+    assert sys.modules.pop('lazy_probe_imports') == [1]
+    assert host.status()['lazy_probe']['loaded']
+    assert host.profiler.snapshot()['lazy_probe']['import']['calls'] == 1
+
+    # A second scan only stats the file
+    reread = []
+    original = plugin_manifest.read_manifest
+    plugin_manifest.read_manifest = lambda source: reread.append(source) or original(source)
+    try:
+        plugin_manifest.scan([{'name': 'lazy_probe', 'path': path}],
+                             plugin_manifest.ManifestIndex(str(tmp_path / "index.json")))
+    finally:
+        plugin_manifest.read_manifest = original
+    assert reread == []
+
+
+def test_broken_plugin_is_disabled_after_its_failed_import(tmp_path):
+    path = _write(tmp_path / "broken.py", "def on_tick(app):\n    pass\nraise RuntimeError('nope')\n")
+    [plugin] = plugin_manifest.scan([{'name': 'broken', 'path': path}],
+                                    plugin_manifest.ManifestIndex(str(tmp_path / "index.json")))
+    logs = []
+    host = plugin_runtime.PluginHost(app=None, log=logs.append)
+    host.set_plugins([plugin])
+    host.dispatch('on_tick')
+    assert host.wait_idle(5)
+    assert host.status()['broken']['disabled'] and not host.status()['broken']['loaded']
+    assert host.dispatch('on_tick') == 0
+    assert any('Failed to load plugin broken' in line for line in logs)
+
+
+def test_install_defaults_trusts_the_stamp_and_repairs_edits(tmp_path, monkeypatch):
+    defaults = {'a.py': "def on_tick(app):\n    pass", 'b.py': "x = 1"}
+    assert plugin_manifest.install_defaults(str(tmp_path), defaults) == ['a.py', 'b.py']
+    assert (tmp_path / 'a.py').read_text() == defaults['a.py'] + "\n"
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr('builtins.open', lambda f, *a, **k: opened.append(os.path.basename(str(f))) or real_open(f, *a, **k))
+    assert plugin_manifest.install_defaults(str(tmp_path), defaults) == []
+    assert opened == [plugin_manifest.DEFAULTS_STAMP]
+    monkeypatch.undo()
+
+    (tmp_path / 'b.py').write_text("x = 2\n")
+    assert plugin_manifest.install_defaults(str(tmp_path), defaults) == ['b.py']
+    assert (tmp_path / 'b.py').read_text() == "x = 1\n"
+    os.utime(tmp_path / 'a.py', ns=(1, 1))
+    assert plugin_manifest.install_defaults(str(tmp_path), defaults) == []
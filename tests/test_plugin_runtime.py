@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+import types
+
+from utils import plugin_runtime
+
+
+def _plugin(name, **attrs):
+    mod = types.ModuleType(name)
+    for key, value in attrs.items():
+        setattr(mod, key, value)
+    return mod
+
+
+def test_hooks_run_on_workers_in_order_and_ui_thread_opt_in_runs_inline():
+    calls = []
+    worker = _plugin('worker', on_view_changed=lambda app, view: calls.append((view, threading.current_thread().name)))
+    legacy = _plugin('legacy', UI_THREAD=True,
+                     on_view_changed=lambda app, view: calls.append(('legacy', threading.current_thread().name)))
+    host = plugin_runtime.PluginHost(app=None)
+    host.set_plugins([worker, legacy])
+    for view in ('a', 'b', 'c'):
+        assert host.dispatch('on_view_changed', view) == 2
+    assert host.wait_idle(5)
+    assert [c for c in calls if c[0] != 'legacy'] == [('a', 'plugin-hooks'), ('b', 'plugin-hooks'), ('c', 'plugin-hooks')]
+    assert [c for c in calls if c[0] == 'legacy'] == [('legacy', threading.current_thread().name)] * 3
+
+
+def test_slow_tick_is_coalesced_and_does_not_block_dispatch():
+    release = threading.Event()
+    ticks = []
+
+    def on_tick(app):
+        ticks.append(1)
+        release.wait(5)
+
+    host = plugin_runtime.PluginHost(app=None)
+    host.set_plugins([_plugin('slow', on_tick=on_tick, HOOK_BUDGETS={'on_tick': 30})])
+    t0 = time.monotonic()
+    counts = [host.dispatch('on_tick') for _ in range(3)]
+    assert time.monotonic() - t0 < 0.5
+    release.set()
+    assert host.wait_idle(5)
+    assert counts[0] == 1 and counts[1:] == [0, 0] and ticks == [1]
+
+
+def test_overrunning_plugin_is_flagged_then_disabled():
+    logs = []
+    host = plugin_runtime.PluginHost(app=None, log=logs.append)
+    ok = _plugin('ok', on_tick=lambda app: None)
+    slow = _plugin('slow', on_tick=lambda app: time.sleep(0.05), HOOK_BUDGETS={'on_tick': 0.01})
+    host.set_plugins([ok, slow])
+    for _ in range(plugin_runtime.MAX_OVERRUNS):
+        host.dispatch('on_tick')
+        assert host.wait_idle(5)
+    status = host.status()
+    assert status['slow']['flagged'] and status['slow']['disabled']
+    assert not status['ok']['flagged']
+    assert host.dispatch('on_tick') == 1
+    assert host.wait_idle(5)
+    assert any('disabled' in line for line in logs)
+    host.enable('slow')
+    assert host.dispatch('on_tick') == 2
+
+
+def test_watchdog_flags_a_hook_that_is_still_running():
+    now = [100.0]
+    entered, release = threading.Event(), threading.Event()
+
+    def on_startup(app):
+        entered.set()
+        release.wait(5)
+
+    host = plugin_runtime.PluginHost(app=None, clock=lambda: now[0])
+    host.set_plugins([_plugin('hung', on_startup=on_startup)])
+    host.dispatch('on_startup')
+    assert entered.wait(5)
+    assert host.check_overruns() == []
+    now[0] += plugin_runtime.DEFAULT_BUDGETS['on_startup'] + 1
+    assert host.check_overruns() == ['hung']
+    assert host.check_overruns() == []
+    release.set()
+    assert host.wait_idle(5)
+    assert host.status()['hung']['overruns'] == 1
+
+
+def test_run_on_ui_waits_for_the_ui_thread_result():
+    posted = queue.Queue()
+    result = {}
+
+    def worker():
+        result['value'] = plugin_runtime.run_on_ui(posted.put, lambda a, b: a + b, 2, 3, wait=True, timeout=5)
+        plugin_runtime.run_on_ui(posted.put, result.setdefault, 'fire', 'and forget')
+
+    t = threading.Thread(target=worker)
+    t.start()
+    posted.get(timeout=5)()
+    posted.get(timeout=5)()
+    t.join(5)
+    assert result == {'value': 5, 'fire': 'and forget'}
+    assert plugin_runtime.run_on_ui(posted.put, lambda: 'inline') == 'inline'
+
+
+def test_profiler_records_timings_errors_and_exports_json(tmp_path):
+    import json
+
+    now = [0.0]
+
+    def tick(app):
+        now[0] += 0.010
+
+    def view_changed(app, view):
+        now[0] += 0.100 if view == 'slow' else 0.001
+        if view == 'boom':
+            raise ValueError('bad view')
+
+    host = plugin_runtime.PluginHost(app=None, clock=lambda: now[0])
+    host.set_plugins([_plugin('prof', UI_THREAD=True, on_tick=tick, on_view_changed=view_changed)])
+    for view in ['fast'] * 18 + ['slow', 'boom']:
+        host.dispatch('on_view_changed', view)
+    host.dispatch('on_tick')
+
+    hooks = host.profiler.snapshot()['prof']
+    views = hooks['on_view_changed']
+    assert views['calls'] == 20 and views['errors'] == 1
+    assert views['last_errors'] == ['ValueError: bad view']
+    assert abs(views['max_ms'] - 100) < 1e-6 and abs(views['p95_ms'] - 1) < 1e-6
+    assert abs(views['total_ms'] - 119) < 1e-6
+    summary = host.profiler.plugin_summary('prof')
+    assert summary['calls'] == 21 and summary['errors'] == 1
+    assert host.profiler.plugin_summary('missing') is None
+
+    path = tmp_path / 'profile.json'
+    assert host.profiler.export(str(path), host.status()) == 1
+    data = json.loads(path.read_text())
+    assert data['plugins']['prof']['hooks']['on_tick']['calls'] == 1
+    assert data['plugins']['prof']['status']['disabled'] is False
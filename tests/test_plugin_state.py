@@ -0,0 +1,53 @@
+import os
+import stat
+from components import plugin_state
+
+
+def _exe(path, body="#!/bin/sh\nexit 0\n"):
+    path.write_text(body)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def test_states_from_one_package_query_and_path_scan(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    calls = tmp_path / "calls"
+    _exe(bindir / "pacman", f"#!/bin/sh\necho \"$@\" >> {calls}\nprintf 'gparted\\nvlc\\n'\n")
+    _exe(bindir / "btop")
+    (bindir / "notes").write_text("not executable")
+    monkeypatch.setenv("PATH", str(bindir))
+    monkeypatch.setattr(plugin_state, 'LOCAL_DB', str(tmp_path / "no-local-db"))
+    specs = [
+        {'id': 'gparted', 'pkg': 'gparted', 'cmd': 'gparted'},
+        {'id': 'btop', 'pkg': 'btop', 'cmd': 'btop'},
+        {'id': 'notes', 'pkg': 'notes', 'cmd': 'notes'},
+        {'id': 'steam', 'pkg': 'steam', 'cmd': 'steam'},
+    ]
+    states = plugin_state.installed_states(specs)
+    assert states == {'gparted': True, 'btop': True, 'notes': False, 'steam': False}
+    assert calls.read_text().splitlines() == ["-Qq"]
+
+
+def test_path_index_prefers_first_directory(tmp_path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    _exe(first / "tool")
+    _exe(second / "tool")
+    index = plugin_state.path_executables(os.pathsep.join([str(first), str(tmp_path / "missing"), str(second)]))
+    assert index["tool"] == str(first / "tool")
+
+
+def test_local_db_adds_provides(tmp_path):
+    db = tmp_path / "local"
+    for dirname, desc in {
+        "jre17-openjdk-17.0.9-1": "%NAME%\njre17-openjdk\n\n%VERSION%\n17.0.9-1\n\n%PROVIDES%\njava-runtime=17\njre17\n\n",
+        "bash-5.2-1": "%NAME%\nbash\n\n%PROVIDES%\nsh\n",
+    }.items():
+        (db / dirname).mkdir(parents=True)
+        (db / dirname / "desc").write_text(desc)
+    (db / "ALPM_DB_VERSION").write_text("9\n")
+    packages = plugin_state.installed_packages(dbpath=str(db))
+    assert packages == {'jre17-openjdk', 'java-runtime', 'jre17', 'bash', 'sh'}
+    assert plugin_state.is_installed({'id': 'java', 'pkg': 'java-runtime'}, packages, {})
@@ -0,0 +1,180 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication, QPushButton
+
+app = QApplication.instance() or QApplication([])
+
+from components import plugin_grid
+from components.plugins_view import PluginsView
+
+
+# Parentless views of earlier tests are hidden and kept alive: if the cyclic
+# GC collected one while Qt was painting it, the process would crash
+_views = []
+
+
+def _view(monkeypatch):
+    monkeypatch.setattr(PluginsView, 'refresh_installed_states', lambda self: None)
+    for old in _views:
+        old.hide()
+    view = PluginsView(None, lambda path, size: QIcon())
+    _views.append(view)
+    view.resize(1200, 900)
+    view.show()
+    QApplication.processEvents()
+    return view
+
+
+def test_state_change_repaints_only_that_row(monkeypatch):
+    view = _view(monkeypatch)
+    model = view._grid_model
+    assert model.rowCount() == len(view._all_plugins) > 8
+    view._grid_view.verticalScrollBar().setValue(200)
+    target = model.index(3).data(plugin_grid.IdRole)
+    changed, resets = [], []
+    model.dataChanged.connect(lambda a, b, roles: changed.append((a.row(), b.row())))
+    model.modelReset.connect(lambda: resets.append(True))
+
+    view._apply_installed_states({target: True, model.index(5).data(plugin_grid.IdRole): False})
+
+    assert changed == [(3, 3)] and resets == []
+    assert model.index(3).data(plugin_grid.InstalledRole) is True
+    assert view._grid_view.verticalScrollBar().value() == 200
+
+
+def test_install_button_click_marks_row_installing(monkeypatch):
+    view = _view(monkeypatch)
+    grid = view._grid_view
+    requested = []
+    view.install_requested.connect(requested.append)
+    index = view._grid_model.index(0)
+    card = plugin_grid.PluginCardDelegate.card_rect(grid.visualRect(index))
+    button = plugin_grid.PluginCardDelegate.button_rects(card, False)['install']
+
+    QTest.mouseClick(grid.viewport(), Qt.MouseButton.LeftButton, pos=button.center())
+    QTest.mouseClick(grid.viewport(), Qt.MouseButton.LeftButton, pos=button.center())
+
+    assert requested == [index.data(plugin_grid.IdRole)]
+    assert index.data(plugin_grid.InstallingRole) is True
+    view.set_installing(requested[0], False)
+    assert index.data(plugin_grid.InstallingRole) is False
+
+
+def test_columns_follow_viewport_width():
+    assert plugin_grid.columns_for(300) == 1
+    assert plugin_grid.columns_for(700) == 2
+    assert plugin_grid.columns_for(5000) == plugin_grid.MAX_COLUMNS
+
+
+class _FakeSignal:
+    def __init__(self):
+        self.calls = []
+
+    def emit(self, *args):
+        self.calls.append(args)
+
+
+class _FakeView:
+    def __init__(self, installed=False):
+        self.installed = installed
+        self.events = []
+
+    def get_plugin(self, plugin_id):
+        return {'id': plugin_id, 'name': plugin_id, 'pkg': plugin_id}
+
+    def is_installed(self, spec):
+        return self.installed
+
+    def set_installing(self, plugin_id, installing):
+        self.events.append(('installing', plugin_id, installing))
+
+    def refresh_all(self):
+        self.events.append(('refresh',))
+
+
+class _FakeProc:
+    stdout = iter(["ok\n"])
+
+    def wait(self):
+        return 0
+
+
+def _manager(monkeypatch):
+    import threading
+    from types import SimpleNamespace
+    from managers import plugin_manager
+
+    threads = []
+
+    class _Thread(threading.Thread):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            threads.append(self)
+
+    monkeypatch.setattr(plugin_manager, 'Thread', _Thread)
+    monkeypatch.setattr(plugin_manager.subprocess, 'Popen', lambda *a, **kw: _FakeProc())
+    app = SimpleNamespace(ui_call=_FakeSignal(), show_message=_FakeSignal(), log_signal=_FakeSignal())
+    return plugin_manager.PluginsManager(app), app, threads
+
+
+def test_install_worker_posts_view_updates_to_the_ui_thread(monkeypatch):
+    manager, fake_app, threads = _manager(monkeypatch)
+    view = _FakeView()
+    manager.install_by_id(view, 'htop')
+    for t in threads:
+        t.join(5)
+    # Nothing touched the view from the worker; everything went through ui_call
+    assert view.events == []
+    for (fn,) in fake_app.ui_call.calls:
+        fn()
+    assert view.events == [('installing', 'htop', True), ('installing', 'htop', False), ('refresh',)]
+
+
+def test_installing_flag_clears_on_early_return_and_when_scan_sees_the_result(monkeypatch):
+    from types import SimpleNamespace
+    from managers import plugin_manager
+
+    view = _view(monkeypatch)
+    grid = view._grid_view
+    index = view._grid_model.index(0)
+    pid = index.data(plugin_grid.IdRole)
+    card = plugin_grid.PluginCardDelegate.card_rect(grid.visualRect(index))
+    button = plugin_grid.PluginCardDelegate.button_rects(card, False)['install']
+    app_ = SimpleNamespace(ui_call=_FakeSignal(), show_message=_FakeSignal(), log_signal=_FakeSignal())
+    manager = plugin_manager.PluginsManager(app_)
+
+    # Already installed: the manager returns before starting a worker
+    monkeypatch.setattr(PluginsView, 'is_installed', lambda self, spec: True)
+    view.install_requested.connect(lambda plugin_id: manager.install_by_id(view, plugin_id))
+    QTest.mouseClick(grid.viewport(), Qt.MouseButton.LeftButton, pos=button.center())
+    assert index.data(plugin_grid.InstallingRole) is False
+
+    # Normal path: the flag stays until the state scan reports the plugin installed
+    view.install_requested.disconnect()
+    view._on_install_clicked(pid)
+    view._apply_installed_states({pid: False})
+    assert index.data(plugin_grid.InstallingRole) is True
+    view._apply_installed_states({pid: True})
+    assert index.data(plugin_grid.InstallingRole) is False
+
+
+def test_slider_card_opens_once_the_scan_reports_it_installed(monkeypatch):
+    view = _view(monkeypatch)
+    cards = [view.slider_layout.itemAt(i).widget() for i in range(view.slider_layout.count())]
+    card = next(c for c in cards if c is not None and getattr(c, 'card_state', None) and c.card_state.get_matching_plugin())
+    plugin_id = card.card_state.get_matching_plugin()['id']
+    assert not card.card_state.get_installed_state()
+    launched, installs = [], []
+    view.launch_requested.connect(launched.append)
+    view.install_requested.connect(installs.append)
+
+    view._apply_installed_states({plugin_id: True})
+    button = card.findChildren(QPushButton)[0]
+    assert button.text() == "Open"
+    button.click()
+    assert launched == [plugin_id] and installs == []
@@ -0,0 +1,92 @@
+import time
+import types
+from services import prefetch_service
+from utils.process_runner import ProcessResult
+
+
+def _app(**settings):
+    return types.SimpleNamespace(settings=settings, prefetch_state={}, _prefetch_running=False, _installing=False)
+
+
+def test_cached_files_match_exact_package_name(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefetch_service, 'PACMAN_CACHE_DIR', str(tmp_path))
+    (tmp_path / "foo-1.2-1-x86_64.pkg.tar.zst").write_bytes(b"x" * 10)
+    (tmp_path / "foo-1.2-1-x86_64.pkg.tar.zst.sig").write_bytes(b"s")
+    (tmp_path / "foo-bar-1.2-1-x86_64.pkg.tar.zst").write_bytes(b"y")
+    files = prefetch_service._cached_files("foo", "1.2")
+    assert [f.rsplit('/', 1)[-1] for f in files] == ["foo-1.2-1-x86_64.pkg.tar.zst"]
+
+
+def test_cachedir_args_only_when_enabled_and_populated(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefetch_service, 'PACMAN_CACHE_DIR', str(tmp_path))
+    assert prefetch_service.pacman_cachedir_args(_app(prefetch_updates=True)) == []
+    (tmp_path / "foo-1.2-1-any.pkg.tar.zst").write_bytes(b"x")
+    assert prefetch_service.pacman_cachedir_args(_app(prefetch_updates=False)) == []
+    args = prefetch_service.pacman_cachedir_args(_app(prefetch_updates=True))
+    assert args == ["--cachedir", prefetch_service.SYSTEM_CACHE_DIR, "--cachedir", str(tmp_path)]
+
+
+def test_prefetch_is_opt_in():
+    assert prefetch_service.maybe_start_prefetch(_app(), [{'source': 'pacman', 'id': 'foo'}]) is False
+    app = _app(prefetch_updates=True)
+    app._installing = True
+    assert prefetch_service.maybe_start_prefetch(app, [{'source': 'pacman', 'id': 'foo'}]) is False
+
+
+def test_prefetch_labels():
+    app = _app()
+    prefetch_service._set_state(app, ('npm', 'left-pad'), status='cached', bytes=2048)
+    info = prefetch_service.prefetch_info(app, {'source': 'npm', 'id': 'left-pad'})
+    assert prefetch_service.prefetch_label(info) == "✓ cached 2.0 KiB"
+    assert prefetch_service.prefetch_info(app, {'source': 'npm', 'id': 'other'}) is None
+    assert prefetch_service.prefetch_label({'status': 'downloading', 'bytes': 512, 'total': 1024}) == "⤓ 512 B / 1.0 KiB"
+
+
+def test_pacman_prefetch_reports_bytes_per_package_from_the_cache(tmp_path, monkeypatch):
+    cache = tmp_path / "pkg"
+    monkeypatch.setattr(prefetch_service, 'PACMAN_CACHE_DIR', str(cache))
+    monkeypatch.setattr(prefetch_service, 'PACMAN_DB_DIR', str(tmp_path / "db"))
+    monkeypatch.setattr(prefetch_service.shutil, 'which', lambda name: '/usr/bin/' + name)
+    monkeypatch.setattr(prefetch_service.os, 'symlink', lambda src, dst: None)
+
+    def run_command(cmd, on_stdout=None, timeout=None, **kw):
+        if "-Sp" in cmd:
+            return ProcessResult(0, "foo 1000\nbar 50", "")
+        if "-Sw" in cmd:
+            part = cache / "foo-1.2-1-x86_64.pkg.tar.zst.part"
+            part.write_bytes(b"x" * 400)
+            time.sleep(0.8)
+            part.rename(cache / "foo-1.2-1-x86_64.pkg.tar.zst")
+            part.with_name("foo-1.2-1-x86_64.pkg.tar.zst").write_bytes(b"x" * 1000)
+        return ProcessResult(0, "", "")
+
+    monkeypatch.setattr(prefetch_service, 'run_command', run_command)
+    seen = []
+    app = _app(prefetch_updates=True)
+    app.log = lambda msg: None
+    app.refresh_prefetch_labels = None
+    app.ui_call = types.SimpleNamespace(emit=lambda fn: seen.append(dict(app.prefetch_state[('pacman', 'foo')])))
+    prefetch_service._prefetch_pacman(app, [{'source': 'pacman', 'id': 'foo', 'name': 'foo', 'new_version': '1.2-1'}])
+
+    assert seen[0] == {'status': 'downloading', 'bytes': 0, 'total': 1000}
+    assert {'status': 'downloading', 'bytes': 400, 'total': 1000} in seen
+    assert app.prefetch_state[('pacman', 'foo')] == {'status': 'cached', 'bytes': 1000, 'total': 1000}
+
+
+def test_prefetch_and_system_download_share_the_private_db_invocation(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefetch_service, 'PACMAN_CACHE_DIR', str(tmp_path / "pkg"))
+    monkeypatch.setattr(prefetch_service, 'PACMAN_DB_DIR', str(tmp_path / "db"))
+    monkeypatch.setattr(prefetch_service.shutil, 'which', lambda name: '/usr/bin/' + name)
+    monkeypatch.setattr(prefetch_service.os, 'symlink', lambda src, dst: None)
+    calls = []
+    monkeypatch.setattr(prefetch_service, 'run_command',
+                        lambda cmd, **kw: calls.append(cmd) or ProcessResult(0, "", ""))
+    assert prefetch_service.download_system_upgrade(log=lambda msg: None)
+    app = _app(prefetch_updates=True)
+    app.log = lambda msg: None
+    app.refresh_prefetch_labels = None
+    app.ui_call = types.SimpleNamespace(emit=lambda fn: None)
+    prefetch_service._prefetch_pacman(app, [{'source': 'pacman', 'id': 'foo', 'name': 'foo', 'new_version': '1-1'}])
+    syncs = [c for c in calls if c[-1] == "-Sy"]
+    assert len(syncs) == 2 and syncs[0] == syncs[1]
+    assert calls[1][:len(syncs[0]) - 1] == calls[-1][:len(syncs[0]) - 1] == syncs[0][:-1]
@@ -0,0 +1,84 @@
+import os
+import stat
+import socket
+import threading
+import pytest
+from services import privileged_helper
+from services.privileged_helper import PrivilegedHelper, op_for_command, validate
+
+
+def test_validate_allow_list():
+    assert validate('pacman_sync', ['--needed', 'firefox', 'extra/vim']) == ['pacman', '-S', '--noconfirm', '--needed', 'firefox', 'extra/vim']
+    for op, args in [('rm', ['-rf', '/']), ('pacman_sync', ['--config', '/tmp/x', 'a']),
+                     ('pacman_sync', ['-Ud', 'a']), ('pacman_remove', []),
+                     ('npm_install', ['eslint']), ('pacman_sync', ['--cachedir', 'relative', 'a'])]:
+        with pytest.raises(ValueError):
+            validate(op, args)
+
+
+def test_op_for_command_maps_plain_commands():
+    assert op_for_command(['pacman', '-S', '--needed', '--noconfirm', 'git']) == ('pacman_sync', ['--needed', 'git'])
+    assert op_for_command(['pacman', '-R', '--noconfirm', 'git']) == ('pacman_remove', ['git'])
+    # npm lifecycle scripts must never run as root without a prompt
+    assert op_for_command(['npm', 'update', '-g', 'eslint']) is None
+    assert op_for_command(['npm', 'install', '-g', 'eslint']) is None
+    assert op_for_command(['pacman', '-Rns', '--noconfirm', 'git']) is None
+    assert op_for_command(['flatpak', 'update']) is None
+
+
+def test_server_streams_output_and_rejects_unknown_ops(tmp_path, monkeypatch):
+    monkeypatch.setitem(privileged_helper.OPERATIONS, 'test_echo', (['echo'], set(), set()))
+    path = str(tmp_path / "helper.sock")
+    server = threading.Thread(target=privileged_helper.serve, args=(path, os.getuid(), 10), daemon=True)
+    server.start()
+    helper = PrivilegedHelper(socket_path=path)
+    for _ in range(100):
+        if helper.ping():
+            break
+        threading.Event().wait(0.02)
+    lines = []
+    result = helper.run('test_echo', ['hello'], on_stdout=lines.append)
+    assert result.returncode == 0 and lines == ['hello']
+    # A long request does not block pings or other requests
+    monkeypatch.setitem(privileged_helper.OPERATIONS, 'test_sleep', (['sleep'], set(), set()))
+    slow = threading.Thread(target=helper.run, args=('test_sleep', ['2']), daemon=True)
+    slow.start()
+    threading.Event().wait(0.2)
+    assert helper.ping()
+    assert helper.run('test_echo', ['again']).returncode == 0
+    rejected = helper.run('pacman_sync', ['--dbpath', '/tmp', 'x'])
+    assert rejected.returncode == 126 and 'not allowed' in rejected.stderr
+    helper.stop()
+    server.join(timeout=5)
+    assert not server.is_alive() and not os.path.exists(path)
+
+
+def test_socket_path_requires_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert privileged_helper.default_socket_path(1000) == str(tmp_path / "neoarch-helper-1000.sock")
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    with pytest.raises(privileged_helper.HelperUnavailable):
+        privileged_helper.default_socket_path(1000)
+
+
+def test_socket_hand_over_refuses_links_and_other_files(tmp_path):
+    target = tmp_path / "shadow"
+    target.write_text("secret")
+    target.chmod(0o640)
+    link = tmp_path / "helper.sock"
+    link.symlink_to(target)
+    with pytest.raises(OSError):
+        privileged_helper._hand_over_socket(str(link), os.getuid())
+    with pytest.raises(OSError):
+        privileged_helper._hand_over_socket(str(target), os.getuid())
+    assert oct(target.stat().st_mode & 0o777) == oct(0o640)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old = os.umask(0o177)
+    try:
+        sock.bind(str(tmp_path / "real.sock"))
+    finally:
+        os.umask(old)
+    privileged_helper._hand_over_socket(str(tmp_path / "real.sock"), os.getuid())
+    assert stat.S_IMODE(os.lstat(tmp_path / "real.sock").st_mode) == 0o600
+    sock.close()
@@ -0,0 +1,41 @@
+import os
+import threading
+import time
+from utils.process_runner import ProcessRunner, run_command
+
+
+def test_run_command_streams_both_pipes():
+    out = []
+    err = []
+    r = run_command(['sh', '-c', "for i in 1 2 3; do echo out $i; echo err $i 1>&2; done; printf 'a\\rb'; exit 3"],
+                    on_stdout=out.append, on_stderr=err.append)
+    assert out == ['out 1', 'out 2', 'out 3', 'a', 'b']
+    assert err == ['err 1', 'err 2', 'err 3']
+    assert r.returncode == 3
+    assert not r.ok
+
+
+def test_cancel_kills_process_group():
+    runner = ProcessRunner(['sh', '-c', 'sleep 30 & sleep 30'])
+    threading.Timer(0.2, runner.cancel).start()
+    start = time.monotonic()
+    r = runner.run()
+    assert r.cancelled
+    assert time.monotonic() - start < 5
+
+
+def test_cancel_event_and_timeout():
+    ev = threading.Event()
+    threading.Timer(0.2, ev.set).start()
+    assert run_command(['sleep', '30'], cancel_event=ev).cancelled
+    assert run_command(['sleep', '30'], timeout=0.2).timed_out
+
+
+def test_wake_pipe_exists_only_during_run():
+    before = len(os.listdir('/proc/self/fd'))
+    runners = [ProcessRunner(['true']) for _ in range(50)]
+    assert len(os.listdir('/proc/self/fd')) == before
+    runner = runners[0]
+    runner.cancel()
+    assert runner.run().cancelled
+    assert runner._wake_r is None and len(os.listdir('/proc/self/fd')) == before
@@ -0,0 +1,106 @@
+from utils.progress import (CacheDownloadWatcher, PacmanParser, FlatpakParser, ProgressEvent,
+                            TransactionProgress)
+
+
+def _feed_all(parser, lines):
+    events = []
+    for line in lines:
+        events.extend(parser.feed(line))
+    events.extend(parser.finish())
+    return events
+
+
+def test_pacman_parser_events():
+    events = _feed_all(PacmanParser(), [
+        "Total Download Size:   10.00 MiB",
+        " foo-1.0-1-x86_64      8.0 MiB  2.00 MiB/s 00:04 [#####-----]  50%",
+        "Total (1/2)           10.0 MiB  2.00 MiB/s 00:05 [#####-----]  40%",
+        "(1/2) checking keys in keyring     [##########] 100%",
+        "(1/2) installing foo               [##########] 100%",
+        "(2/2) upgrading bar                [##########] 100%",
+    ])
+    kinds = [e.kind for e in events]
+    assert kinds == [ProgressEvent.DOWNLOAD_TOTAL, ProgressEvent.DOWNLOAD, ProgressEvent.STEP,
+                     ProgressEvent.PACKAGE_START, ProgressEvent.PACKAGE_DONE, ProgressEvent.PACKAGE_START,
+                     ProgressEvent.PACKAGE_DONE]
+    assert events[0].total == 10 * 1024 ** 2
+    assert events[1].package == "foo-1.0-1-x86_64" and events[1].done == 4 * 1024 ** 2
+
+
+def test_pacman_parser_piped_output():
+    # What pacman prints when stdout is a pipe: no bars, no (k/N) counters
+    events = _feed_all(PacmanParser(), [
+        "resolving dependencies...",
+        "Packages (2) bar-2.0-1  foo-1.0-1",
+        "Total Download Size:   10.00 MiB",
+        ":: Retrieving packages...",
+        " foo-1.0-1-x86_64 downloading...",
+        "checking keyring...",
+        "checking package integrity...",
+        "installing foo...",
+        "upgrading bar...",
+    ])
+    kinds = [e.kind for e in events]
+    assert kinds == [ProgressEvent.DOWNLOAD_TOTAL, ProgressEvent.STEP, ProgressEvent.STEP, ProgressEvent.STEP,
+                     ProgressEvent.PACKAGE_START, ProgressEvent.PACKAGE_DONE, ProgressEvent.PACKAGE_START,
+                     ProgressEvent.PACKAGE_DONE]
+    assert events[1].package == "foo-1.0-1-x86_64" and events[2].text == "checking keyring"
+    starts = [e for e in events if e.kind == ProgressEvent.PACKAGE_START]
+    assert [(e.package, e.done, e.total, e.text) for e in starts] == [("foo", 1, 2, "installing"), ("bar", 2, 2, "upgrading")]
+
+    tp = TransactionProgress(2)
+    tp.begin_segment(2)
+    for ev in events[:-1]:
+        tp.feed(ev)
+    # Installing counts for half; the download half comes from CacheDownloadWatcher
+    assert tp.completed == 1 and tp.percent() == 25
+    tp.feed(ProgressEvent(ProgressEvent.DOWNLOAD, package="foo-1.0-1-x86_64", done=10 * 1024 ** 2))
+    assert tp.percent() == 75
+
+
+def test_cache_watcher_reports_part_files_and_finished_downloads(tmp_path):
+    (tmp_path / "old-1-1-any.pkg.tar.zst").write_bytes(b"o" * 10)
+    watcher = CacheDownloadWatcher([str(tmp_path)], on_events=None)
+    watcher._partial = watcher._scan()
+    sub = tmp_path / "download-abc123"
+    sub.mkdir()
+    part = sub / "foo-1.0-1-x86_64.pkg.tar.zst.part"
+    part.write_bytes(b"x" * 100)
+    assert [(e.package, e.done) for e in watcher.poll()] == [("foo-1.0-1-x86_64", 100)]
+    assert watcher.poll() == []
+    part.unlink()
+    (tmp_path / "foo-1.0-1-x86_64.pkg.tar.zst").write_bytes(b"x" * 250)
+    [done] = watcher.poll()
+    assert (done.package, done.done, done.total) == ("foo-1.0-1-x86_64", 250, 250)
+
+
+def test_flatpak_parser_events():
+    events = _feed_all(FlatpakParser(), [
+        "Installing 1/2… org.example.App",
+        "Installing 1/2… ████▍   45%  1.2 MB/s  00:03",
+        "Installing 2/2… org.example.Platform",
+    ])
+    assert [e.kind for e in events].count(ProgressEvent.PACKAGE_DONE) == 2
+    assert events[0].package == "org.example.App"
+
+
+def test_transaction_progress_percent_and_throttle():
+    now = [0.0]
+    tp = TransactionProgress(2, interval=0.25, clock=lambda: now[0])
+    tp.begin_segment(2)
+    tp.feed(ProgressEvent(ProgressEvent.DOWNLOAD_TOTAL, total=1000))
+    tp.feed(ProgressEvent(ProgressEvent.DOWNLOAD, package="a", done=0, total=1000))
+    assert tp.poll() is not None
+    now[0] = 1.0
+    tp.feed(ProgressEvent(ProgressEvent.DOWNLOAD, package="a", done=500, total=1000))
+    assert tp.percent() == 25
+    assert tp.rate == 500
+    assert tp.poll() is not None
+    now[0] = 1.1
+    tp.feed(ProgressEvent(ProgressEvent.DOWNLOAD, package="a", done=600, total=1000))
+    assert tp.poll() is None
+    assert tp.poll(force=True) is not None
+    tp.feed(ProgressEvent(ProgressEvent.PACKAGE_START, package="a", done=1, total=3))
+    assert tp.total_packages == 3
+    tp.end_segment()
+    assert tp.percent() == 100
@@ -0,0 +1,39 @@
+import threading
+import time
+from utils.scheduler import DomainScheduler, group_by_domain
+
+
+def test_group_by_domain_keeps_alpm_together():
+    groups = group_by_domain({'pacman': ['a'], 'Flatpak': ['f'], 'AUR': ['b'], 'npm': []})
+    assert groups == {'alpm': [('pacman', ['a']), ('AUR', ['b'])], 'flatpak': [('Flatpak', ['f'])]}
+
+
+def test_domains_run_in_parallel_and_same_domain_in_order():
+    order = []
+    lock = threading.Lock()
+
+    def job(domain, source, packages, token):
+        with lock:
+            order.append(('start', source))
+        time.sleep(0.2)
+        with lock:
+            order.append(('end', source))
+        return source
+
+    start = time.monotonic()
+    results = DomainScheduler().run({'pacman': ['a'], 'AUR': ['b'], 'Flatpak': ['c'], 'npm': ['d']}, job)
+    elapsed = time.monotonic() - start
+    assert results == {'pacman': 'pacman', 'AUR': 'AUR', 'Flatpak': 'Flatpak', 'npm': 'npm'}
+    assert elapsed < 0.55
+    assert order.index(('end', 'pacman')) < order.index(('start', 'AUR'))
+
+
+def test_cancel_single_domain():
+    sched = DomainScheduler()
+    sched.cancel('alpm')
+
+    def job(domain, source, packages, token):
+        return 'ran'
+
+    results = sched.run({'pacman': ['a'], 'Flatpak': ['b']}, job)
+    assert results == {'pacman': None, 'Flatpak': 'ran'}
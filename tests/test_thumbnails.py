@@ -0,0 +1,48 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication([])
+
+from utils import thumbnails
+
+
+def _image(path, w, h):
+    image = QImage(w, h, QImage.Format.Format_RGB32)
+    image.fill(QColor("teal"))
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_decode_scales_and_caches_by_mtime(tmp_path):
+    src = _image(tmp_path / "art.png", 400, 200)
+    cache = tmp_path / "cache"
+    assert thumbnails.decode(src, QSize(48, 48), 'fit', str(cache)).size() == QSize(48, 24)
+    cover = thumbnails.decode(src, QSize(60, 60), 'cover', str(cache))
+    assert cover.size() == QSize(60, 60)
+    assert len(os.listdir(cache)) == 2
+
+    first = thumbnails.cache_path(src, QSize(48, 48), 'fit', str(cache))
+    os.utime(src, (time.time() + 10, time.time() + 10))
+    assert thumbnails.cache_path(src, QSize(48, 48), 'fit', str(cache)) != first
+    assert thumbnails.decode(str(tmp_path / "missing.png"), QSize(48, 48), 'fit', str(cache)).isNull()
+
+
+def test_loader_delivers_on_gui_thread_and_coalesces(tmp_path):
+    src = _image(tmp_path / "art.jpg", 300, 300)
+    loader = thumbnails.ThumbnailLoader(cache_dir=str(tmp_path / "cache"))
+    got = []
+    assert loader.load(src, QSize(32, 32), got.append) is False
+    assert loader.load(src, QSize(32, 32), got.append) is False
+    deadline = time.monotonic() + 5
+    while len(got) < 2 and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert [i.size() for i in got] == [QSize(32, 32)] * 2
+    assert loader.load(src, QSize(32, 32), got.append) is True
+    assert loader.cached(src, QSize(32, 32)).size() == QSize(32, 32)
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import sys, threading
+from utils import tracing
+argv = ['aurora_home.py', '--trace=' + sys.argv[1]]
+assert tracing.configure_from_argv(argv) and argv == ['aurora_home.py']
+
+@tracing.traced('switch_view', args=lambda view: {'view': view})
+def switch_view(view):
+    import json.tool
+    t = threading.Thread(target=tracing.bind(lambda: None, 'load view'), name='loader')
+    t.start()
+    t.join()
+
+with tracing.span('setup_ui'):
+    switch_view('plugins')
+tracing.since_start('first paint')
+"""
+
+
+def test_trace_file_has_spans_imports_and_linked_jobs(tmp_path):
+    out = tmp_path / "trace.json"
+    env = dict(os.environ)
+    env.pop('NEOARCH_TRACE', None)
+    subprocess.run([sys.executable, '-c', SCRIPT, str(out)], cwd=ROOT, env=env, check=True, timeout=60)
+    events = json.loads(out.read_text())['traceEvents']
+    spans = {e['name']: e for e in events if e['ph'] == 'X'}
+    assert spans['switch_view']['args'] == {'view': 'plugins'}
+    assert 'import json.tool' in spans
+    outer, inner = spans['setup_ui'], spans['switch_view']
+    assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    job = spans['load view']
+    assert job['tid'] != inner['tid']
+    flows = [e for e in events if e['ph'] in ('s', 'f')]
+    assert {e['ph'] for e in flows} == {'s', 'f'} and len({e['id'] for e in flows}) == 1
+    names = {e['args']['name'] for e in events if e['ph'] == 'M' and e['name'] == 'thread_name'}
+    assert 'loader' in names
+    assert spans['first paint']['ts'] == 0
+
+
+def test_disabled_tracing_is_a_no_op():
+    from utils import tracing
+    if tracing.is_enabled():
+        return
+
+    def job():
+        return 42
+    assert tracing.bind(job) is job
+    with tracing.span('nothing'):
+        pass
+    assert tracing.save() is None
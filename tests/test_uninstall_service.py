@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from services import uninstall_service
+
+
+class _Signal:
+    def __init__(self):
+        self.calls = []
+
+    def emit(self, *args):
+        self.calls.append(args)
+
+    def connect(self, slot):
+        pass
+
+
+def _run(monkeypatch, returncode):
+    class FakeWorker:
+        def __init__(self, cmd, sudo=False, env=None):
+            self.output = _Signal()
+            self.error = _Signal()
+            self.returncode = None
+
+        def run(self):
+            self.returncode = returncode
+
+    monkeypatch.setattr(uninstall_service, 'CommandWorker', FakeWorker)
+    app = SimpleNamespace(log=lambda msg: None, show_message=_Signal(), ui_call=_Signal(),
+                          invalidate_package_views=lambda: None)
+    return uninstall_service.uninstall_packages_sync(app, {'pacman': ['foo']}), app
+
+
+def test_success_message_only_when_every_step_succeeded(monkeypatch):
+    ok, app = _run(monkeypatch, 0)
+    assert ok and app.show_message.calls[-1][0] == "Uninstallation Complete"
+    ok, app = _run(monkeypatch, 1)
+    assert not ok and app.show_message.calls[-1][0] == "Uninstallation Failed"
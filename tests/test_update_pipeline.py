@@ -0,0 +1,53 @@
+import json
+import threading
+import time
+from utils.update_pipeline import PhaseTimings, snapshot_then_install
+
+
+def test_install_waits_for_overlapped_snapshot_and_download():
+    events = []
+    both_running = threading.Barrier(2, timeout=2)
+
+    def snapshot():
+        both_running.wait()
+        time.sleep(0.2)
+        events.append('snapshot done')
+        return True
+
+    def download():
+        both_running.wait()
+        events.append('download done')
+        return True
+
+    def install(results):
+        events.append('install')
+        return results
+
+    timings = PhaseTimings()
+    results = snapshot_then_install(download, install, snapshot=snapshot, timings=timings)
+    assert events[-1] == 'install'
+    assert results['install'] == {'snapshot': True, 'download': True}
+    assert timings.phases['snapshot'] >= 0.2
+    assert timings.overlap_saved('snapshot', 'download') == timings.phases['download']
+
+
+def test_failing_phase_does_not_block_install(tmp_path):
+    def download():
+        raise RuntimeError("mirror down")
+
+    results = snapshot_then_install(download, lambda r: 'installed')
+    assert isinstance(results['download'], RuntimeError)
+    assert results['install'] == 'installed'
+
+
+def test_timings_are_appended_as_json_lines(tmp_path):
+    clock = iter([0.0, 1.0, 4.0, 5.0, 7.0, 10.0]).__next__
+    timings = PhaseTimings(clock=clock)
+    with timings.phase('snapshot'):
+        pass
+    timings.record('download', 2.0)
+    path = tmp_path / "timings.jsonl"
+    timings.save(str(path))
+    entry = json.loads(path.read_text().splitlines()[0])
+    assert entry['phases'] == {'snapshot': 3.0, 'download': 2.0}
+    assert entry['overlap_saved'] == 2.0
@@ -1,10 +1,10 @@
-"""Utility modules for NeoArch package manager."""
+"""Utility modules for NeoArch package manager.
 
-from . import workers
-from . import config_utils
-from . import sys_utils
-from . import networking
-from . import styles
+Submodules are imported on first access, so ``from utils import tracing``
+can run before anything heavy has been loaded.
+"""
+
+import importlib
 
 __all__ = [
     'workers',
@@ -12,4 +12,18 @@ __all__ = [
     'sys_utils',
     'networking',
     'styles',
+    'log_sink',
+    'process_runner',
+    'npm_utils',
+    'pacman_lock',
+    'tracing',
+    'thumbnails',
+    'plugin_runtime',
+    'plugin_manifest',
 ]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
@@ -0,0 +1,116 @@
+import threading
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer
+
+
+class LogSink(QObject):
+    """Buffers console lines from any thread and renders them in batches.
+
+    ``write`` only appends to a locked deque, so worker threads never touch
+    the widget. A timer on the GUI thread drains the buffer about 25 times a
+    second with a single ``appendPlainText`` call. The widget keeps only the
+    newest ``max_blocks`` lines; the complete history stays in memory for
+    search and export.
+    """
+
+    def __init__(self, widget=None, interval_ms=40, max_blocks=1000, history_limit=200000, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._history = deque(maxlen=history_limit)
+        self._filter = ""
+        self.max_blocks = max_blocks
+        self.widget = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        if widget is not None:
+            self.attach(widget)
+        self._timer.start()
+
+    def attach(self, widget):
+        self.widget = widget
+        try:
+            widget.setMaximumBlockCount(self.max_blocks)
+        except Exception:
+            pass
+
+    def write(self, message):
+        """Queue a message for display. Safe to call from any thread."""
+        text = "" if message is None else str(message)
+        lines = text.split("\n")
+        with self._lock:
+            self._pending.extend(lines)
+            self._history.extend(lines)
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            batch = self._pending
+            self._pending = []
+        if self.widget is None:
+            return
+        query = self._filter.lower()
+        if query:
+            # Every line is already in the history; the filter only limits what is shown
+            batch = [ln for ln in batch if query in ln.lower()]
+            if not batch:
+                return
+        if len(batch) > self.max_blocks:
+            batch = batch[-self.max_blocks:]
+        try:
+            self.widget.appendPlainText("\n".join(batch))
+        except Exception:
+            pass
+
+    def clear(self):
+        """Clear the visible console. The history used for search/export is kept."""
+        with self._lock:
+            self._pending = []
+        if self.widget is not None:
+            try:
+                self.widget.clear()
+            except Exception:
+                pass
+
+    def lines(self):
+        with self._lock:
+            return list(self._history)
+
+    def search(self, query, limit=None):
+        """Return (line_number, text) pairs whose text contains ``query`` (case-insensitive)."""
+        q = (query or "").lower()
+        if not q:
+            return []
+        matches = [(i, ln) for i, ln in enumerate(self.lines()) if q in ln.lower()]
+        if limit:
+            matches = matches[-limit:]
+        return matches
+
+    def set_filter(self, query):
+        """Show only matching history lines; an empty query resumes the live tail."""
+        self._filter = (query or "").strip()
+        if self.widget is None:
+            return
+        # The re-render below covers everything queued so far
+        with self._lock:
+            self._pending = []
+        if self._filter:
+            shown = [ln for _, ln in self.search(self._filter, limit=self.max_blocks)]
+        else:
+            shown = self.lines()[-self.max_blocks:]
+        try:
+            self.widget.setPlainText("\n".join(shown))
+            bar = self.widget.verticalScrollBar()
+            bar.setValue(bar.maximum())
+        except Exception:
+            pass
+
+    def export(self, path):
+        lines = self.lines()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+            if lines:
+                f.write("\n")
+        return len(lines)
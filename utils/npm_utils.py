@@ -0,0 +1,103 @@
+import os
+import json
+import shutil
+import subprocess
+from threading import Thread
+
+
+def user_prefix():
+    """The per-user global prefix used for npm installs without root."""
+    return os.path.join(os.path.expanduser('~'), '.npm-global')
+
+
+def user_env(base=None):
+    env = dict(base if base is not None else os.environ)
+    prefix = user_prefix()
+    try:
+        os.makedirs(prefix, exist_ok=True)
+        env['npm_config_prefix'] = prefix
+        env['NPM_CONFIG_PREFIX'] = prefix
+        env['PATH'] = os.path.join(prefix, 'bin') + os.pathsep + env.get('PATH', '')
+    except Exception:
+        pass
+    return env
+
+
+def system_prefix(env=None):
+    """npm's default global prefix without spawning node: an explicit config
+    prefix, else the directory above the node binary (e.g. /usr)."""
+    env = env if env is not None else os.environ
+    configured = env.get('npm_config_prefix') or env.get('NPM_CONFIG_PREFIX')
+    if configured:
+        return configured
+    node = shutil.which('node', path=env.get('PATH'))
+    if node:
+        return os.path.dirname(os.path.dirname(os.path.realpath(node)))
+    return '/usr'
+
+
+def env_for_prefix(prefix):
+    if prefix == user_prefix():
+        return user_env()
+    env = os.environ.copy()
+    if prefix != system_prefix(env):
+        env['npm_config_prefix'] = prefix
+    return env
+
+
+def prefix_writable(prefix):
+    root = os.path.join(prefix, 'lib', 'node_modules')
+    return os.access(root if os.path.isdir(root) else prefix, os.W_OK)
+
+
+def list_global(env=None, timeout=30):
+    """Names of the packages in one global prefix, from a single ``npm ls -g``."""
+    try:
+        r = subprocess.run(["npm", "ls", "-g", "--depth=0", "--json"], capture_output=True, text=True, env=env, timeout=timeout)
+        # npm exits 1 for problems such as extraneous packages but still prints the tree
+        if r.returncode in (0, 1) and r.stdout and r.stdout.strip():
+            data = json.loads(r.stdout)
+            deps = (data.get('dependencies') or {}) if isinstance(data, dict) else {}
+            return set(deps.keys())
+    except Exception:
+        pass
+    return set()
+
+
+def classify_global(timeout=30):
+    """Map every globally installed package to its prefix: ``{name: prefix}``.
+
+    Both prefixes are listed once, in parallel; a package present in both
+    is attributed to the user prefix, which comes first on PATH.
+    """
+    uprefix = user_prefix()
+    sprefix = system_prefix()
+    inventories = {}
+
+    def scan(prefix, env):
+        inventories[prefix] = list_global(env=env, timeout=timeout)
+
+    threads = [Thread(target=scan, args=(uprefix, user_env()), daemon=True)]
+    if sprefix != uprefix:
+        threads.append(Thread(target=scan, args=(sprefix, os.environ.copy()), daemon=True))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scopes = {name: sprefix for name in inventories.get(sprefix, ())}
+    scopes.update({name: uprefix for name in inventories.get(uprefix, ())})
+    return scopes
+
+
+def group_by_prefix(names, scopes, default=None):
+    """Group ``names`` into ``{prefix: [names]}`` using a classify_global() map.
+
+    Names that are not installed anywhere go to ``default`` (dropped when
+    it is None).
+    """
+    groups = {}
+    for name in names:
+        prefix = scopes.get(name, default)
+        if prefix is not None:
+            groups.setdefault(prefix, []).append(name)
+    return groups
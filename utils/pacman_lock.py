@@ -0,0 +1,169 @@
+"""Wait for the ALPM database lock instead of failing on it.
+
+pacman creates ``/var/lib/pacman/db.lck`` for the length of a transaction.
+``wait_for_unlock`` sleeps on inotify events for the lock's directory (via
+ctypes, no extra dependency) and falls back to polling where inotify is not
+available. A lock file with no package manager process alive is reported as
+stale rather than waited on forever.
+"""
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+
+
+DB_LOCK = '/var/lib/pacman/db.lck'
+
+FREE = 'free'
+STALE = 'stale'
+TIMEOUT = 'timeout'
+CANCELLED = 'cancelled'
+
+# Processes that only live for a transaction that takes (or drives) the ALPM
+# lock. Long-lived daemons and GUIs (packagekitd, pamac-daemon, pamac-manager,
+# octopi) are left out: they run all session, so a stale db.lck would look
+# held forever. checkupdates and pacman-key never take db.lck.
+PM_PROCESSES = {
+    'pacman', 'yay', 'paru', 'trizen', 'pikaur', 'aura', 'pamac', 'octopi-helper',
+}
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_locked(path=DB_LOCK):
+    return os.path.exists(path)
+
+
+def is_lock_error(text):
+    low = (text or '').lower()
+    return 'could not lock database' in low or 'unable to lock database' in low
+
+
+def lock_holders(proc='/proc'):
+    """(pid, name) of running package manager processes, excluding ourselves."""
+    holders = []
+    own = os.getpid()
+    try:
+        entries = os.listdir(proc)
+    except OSError:
+        return holders
+    for entry in entries:
+        if not entry.isdigit() or int(entry) == own:
+            continue
+        try:
+            with open(os.path.join(proc, entry, 'comm')) as f:
+                name = f.read().strip()
+        except OSError:
+            continue
+        if name in PM_PROCESSES:
+            holders.append((int(entry), name))
+    return holders
+
+
+def is_stale(path=DB_LOCK, proc='/proc'):
+    """True when the lock file exists but no package manager is running."""
+    return is_locked(path) and not lock_holders(proc)
+
+
+class _Inotify:
+    """Minimal inotify watcher on a directory, through libc."""
+
+    def __init__(self, directory):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        """Block up to ``timeout`` seconds; returns the names of changed entries."""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.append(data[offset:offset + length].rstrip(b'\0').decode(errors='replace'))
+            offset += length
+        return names
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def wait_for_unlock(path=DB_LOCK, timeout=300, on_tick=None, cancel_event=None,
+                    stale_grace=3.0, poll=0.5, proc='/proc'):
+    """Wait until ``path`` is gone.
+
+    Returns FREE, STALE (the lock stayed without any package manager
+    process for ``stale_grace`` seconds), TIMEOUT or CANCELLED.
+    ``on_tick(remaining_seconds, holders)`` is called about once a second
+    while waiting. ``timeout=None`` waits indefinitely.
+    """
+    if not is_locked(path):
+        return FREE
+    watcher = None
+    try:
+        watcher = _Inotify(os.path.dirname(path) or '.')
+    except (OSError, AttributeError):
+        watcher = None
+    start = time.monotonic()
+    orphaned_since = None
+    next_tick = start
+    try:
+        while True:
+            if not is_locked(path):
+                return FREE
+            now = time.monotonic()
+            if cancel_event is not None and cancel_event.is_set():
+                return CANCELLED
+            remaining = None if timeout is None else timeout - (now - start)
+            if remaining is not None and remaining <= 0:
+                return TIMEOUT
+            if now >= next_tick:
+                holders = lock_holders(proc)
+                if holders:
+                    orphaned_since = None
+                elif orphaned_since is None:
+                    orphaned_since = now
+                elif now - orphaned_since >= stale_grace:
+                    return STALE
+                if on_tick is not None:
+                    try:
+                        on_tick(remaining, holders)
+                    except Exception:
+                        pass
+                next_tick = now + 1.0
+            # Wake on the lock's removal, a cancel check or the next countdown tick
+            step = min(max(0.05, next_tick - time.monotonic()), 1.0)
+            if remaining is not None:
+                step = min(step, remaining)
+            if watcher is not None:
+                watcher.wait(step)
+            else:
+                time.sleep(min(step, poll))
+    finally:
+        if watcher is not None:
+            watcher.close()
@@ -0,0 +1,250 @@
+"""Plugin manifests, lazy plugin import and default-plugin installation.
+
+A plugin declares what it reacts to in a header at the top of its file::
+
+    # neoarch-plugin: hooks=on_view_changed,on_tick
+    # neoarch-plugin: views=bundles
+    # neoarch-plugin: ui_thread=false
+
+``hooks`` lists the hooks it implements, ``views`` limits ``on_view_changed``
+to those view ids and ``ui_thread`` replaces ``UI_THREAD = True``. Files
+without a ``hooks`` line get their hooks inferred from top-level
+``def on_*`` definitions, so older plugins keep working.
+
+Manifests are cached in ``~/.cache/neoarch/plugin_manifests.json`` keyed
+by path, mtime and size, so a launch only stats the plugin files. The
+module itself is imported by ``LazyPlugin.load`` the first time one of its
+hooks fires (on the hook worker, see ``utils.plugin_runtime``).
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+import importlib.util
+
+
+HEADER_PREFIX = 'neoarch-plugin:'
+INDEX_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'neoarch', 'plugin_manifests.json')
+INDEX_VERSION = 1
+DEFAULTS_STAMP = '.defaults.json'
+
+_HOOK_DEF_RE = re.compile(r'^(?:async\s+)?def\s+(on_[A-Za-z0-9_]+)\s*\(|^(on_[A-Za-z0-9_]+)\s*=', re.MULTILINE)
+_UI_THREAD_RE = re.compile(r'^UI_THREAD\s*=\s*True\b', re.MULTILINE)
+
+
+def _split(value):
+    return [v.strip() for v in value.replace(';', ',').split(',') if v.strip()]
+
+
+def parse_header(source):
+    """Manifest dict from the leading comment block of ``source`` ({} when there is none)."""
+    manifest = {}
+    for line in source.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not stripped.startswith('#'):
+            break
+        body = stripped.lstrip('#').strip()
+        if not body.startswith(HEADER_PREFIX):
+            continue
+        for pair in body[len(HEADER_PREFIX):].split():
+            key, sep, value = pair.partition('=')
+            if not sep:
+                continue
+            key = key.strip().lower()
+            if key in ('hooks', 'views'):
+                manifest.setdefault(key, [])
+                manifest[key].extend(v for v in _split(value) if v not in manifest[key])
+            elif key == 'ui_thread':
+                manifest['ui_thread'] = value.strip().lower() in ('1', 'true', 'yes')
+    return manifest
+
+
+def read_manifest(source):
+    """Header manifest, with hooks and ``ui_thread`` inferred from the code when not declared."""
+    manifest = parse_header(source)
+    if 'hooks' not in manifest:
+        hooks = []
+        for match in _HOOK_DEF_RE.finditer(source):
+            name = match.group(1) or match.group(2)
+            if name not in hooks:
+                hooks.append(name)
+        manifest['hooks'] = hooks
+        manifest['inferred'] = True
+    if 'ui_thread' not in manifest:
+        manifest['ui_thread'] = bool(_UI_THREAD_RE.search(source))
+    return manifest
+
+
+class ManifestIndex:
+    """On-disk cache of manifests, invalidated by file mtime and size."""
+
+    def __init__(self, path=None):
+        self.path = path or INDEX_PATH
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+                    self._entries = data.get('plugins') or {}
+            except Exception:
+                pass
+        return self._entries
+
+    def manifest(self, path):
+        """Manifest of the plugin at ``path``; re-read only when the file changed."""
+        entries = self._load()
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        entry = entries.get(key)
+        if entry and entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size:
+            return entry['manifest']
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = read_manifest(f.read())
+        entries[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'manifest': manifest}
+        self._dirty = True
+        return manifest
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'plugins': self._entries}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception:
+            pass
+
+
+class LazyPlugin:
+    """A plugin file whose module is imported on first use."""
+
+    def __init__(self, name, path, manifest):
+        self.name = name
+        self.path = path
+        self.hooks = frozenset(manifest.get('hooks') or ())
+        views = manifest.get('views')
+        self.views = frozenset(views) if views else None
+        self.ui_thread = bool(manifest.get('ui_thread'))
+        self.module = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def wants(self, hook, args=()):
+        """True when ``hook`` (called with ``args``) should reach this plugin."""
+        if hook not in self.hooks:
+            return False
+        if hook == 'on_view_changed' and self.views is not None and args:
+            return args[0] in self.views
+        return True
+
+    @property
+    def loaded(self):
+        return self.module is not None
+
+    def load(self):
+        """Import the module once; later calls return it. Raises the import error."""
+        with self._lock:
+            if self.module is not None:
+                return self.module
+            if self.error is not None:
+                raise self.error
+            try:
+                spec = importlib.util.spec_from_file_location(self.name, self.path)
+                if not spec or not spec.loader:
+                    raise ImportError(f"cannot load plugin {self.name} from {self.path}")
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except Exception as e:
+                self.error = e
+                raise
+            self.module = module
+            return module
+
+
+def scan(plugins, index=None):
+    """``LazyPlugin`` for each ``{'name', 'path'}`` dict; nothing is imported."""
+    index = index or ManifestIndex()
+    out = []
+    for p in plugins:
+        try:
+            out.append(LazyPlugin(p['name'], p['path'], index.manifest(p['path'])))
+        except Exception:
+            continue
+    index.save()
+    return out
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def install_defaults(directory, defaults, log=None):
+    """Make ``directory`` hold ``defaults`` ({file name: code}); returns the names written.
+
+    ``.defaults.json`` records each file's content hash with its mtime and
+    size. A file whose stat still matches a stamp for the current hash is
+    trusted without being read; otherwise it is hashed and rewritten only if
+    the content differs.
+    """
+    stamp_path = os.path.join(directory, DEFAULTS_STAMP)
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            stamps = json.load(f)
+        if not isinstance(stamps, dict):
+            stamps = {}
+    except Exception:
+        stamps = {}
+    written = []
+    changed = False
+    for fname, code in defaults.items():
+        text = code + "\n"
+        expected = content_hash(text)
+        fpath = os.path.join(directory, fname)
+        try:
+            st = os.stat(fpath)
+        except OSError:
+            st = None
+        stamp = stamps.get(fname) or {}
+        if (st is not None and stamp.get('sha256') == expected
+                and stamp.get('mtime_ns') == st.st_mtime_ns and stamp.get('size') == st.st_size):
+            continue
+        current = None
+        if st is not None:
+            try:
+                with open(fpath, 'rb') as f:
+                    current = hashlib.sha256(f.read()).hexdigest()
+            except Exception:
+                current = None
+        if current != expected:
+            try:
+                with open(fpath, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                written.append(fname)
+            except Exception as e:
+                if log:
+                    log(f"Default plugin write failed {fname}: {e}")
+                continue
+        try:
+            st = os.stat(fpath)
+            stamps[fname] = {'sha256': expected, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+            changed = True
+        except OSError:
+            pass
+    if changed:
+        try:
+            with open(stamp_path, 'w', encoding='utf-8') as f:
+                json.dump(stamps, f, indent=2)
+        except Exception:
+            pass
+    return written
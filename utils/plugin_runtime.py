@@ -0,0 +1,414 @@
+"""Plugin hook dispatch on worker threads with per-hook time budgets.
+
+Hooks (``on_startup``, ``on_tick``, ``on_view_changed``) used to run on the
+Qt main thread, so one slow plugin froze the window. ``PluginHost`` runs
+them on a small pool of daemon workers instead:
+
+* hooks of one plugin run one at a time, in order (module globals stay
+  safe), while different plugins run in parallel;
+* an ``on_tick`` is skipped while the previous one of that plugin is still
+  queued or running;
+* every call has a time budget (``DEFAULT_BUDGETS``, overridable per
+  plugin with a module-level ``HOOK_BUDGETS = {'on_tick': 600}``). A
+  watchdog flags calls that overrun; after ``MAX_OVERRUNS`` overruns in a
+  row the plugin gets no more hooks this session.
+
+Hooks running on a worker must not touch widgets directly; they use
+``app.run_on_ui(fn, *args, wait=False)`` and ``app.ask_user(title, text)``
+(see ``run_on_ui`` and ``ask_user`` below). Legacy plugins that need the
+old behaviour set ``UI_THREAD = True`` and are called inline on the main
+thread, still timed and flagged.
+
+Plugins given as ``plugin_manifest.LazyPlugin`` are only imported, on a
+worker, when one of the hooks their manifest declares first fires.
+
+Every call is also recorded in ``PluginHost.profiler`` (``HookProfiler``):
+count, total, mean, p95 and max per plugin and hook, plus the exceptions
+raised. The Plugins settings page shows it and exports it as JSON.
+"""
+import json
+import math
+import time
+import queue
+import threading
+import traceback
+from collections import deque
+
+from utils import tracing
+
+
+DEFAULT_BUDGETS = {
+    'on_startup': 10.0,
+    'on_view_changed': 2.0,
+    'on_tick': 5.0,
+}
+DEFAULT_BUDGET = 5.0
+MAX_OVERRUNS = 3
+COALESCED_HOOKS = ('on_tick',)
+PROFILE_SAMPLES = 256
+PROFILE_ERRORS = 5
+
+
+def run_on_ui(post, fn, *args, wait=False, timeout=None):
+    """Run ``fn(*args)`` on the GUI thread through ``post`` (e.g. ``app.ui_call.emit``).
+
+    Called from the GUI thread it runs inline. With ``wait=True`` the worker
+    blocks until ``fn`` returned and gets its result (or its exception);
+    ``TimeoutError`` is raised if that takes longer than ``timeout``.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return fn(*args)
+    if not wait:
+        post(lambda: fn(*args))
+        return None
+    done = threading.Event()
+    outcome = {}
+
+    def call():
+        try:
+            outcome['value'] = fn(*args)
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            done.set()
+
+    post(call)
+    if not done.wait(timeout):
+        raise TimeoutError(f"UI call {getattr(fn, '__name__', fn)!r} did not finish in {timeout}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
+
+
+def ask_user(post, parent, title, text, default=True, timeout=None):
+    """Yes/No question on the GUI thread; safe to call from a hook worker."""
+    def question():
+        from PyQt6.QtWidgets import QMessageBox
+        buttons = QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        default_button = QMessageBox.StandardButton.Yes if default else QMessageBox.StandardButton.No
+        return QMessageBox.question(parent, title, text, buttons, default_button) == QMessageBox.StandardButton.Yes
+    return bool(run_on_ui(post, question, wait=True, timeout=timeout))
+
+
+def plugin_name(module):
+    return getattr(module, '__name__', None) or repr(module)
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class _HookStats:
+    """Timings of one hook of one plugin; p95 is taken over the last PROFILE_SAMPLES calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.samples = deque(maxlen=PROFILE_SAMPLES)
+        self.last_errors = deque(maxlen=PROFILE_ERRORS)
+
+
+class HookProfiler:
+    """Per plugin/hook call statistics, kept for the whole session (survives plugin reloads)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, plugin, hook, duration, error=None):
+        with self._lock:
+            stats = self._stats.get((plugin, hook))
+            if stats is None:
+                stats = self._stats[(plugin, hook)] = _HookStats()
+            stats.calls += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.samples.append(duration)
+            if error is not None:
+                stats.errors += 1
+                stats.last_errors.append(f"{type(error).__name__}: {error}")
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    @staticmethod
+    def _summary(calls, total, maximum, errors, samples, last_errors):
+        return {
+            'calls': calls,
+            'total_ms': round(total * 1000, 3),
+            'mean_ms': round(total / calls * 1000, 3) if calls else 0.0,
+            'p95_ms': round(_percentile(samples, 95) * 1000, 3),
+            'max_ms': round(maximum * 1000, 3),
+            'errors': errors,
+            'last_errors': list(last_errors),
+        }
+
+    def snapshot(self):
+        """{plugin: {hook: summary}}; summaries are in milliseconds."""
+        with self._lock:
+            out = {}
+            for (plugin, hook), s in self._stats.items():
+                out.setdefault(plugin, {})[hook] = self._summary(
+                    s.calls, s.total, s.max, s.errors, s.samples, s.last_errors)
+            return out
+
+    def plugin_summary(self, plugin):
+        """All hooks of ``plugin`` folded into one summary, or None if it never ran."""
+        with self._lock:
+            hooks = [s for (name, _), s in self._stats.items() if name == plugin]
+            if not hooks:
+                return None
+            samples = [d for s in hooks for d in s.samples]
+            last_errors = [e for s in hooks for e in s.last_errors][-PROFILE_ERRORS:]
+            return self._summary(sum(s.calls for s in hooks), sum(s.total for s in hooks),
+                                 max(s.max for s in hooks), sum(s.errors for s in hooks),
+                                 samples, last_errors)
+
+    def export(self, path, status=None):
+        """Write the snapshot (plus ``status`` from ``PluginHost.status``) as JSON to ``path``."""
+        status = status or {}
+        snapshot = self.snapshot()
+        data = {
+            'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'plugins': {name: {'hooks': snapshot.get(name, {}), 'status': status.get(name)}
+                        for name in sorted(set(snapshot) | set(status))},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return len(data['plugins'])
+
+
+class _Slot:
+    """Per-plugin dispatch state; ``plugin`` is a module or a ``plugin_manifest.LazyPlugin``."""
+
+    def __init__(self, plugin):
+        self.lazy = plugin if hasattr(plugin, 'wants') and hasattr(plugin, 'load') else None
+        self.module = None if self.lazy else plugin
+        self.name = self.lazy.name if self.lazy else plugin_name(plugin)
+        self.pending = deque()
+        self.busy = False
+        self.running = None  # (hook, start, budget, call state dict)
+        self.overruns = 0
+        self.flagged = False
+        self.disabled = False
+
+    def wants(self, hook, args):
+        if self.lazy is not None:
+            return self.lazy.wants(hook, args)
+        return callable(getattr(self.module, hook, None))
+
+    @property
+    def ui_thread(self):
+        if self.lazy is not None:
+            return self.lazy.ui_thread
+        return bool(getattr(self.module, 'UI_THREAD', False))
+
+
+class PluginHost:
+    """Dispatches plugin hooks; see the module docstring."""
+
+    def __init__(self, app, workers=4, log=None, clock=time.monotonic):
+        self.app = app
+        self._log = log or (lambda message: None)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slots = []
+        self._ready = queue.Queue()
+        self._workers = max(1, int(workers))
+        self._threads = []
+        self._watchdog = None
+        self._wake = threading.Condition(self._lock)
+        self.profiler = HookProfiler()
+
+    # --- plugin set -------------------------------------------------------
+    def set_plugins(self, plugins):
+        """Modules, or ``LazyPlugin``s that get imported when a declared hook first fires."""
+        with self._lock:
+            self._slots = [_Slot(p) for p in plugins]
+
+    def budget_for(self, module, hook):
+        budgets = getattr(module, 'HOOK_BUDGETS', None)
+        if isinstance(budgets, dict) and budgets.get(hook):
+            try:
+                return float(budgets[hook])
+            except (TypeError, ValueError):
+                pass
+        return DEFAULT_BUDGETS.get(hook, DEFAULT_BUDGET)
+
+    def status(self):
+        """{plugin name: {'flagged', 'disabled', 'overruns', 'running', 'loaded'}}"""
+        with self._lock:
+            return {s.name: {'flagged': s.flagged, 'disabled': s.disabled, 'overruns': s.overruns,
+                             'running': s.running[0] if s.running else None,
+                             'loaded': s.module is not None}
+                    for s in self._slots}
+
+    def enable(self, name):
+        """Re-enable a plugin that was disabled for overrunning."""
+        with self._lock:
+            for s in self._slots:
+                if s.name == name:
+                    s.disabled = False
+                    s.flagged = False
+                    s.overruns = 0
+
+    # --- dispatch ---------------------------------------------------------
+    def dispatch(self, hook, *args, **kwargs):
+        """Queue ``hook`` for every plugin that defines it; returns the number dispatched."""
+        inline = []
+        count = 0
+        with self._lock:
+            for slot in self._slots:
+                if slot.disabled or not slot.wants(hook, args):
+                    continue
+                if slot.ui_thread:
+                    inline.append((slot, hook, args, kwargs))
+                    count += 1
+                    continue
+                if hook in COALESCED_HOOKS and ((slot.running and slot.running[0] == hook)
+                                                or any(p[0] == hook for p in slot.pending)):
+                    continue
+                slot.pending.append((hook, args, kwargs))
+                count += 1
+                if not slot.busy:
+                    slot.busy = True
+                    self._ready.put(slot)
+            self._start_workers()
+        for slot, hook, args, kwargs in inline:
+            self._call(slot, hook, args, kwargs)
+        return count
+
+    def _start_workers(self):
+        while len(self._threads) < self._workers and len(self._threads) < max(1, len(self._slots)):
+            t = threading.Thread(target=self._work, name="plugin-hooks", daemon=True)
+            self._threads.append(t)
+            t.start()
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="plugin-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def _work(self):
+        while True:
+            slot = self._ready.get()
+            with self._lock:
+                job = slot.pending.popleft() if slot.pending and not slot.disabled else None
+                if job is None:
+                    slot.pending.clear()
+                    slot.busy = False
+                    continue
+            hook, args, kwargs = job
+            self._call(slot, hook, args, kwargs)
+            with self._lock:
+                if slot.pending and not slot.disabled:
+                    self._ready.put(slot)
+                else:
+                    slot.pending.clear()
+                    slot.busy = False
+
+    def _load(self, slot):
+        """The plugin's module, importing a lazy plugin on first use (timed as ``import``)."""
+        if slot.module is not None:
+            return slot.module
+        start = self._clock()
+        error = None
+        module = None
+        try:
+            with tracing.span(f"load plugin {slot.name}", cat='plugin'):
+                module = slot.lazy.load()
+        except Exception as e:
+            error = e
+            self._log(f"Failed to load plugin {slot.name}: {e}\n{traceback.format_exc()}")
+        self.profiler.record(slot.name, 'import', self._clock() - start, error)
+        with self._lock:
+            if module is None:
+                slot.disabled = True
+                slot.pending.clear()
+            else:
+                slot.module = module
+        return module
+
+    def _call(self, slot, hook, args, kwargs):
+        module = self._load(slot)
+        func = getattr(module, hook, None) if module is not None else None
+        if not callable(func):
+            return
+        budget = self.budget_for(module, hook)
+        state = {'overrun': False}
+        start = self._clock()
+        with self._lock:
+            slot.running = (hook, start, budget, state)
+            self._wake.notify_all()
+        error = None
+        try:
+            with tracing.span(f"{hook} {slot.name}", cat='plugin'):
+                func(self.app, *args, **kwargs)
+        except Exception as e:
+            error = e
+            self._log(f"Plugin hook {hook} error: {e}\n{traceback.format_exc()}")
+        duration = self._clock() - start
+        self.profiler.record(slot.name, hook, duration, error)
+        with self._lock:
+            slot.running = None
+            overrun = duration > budget and not state['overrun']
+            if duration <= budget and not state['overrun']:
+                slot.overruns = 0
+        if overrun:
+            self._overrun(slot, hook, duration, budget, finished=True)
+
+    # --- budgets ----------------------------------------------------------
+    def check_overruns(self):
+        """Flag running calls that are past their budget; returns their plugin names."""
+        now = self._clock()
+        late = []
+        with self._lock:
+            for slot in self._slots:
+                if slot.running is None:
+                    continue
+                hook, start, budget, state = slot.running
+                if not state['overrun'] and now - start > budget:
+                    state['overrun'] = True
+                    late.append((slot, hook, now - start, budget))
+        for slot, hook, elapsed, budget in late:
+            self._overrun(slot, hook, elapsed, budget, finished=False)
+        return [slot.name for slot, _, _, _ in late]
+
+    def _overrun(self, slot, hook, elapsed, budget, finished):
+        with self._lock:
+            slot.overruns += 1
+            slot.flagged = True
+            disable = slot.overruns >= MAX_OVERRUNS and not slot.disabled
+            if disable:
+                slot.disabled = True
+        what = "took" if finished else "still running after"
+        self._log(f"Plugin {slot.name}: {hook} {what} {elapsed:.1f}s (budget {budget:g}s)")
+        if disable:
+            self._log(f"Plugin {slot.name} disabled for this session after {MAX_OVERRUNS} overruns in a row")
+
+    def _watch(self):
+        while True:
+            with self._lock:
+                while not any(s.running for s in self._slots):
+                    self._wake.wait()
+            time.sleep(0.25)
+            try:
+                self.check_overruns()
+            except Exception:
+                pass
+
+    def wait_idle(self, timeout=None):
+        """Block until no hook is queued or running (tests and shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not any(s.busy or s.running for s in self._slots):
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
@@ -0,0 +1,194 @@
+import codecs
+import os
+import signal
+import selectors
+import subprocess
+import threading
+import time
+
+
+class ProcessResult:
+    def __init__(self, returncode, stdout, stderr, cancelled=False, timed_out=False):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.cancelled = cancelled
+        self.timed_out = timed_out
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.cancelled and not self.timed_out
+
+
+class ProcessRunner:
+    """Run a command and deliver its stdout/stderr lines as soon as they arrive.
+
+    Both pipes are multiplexed with ``selectors`` so neither can fill up and
+    block the child, and there is no sleep between reads. ``cancel()`` wakes
+    the loop through a self-pipe and terminates the whole process group.
+
+    With ``new_session=False`` the child stays in our session; pkexec needs
+    this to reach the polkit agent over D-Bus. Such processes are cancelled
+    with ``terminate()`` on the child alone.
+    """
+
+    def __init__(self, command, env=None, cwd=None, new_session=True, grace=5.0):
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.new_session = new_session
+        self.grace = grace
+        self.process = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+        # Self-pipe for cancel(); only exists while run() is active
+        self._wake_r = self._wake_w = None
+
+    def cancel(self):
+        """Stop the process. Safe to call from any thread, before or during run()."""
+        self._cancelled = True
+        with self._lock:
+            if self._wake_w is None:
+                return
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+
+    def run(self, on_stdout=None, on_stderr=None, cancel_event=None, timeout=None):
+        """Run to completion and return a ProcessResult.
+
+        ``cancel_event`` is an optional threading.Event checked a few times a
+        second; ``cancel()`` takes effect immediately.
+        """
+        stdout_lines, stderr_lines = [], []
+        timed_out = False
+        try:
+            with self._lock:
+                self._wake_r, self._wake_w = os.pipe()
+            self.process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                env=self.env,
+                cwd=self.cwd,
+                start_new_session=self.new_session,
+            )
+            sel = selectors.DefaultSelector()
+            sel.register(self.process.stdout, selectors.EVENT_READ, (stdout_lines, on_stdout))
+            sel.register(self.process.stderr, selectors.EVENT_READ, (stderr_lines, on_stderr))
+            sel.register(self._wake_r, selectors.EVENT_READ, None)
+            partial = {}
+            decoders = {}
+            deadline = time.monotonic() + timeout if timeout else None
+            open_streams = 2
+            while open_streams:
+                if self._cancelled or (cancel_event is not None and cancel_event.is_set()):
+                    self._cancelled = True
+                    break
+                wait = None
+                if cancel_event is not None:
+                    wait = 0.25
+                if deadline is not None:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        timed_out = True
+                        break
+                    wait = left if wait is None else min(wait, left)
+                for key, _ in sel.select(wait):
+                    if key.data is None:
+                        continue
+                    chunk = os.read(key.fd, 65536)
+                    lines, callback = key.data
+                    if not chunk:
+                        sel.unregister(key.fileobj)
+                        open_streams -= 1
+                        rest = partial.pop(key.fd, "")
+                        if rest:
+                            self._deliver([rest], lines, callback)
+                        continue
+                    decoder = decoders.get(key.fd)
+                    if decoder is None:
+                        decoder = decoders[key.fd] = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                    text = partial.get(key.fd, "") + decoder.decode(chunk)
+                    complete, rest = _split_lines(text)
+                    partial[key.fd] = rest
+                    self._deliver(complete, lines, callback)
+            sel.close()
+            if self._cancelled or timed_out:
+                self._stop()
+            self.process.wait()
+            return ProcessResult(
+                self.process.returncode,
+                "\n".join(stdout_lines),
+                "\n".join(stderr_lines),
+                cancelled=self._cancelled,
+                timed_out=timed_out,
+            )
+        finally:
+            for stream in (getattr(self.process, "stdout", None), getattr(self.process, "stderr", None)):
+                try:
+                    if stream:
+                        stream.close()
+                except Exception:
+                    pass
+            with self._lock:
+                for fd in (self._wake_r, self._wake_w):
+                    if fd is None:
+                        continue
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+                self._wake_r = self._wake_w = None
+
+    def _deliver(self, complete, lines, callback):
+        for line in complete:
+            line = line.strip()
+            if not line:
+                continue
+            lines.append(line)
+            if callback:
+                try:
+                    callback(line)
+                except Exception:
+                    pass
+
+    def _stop(self):
+        p = self.process
+        if p is None or p.poll() is not None:
+            return
+        self._signal(signal.SIGTERM)
+        try:
+            p.wait(timeout=self.grace)
+        except subprocess.TimeoutExpired:
+            self._signal(signal.SIGKILL)
+
+    def _signal(self, sig):
+        p = self.process
+        try:
+            if self.new_session:
+                os.killpg(p.pid, sig)
+            elif sig == signal.SIGKILL:
+                p.kill()
+            else:
+                p.terminate()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _split_lines(text):
+    """Split off complete lines; CR counts as a line end so progress bars come through."""
+    cut = max(text.rfind("\n"), text.rfind("\r"))
+    if cut < 0:
+        return [], text
+    return text[:cut].replace("\r\n", "\n").replace("\r", "\n").split("\n"), text[cut + 1:]
+
+
+def run_command(command, on_stdout=None, on_stderr=None, env=None, cwd=None,
+                new_session=True, cancel_event=None, timeout=None):
+    """Convenience wrapper: run ``command`` with a fresh ProcessRunner."""
+    runner = ProcessRunner(command, env=env, cwd=cwd, new_session=new_session)
+    return runner.run(on_stdout=on_stdout, on_stderr=on_stderr, cancel_event=cancel_event, timeout=timeout)
+
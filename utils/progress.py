@@ -0,0 +1,509 @@
+import os
+import re
+import threading
+import time
+
+
+class ProgressEvent:
+    PACKAGE_START = "package_start"
+    DOWNLOAD = "download"
+    DOWNLOAD_TOTAL = "download_total"
+    STEP = "step"
+    PACKAGE_DONE = "package_done"
+
+    def __init__(self, kind, package=None, done=None, total=None, text=None):
+        self.kind = kind
+        self.package = package
+        self.done = done
+        self.total = total
+        self.text = text
+
+    def __repr__(self):
+        return f"ProgressEvent({self.kind!r}, {self.package!r}, done={self.done!r}, total={self.total!r})"
+
+
+_UNITS = {"B": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3,
+          "kB": 1000, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3}
+
+
+def to_bytes(value, unit):
+    try:
+        return int(float(value) * _UNITS.get(unit, 1))
+    except (TypeError, ValueError):
+        return 0
+
+
+def format_bytes(n):
+    n = float(n or 0)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+
+
+def format_eta(seconds):
+    seconds = int(max(0, seconds))
+    m, s = divmod(seconds, 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+_SIZE = r"([\d.]+)\s*(B|KiB|MiB|GiB)"
+
+
+class PacmanParser:
+    """Turns pacman output (also what AUR helpers print around it) into ProgressEvents.
+
+    On a terminal pacman prints download bars and "(k/N) installing foo"
+    counters. With stdout on a pipe, which is how ProcessRunner runs it, the
+    bars are gone and actions are plain "installing foo..." lines; their
+    count comes from the "Packages (N)" target list. Byte progress for that
+    case comes from ``CacheDownloadWatcher``.
+    """
+
+    _total = re.compile(r"^Total Download Size:\s+" + _SIZE)
+    _targets = re.compile(r"^Packages?\s+\((\d+)\)")
+    _bar = re.compile(r"^\s*(\S+)\s+" + _SIZE + r"\s+" + _SIZE + r"/s\s+\S+\s+\[[^\]]*\]\s+(\d+)%")
+    _action = re.compile(r"^\((\d+)/(\d+)\)\s+(installing|upgrading|reinstalling|downgrading|removing)\s+(\S+)")
+    _plain_action = re.compile(r"^(installing|upgrading|reinstalling|downgrading|removing)\s+(\S+?)\.\.\.$")
+    _phase = re.compile(r"^\((\d+)/(\d+)\)\s+(checking [^\[]+|loading [^\[]+|downloading [^\[]+)")
+    _plain_phase = re.compile(r"^(checking [^.]+|loading [^.]+)\.\.\.$")
+    _plain_download = re.compile(r"^\s*(\S+) downloading\.\.\.$")
+    _aur_make = re.compile(r"^==> Making package:\s+(\S+)")
+    _aur_done = re.compile(r"^==> Finished making:\s+(\S+)")
+
+    def __init__(self):
+        self._current = None
+        self._targets_count = None
+        self._index = 0
+
+    def _start(self, package, done, total, text):
+        events = []
+        if self._current:
+            events.append(ProgressEvent(ProgressEvent.PACKAGE_DONE, package=self._current))
+        self._current = package
+        events.append(ProgressEvent(ProgressEvent.PACKAGE_START, package=package, done=done, total=total, text=text))
+        return events
+
+    def feed(self, line):
+        events = []
+        m = self._total.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.DOWNLOAD_TOTAL, total=to_bytes(m.group(1), m.group(2)))]
+        m = self._targets.match(line)
+        if m:
+            # A new transaction (AUR helpers run several) restarts the counter
+            self._targets_count = int(m.group(1))
+            self._index = 0
+            return events
+        m = self._bar.match(line)
+        if m and not line.lstrip().startswith(("(", "Total")):
+            total = to_bytes(m.group(2), m.group(3))
+            pct = int(m.group(6))
+            return [ProgressEvent(ProgressEvent.DOWNLOAD, package=m.group(1), done=total * pct // 100, total=total)]
+        m = self._action.match(line)
+        if m:
+            return self._start(m.group(4), int(m.group(1)), int(m.group(2)), m.group(3))
+        m = self._plain_action.match(line.strip())
+        if m:
+            self._index += 1
+            return self._start(m.group(2), self._index, self._targets_count, m.group(1))
+        m = self._phase.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, text=m.group(3).strip())]
+        m = self._plain_phase.match(line.strip())
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, text=m.group(1).strip())]
+        m = self._plain_download.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, package=m.group(1), text="downloading")]
+        m = self._aur_make.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, package=m.group(1), text="building")]
+        m = self._aur_done.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, package=m.group(1), text="built")]
+        return events
+
+    def finish(self):
+        if self._current:
+            done, self._current = self._current, None
+            return [ProgressEvent(ProgressEvent.PACKAGE_DONE, package=done)]
+        return []
+
+
+def _package_file_name(filename):
+    """'foo-1.0-1-x86_64' for 'foo-1.0-1-x86_64.pkg.tar.zst(.part)', the name pacman's bars use."""
+    if filename.endswith('.part'):
+        filename = filename[:-len('.part')]
+    cut = filename.find('.pkg.tar')
+    return filename[:cut] if cut > 0 else None
+
+
+class CacheDownloadWatcher:
+    """Byte progress of pacman downloads, read from the package cache.
+
+    pacman drops its download bars when stdout is not a terminal, so this
+    polls the ``.part`` files in ``cache_dirs`` (and the ``download-*``
+    directories pacman >= 7 downloads into) and reports each one as a
+    DOWNLOAD event; a download that finished since the last poll is reported
+    with its final size. Files that were complete before ``start()`` are
+    never reported.
+    """
+
+    def __init__(self, cache_dirs, on_events, interval=0.5):
+        self.cache_dirs = [d for d in cache_dirs if d]
+        self.on_events = on_events
+        self.interval = interval
+        self._partial = {}  # package -> (directory, size)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _scan(self):
+        found = {}
+        dirs = list(self.cache_dirs)
+        for directory in self.cache_dirs:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('download-') and entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.path)
+            except OSError:
+                continue
+        for directory in dirs:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith('.part'):
+                            continue
+                        package = _package_file_name(entry.name)
+                        if package:
+                            try:
+                                found[package] = (directory, entry.stat().st_size)
+                            except OSError:
+                                pass
+            except OSError:
+                continue
+        return found
+
+    def _final_size(self, package, last):
+        for directory in self.cache_dirs:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(package + '.pkg.tar') and not entry.name.endswith(('.part', '.sig')):
+                            return entry.stat().st_size
+            except OSError:
+                continue
+        return last
+
+    def poll(self):
+        """DOWNLOAD events for the downloads that moved since the last poll."""
+        events = []
+        found = self._scan()
+        for package, (directory, size) in found.items():
+            if self._partial.get(package, (None, None))[1] != size:
+                events.append(ProgressEvent(ProgressEvent.DOWNLOAD, package=package, done=size))
+        for package, (directory, size) in self._partial.items():
+            if package not in found:
+                final = self._final_size(package, size)
+                events.append(ProgressEvent(ProgressEvent.DOWNLOAD, package=package, done=final, total=final))
+        self._partial = found
+        return events
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._emit(self.poll())
+        self._emit(self.poll())
+
+    def _emit(self, events):
+        if events:
+            try:
+                self.on_events(events)
+            except Exception:
+                pass
+
+    def start(self):
+        self._partial = self._scan()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+class FlatpakParser:
+    _action = re.compile(r"^(Installing|Updating|Uninstalling)\s+(\d+)/(\d+)\W*\s*(\S+)?")
+    _pct = re.compile(r"(\d+)%")
+
+    def __init__(self):
+        self._current = None
+
+    def feed(self, line):
+        events = []
+        m = self._action.match(line.strip())
+        if not m:
+            return events
+        idx, count = int(m.group(2)), int(m.group(3))
+        ref = m.group(4) if m.group(4) and not m.group(4).endswith("%") else None
+        key = f"{idx}/{count}"
+        if key != self._current:
+            if self._current:
+                events.append(ProgressEvent(ProgressEvent.PACKAGE_DONE, package=self._current))
+            self._current = key
+            events.append(ProgressEvent(ProgressEvent.PACKAGE_START, package=ref or key, done=idx, total=count,
+                                        text=m.group(1).lower()))
+        p = self._pct.search(line)
+        if p:
+            events.append(ProgressEvent(ProgressEvent.STEP, package=ref or key, done=int(p.group(1)), total=100))
+        return events
+
+    def finish(self):
+        if self._current:
+            done, self._current = self._current, None
+            return [ProgressEvent(ProgressEvent.PACKAGE_DONE, package=done)]
+        return []
+
+
+class NpmParser:
+    _summary = re.compile(r"^(?:added|changed|removed|updated) (\d+) packages?")
+    _fetch = re.compile(r"^npm (?:http|info) fetch GET \d+ \S+/([^/\s]+)")
+
+    def feed(self, line):
+        line = line.strip()
+        m = self._fetch.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, package=m.group(1), text="fetching")]
+        m = self._summary.match(line)
+        if m:
+            return [ProgressEvent(ProgressEvent.STEP, text=line)]
+        return []
+
+    def finish(self):
+        return []
+
+
+def parser_for_source(source):
+    if source in ("pacman", "AUR"):
+        return PacmanParser()
+    if source == "Flatpak":
+        return FlatpakParser()
+    if source == "npm":
+        return NpmParser()
+    return None
+
+
+class TransactionProgress:
+    """Aggregates ProgressEvents of a whole transaction.
+
+    A transaction is a sequence of segments (one per source command). Inside a
+    segment the download, when its size is known, counts for half the work
+    and package installation for the other half; pacman's package counters
+    may grow the package total when dependencies are pulled in. Throughput is
+    an exponential moving average of download bytes per second. ``poll()``
+    returns a status text at most every ``interval`` seconds so callers can
+    push it to the UI cheaply.
+    """
+
+    def __init__(self, total_packages, interval=0.25, clock=time.monotonic):
+        self.total_packages = max(1, int(total_packages or 1))
+        self.interval = interval
+        self.clock = clock
+        self.started = clock()
+        self.completed = 0
+        self.current = None
+        self.step_fraction = 0.0
+        self.step_text = ""
+        self._seg_base = 0
+        self._seg_count = 0
+        self._seg_done = 0
+        self._reset_download()
+        self._last_emit = None
+        self._dirty = True
+
+    def _reset_download(self):
+        self.download_total = 0
+        self._downloads = {}
+        self.rate = 0.0
+        self._rate_at = None
+        self._rate_bytes = 0
+
+    @property
+    def downloaded(self):
+        return sum(done for done, _ in self._downloads.values())
+
+    def begin_segment(self, count):
+        self._seg_base = self.completed
+        self._seg_count = max(0, int(count))
+        self._seg_done = 0
+        self.current = None
+        self.step_fraction = 0.0
+        self._reset_download()
+        self._dirty = True
+
+    def end_segment(self):
+        self._seg_done = self._seg_count
+        self.completed = self._seg_base + self._seg_count
+        self.step_fraction = 0.0
+        self._reset_download()
+        self._dirty = True
+
+    def feed(self, event):
+        kind = event.kind
+        if kind == ProgressEvent.DOWNLOAD_TOTAL:
+            self.download_total = max(self.download_total, event.total or 0)
+        elif kind == ProgressEvent.DOWNLOAD:
+            self._downloads[event.package] = (event.done or 0, event.total or 0)
+            if not self.download_total:
+                self.download_total = sum(t for _, t in self._downloads.values())
+            self._update_rate()
+        elif kind == ProgressEvent.PACKAGE_START:
+            self.current = event.package
+            self.step_fraction = 0.0
+            self.step_text = event.text or ""
+            if event.total and event.total > self._seg_count:
+                self._seg_count = event.total
+                self.total_packages = max(self.total_packages, self._seg_base + self._seg_count)
+        elif kind == ProgressEvent.STEP:
+            if event.total:
+                self.step_fraction = min(1.0, float(event.done or 0) / event.total)
+            if event.text:
+                self.step_text = event.text
+        elif kind == ProgressEvent.PACKAGE_DONE:
+            self._seg_done = min(self._seg_count, self._seg_done + 1)
+            self.completed = self._seg_base + self._seg_done
+            self.step_fraction = 0.0
+        self._dirty = True
+
+    def _update_rate(self):
+        now = self.clock()
+        total = self.downloaded
+        if self._rate_at is None:
+            self._rate_at, self._rate_bytes = now, total
+            return
+        dt = now - self._rate_at
+        if dt < 0.2:
+            return
+        inst = max(0, total - self._rate_bytes) / dt
+        self.rate = inst if not self.rate else 0.7 * self.rate + 0.3 * inst
+        self._rate_at, self._rate_bytes = now, total
+
+    def percent(self):
+        installed = min(self._seg_count, self._seg_done + self.step_fraction)
+        if self.download_total:
+            download = min(1.0, float(self.downloaded) / self.download_total)
+            segment = 0.5 * self._seg_count * download + 0.5 * installed
+        else:
+            segment = installed
+        return min(100, int(100 * (self._seg_base + segment) / self.total_packages))
+
+    def eta(self):
+        if self.download_total and self.rate > 0 and self.downloaded < self.download_total:
+            return (self.download_total - self.downloaded) / self.rate
+        pct = self.percent()
+        elapsed = self.clock() - self.started
+        if pct <= 0 or elapsed <= 0:
+            return None
+        return elapsed * (100 - pct) / pct
+
+    def status_text(self):
+        lines = [f"Installing: {self.completed}/{self.total_packages} packages · {self.percent()}%"]
+        detail = []
+        if self.download_total and self.downloaded < self.download_total:
+            detail.append(f"{format_bytes(self.downloaded)} / {format_bytes(self.download_total)}")
+            if self.rate:
+                detail.append(f"{format_bytes(self.rate)}/s")
+        elif self.current:
+            detail.append(f"{self.step_text} {self.current}".strip())
+        eta = self.eta()
+        if eta is not None and self.completed < self.total_packages:
+            detail.append(f"ETA {format_eta(eta)}")
+        if detail:
+            lines.append(" · ".join(detail))
+        return "\n".join(lines)
+
+    def poll(self, force=False):
+        """Return the status text if it changed and the throttle interval has passed, else None."""
+        if not self._dirty and not force:
+            return None
+        now = self.clock()
+        if not force and self._last_emit is not None and now - self._last_emit < self.interval:
+            return None
+        self._last_emit = now
+        self._dirty = False
+        return self.status_text()
+
+
+class CombinedProgress:
+    """Several TransactionProgress parts (one per lock domain) shown as one status.
+
+    Parts may be fed from different threads; ``poll()`` throttles the combined
+    text the same way TransactionProgress does.
+    """
+
+    def __init__(self, totals, labels=None, interval=0.25, clock=time.monotonic):
+        self.parts = {name: TransactionProgress(n, interval=0, clock=clock) for name, n in totals.items()}
+        self.labels = labels or {}
+        self.interval = interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._last_emit = None
+        self._dirty = True
+
+    def begin_segment(self, name, count):
+        with self._lock:
+            self.parts[name].begin_segment(count)
+            self._dirty = True
+
+    def end_segment(self, name):
+        with self._lock:
+            self.parts[name].end_segment()
+            self._dirty = True
+
+    def feed(self, name, event):
+        with self._lock:
+            self.parts[name].feed(event)
+            self._dirty = True
+
+    def percent(self):
+        total = sum(p.total_packages for p in self.parts.values())
+        if not total:
+            return 0
+        return int(sum(p.percent() * p.total_packages for p in self.parts.values()) / total)
+
+    def status_text(self):
+        if len(self.parts) == 1:
+            return next(iter(self.parts.values())).status_text()
+        done = sum(p.completed for p in self.parts.values())
+        total = sum(p.total_packages for p in self.parts.values())
+        lines = [f"Installing: {done}/{total} packages · {self.percent()}%"]
+        for name, part in self.parts.items():
+            detail = [f"{self.labels.get(name, name)}: {part.percent()}%"]
+            if part.download_total and part.downloaded < part.download_total and part.rate:
+                detail.append(f"{format_bytes(part.rate)}/s")
+            eta = part.eta()
+            if eta is not None and part.completed < part.total_packages:
+                detail.append(f"ETA {format_eta(eta)}")
+            lines.append(" · ".join(detail))
+        return "\n".join(lines)
+
+    def poll(self, force=False):
+        with self._lock:
+            if not self._dirty and not force:
+                return None
+            now = self.clock()
+            if not force and self._last_emit is not None and now - self._last_emit < self.interval:
+                return None
+            self._last_emit = now
+            self._dirty = False
+            return self.status_text()
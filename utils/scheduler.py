@@ -0,0 +1,105 @@
+import threading
+
+
+# Sources that share a lock must run one after another. pacman and the AUR
+# helpers both take the ALPM database lock (/var/lib/pacman/db.lck); user
+# Flatpak installs, npm prefixes and local update commands are independent.
+LOCK_DOMAINS = {
+    'pacman': 'alpm',
+    'AUR': 'alpm',
+    'Flatpak': 'flatpak',
+    'npm': 'npm',
+    'Local': 'local',
+}
+
+DOMAIN_LABELS = {
+    'alpm': 'pacman/AUR',
+    'flatpak': 'Flatpak',
+    'npm': 'npm',
+    'local': 'Local',
+}
+
+
+def lock_domain(source):
+    return LOCK_DOMAINS.get(source, source)
+
+
+def group_by_domain(packages_by_source):
+    """Group {source: packages} into {domain: [(source, packages), ...]}, keeping the given order."""
+    groups = {}
+    for source, packages in packages_by_source.items():
+        if not packages:
+            continue
+        groups.setdefault(lock_domain(source), []).append((source, packages))
+    return groups
+
+
+class CancelToken:
+    """Event-like flag that is also set when its parent event is set."""
+
+    def __init__(self, parent=None):
+        self._event = threading.Event()
+        self._parent = parent
+
+    def set(self):
+        self._event.set()
+
+    def is_set(self):
+        return self._event.is_set() or (self._parent is not None and self._parent.is_set())
+
+
+class DomainScheduler:
+    """Run per-source jobs grouped by lock domain.
+
+    Jobs in the same domain run sequentially in the order given; different
+    domains run in parallel threads. ``job(domain, source, packages, token)``
+    is called for every source and its return value is collected per source.
+    ``token`` is a CancelToken for the domain, set by ``cancel(domain)`` or
+    by the shared ``cancel_event``.
+    """
+
+    def __init__(self, cancel_event=None):
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def token(self, domain):
+        with self._lock:
+            tok = self._tokens.get(domain)
+            if tok is None:
+                tok = self._tokens[domain] = CancelToken(self.cancel_event)
+            return tok
+
+    def cancel(self, domain=None):
+        if domain is None:
+            self.cancel_event.set()
+            return
+        self.token(domain).set()
+
+    def run(self, packages_by_source, job, on_error=None):
+        groups = group_by_domain(packages_by_source)
+        results = {}
+
+        def run_domain(domain, items):
+            tok = self.token(domain)
+            for source, packages in items:
+                if tok.is_set():
+                    results[source] = None
+                    continue
+                try:
+                    results[source] = job(domain, source, packages, tok)
+                except Exception as e:
+                    results[source] = None
+                    if on_error:
+                        on_error(source, e)
+
+        if len(groups) <= 1:
+            for domain, items in groups.items():
+                run_domain(domain, items)
+            return results
+        threads = [threading.Thread(target=run_domain, args=(d, items), daemon=True) for d, items in groups.items()]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
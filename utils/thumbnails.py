@@ -0,0 +1,169 @@
+"""Off-thread image decoding with a thumbnail disk cache.
+
+Artwork is decoded straight at its display size (``QImageReader`` with
+``setScaledSize``/``setScaledClipRect``) on a couple of worker threads, so
+a 3000x2000 PNG shown as a 48px icon never gets decoded in full, and never
+on the UI thread. Each thumbnail is also written to
+``~/.cache/neoarch/thumbnails`` under a key made of the source path, its
+mtime and size and the target size, so later runs only read a small PNG.
+
+Workers produce ``QImage`` (safe outside the GUI thread); callbacks run on
+the GUI thread and convert to ``QPixmap`` there::
+
+    thumbnails.loader().load(path, QSize(240, 180), label_setter, mode='cover')
+"""
+import os
+import queue
+import hashlib
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'neoarch', 'thumbnails')
+CACHE_VERSION = 1
+MODES = ('fit', 'cover', 'center')
+
+
+def _target_size(source, size, mode):
+    if mode == 'fit':
+        return source.scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+    if mode == 'cover':
+        return source.scaled(size, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+    return source
+
+
+def cache_path(path, size, mode='fit', cache_dir=None):
+    """Disk cache file for ``path`` at ``size``; None when the source cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    raw = f"{CACHE_VERSION}|{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{size.width()}x{size.height()}|{mode}"
+    name = hashlib.sha1(raw.encode('utf-8')).hexdigest() + '.png'
+    return os.path.join(cache_dir or CACHE_DIR, name)
+
+
+def decode(path, size, mode='fit', cache_dir=None):
+    """``path`` decoded at ``size`` (see MODES); reads and fills the disk cache.
+
+    ``fit`` scales inside ``size``, ``cover`` scales to fill it and crops the
+    centre, ``center`` crops the centre at the original scale. Returns a null
+    QImage when the file cannot be read.
+    """
+    cached = cache_path(path, size, mode, cache_dir)
+    if cached is None:
+        return QImage()
+    if os.path.exists(cached):
+        image = QImage(cached)
+        if not image.isNull():
+            return image
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source = reader.size()
+    if source.isValid():
+        scaled = _target_size(source, size, mode)
+        if scaled != source:
+            reader.setScaledSize(scaled)
+        if mode in ('cover', 'center') and (scaled.width() > size.width() or scaled.height() > size.height()):
+            w, h = min(size.width(), scaled.width()), min(size.height(), scaled.height())
+            reader.setScaledClipRect(QRect((scaled.width() - w) // 2, (scaled.height() - h) // 2, w, h))
+    image = reader.read()
+    if image.isNull():
+        return QImage()
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        tmp = f"{cached}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if image.save(tmp, 'PNG'):
+            os.replace(tmp, cached)
+    except Exception:
+        pass
+    return image
+
+
+class ThumbnailLoader(QObject):
+    """Decodes images on worker threads and hands them to callbacks on the GUI thread."""
+
+    _decoded = pyqtSignal(object, QImage)
+
+    def __init__(self, workers=2, cache_dir=None, memory_items=256, parent=None):
+        super().__init__(parent)
+        self._workers = max(1, int(workers))
+        self._cache_dir = cache_dir
+        self._memory_items = memory_items
+        self._memory = OrderedDict()
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._threads = []
+        self._decoded.connect(self._deliver)
+
+    @staticmethod
+    def _key(path, size, mode):
+        return (os.path.abspath(path), size.width(), size.height(), mode)
+
+    def cached(self, path, size, mode='fit'):
+        """The image if it was already decoded this session, else None."""
+        key = self._key(path, size, mode)
+        image = self._memory.get(key)
+        if image is not None:
+            self._memory.move_to_end(key)
+        return image
+
+    def load(self, path, size, callback, mode='fit'):
+        """Call ``callback(QImage)`` on the GUI thread once ``path`` is decoded at ``size``.
+
+        Already decoded images are delivered immediately; a null image means
+        the file could not be read. Returns True when delivered synchronously.
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown thumbnail mode {mode!r}")
+        key = self._key(path, size, mode)
+        image = self.cached(path, size, mode)
+        if image is not None:
+            callback(image)
+            return True
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return False
+        self._pending[key] = [callback]
+        self._queue.put((key, path, QSize(size), mode))
+        if len(self._threads) < self._workers:
+            t = threading.Thread(target=self._work, name="thumbnails", daemon=True)
+            self._threads.append(t)
+            t.start()
+        return False
+
+    def _work(self):
+        while True:
+            key, path, size, mode = self._queue.get()
+            try:
+                image = decode(path, size, mode, self._cache_dir)
+            except Exception:
+                image = QImage()
+            self._decoded.emit(key, image)
+
+    def _deliver(self, key, image):
+        self._memory[key] = image
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+        for callback in self._pending.pop(key, []):
+            try:
+                callback(image)
+            except RuntimeError:
+                # The receiving widget was deleted while the image was decoding
+                pass
+            except Exception:
+                pass
+
+
+_loader = None
+
+
+def loader():
+    """Process-wide loader; create it from the GUI thread."""
+    global _loader
+    if _loader is None:
+        _loader = ThumbnailLoader()
+    return _loader
@@ -0,0 +1,225 @@
+"""Chrome trace capture for startup and view switches.
+
+Enabled with ``aurora_home.py --trace[=PATH]`` or ``NEOARCH_TRACE=1|PATH``.
+Spans are written as Trace Event Format JSON when the process exits and can
+be opened in chrome://tracing or https://ui.perfetto.dev. Module imports are
+recorded through an ``__import__`` hook; background jobs wrapped with
+``bind`` get their own span plus a flow arrow from where they were started.
+
+While tracing is off every helper returns immediately, so the call sites can
+stay in place.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import builtins
+import functools
+import itertools
+import threading
+from contextlib import nullcontext
+
+
+ENV_VAR = 'NEOARCH_TRACE'
+
+_enabled = False
+_path = None
+_origin = time.perf_counter()
+_events = []
+_thread_names = {}
+_flow_ids = itertools.count(1)
+_original_import = None
+_NULL = nullcontext()
+
+
+def _now_us():
+    return (time.perf_counter() - _origin) * 1e6
+
+
+def _tid():
+    t = threading.current_thread()
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        _thread_names[tid] = t.name
+    return tid
+
+
+def default_trace_path():
+    base = os.path.join(os.path.expanduser('~'), '.cache', 'neoarch', 'traces')
+    return os.path.join(base, f"neoarch-trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(path=None, trace_imports=True):
+    """Start recording; the trace is written to ``path`` at exit."""
+    global _enabled, _path
+    if _enabled:
+        return
+    _enabled = True
+    _path = path or default_trace_path()
+    if trace_imports:
+        _install_import_hook()
+    atexit.register(save)
+
+
+def configure_from_argv(argv):
+    """Enable tracing from ``--trace[=PATH]`` (removed from ``argv``) or $NEOARCH_TRACE."""
+    path = None
+    requested = False
+    for arg in list(argv[1:]):
+        if arg == '--trace' or arg.startswith('--trace='):
+            requested = True
+            path = arg.partition('=')[2] or path
+            argv.remove(arg)
+    env = os.environ.get(ENV_VAR, '').strip()
+    if env and env.lower() not in ('0', 'false', 'no', 'off'):
+        requested = True
+        if not path and env.lower() not in ('1', 'true', 'yes', 'on'):
+            path = env
+    if requested:
+        enable(path)
+    return requested
+
+
+def _record(event):
+    event['pid'] = os.getpid()
+    event['tid'] = _tid()
+    _events.append(event)
+
+
+def complete(name, start_us, duration_us, cat='app', args=None):
+    if not _enabled:
+        return
+    event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start_us, 'dur': duration_us}
+    if args:
+        event['args'] = args
+    _record(event)
+
+
+def instant(name, cat='app', **args):
+    if not _enabled:
+        return
+    event = {'name': name, 'cat': cat, 'ph': 'i', 's': 'p', 'ts': _now_us()}
+    if args:
+        event['args'] = args
+    _record(event)
+
+
+def since_start(name, cat='app'):
+    """Span from the start of tracing until now (e.g. 'first paint')."""
+    if _enabled:
+        complete(name, 0, _now_us(), cat)
+
+
+class _Span:
+    __slots__ = ('name', 'cat', 'args', 't0')
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or {}, error=exc_type.__name__)
+        complete(self.name, self.t0, _now_us() - self.t0, self.cat, args)
+        return False
+
+
+def span(name, cat='app', **args):
+    """Context manager recording a complete ('X') event."""
+    if not _enabled:
+        return _NULL
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat='app', args=None):
+    """Decorator form of ``span``; ``args(*call_args)`` may return span arguments."""
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not _enabled:
+                return fn(*a, **kw)
+            extra = {}
+            if args is not None:
+                try:
+                    extra = args(*a, **kw) or {}
+                except Exception:
+                    extra = {}
+            with _Span(label, cat, extra):
+                return fn(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def bind(fn, name=None, cat='job'):
+    """Wrap a thread target so it is traced and linked to the span that started it."""
+    if not _enabled:
+        return fn
+    label = name or getattr(fn, '__qualname__', None) or repr(fn)
+    flow = next(_flow_ids)
+    _record({'name': label, 'cat': cat, 'ph': 's', 'id': flow, 'ts': _now_us()})
+
+    @functools.wraps(fn)
+    def run(*a, **kw):
+        with _Span(label, cat, None):
+            _record({'name': label, 'cat': cat, 'ph': 'f', 'bp': 'e', 'id': flow, 'ts': _now_us()})
+            return fn(*a, **kw)
+    return run
+
+
+def _install_import_hook():
+    global _original_import
+    if _original_import is not None:
+        return
+    _original_import = builtins.__import__
+
+    def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+        before = len(sys.modules)
+        t0 = _now_us()
+        module = _original_import(name, globals, locals, fromlist, level)
+        # Only imports that actually loaded something are worth a span
+        if _enabled and len(sys.modules) > before:
+            label = name
+            if level and globals:
+                label = f"{globals.get('__package__') or ''}.{name}".rstrip('.')
+            complete(f"import {label}", t0, _now_us() - t0, 'import')
+        return module
+
+    builtins.__import__ = traced_import
+
+
+def trace_data():
+    events = list(_events)
+    pid = os.getpid()
+    meta = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'neoarch'}}]
+    for tid, tname in list(_thread_names.items()):
+        meta.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': tname}})
+    return {'traceEvents': meta + events, 'displayTimeUnit': 'ms'}
+
+
+def save(path=None):
+    """Write the trace; returns the path or None."""
+    path = path or _path
+    if not _enabled or not path:
+        return None
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(trace_data(), f)
+        sys.stderr.write(f"Trace written to {path}\n")
+        return path
+    except Exception as e:
+        sys.stderr.write(f"Could not write trace {path}: {e}\n")
+        return None
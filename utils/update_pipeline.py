@@ -0,0 +1,127 @@
+"""Pre-update snapshot overlapped with package downloads.
+
+A full update used to run ``timeshift --list``, maybe ``--delete-all``,
+``--create`` and only then ``pacman -Syu``. Downloading does not touch the
+installed system, so it can run while the snapshot is being taken; only the
+install phase has to wait for the snapshot to be committed.
+
+``PhaseTimings`` records how long each phase took (and how much wall-clock
+time the overlap saved) and appends it to
+``~/.local/state/neoarch/update_timings.jsonl``.
+"""
+import os
+import json
+import time
+import threading
+import subprocess
+from contextlib import contextmanager
+
+
+def timings_path():
+    base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'neoarch', 'update_timings.jsonl')
+
+
+class PhaseTimings:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        t0 = self.clock()
+        try:
+            yield
+        finally:
+            self.record(name, self.clock() - t0)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def overlap_saved(self, *names):
+        """Seconds saved by running ``names`` concurrently instead of one after another."""
+        durations = [self.phases.get(n, 0.0) for n in names]
+        return sum(durations) - max(durations) if durations else 0.0
+
+    def as_dict(self):
+        with self._lock:
+            phases = {k: round(v, 3) for k, v in self.phases.items()}
+        return {
+            'time': time.time(),
+            'total': round(self.clock() - self.started, 3),
+            'phases': phases,
+            'overlap_saved': round(self.overlap_saved('snapshot', 'download'), 3),
+        }
+
+    def summary(self):
+        d = self.as_dict()
+        parts = ", ".join(f"{k} {v:.1f}s" for k, v in d['phases'].items())
+        return f"{parts}; total {d['total']:.1f}s, overlap saved {d['overlap_saved']:.1f}s"
+
+    def save(self, path=None):
+        path = path or timings_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(json.dumps(self.as_dict()) + "\n")
+        except Exception:
+            pass
+
+
+def snapshot_then_install(download, install, snapshot=None, timings=None):
+    """Run ``snapshot()`` and ``download()`` concurrently, then ``install(results)``.
+
+    ``install`` receives {'snapshot': ..., 'download': ...} with the return
+    values of the first two phases and starts only after both have
+    finished. Returns the results dict including 'install'.
+    """
+    timings = timings or PhaseTimings()
+    results = {}
+
+    def run(name, fn):
+        with timings.phase(name):
+            try:
+                results[name] = fn()
+            except Exception as e:
+                results[name] = e
+
+    threads = []
+    if snapshot is not None:
+        threads.append(threading.Thread(target=run, args=('snapshot', snapshot), daemon=True))
+    threads.append(threading.Thread(target=run, args=('download', download), daemon=True))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    run('install', lambda: install(dict(results)))
+    return results
+
+
+def create_pre_update_snapshot(log=print, keep=2):
+    """Prune old Timeshift snapshots down to ``keep`` and create a new one; True on success."""
+    try:
+        result = subprocess.run(["timeshift", "--list"], capture_output=True, text=True, timeout=30)
+        if result.returncode == 0:
+            lines = result.stdout.strip().split('\n')
+            snapshot_count = sum(1 for line in lines if line.strip() and not line.startswith('Num') and not line.startswith('---'))
+            if snapshot_count > keep:
+                delete_result = subprocess.run(["pkexec", "timeshift", "--delete-all", "--skip", str(keep)],
+                                               capture_output=True, text=True, timeout=300)
+                if delete_result.returncode == 0:
+                    log(f"Cleaned up old snapshots (kept latest {keep})")
+                else:
+                    log(f"Failed to clean up snapshots: {delete_result.stderr}")
+    except Exception as e:
+        log(f"Error checking snapshots: {e}")
+
+    comment = f"NeoArch pre-update snapshot {time.strftime('%Y-%m-%d_%H-%M-%S')}"
+    result = subprocess.run(["pkexec", "timeshift", "--create", "--comments", comment],
+                            capture_output=True, text=True, timeout=300)
+    if result.returncode == 0:
+        log(f"Pre-update snapshot created: {comment}")
+        return True
+    log(f"Failed to create pre-update snapshot: {result.stderr}")
+    return False
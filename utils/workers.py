@@ -1,13 +1,47 @@
 import os
 import subprocess
+import threading
 from PyQt6.QtCore import QObject, pyqtSignal
+from utils.process_runner import ProcessRunner
+
+
+# Environment variables that identify the graphical session; a change in any
+# of them means the auth probe has to run again.
+_SESSION_VARS = ('XDG_CURRENT_DESKTOP', 'XDG_SESSION_TYPE', 'XDG_SESSION_ID', 'WAYLAND_DISPLAY',
+                 'HYPRLAND_INSTANCE_SIGNATURE', 'DISPLAY', 'DBUS_SESSION_BUS_ADDRESS')
+_auth_cache = {}
+_auth_cache_lock = threading.Lock()
+
+
+def _session_signature(env):
+    return tuple(env.get(k, '') for k in _SESSION_VARS) + ('SUDO_ASKPASS' in env,)
+
+
+def invalidate_auth_cache():
+    """Forget probed auth commands, e.g. after a polkit agent started or went away."""
+    with _auth_cache_lock:
+        _auth_cache.clear()
 
 
 def get_auth_command(env=None):
-    """Get the appropriate authentication command based on desktop environment"""
+    """Get the appropriate authentication command based on desktop environment.
+
+    The probe (pgrep for a polkit agent, ``pkexec --version``) runs once per
+    session signature; see invalidate_auth_cache().
+    """
     if env is None:
         env = os.environ
-    
+    key = _session_signature(env)
+    with _auth_cache_lock:
+        cached = _auth_cache.get(key)
+    if cached is None:
+        cached = _probe_auth_command(env)
+        with _auth_cache_lock:
+            _auth_cache[key] = cached
+    return list(cached)
+
+
+def _probe_auth_command(env):
     desktop = env.get('XDG_CURRENT_DESKTOP', '').lower()
     session_type = env.get('XDG_SESSION_TYPE', '').lower()
     wayland_display = env.get('WAYLAND_DISPLAY', '')
@@ -114,10 +148,25 @@ class CommandWorker(QObject):
         self.command = command
         self.sudo = sudo
         self.env = env if env is not None else os.environ.copy()
+        self.returncode = None
+        self._runner = None
+    
+    def cancel(self):
+        if self._runner is not None:
+            self._runner.cancel()
     
     def run(self):
         try:
             if self.sudo:
+                # Import here to avoid circular imports
+                from services.privileged_helper import run_privileged
+                result = run_privileged(self.command, on_stdout=self.output.emit, env=self.env)
+                if result is not None:
+                    self.returncode = result.returncode
+                    if result.stderr and result.returncode != 0:
+                        self.error.emit(f"Error: {result.stderr}")
+                    self.finished.emit()
+                    return
                 auth_cmd = get_auth_command(self.env)
                 self.command = auth_cmd + self.command
                 
@@ -127,27 +176,14 @@ class CommandWorker(QObject):
                     from services.askpass_service import prepare_askpass_env
                     self.env, _ = prepare_askpass_env()
             
-            process = subprocess.Popen(
-                self.command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.DEVNULL,
-                text=True,
-                bufsize=1,
-                preexec_fn=os.setsid,
-                env=self.env
-            )
-            
-            while True:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    self.output.emit(line.strip())
-            
-            _, stderr = process.communicate()
-            if stderr and process.returncode != 0:
-                self.error.emit(f"Error: {stderr}")
+            self._runner = ProcessRunner(self.command, env=self.env)
+            result = self._runner.run(on_stdout=self.output.emit)
+            self.returncode = result.returncode
+            if self.sudo and result.returncode == 127 and self.command[:1] == ["pkexec"]:
+                # No polkit agent after all; probe again next time
+                invalidate_auth_cache()
+            if result.stderr and result.returncode != 0:
+                self.error.emit(f"Error: {result.stderr}")
             
             self.finished.emit()
         except Exception as e: